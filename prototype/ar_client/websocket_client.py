@@ -1,12 +1,18 @@
 """
 CADverse AR 클라이언트 - WebSocket 통신
-서버로부터 주기적 메시지를 수신하고 응답합니다.
+서버로부터 시뮬레이션 프레임을 받아 지터 버퍼로 부드럽게 재생합니다.
 
 사용법:
-    python ar_client/websocket_client.py
+    python ar_client/websocket_client.py [재생 지연 ms] [지연 측정용 모터 이름]
+
+모터 이름을 주면 PROBE_INTERVAL마다 cid를 붙인 속도 명령을 보내고,
+서버가 그 입력이 반영된 프레임에 cid를 표시하면 input_ack로 응답해 입력 → 화면 지연을 측정한다
 """
 import asyncio
+import itertools
+import json
 import sys
+import time
 from pathlib import Path
 
 # 필요한 라이브러리 import
@@ -24,49 +30,277 @@ SERVER_HOST = "localhost"
 SERVER_PORT = 8000
 WS_URL = f"ws://{SERVER_HOST}:{SERVER_PORT}/cadverse/interaction"
 
+# 재생 설정
+PLAYOUT_DELAY = 0.1        # 서버 프레임 생성 시각보다 얼마나 늦게 재생할지 (초)
+MAX_EXTRAPOLATION = 0.1    # 버퍼가 비었을 때 마지막 속도로 예측할 최대 시간 (초)
+CLOCK_SYNC_INTERVAL = 2.0  # 시계 동기화 주기 (초)
+PLAYBACK_HZ = 60           # 재생(렌더) 주기
+PROBE_INTERVAL = 2.0       # 지연 측정용 모터 명령 주기 (초)
+LATENCY_REPORT_INTERVAL = 10.0  # 서버에 지연 통계를 요청하는 주기 (초)
+
+
+class ClockSync:
+    """
+    NTP 방식 서버 시계 추정
+    보낸 시각 t0, 서버 수신 t1, 서버 송신 t2, 받은 시각 t3로
+        offset = ((t1 - t0) + (t2 - t3)) / 2   (서버시계 - 로컬시계)
+        delay  = (t3 - t0) - (t2 - t1)         (왕복 네트워크 지연)
+    최근 window개 샘플 중 delay가 가장 작은 샘플의 offset을 사용 (큐잉 지연이 섞인 샘플 배제)
+    """
+
+    def __init__(self, window: int = 8):
+        self.window = window
+        self.samples = []  # [(delay, offset)]
+        self._nextId = 1
+        self._sent = {}
+
+    def request(self) -> str:
+        msgId = self._nextId
+        self._nextId += 1
+        t0 = time.time()
+        self._sent[msgId] = t0
+        return json.dumps({"type": "clock_sync", "id": msgId, "t0": t0})
+
+    def onReply(self, message: dict):
+        t3 = time.time()
+        t0 = self._sent.pop(message.get("id"), None)
+        if t0 is None:
+            return
+        t1, t2 = message["t1"], message["t2"]
+        delay = (t3 - t0) - (t2 - t1)
+        offset = ((t1 - t0) + (t2 - t3)) / 2
+        self.samples.append((delay, offset))
+        if len(self.samples) > self.window:
+            self.samples.pop(0)
+
+    @property
+    def ready(self) -> bool:
+        return bool(self.samples)
+
+    @property
+    def offset(self) -> float:
+        return min(self.samples)[1] if self.samples else 0.0
+
+    @property
+    def delay(self) -> float:
+        return min(self.samples)[0] if self.samples else 0.0
+
+    def serverNow(self) -> float:
+        return time.time() + self.offset
+
+
+def _lerp(a, b, u):
+    return [x + (y - x) * u for x, y in zip(a, b)]
+
+
+def _nlerp(q0, q1, u):
+    """쿼터니언 보간 (짧은 경로, 정규화된 선형 보간)"""
+    if sum(x * y for x, y in zip(q0, q1)) < 0:
+        q1 = [-x for x in q1]
+    q = _lerp(q0, q1, u)
+    n = sum(x * x for x in q) ** 0.5 or 1.0
+    return [x / n for x in q]
+
+
+class JitterBuffer:
+    """
+    프레임 지터 버퍼 + 보간/외삽
+    - push(): 서버 "wall"(프레임 생성 시각, 서버 시계) 순서로 보관
+    - sample(serverNow): serverNow - playoutDelay 시점의 바디 포즈를
+        앞뒤 프레임 사이면 보간, 최신 프레임보다 뒤면 마지막 두 프레임 속도로 외삽
+    네트워크 도착 간격이 흔들려도 playoutDelay 안쪽이면 끊김 없이 재생됨
+    """
+
+    def __init__(self, playoutDelay: float = PLAYOUT_DELAY,
+                 maxExtrapolation: float = MAX_EXTRAPOLATION, capacity: int = 256):
+        self.playoutDelay = playoutDelay
+        self.maxExtrapolation = maxExtrapolation
+        self.capacity = capacity
+        self.frames = []  # [(wall, {name: (pos, rot)})]
+        self.late = 0          # 재생 시점보다 늦게 도착해서 버린 프레임
+        self.extrapolated = 0  # 버퍼가 비어 외삽한 횟수
+        self.underruns = 0     # 외삽 한도도 넘어서 마지막 포즈로 멈춘 횟수
+        self._prev = None      # 마지막으로 버퍼에서 빠진 프레임 (외삽 속도 계산용)
+
+    def push(self, frame: dict, serverNow: float):
+        wall = frame.get("wall")
+        if wall is None:
+            return
+        # 재생 기준 프레임(frames[0])보다 오래된 프레임은 더 이상 쓸 데가 없음
+        if self.frames and wall <= self.frames[0][0] and wall < serverNow - self.playoutDelay:
+            self.late += 1
+            return
+        poses = {b["name"]: (b["pos"], b["rot"]) for b in frame.get("bodies", [])}
+        # 대부분 순서대로 도착하므로 뒤에서부터 삽입 위치 탐색
+        i = len(self.frames)
+        while i > 0 and self.frames[i - 1][0] > wall:
+            i -= 1
+        self.frames.insert(i, (wall, poses))
+        if len(self.frames) > self.capacity:
+            self.frames.pop(0)
+
+    def sample(self, serverNow: float):
+        """재생 시점의 {바디 이름: (pos, rot)} (프레임이 없으면 None)"""
+        frames = self.frames
+        if not frames:
+            return None
+        target = serverNow - self.playoutDelay
+
+        # 재생 시점 이전 프레임은 하나만 남기고 정리
+        while len(frames) >= 2 and frames[1][0] <= target:
+            self._prev = frames.pop(0)
 
-async def runClient():
+        t0, p0 = frames[0]
+        if target <= t0:
+            return p0
+        if len(frames) >= 2:
+            t1, p1 = frames[1]
+            u = (target - t0) / (t1 - t0) if t1 > t0 else 1.0
+            return {n: (_lerp(p0[n][0], p1[n][0], u), _nlerp(p0[n][1], p1[n][1], u))
+                    for n in p1 if n in p0}
+
+        # 최신 프레임보다 뒤: 직전 프레임과의 속도로 외삽 (한도 내에서)
+        ahead = target - t0
+        if ahead > self.maxExtrapolation or self._prev is None:
+            self.underruns += 1
+            return p0
+        self.extrapolated += 1
+        tp, pp = self._prev
+        u = 1.0 + ahead / (t0 - tp) if t0 > tp else 1.0
+        return {n: (_lerp(pp[n][0], p0[n][0], u), p0[n][1]) for n in p0 if n in pp}
+
+    def stats(self) -> dict:
+        span = self.frames[-1][0] - self.frames[0][0] if len(self.frames) > 1 else 0.0
+        return {"buffered": len(self.frames), "span_ms": round(span * 1000, 1),
+                "late": self.late, "extrapolated": self.extrapolated,
+                "underruns": self.underruns}
+
+
+async def runClient(playoutDelay: float = PLAYOUT_DELAY, probeMotor: str = None):
     """
     WebSocket 클라이언트 실행
-    - 서버로부터 "Hello, AR! @ {서버시간}" 수신
-    - "Hi, CAD! {메시지카운트} times" 응답
+    - {"type": "frame"}: 시뮬레이션 프레임 → 지터 버퍼에 넣고 재생 태스크가 보간해서 사용
+    - {"type": "ping"}: 같은 id로 pong 응답 (서버가 RTT로 전송 주기를 조절)
+    - {"type": "rate"}: 서버가 정한 현재 전송 주기/정밀도
+    - {"type": "clock_sync"}: 서버 시계 오프셋 추정 (CLOCK_SYNC_INTERVAL마다 요청)
+    - 프레임에 "cids"가 있으면 {"type": "input_ack"}로 바로 응답 (render_in: 재생까지 남은 시간)
+    - {"type": "latency"}: 서버가 측정한 이 클라이언트의 입력 지연 통계
+    - 그 외 텍스트 ("Hello, AR! @ {서버시간}"): "Hi, CAD! {메시지카운트} times" 응답
     """
     messageCount = 0
+    clock = ClockSync()
+    jitter = JitterBuffer(playoutDelay=playoutDelay)
 
-    print(f"CADverse AR 클라이언트 시작")
+    print(f"CADverse AR 클라이언트 시작 (재생 지연 {playoutDelay * 1000:.0f} ms)")
     print(f"서버 연결 시도: {WS_URL}\n")
 
+    async def syncClock(websocket):
+        """주기적으로 시계 동기화 요청"""
+        while True:
+            await websocket.send(clock.request())
+            await asyncio.sleep(CLOCK_SYNC_INTERVAL)
+
+    async def probeLatency(websocket):
+        """cid를 붙인 모터 명령을 주기적으로 보내고 지연 통계를 요청"""
+        cids = itertools.count(1)
+        nextReport = time.monotonic() + LATENCY_REPORT_INTERVAL
+        speed = 1.0
+        while True:
+            await asyncio.sleep(PROBE_INTERVAL)
+            speed = -speed  # 매번 값이 바뀌어야 프레임에서 움직임이 보임
+            await websocket.send(json.dumps({
+                "type": "motors", "cid": f"probe-{next(cids)}",
+                "motors": [{"name": probeMotor, "speed": speed}]}))
+            if time.monotonic() >= nextReport:
+                nextReport += LATENCY_REPORT_INTERVAL
+                await websocket.send(json.dumps({"type": "latency"}))
+
+    async def playback():
+        """PLAYBACK_HZ로 재생 시점 포즈를 샘플 (실제 AR 앱에서는 여기서 렌더)"""
+        count = 0
+        while True:
+            await asyncio.sleep(1 / PLAYBACK_HZ)
+            if not clock.ready:
+                continue
+            poses = jitter.sample(clock.serverNow())
+            count += 1
+            if poses and count % (PLAYBACK_HZ * 2) == 0:
+                name, (pos, _) = next(iter(poses.items()))
+                print(f"[재생] {name} pos={[round(v, 4) for v in pos]} "
+                      f"offset={clock.offset * 1000:.1f}ms rtt={clock.delay * 1000:.1f}ms "
+                      f"{jitter.stats()}")
+
     try:
         async with websockets.connect(WS_URL) as websocket:
             print("✅ 서버에 연결되었습니다!")
             print("서버로부터 메시지 수신 대기 중...\n")
             print("-" * 60)
 
+            tasks = [asyncio.create_task(syncClock(websocket)),
+                     asyncio.create_task(playback())]
+            if probeMotor:
+                tasks.append(asyncio.create_task(probeLatency(websocket)))
+
             # 메시지 수신 루프
-            while True:
-                try:
-                    # 서버로부터 메시지 수신
-                    serverMessage = await websocket.recv()
-                    messageCount += 1
-
-                    print(f"[{messageCount}] ← 서버: {serverMessage}")
-
-                    # 응답 메시지 생성
-                    response = f"Hi, CAD! {messageCount} times"
-
-                    # 서버로 응답 전송
-                    await websocket.send(response)
-                    print(f"[{messageCount}] → 클라이언트: {response}")
-                    print("-" * 60)
-
-                except websockets.exceptions.ConnectionClosed:
-                    print("\n서버와의 연결이 종료되었습니다.")
-                    break
-                except Exception as e:
-                    print(f"\n오류 발생: {e}")
-                    import traceback
-                    traceback.print_exc()
-                    break
+            try:
+                while True:
+                    try:
+                        # 서버로부터 메시지 수신
+                        serverMessage = await websocket.recv()
+                        messageCount += 1
+
+                        try:
+                            data = json.loads(serverMessage)
+                        except ValueError:
+                            data = None
+
+                        if isinstance(data, dict) and "type" in data:
+                            msgType = data["type"]
+                            if msgType == "frame":
+                                serverNow = clock.serverNow()
+                                jitter.push(data["frame"], serverNow)
+                                if "cids" in data:
+                                    # 이 프레임이 지터 버퍼에서 재생되기까지 남은 시간
+                                    wall = data["frame"].get("wall", serverNow)
+                                    renderIn = max(wall + jitter.playoutDelay - serverNow, 0.0)
+                                    await websocket.send(json.dumps({
+                                        "type": "input_ack", "cids": data["cids"],
+                                        "render_in": round(renderIn, 4)}))
+                            elif msgType == "ping":
+                                await websocket.send(json.dumps({"type": "pong", "id": data.get("id")}))
+                            elif msgType == "clock_sync":
+                                clock.onReply(data)
+                            elif msgType == "rate":
+                                print(f"[{messageCount}] ← 전송 주기: {data}")
+                            elif msgType == "latency":
+                                stages = {k: f"p50={v['p50'] * 1000:.1f}ms p99={v['p99'] * 1000:.1f}ms"
+                                          for k, v in data.get("stages", {}).items()}
+                                print(f"[{messageCount}] ← 입력 지연: {stages}")
+                            else:
+                                print(f"[{messageCount}] ← 서버: {serverMessage}")
+                            continue
+
+                        print(f"[{messageCount}] ← 서버: {serverMessage}")
+
+                        # 응답 메시지 생성
+                        response = f"Hi, CAD! {messageCount} times"
+
+                        # 서버로 응답 전송
+                        await websocket.send(response)
+                        print(f"[{messageCount}] → 클라이언트: {response}")
+                        print("-" * 60)
+
+                    except websockets.exceptions.ConnectionClosed:
+                        print("\n서버와의 연결이 종료되었습니다.")
+                        break
+                    except Exception as e:
+                        print(f"\n오류 발생: {e}")
+                        import traceback
+                        traceback.print_exc()
+                        break
+            finally:
+                for task in tasks:
+                    task.cancel()
 
     except websockets.exceptions.WebSocketException as e:
         print(f"❌ WebSocket 연결 실패: {e}")
@@ -81,9 +315,11 @@ async def runClient():
 
 
 def main():
-    """메인 함수"""
+    """메인 함수 (인자: 재생 지연 ms, 기본 100 / 지연 측정용 모터 이름, 선택)"""
+    playoutDelay = float(sys.argv[1]) / 1000 if len(sys.argv) > 1 else PLAYOUT_DELAY
+    probeMotor = sys.argv[2] if len(sys.argv) > 2 else None
     try:
-        asyncio.run(runClient())
+        asyncio.run(runClient(playoutDelay, probeMotor))
     except KeyboardInterrupt:
         print("\n\nCtrl+C로 종료되었습니다.")
 
@@ -0,0 +1,250 @@
+"""
+기록된 실행(frame_recorder 형식) 사후 분석
+JSON으로 내보내서 파이썬 루프로 돌던 검증을 NumPy 벡터 연산으로 처리한다
+
+- angular_velocity : 쿼터니언 시계열 → 월드 기준 각속도 (연속 프레임 상대 회전)
+- 기어 쌍 실효 변속비 : |ω_B| / |ω_A|
+- RPM 안정성 : 회전 속도 평균/표준편차/변동계수
+- 축 흔들림(wobble) : 바디 로컬 회전축이 처음 월드 방향에서 벗어난 각도
+
+긴 실행은 청크 단위로 읽고 통계만 누적하므로 메모리는 청크 크기로 고정된다
+
+사용법:
+    python -m sim_server.analytics <run_dir> --gear gear_A:gear_B --body shaft
+"""
+import json
+import math
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_CHUNK = 65536
+
+
+@dataclass
+class RunningStats:
+    """청크별 통계를 합쳐 가는 누적 통계 (Chan 병렬 분산 공식)"""
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    min: float = math.inf
+    max: float = -math.inf
+
+    def add(self, values: np.ndarray):
+        values = values[np.isfinite(values)]
+        n = values.size
+        if n == 0:
+            return
+        mean = float(values.mean())
+        m2 = float(((values - mean) ** 2).sum())
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.count * n / total
+        self.count = total
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.m2 / self.count) if self.count else 0.0
+
+    def toDict(self) -> dict:
+        if not self.count:
+            return {"count": 0}
+        return {"count": self.count, "mean": self.mean, "std": self.std,
+                "min": self.min, "max": self.max,
+                "cv": self.std / abs(self.mean) if self.mean else None}
+
+
+#==================================================================================================
+# 벡터 연산 (배열 입력, 청크와 무관)
+
+def quat_conj(q: np.ndarray) -> np.ndarray:
+    return q * np.array([1.0, -1.0, -1.0, -1.0])
+
+
+def quat_mul(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """[..., 4] (e0, e1, e2, e3) 쿼터니언 곱"""
+    w1, x1, y1, z1 = np.moveaxis(a, -1, 0)
+    w2, x2, y2, z2 = np.moveaxis(b, -1, 0)
+    return np.stack([
+        w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2,
+        w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2,
+        w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2,
+        w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2,
+    ], axis=-1)
+
+
+def quat_rotate(q: np.ndarray, v: np.ndarray) -> np.ndarray:
+    """[N, 4] 쿼터니언으로 벡터 v([3] 또는 [N, 3]) 회전"""
+    w = q[..., :1]
+    u = q[..., 1:]
+    v = np.broadcast_to(v, u.shape)
+    t = 2.0 * np.cross(u, v)
+    return v + w * t + np.cross(u, t)
+
+
+def angular_velocity(quats: np.ndarray, times: np.ndarray) -> np.ndarray:
+    """
+    연속 프레임 쿼터니언 → 월드 기준 각속도 [N-1, 3] (rad/s)
+    dq = q[i+1] * conj(q[i]) 의 회전각/축을 dt로 나눔 (프레임 사이 회전이 π 미만이라고 가정)
+    """
+    q = quats.astype(np.float64)
+    q /= np.linalg.norm(q, axis=1, keepdims=True)
+    dq = quat_mul(q[1:], quat_conj(q[:-1]))
+    # 짧은 경로 (w >= 0)
+    dq *= np.where(dq[:, :1] < 0, -1.0, 1.0)
+    vec = dq[:, 1:]
+    sin_half = np.linalg.norm(vec, axis=1)
+    angle = 2.0 * np.arctan2(sin_half, dq[:, 0])
+    dt = np.diff(times)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        axis = vec / sin_half[:, None]
+        omega = axis * (angle / dt)[:, None]
+    omega[~np.isfinite(omega)] = 0.0
+    return omega
+
+
+def dominant_local_axis(quats: np.ndarray, omega: np.ndarray) -> np.ndarray:
+    """바디 로컬 기준 평균 회전축 (월드 각속도를 로컬로 돌려서 평균)"""
+    local = quat_rotate(quat_conj(quats[:-1].astype(np.float64)), omega)
+    # 회전 방향이 바뀌어도 같은 축이 되도록 첫 성분 기준으로 부호 정렬
+    ref = local[np.argmax(np.linalg.norm(local, axis=1))]
+    signs = np.where(local @ ref < 0, -1.0, 1.0)
+    axis = (local * signs[:, None]).sum(axis=0)
+    norm = np.linalg.norm(axis)
+    return axis / norm if norm > 0 else np.array([0.0, 0.0, 1.0])
+
+
+#==================================================================================================
+# 청크 단위 분석
+
+def iter_blocks(run, body: str, chunk: int = DEFAULT_CHUNK) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    (times, block[n, 7]) 청크 순회
+    각속도 계산을 위해 다음 청크의 첫 프레임을 겹쳐서 포함
+    """
+    n = len(run)
+    start = 0
+    while start < n - 1:
+        stop = min(start + chunk + 1, n)
+        yield run.times[start:stop], run.body_block(body, start, stop)
+        start = stop - 1
+
+
+def analyze_body(run, body: str, axis: Optional[List[float]] = None,
+                 chunk: int = DEFAULT_CHUNK) -> dict:
+    """
+    바디 하나의 회전 속도(RPM)/축 흔들림/위치 변화 통계
+
+    Args:
+        axis: 바디 로컬 회전축 (없으면 첫 청크에서 추정)
+    """
+    speed = RunningStats()     # |ω| (rpm)
+    wobble = RunningStats()    # 회전축 기울어짐 (deg)
+    drift = RunningStats()     # 처음 위치에서 벗어난 거리 (m)
+    local_axis = None if axis is None else np.asarray(axis, dtype=np.float64) / np.linalg.norm(axis)
+    ref_axis = None
+    p0 = None  # 첫 프레임 위치 (첫 청크 여부 표시 겸용)
+
+    for times, block in iter_blocks(run, body, chunk):
+        pos = block[:, :3].astype(np.float64)
+        quats = block[:, 3:].astype(np.float64)
+        omega = angular_velocity(quats, times)
+        speed.add(np.linalg.norm(omega, axis=1) * 60.0 / (2 * math.pi))
+
+        if local_axis is None:
+            local_axis = dominant_local_axis(quats, omega)
+        # 포즈 기반 통계는 겹친 첫 프레임을 두 번 세지 않도록 제외
+        if p0 is None:
+            p0 = pos[0]
+            ref_axis = quat_rotate(quats[:1], local_axis)[0]
+        else:
+            pos, quats = pos[1:], quats[1:]
+        world_axis = quat_rotate(quats, local_axis)
+        cos = np.clip(np.abs(world_axis @ ref_axis), -1.0, 1.0)
+        wobble.add(np.degrees(np.arccos(cos)))
+        drift.add(np.linalg.norm(pos - p0, axis=1))
+
+    return {
+        "body": body,
+        "local_axis": None if local_axis is None else local_axis.tolist(),
+        "rpm": speed.toDict(),
+        "wobble_deg": wobble.toDict(),
+        "position_drift_m": drift.toDict(),
+    }
+
+
+def analyze_gear_pair(run, driver: str, driven: str, nominal: Optional[float] = None,
+                      chunk: int = DEFAULT_CHUNK, min_speed: float = 1e-3) -> dict:
+    """
+    기어 쌍 실효 변속비 |ω_driven| / |ω_driver| 통계
+    구동 기어가 거의 멈춘 프레임(min_speed rad/s 미만)은 제외
+    """
+    ratio = RunningStats()
+    for (times, a), (_, b) in zip(iter_blocks(run, driver, chunk), iter_blocks(run, driven, chunk)):
+        wa = np.linalg.norm(angular_velocity(a[:, 3:], times), axis=1)
+        wb = np.linalg.norm(angular_velocity(b[:, 3:], times), axis=1)
+        moving = wa > min_speed
+        ratio.add(wb[moving] / wa[moving])
+
+    out = {"driver": driver, "driven": driven, "ratio": ratio.toDict()}
+    if nominal:
+        out["nominal"] = nominal
+        if ratio.count:
+            out["error"] = (ratio.mean - nominal) / nominal
+    return out
+
+
+def analyze_run(run, bodies: Optional[List[str]] = None,
+                gears: Optional[List[Tuple[str, str, Optional[float]]]] = None,
+                chunk: int = DEFAULT_CHUNK) -> dict:
+    """실행 전체 요약 (bodies가 없으면 기록된 모든 바디)"""
+    bodies = list(run.body_names) if bodies is None else bodies
+    times = run.times
+    return {
+        "run": str(run.run_dir),
+        "frames": len(run),
+        "duration": float(times[-1] - times[0]) if len(run) > 1 else 0.0,
+        "bodies": [analyze_body(run, b, chunk=chunk) for b in bodies],
+        "gears": [analyze_gear_pair(run, a, b, nominal, chunk=chunk)
+                  for a, b, nominal in (gears or [])],
+    }
+
+
+def _parse_gear(spec: str):
+    """ "gear_A:gear_B" 또는 "gear_A:gear_B:0.5" """
+    parts = spec.split(":")
+    if len(parts) not in (2, 3):
+        raise ValueError(f"--gear 형식은 driver:driven[:nominal] ({spec})")
+    return parts[0], parts[1], float(parts[2]) if len(parts) == 3 else None
+
+
+def main(argv=None):
+    import argparse
+    import sys
+    import time
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from sim_server.utils.frame_recorder import RecordedRun
+
+    parser = argparse.ArgumentParser(description="기록된 실행 분석 (RPM, 변속비, 축 흔들림)")
+    parser.add_argument("run_dir")
+    parser.add_argument("--body", action="append", help="분석할 바디 (여러 번 지정 가능, 없으면 전체)")
+    parser.add_argument("--gear", action="append", default=[],
+                        help="기어 쌍 driver:driven[:nominal_ratio]")
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    run = RecordedRun(args.run_dir)
+    report = analyze_run(run, args.body, [_parse_gear(g) for g in args.gear], chunk=args.chunk)
+    report["elapsed_s"] = round(time.perf_counter() - start, 3)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+핫패스 마이크로벤치마크 공용 픽스처 (pytest-benchmark와 비슷한 사용법, 추가 의존성 없음)
+
+실행 (prototype 디렉토리에서):
+    python -m pytest sim_server/benchmarks -q
+    python -m pytest sim_server/benchmarks -q --bench-save-baseline   # 현재 결과를 기준선으로 저장
+
+- 결과: --bench-json 경로 (기본 sim_server/benchmarks/.results/latest.json)
+- 기준선: --bench-baseline 경로 (기본 sim_server/benchmarks/baseline.json)
+  있으면 벤치마크별 중앙값을 비교해 --bench-tolerance(기본 0.25 = 25%)보다 느려진 항목을 실패로 보고
+  기준선은 기계마다 다르므로 같은 기계에서 만든 것과만 비교한다
+
+사용 예:
+    def test_commit(bench):
+        buf = OwnedBuffer({})
+        bench(buf.commit, {"time": 0.0})
+"""
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# sim_server 패키지를 import할 수 있도록 prototype 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+BENCH_DIR = Path(__file__).resolve().parent
+DEFAULT_RESULTS = BENCH_DIR / ".results" / "latest.json"
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+
+# 한 라운드가 이 시간보다 짧으면 반복 횟수를 늘려서 타이머 해상도 영향을 줄임
+MIN_ROUND_TIME = 1e-3
+
+_results = {}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("bench", "핫패스 마이크로벤치마크")
+    group.addoption("--bench-json", default=str(DEFAULT_RESULTS),
+                    help="결과 JSON 경로")
+    group.addoption("--bench-baseline", default=str(DEFAULT_BASELINE),
+                    help="비교할 기준선 JSON 경로 (없으면 비교 생략)")
+    group.addoption("--bench-tolerance", type=float, default=0.25,
+                    help="기준선 대비 허용 중앙값 증가 비율")
+    group.addoption("--bench-save-baseline", action="store_true",
+                    help="이번 결과를 기준선으로 저장 (비교 생략)")
+    group.addoption("--bench-rounds", type=int, default=None,
+                    help="모든 벤치마크의 라운드 수를 덮어씀 (빠른 확인용)")
+
+
+class Bench:
+    """
+    bench(fn, *args, rounds=20, warmup=2, **kwargs)
+    fn 한 번 호출 시간을 라운드별로 재서 통계를 남기고, 마지막 호출 결과를 반환
+    setup이 있으면 라운드마다 호출해서 (args, kwargs)를 새로 받음 (측정 제외)
+    """
+
+    def __init__(self, name, roundsOverride=None):
+        self.name = name
+        self.roundsOverride = roundsOverride
+        self.extra = {}
+
+    def __call__(self, fn, *args, rounds=20, warmup=2, setup=None, **kwargs):
+        if self.roundsOverride is not None:
+            rounds = self.roundsOverride
+        perf = time.perf_counter
+        result = None
+        for _ in range(warmup):
+            if setup is not None:
+                args, kwargs = setup()
+            result = fn(*args, **kwargs)
+
+        # 반복 횟수 보정 (setup이 있으면 라운드당 한 번만)
+        number = 1
+        if setup is None:
+            while True:
+                t0 = perf()
+                for _ in range(number):
+                    fn(*args, **kwargs)
+                if perf() - t0 >= MIN_ROUND_TIME or number >= 1 << 20:
+                    break
+                number *= 4
+
+        samples = []
+        for _ in range(rounds):
+            if setup is not None:
+                args, kwargs = setup()
+            t0 = perf()
+            for _ in range(number):
+                result = fn(*args, **kwargs)
+            samples.append((perf() - t0) / number)
+        self.record(samples, number)
+        return result
+
+    def record(self, samples, number=1):
+        """직접 잰 호출당 시간 목록을 결과로 기록 (여러 스레드를 엮은 벤치마크용)"""
+        median = statistics.median(samples)
+        _results[self.name] = {
+            "rounds": len(samples),
+            "iterations": number,
+            "min": min(samples),
+            "median": median,
+            "mean": statistics.fmean(samples),
+            "stddev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+            "ops": 1.0 / median if median > 0 else math.inf,
+            **({"extra": self.extra} if self.extra else {}),
+        }
+
+
+@pytest.fixture
+def bench(request):
+    return Bench(request.node.nodeid.split("::", 1)[-1],
+                 request.config.getoption("--bench-rounds"))
+
+
+def _compare(baseline, tolerance):
+    regressions = []
+    for name, result in sorted(_results.items()):
+        base = baseline.get(name)
+        if not base or not base.get("median"):
+            continue
+        ratio = result["median"] / base["median"]
+        result["baseline_median"] = base["median"]
+        result["ratio"] = ratio
+        if ratio > 1.0 + tolerance:
+            regressions.append((name, base["median"], result["median"], ratio))
+    return regressions
+
+
+def _fmt(seconds):
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.3f}ms"
+    return f"{seconds * 1e6:.2f}µs"
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not _results:
+        return
+    config = session.config
+    tolerance = config.getoption("--bench-tolerance")
+    baselinePath = Path(config.getoption("--bench-baseline"))
+
+    regressions = []
+    if config.getoption("--bench-save-baseline"):
+        target = baselinePath
+    else:
+        target = Path(config.getoption("--bench-json"))
+        if baselinePath.exists():
+            baseline = json.loads(baselinePath.read_text(encoding="utf-8")).get("benchmarks", {})
+            regressions = _compare(baseline, tolerance)
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(json.dumps({
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                    "processor": platform.processor()},
+        "benchmarks": _results,
+    }, indent=2), encoding="utf-8")
+
+    reporter = config.pluginmanager.get_plugin("terminalreporter")
+    if reporter is not None:
+        reporter.write_sep("-", f"benchmarks ({len(_results)}) → {target}")
+        for name, r in sorted(_results.items()):
+            line = f"{name:<60} median {_fmt(r['median']):>11}  min {_fmt(r['min']):>11}"
+            if "ratio" in r:
+                line += f"  x{r['ratio']:.2f}"
+            reporter.write_line(line)
+        for name, old, new, ratio in regressions:
+            reporter.write_line(f"REGRESSION {name}: {_fmt(old)} → {_fmt(new)} (x{ratio:.2f})", red=True)
+    if regressions and session.exitstatus == 0:
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
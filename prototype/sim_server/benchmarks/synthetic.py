@@ -0,0 +1,92 @@
+"""
+벤치마크용 합성 모델 생성
+shaft_base / gear_pair 어셈블리 N개로 된 model_meta와 그 OBJ 파일들을 절차적으로 만든다
+
+- 샤프트: y축 원기둥 (segments로 삼각형 수 조절)
+- 베이스: 직육면체
+- 기어: utils/gear_mesh.py 인벌류트 메시를 파일명 규칙(gear_*_m2_z20.obj)대로 기록
+  → simulate.gear_pitch_radius가 파일명에서 피치반지름을 읽음
+같은 종류의 어셈블리는 같은 메시 파일을 공유 (실제 모델처럼 simulate.load_mesh 캐시가 동작)
+"""
+import math
+from pathlib import Path
+
+from sim_server.utils.gear_mesh import GearParams, gear_obj_text
+
+
+def cylinder_obj_text(radius=0.01, length=0.2, segments=32) -> str:
+    """y축 방향 원기둥 OBJ (단위 m, 바닥이 y=0)"""
+    lines = ["# synthetic shaft\n"]
+    for y in (0.0, length):
+        for i in range(segments):
+            a = 2 * math.pi * i / segments
+            lines.append(f"v {radius * math.cos(a):.6f} {y:.6f} {radius * math.sin(a):.6f}\n")
+    lines.append(f"v 0 0 0\nv 0 {length:.6f} 0\n")
+    bottom, top = 2 * segments + 1, 2 * segments + 2
+    for i in range(segments):
+        j = (i + 1) % segments
+        a, b, c, d = i + 1, j + 1, segments + j + 1, segments + i + 1
+        lines.append(f"f {a} {b} {c}\nf {a} {c} {d}\n")
+        lines.append(f"f {bottom} {b} {a}\nf {top} {d} {c}\n")
+    return "".join(lines)
+
+
+def box_obj_text(sx=0.1, sy=0.02, sz=0.1) -> str:
+    """원점 아래쪽에 놓인 직육면체 OBJ (베이스)"""
+    lines = ["# synthetic base\n"]
+    for x in (-sx / 2, sx / 2):
+        for y in (-sy, 0.0):
+            for z in (-sz / 2, sz / 2):
+                lines.append(f"v {x:.6f} {y:.6f} {z:.6f}\n")
+    for a, b, c, d in ((1, 2, 4, 3), (5, 7, 8, 6), (1, 5, 6, 2),
+                       (3, 4, 8, 7), (1, 3, 7, 5), (2, 6, 8, 4)):
+        lines.append(f"f {a} {b} {c}\nf {a} {c} {d}\n")
+    return "".join(lines)
+
+
+def write_meshes(out_dir, segments=32, module=2, teeth=(20, 40)) -> dict:
+    """
+    메시 파일 기록 후 경로 반환
+    {"shaft": ..., "base": ..., "gearA": ..., "gearB": ...}
+    """
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    paths = {
+        "shaft": out / f"shaft_s{segments}.obj",
+        "base": out / "base.obj",
+        "gearA": out / f"gear_A_m{module}_z{teeth[0]}.obj",
+        "gearB": out / f"gear_B_m{module}_z{teeth[1]}.obj",
+    }
+    paths["shaft"].write_text(cylinder_obj_text(segments=segments), encoding="utf-8")
+    paths["base"].write_text(box_obj_text(), encoding="utf-8")
+    paths["gearA"].write_text(gear_obj_text(GearParams(module, teeth[0])), encoding="utf-8")
+    paths["gearB"].write_text(gear_obj_text(GearParams(module, teeth[1])), encoding="utf-8")
+    return {k: str(v) for k, v in paths.items()}
+
+
+def synthetic_model(out_dir, shafts=1, gear_pairs=1, segments=32) -> dict:
+    """
+    shaft_base shafts개 + gear_pair gear_pairs개로 된 model_meta
+    바디/모터 이름은 어셈블리 번호로 구분 (입력/interest 구독이 실제 모델과 같은 경로를 탐)
+    """
+    meshes = write_meshes(out_dir, segments=segments)
+    assemblies = []
+    for i in range(shafts):
+        assemblies.append({
+            "type": "shaft_base",
+            "id": f"shaft_{i}",
+            "shaft": {"name": f"shaft_{i}", "mesh": meshes["shaft"], "mass": 500,
+                      "motor_name": f"shaft_{i}_motor"},
+            "base": {"name": f"base_{i}", "mesh": meshes["base"], "mass": 1000, "fixed": True},
+            "motor_speed": 5.0,
+        })
+    for i in range(gear_pairs):
+        assemblies.append({
+            "type": "gear_pair",
+            "id": f"gears_{i}",
+            "gearA": {"name": f"gear_A_{i}", "mesh": meshes["gearA"], "mass": 1000,
+                      "motor_name": f"gear_{i}_motor"},
+            "gearB": {"name": f"gear_B_{i}", "mesh": meshes["gearB"], "mass": 1000},
+            "motor_speed": 2.0,
+        })
+    return {"assemblies": assemblies}
@@ -0,0 +1,122 @@
+# 프레임 파이프라인 벤치마크 (PyChrono 없이 실행 가능)
+# OBJ 파싱/스케일 변환, 기어 메시 생성, OwnedBuffer commit/read 경합, 프레임 JSON 인코딩
+import itertools
+import threading
+import time
+
+import pytest
+
+from sim_server.benchmarks.synthetic import write_meshes, cylinder_obj_text
+from sim_server.utils.client_session import FrameEncoder
+from sim_server.utils.gear_mesh import GearParams, gear_mesh
+from sim_server.utils.mesh_pipeline import parse_obj_arrays
+from sim_server.utils.obj_scaler import rescale_obj_file
+from sim_server.utils.owned_buffer import OwnedBuffer
+
+
+def make_frame(n_bodies, t=0.0):
+    """step_sim이 commit하는 것과 같은 모양의 프레임"""
+    return {
+        "time": t,
+        "bodies": [{"name": f"body_{i}", "pos": [0.1 * i, 0.25, -0.5],
+                    "rot": [0.9238795325, 0.0, 0.3826834324, 0.0]} for i in range(n_bodies)],
+    }
+
+
+@pytest.fixture(scope="module")
+def meshes(tmp_path_factory):
+    return write_meshes(tmp_path_factory.mktemp("meshes"), segments=256)
+
+
+# ------------------------------------------------------------------ OBJ
+
+
+@pytest.mark.parametrize("kind", ["shaft", "gearB"])
+def test_parse_obj_arrays(bench, meshes, kind):
+    vertices, triangles = bench(parse_obj_arrays, meshes[kind], rounds=10)
+    assert len(vertices) and len(triangles)
+    bench.extra["vertices"] = len(vertices)
+
+
+def test_rescale_obj_file(bench, tmp_path):
+    src = tmp_path / "shaft_mm.obj"
+    src.write_text(cylinder_obj_text(radius=10.0, length=200.0, segments=1024), encoding="utf-8")
+    dst = tmp_path / "shaft_scaled.obj"
+    bench(rescale_obj_file, str(src), str(dst), rounds=10)
+    assert dst.stat().st_size > 0
+
+
+def test_gear_mesh_generation(bench):
+    # gear_mesh는 lru_cache로 캐시되므로 라운드마다 잇수를 바꿔 매번 새로 생성
+    teeth = itertools.count(101)
+    bench(gear_mesh, setup=lambda: ((GearParams(2, next(teeth)),), {}), warmup=0, rounds=10)
+
+
+# ------------------------------------------------------------------ OwnedBuffer
+
+
+def test_buffer_commit_uncontended(bench):
+    buf = OwnedBuffer({})
+    frame = make_frame(32)
+    bench(buf.commit, frame)
+
+
+def test_buffer_latest_uncontended(bench):
+    buf = OwnedBuffer(make_frame(32))
+    bench(buf.latest)
+
+
+@pytest.mark.parametrize("readers", [4, 16])
+def test_buffer_commit_contended(bench, readers):
+    """
+    readers개 스레드가 latest()를 계속 호출하는 동안 시뮬 스레드 쪽 commit 지연
+    (서버의 클라이언트별 publishLoop가 같은 버퍼를 읽는 상황)
+    """
+    buf = OwnedBuffer(make_frame(32))
+    stop = threading.Event()
+    reads = [0] * readers
+
+    def reader(i):
+        latest = buf.latest
+        n = 0
+        while not stop.is_set():
+            latest()
+            n += 1
+        reads[i] = n
+
+    threads = [threading.Thread(target=reader, args=(i,), daemon=True) for i in range(readers)]
+    for th in threads:
+        th.start()
+    try:
+        perf = time.perf_counter
+        samples = []
+        for t in range(64):
+            frame = make_frame(32, t)
+            t0 = perf()
+            buf.commit(frame)
+            samples.append(perf() - t0)
+            time.sleep(0.001)  # 시뮬 틱 사이 간격 (읽는 스레드에 GIL 양보)
+    finally:
+        stop.set()
+        for th in threads:
+            th.join()
+    bench.extra["reads"] = sum(reads)
+    bench.record(samples)
+    assert buf.version == len(samples)
+
+
+def test_buffer_readonly_deepcopy(bench):
+    buf = OwnedBuffer(make_frame(32))
+    bench(buf.readonly, rounds=10)
+
+
+# ------------------------------------------------------------------ 인코딩
+
+
+@pytest.mark.parametrize("n_bodies", [8, 64])
+def test_frame_encode(bench, n_bodies):
+    encoder = FrameEncoder()
+    frame = make_frame(n_bodies)
+    versions = itertools.count()
+    # 버전이 매번 바뀌어 캐시를 쓰지 않는 경우 (새 프레임마다 첫 클라이언트가 내는 비용)
+    bench(lambda: encoder.encode(frame, next(versions), 4))
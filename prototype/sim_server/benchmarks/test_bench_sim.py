@@ -0,0 +1,93 @@
+# 물리 시뮬레이션 벤치마크 (PyChrono 필요, 없으면 전체 건너뜀)
+# 합성 모델(shaft_base / gear_pair N개)로 make_sim 빌드, step_sim 처리량, dump_frame, OBJ 메시 로드
+import pytest
+
+chrono = pytest.importorskip("pychrono")
+
+from sim_server import simulate  # noqa: E402
+from sim_server.benchmarks.synthetic import synthetic_model  # noqa: E402
+from sim_server.utils.owned_buffer import OwnedBuffer  # noqa: E402
+from sim_server.legacy_simloop import SimBufferHandle  # noqa: E402
+
+DT = 1 / 60
+SIZES = [1, 8, 32]  # 어셈블리 종류별 개수 (바디 수 = 5N)
+
+
+def reset_caches():
+    """모듈 수준 메시 캐시 초기화 (빌드 시간에 파싱 비용을 포함하려는 경우)"""
+    simulate._load_mesh.cache_clear()
+    simulate._read_obj_bounds.cache_clear()
+
+
+@pytest.fixture(scope="module")
+def model_dir(tmp_path_factory):
+    return tmp_path_factory.mktemp("synthetic")
+
+
+def build(model_dir, n, publish_buffer=True):
+    model = synthetic_model(model_dir / f"n{n}", shafts=n, gear_pairs=n)
+    buffer = SimBufferHandle(None, OwnedBuffer({})) if publish_buffer else None
+    return simulate.make_sim(model, buffer)
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_make_sim_cold(bench, model_dir, n):
+    """메시 캐시가 빈 상태에서 빌드 (서버 첫 시작)"""
+    model = synthetic_model(model_dir / f"cold{n}", shafts=n, gear_pairs=n)
+
+    def setup():
+        reset_caches()
+        return (model, None), {}
+    handle = bench(simulate.make_sim, setup=setup, warmup=1, rounds=5)
+    assert len(handle.bodies) == 5 * n
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_make_sim_warm(bench, model_dir, n):
+    """메시 캐시가 찬 상태에서 빌드 (시뮬 스레드 재시작)"""
+    model = synthetic_model(model_dir / f"warm{n}", shafts=n, gear_pairs=n)
+    handle = bench(simulate.make_sim, model, None, warmup=1, rounds=5)
+    assert len(handle.bodies) == 5 * n
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_step_sim(bench, model_dir, n):
+    """입력 없음, 프레임 commit까지 포함한 한 틱"""
+    handle = build(model_dir, n)
+    bench(simulate.step_sim, handle, DT, rounds=30)
+    bench.extra["bodies"] = len(handle.bodies)
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_step_sim_unpublished(bench, model_dir, n):
+    """보는 사람이 없을 때 (물리만)"""
+    handle = build(model_dir, n)
+    bench(simulate.step_sim, handle, DT, publish=False, rounds=30)
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_dump_frame(bench, model_dir, n):
+    handle = build(model_dir, n, publish_buffer=False)
+    frame = bench(simulate.dump_frame, 0.0, handle.bodies)
+    assert len(frame["bodies"]) == 5 * n
+
+
+def test_load_mesh(bench, model_dir):
+    """Chrono Wavefront 파서 (load_mesh 캐시를 비우고 측정)"""
+    path = synthetic_model(model_dir / "mesh", shafts=1, gear_pairs=0, segments=1024)[
+        "assemblies"][0]["shaft"]["mesh"]
+
+    def setup():
+        simulate._load_mesh.cache_clear()
+        return (path,), {}
+    bench(simulate.load_mesh, setup=setup, rounds=10)
+
+
+def test_read_obj_bounds(bench, model_dir):
+    path = synthetic_model(model_dir / "bounds", shafts=1, gear_pairs=0, segments=1024)[
+        "assemblies"][0]["shaft"]["mesh"]
+
+    def setup():
+        simulate._read_obj_bounds.cache_clear()
+        return (path,), {}
+    bench(simulate.read_obj_bounds, setup=setup, rounds=10)
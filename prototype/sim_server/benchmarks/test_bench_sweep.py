@@ -0,0 +1,26 @@
+# 배치 스윕 벤치마크 (합성 백엔드, PyChrono 없이 실행 가능)
+# 변형 여러 개를 프로세스 풀에서 대기 없이 실행 → 기록 → 분석까지 걸리는 시간
+import math
+
+import pytest
+
+from sim_server.sweep import expand_sweep, run_sweep
+
+MODEL = {"backend": "synthetic", "synthetic": {"bodies": 100, "motors": 2, "step_cost_ms": 0.2}}
+SPEEDS = [1.0, 2.0, 4.0, 8.0]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_sweep_synthetic(bench, tmp_path, workers):
+    variants = expand_sweep({"synthetic.motor_speed": SPEEDS})
+    counter = iter(range(1 << 20))
+    report = bench(lambda: run_sweep(MODEL, variants, tmp_path / f"run_{next(counter)}",
+                                     duration=5.0, workers=workers),
+                   rounds=3, warmup=0)
+    assert report["failed"] == 0 and report["diverged"] == 0
+    bench.extra["variants_per_s"] = len(variants) / report["elapsed_s"]
+    for params, summary in zip(variants, report["variants"]):
+        # body_0은 모터 0에 1:1로 묶여 있으므로 RPM = 모터 속도(rad/s) * 60 / 2π
+        rpm = summary["bodies"]["body_0"]["rpm_mean"]
+        assert rpm == pytest.approx(params["synthetic.motor_speed"] * 60 / (2 * math.pi), rel=1e-3)
+        assert summary["realtime_factor"] > 1.0
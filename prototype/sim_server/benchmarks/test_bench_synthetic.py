@@ -0,0 +1,104 @@
+# 합성 백엔드 벤치마크 (PyChrono 없이 실행 가능)
+# 바디 수에 따른 스텝/프레임 생성/인코딩 비용 (네트워크·버퍼·팬아웃 계층이 받는 부하의 크기)
+import itertools
+import time
+
+import pytest
+
+from sim_server.legacy_simloop import SimBufferHandle, fastForwardSlice
+from sim_server.simInterface import make_sim
+from sim_server.utils.checkpoint import model_key
+from sim_server.utils.client_session import FrameEncoder
+from sim_server.utils.fast_forward import FastForwardControl
+from sim_server.utils.owned_buffer import OwnedBuffer
+from sim_server.utils.sim_pool import WarmSimPool
+
+DT = 1 / 60
+SIZES = [100, 1000, 10000]
+
+
+def build(n, **opts):
+    buffer = SimBufferHandle(None, OwnedBuffer({}))
+    return make_sim({"backend": "synthetic", "synthetic": {"bodies": n, **opts}}, buffer), buffer
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_synthetic_step(bench, n):
+    """입력 없음, 프레임 생성 + commit까지 포함한 한 틱"""
+    sim, _ = build(n)
+    bench(sim.step, DT, rounds=20)
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_synthetic_step_unpublished(bench, n):
+    sim, _ = build(n)
+    bench(sim.step, DT, publish=False, rounds=20)
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_synthetic_frame_encode(bench, n):
+    """합성 프레임 JSON 인코딩 (버전마다 첫 클라이언트가 내는 비용)"""
+    sim, buffer = build(n)
+    sim.step(DT)
+    frame, _ = buffer.outputBuffer.latest()
+    encoder = FrameEncoder()
+    versions = itertools.count()
+    text = bench(lambda: encoder.encode(frame, next(versions), 4), rounds=10)
+    bench.extra["bytes"] = len(text)
+
+
+def test_session_start_cold(bench):
+    """세션 시작 → 첫 프레임 (make_sim부터)"""
+    desc = {"backend": "synthetic", "synthetic": {"bodies": 10000}}
+    handle = SimBufferHandle(None, OwnedBuffer({}))
+
+    def start():
+        sim = make_sim(desc, handle)
+        sim.step(DT)
+        return sim
+
+    bench(start, rounds=5, warmup=1)
+
+
+def test_session_start_pooled(bench):
+    """세션 시작 → 첫 프레임 (WarmSimPool에서 꺼내 버퍼만 연결, 보충 대기는 측정 제외)"""
+    desc = {"backend": "synthetic", "synthetic": {"bodies": 10000}}
+    handle = SimBufferHandle(None, OwnedBuffer({}))
+    pool = WarmSimPool(size=1)
+    pool.prewarm(desc)
+    key = model_key(desc)
+
+    def waitReady():
+        deadline = time.perf_counter() + 30
+        while not pool.status()[key]["ready"]:
+            assert time.perf_counter() < deadline, "풀 보충 안 됨"
+            time.sleep(0.005)
+        return (), {}
+
+    def start():
+        sim = pool.take(desc)
+        sim.bindBuffer(handle)
+        sim.step(DT)
+        return sim
+
+    try:
+        bench(start, rounds=5, warmup=1, setup=waitReady)
+    finally:
+        pool.close()
+
+
+@pytest.mark.parametrize("publish_hz", [0.0, 5.0])
+def test_fast_forward(bench, publish_hz):
+    """라이브 루프 빨리 감기로 시뮬레이션 10초 (1000 바디, 구간 나누기/진행 보고 포함)"""
+    sim, _ = build(1000)
+    control = FastForwardControl(publishHz=publish_hz)
+
+    def fastForward():
+        control.request(by=10.0)
+        while (job := control.poll(sim.time)) is not None:
+            fastForwardSlice(sim, job, DT, control)
+        return control.state()
+
+    state = bench(fastForward, rounds=3, warmup=1)
+    assert state["state"] == "done"
+    bench.extra["speed"] = state["speed"]
@@ -0,0 +1,51 @@
+# 시작 지연 가드 (-X importtime)
+# 서버 main 모듈과 워커가 import하는 모듈이 무거운 패키지를 모듈 로드 시점에 끌고 오지 않는지,
+# 헤드리스 서버가 시각화 패키지를 import하지 않는지, spawn 워커 풀이 1초 안에 준비되는지 확인
+import ast
+from pathlib import Path
+
+import pytest
+
+from sim_server.importtime import (HEAVY_PACKAGES, VISUALIZATION_PACKAGES, ROOT, loaded,
+                                   measure, pool_ready_seconds)
+
+# 누적 import 시간 예산 (ms, 느린 CI 머신을 고려해 측정값의 몇 배로 잡음)
+BUDGET_MS = {
+    "sim_server.main": 150.0,
+    "sim_server.server": 120.0,
+    "sim_server.legacy_simloop": 120.0,
+    "sim_server.utils.mesh_pipeline": 50.0,
+}
+POOL_READY_BUDGET = 1.0
+
+
+@pytest.mark.parametrize("module", sorted(BUDGET_MS))
+def test_import_is_light(bench, module):
+    report = measure(module)
+    bench.record([report["cumulative_ms"] / 1e3])
+    assert loaded(report, HEAVY_PACKAGES) == [], "모듈 로드 시점에 무거운 패키지를 import함"
+    assert report["cumulative_ms"] < BUDGET_MS[module]
+
+
+def test_no_visualization_imports():
+    """sim_server 어디에서도 시각화 패키지를 import하지 않음 (pychrono 없이도 검사 가능하도록 AST로)"""
+    offenders = []
+    for path in (ROOT / "sim_server").rglob("*.py"):
+        tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module:
+                names = [node.module] + [f"{node.module}.{alias.name}" for alias in node.names]
+            else:
+                continue
+            for name in names:
+                if any(name == p or name.startswith(p + ".") for p in VISUALIZATION_PACKAGES):
+                    offenders.append(f"{Path(path).relative_to(ROOT)}:{node.lineno} {name}")
+    assert offenders == []
+
+
+def test_spawn_pool_ready(bench):
+    seconds = pool_ready_seconds(workers=2)
+    bench.record([seconds])
+    assert seconds < POOL_READY_BUDGET
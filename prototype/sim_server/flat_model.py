@@ -0,0 +1,233 @@
+"""
+평면(flat) 모델 기술 검증/정렬
+model_meta의 "bodies" / "joints" / "motors" 목록을 한 번에 검증하고,
+이름 → 항목 dict 인덱스와 의존 순서(부모 바디 먼저)를 만들어 둔다.
+pychrono를 쓰지 않으므로 실제 조립(simulate.create_flat_model) 전에 싸게 실패할 수 있음
+
+형식 예시:
+{
+    "bodies": [
+        {"name": "base", "mesh": "base_scaled.obj", "mass": 1000, "fixed": True},
+        {"name": "gear_A", "gear": {"module": 2, "teeth": 20}, "mass": 1000,
+         "pos": [0, 0, 0], "rot": [1, 0, 0, 0]},
+        {"name": "pin", "mesh": "pin.obj", "parent": "gear_A", "pos": [0.01, 0, 0]}
+    ],
+    "joints": [
+        {"name": "revA", "type": "revolute", "body": "gear_A", "base": "world",
+         "center": [0, 0, 0], "axis": [0, 0, 1]},
+        {"name": "mesh_AB", "type": "gear", "body": "gear_A", "base": "gear_B"}
+    ],
+    "motors": [
+        {"name": "gearA_motor", "joint": "revA", "speed": 2.0}
+    ]
+}
+
+- "parent"가 있는 바디의 pos/rot는 부모 바디 기준 (의존 순서대로 월드 포즈로 변환)
+- base가 "world" 또는 null이면 고정 ground 바디
+- 모터는 "joint"로 회전 조인트의 위치/축을 그대로 쓰거나, body/base/center/axis를 직접 지정
+- gear 조인트의 피치반지름은 여기서 미리 계산해 "pitch_radius_a"/"pitch_radius_b"에 채움
+  ("ratio" → 명시값 → 바디의 gear 파라미터/메시 파일명/"pitch_radius" 순)
+"""
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from sim_server.utils.gear_mesh import GearParams, gear_pitch_radius
+from sim_server.utils.sdf_parser import compose
+
+JOINT_TYPES = ("revolute", "prismatic", "fixed", "gear")
+MOTOR_TYPES = ("rotation_speed",)
+WORLD = "world"
+
+
+@dataclass
+class FlatPlan:
+    """검증/정렬이 끝난 조립 계획 (바디는 의존 순서, 포즈는 월드 기준)"""
+    bodies: List[dict]
+    joints: List[dict]
+    motors: List[dict]
+    body_index: Dict[str, dict]
+    joint_index: Dict[str, dict]
+    needs_ground: bool
+
+
+def is_world(ref: Optional[str]) -> bool:
+    return ref is None or ref == WORLD
+
+
+def _check_vec(errors, where, value, size):
+    if value is None:
+        return
+    if not isinstance(value, (list, tuple)) or len(value) != size:
+        errors.append(f"{where}: 길이 {size}의 숫자 목록이어야 함 ({value!r})")
+        return
+    if not all(isinstance(v, (int, float)) for v in value):
+        errors.append(f"{where}: 숫자가 아닌 값 포함 ({value!r})")
+
+
+def _index(errors, kind, items):
+    index = {}
+    for i, item in enumerate(items):
+        name = item.get("name")
+        if not name:
+            errors.append(f"{kind}[{i}]: name이 없음")
+        elif name in index:
+            errors.append(f"{kind}[{i}]: 이름 중복 '{name}'")
+        else:
+            index[name] = item
+    return index
+
+
+def _pitch_radius(errors, where, body, explicit):
+    """명시값 → 바디의 gear 파라미터/메시 파일명/"pitch_radius" 순 (body가 None이면 검증 생략)"""
+    if explicit is not None:
+        try:
+            return float(explicit)
+        except (TypeError, ValueError):
+            errors.append(f"{where}: 숫자가 아님 ({explicit!r})")
+            return None
+    if body is None:
+        return None
+    r = body.get("pitch_radius")
+    if "gear" in body or body.get("mesh"):
+        try:
+            r = gear_pitch_radius(body, fallback=r)
+        except (KeyError, TypeError, ValueError):
+            return None  # 바디 검증에서 이미 오류로 모음
+    if r is None:
+        errors.append(f"{where}: 기어 피치반지름을 알 수 없음 ('{body['name']}')")
+    return r
+
+
+def _resolve_gear(errors, name, j, body_index):
+    """gear 조인트 사본에 pitch_radius_a/b를 채움 (ratio가 있으면 ratio:1)"""
+    if "ratio" in j:
+        ra = _pitch_radius(errors, f"joint '{name}'.ratio", None, j["ratio"])
+        return {**j, "pitch_radius_a": ra, "pitch_radius_b": 1.0}
+    ra = _pitch_radius(errors, f"joint '{name}'.body", body_index.get(j.get("body")),
+                       j.get("pitch_radius_a"))
+    rb = _pitch_radius(errors, f"joint '{name}'.base", body_index.get(j.get("base")),
+                       j.get("pitch_radius_b"))
+    return {**j, "pitch_radius_a": ra, "pitch_radius_b": rb}
+
+
+def plan_flat_model(model_meta: dict) -> FlatPlan:
+    """
+    flat bodies/joints/motors 검증 + 의존 순서 정렬
+
+    모든 오류를 모아서 한 번에 ValueError로 알림 (조립 중간에 실패하지 않도록)
+    바디 수 N, 조인트 수 J, 모터 수 M에 대해 O(N + J + M)
+
+    Returns:
+        FlatPlan
+    """
+    bodies = model_meta.get("bodies", [])
+    joints = model_meta.get("joints", [])
+    motors = model_meta.get("motors", [])
+    errors = []
+
+    body_index = _index(errors, "bodies", bodies)
+    joint_index = _index(errors, "joints", joints)
+    _index(errors, "motors", motors)
+
+    # 바디 검증 + 부모 관계 그래프
+    children = {name: [] for name in body_index}
+    pending = {}
+    for name, b in body_index.items():
+        if "mesh" in b and "gear" in b:
+            errors.append(f"body '{name}': mesh와 gear는 하나만 지정")
+        if "gear" in b:
+            if not {"module", "teeth"} <= set(b["gear"]):
+                errors.append(f"body '{name}': gear에는 module, teeth가 필요")
+            else:
+                try:
+                    GearParams.fromDict(b["gear"])
+                except (TypeError, ValueError) as e:
+                    errors.append(f"body '{name}': {e}")
+        _check_vec(errors, f"body '{name}'.pos", b.get("pos"), 3)
+        _check_vec(errors, f"body '{name}'.rot", b.get("rot"), 4)
+        parent = b.get("parent")
+        if parent is not None:
+            if parent not in body_index:
+                errors.append(f"body '{name}': 알 수 없는 parent '{parent}'")
+                continue
+            children[parent].append(name)
+            pending[name] = 1
+
+    # Kahn 알고리즘으로 부모 → 자식 순서 정렬 (월드 포즈 계산 순서)
+    ordered = []
+    world_pose = {}
+    queue = deque(name for name in body_index if name not in pending)
+    while queue:
+        name = queue.popleft()
+        b = body_index[name]
+        local = (tuple(b.get("pos", (0.0, 0.0, 0.0))), tuple(b.get("rot", (1.0, 0.0, 0.0, 0.0))))
+        parent = b.get("parent")
+        pose = compose(world_pose[parent], local) if parent in world_pose else local
+        world_pose[name] = pose
+        ordered.append({**b, "pos": list(pose[0]), "rot": list(pose[1])})
+        for child in children[name]:
+            queue.append(child)
+    if len(ordered) < len(body_index):
+        cyclic = sorted(set(body_index) - set(world_pose))
+        errors.append(f"parent 관계에 순환이 있음: {cyclic}")
+
+    # 조인트 검증 (gear 조인트는 피치반지름을 채운 사본으로 교체)
+    needs_ground = False
+    for name, j in joint_index.items():
+        jtype = j.get("type", "revolute")
+        if jtype not in JOINT_TYPES:
+            errors.append(f"joint '{name}': 알 수 없는 type '{jtype}'")
+        if j.get("body") not in body_index:
+            errors.append(f"joint '{name}': 알 수 없는 body '{j.get('body')}'")
+        base = j.get("base")
+        if is_world(base):
+            needs_ground = True
+            if jtype == "gear":
+                errors.append(f"joint '{name}': gear의 base는 기어 바디여야 함")
+        elif base not in body_index:
+            errors.append(f"joint '{name}': 알 수 없는 base '{base}'")
+        if jtype == "gear":
+            joint_index[name] = _resolve_gear(errors, name, j, body_index)
+        if jtype in ("revolute", "prismatic", "fixed"):
+            if "center" not in j:
+                errors.append(f"joint '{name}': center가 필요")
+            _check_vec(errors, f"joint '{name}'.center", j.get("center"), 3)
+            _check_vec(errors, f"joint '{name}'.axis", j.get("axis"), 3)
+
+    # 모터 검증
+    for i, mm in enumerate(motors):
+        name = mm.get("name", f"motors[{i}]")
+        if mm.get("type", "rotation_speed") not in MOTOR_TYPES:
+            errors.append(f"motor '{name}': 알 수 없는 type '{mm.get('type')}'")
+        if "joint" in mm:
+            j = joint_index.get(mm["joint"])
+            if j is None:
+                errors.append(f"motor '{name}': 알 수 없는 joint '{mm['joint']}'")
+            elif j.get("type", "revolute") != "revolute":
+                errors.append(f"motor '{name}': 회전 모터는 revolute 조인트에만 붙일 수 있음")
+            elif is_world(j.get("base")):
+                needs_ground = True
+        else:
+            if mm.get("body") not in body_index:
+                errors.append(f"motor '{name}': 알 수 없는 body '{mm.get('body')}'")
+            if is_world(mm.get("base")):
+                needs_ground = True
+            elif mm.get("base") not in body_index:
+                errors.append(f"motor '{name}': 알 수 없는 base '{mm.get('base')}'")
+            if "center" not in mm:
+                errors.append(f"motor '{name}': joint 또는 center가 필요")
+            _check_vec(errors, f"motor '{name}'.center", mm.get("center"), 3)
+            _check_vec(errors, f"motor '{name}'.axis", mm.get("axis"), 3)
+
+    if errors:
+        raise ValueError("flat 모델 검증 실패:\n  " + "\n  ".join(errors))
+
+    return FlatPlan(
+        bodies=ordered,
+        joints=[joint_index[j["name"]] for j in joints],
+        motors=list(motors),
+        body_index={b["name"]: b for b in ordered},
+        joint_index=joint_index,
+        needs_ground=needs_ground,
+    )
@@ -0,0 +1,169 @@
+"""
+import 시간 측정 (python -X importtime 결과를 파싱한 보고서)
+
+프로세스 재시작, 테스트 실행, spawn된 워커(업로드 전처리 풀)는 모두 모듈 import부터 다시 한다
+무거운 패키지(FastAPI, PyChrono, NumPy ...)가 모듈 로드 시점에 끌려 들어오지 않는지,
+시작 지연이 예산 안에 있는지 확인하는 용도
+
+사용법 (prototype 디렉토리에서):
+    python -m sim_server.importtime sim_server.main
+    python -m sim_server.importtime sim_server.main sim_server.utils.mesh_pipeline --top 20 --json report.json
+    python -m sim_server.importtime sim_server.main --budget-ms 150 --forbid fastapi pychrono
+    python -m sim_server.importtime --pool 2     # spawn 워커 풀이 준비되기까지 걸리는 시간
+
+-X importtime 출력 형식 (stderr, 마이크로초):
+    import time: self [us] | cumulative | imported package
+    import time:       502 |      38551 | sim_server.main
+"""
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# sim_server 패키지 루트 (prototype 디렉토리)
+ROOT = Path(__file__).resolve().parent.parent
+
+# 서버 시작 경로에서 지연 로드해야 하는 패키지 (처음 쓰는 곳에서 import)
+HEAVY_PACKAGES = ("fastapi", "starlette", "uvicorn", "pydantic", "pychrono", "numpy", "websockets")
+# 헤드리스 서버에서 절대 로드하지 않는 시각화 패키지
+VISUALIZATION_PACKAGES = ("pychrono.irrlicht", "vtk", "matplotlib")
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def parse_importtime(text: str) -> list:
+    """-X importtime 출력 → [{"module", "self_us", "cumulative_us", "depth"}] (출력 순서)"""
+    entries = []
+    for line in text.splitlines():
+        match = _LINE.match(line)
+        if match:
+            selfUs, cumulative, indent, module = match.groups()
+            entries.append({"module": module, "self_us": int(selfUs),
+                            "cumulative_us": int(cumulative), "depth": (len(indent) - 1) // 2})
+    return entries
+
+
+def measure(module: str, python: str = sys.executable) -> dict:
+    """새 인터프리터에서 module 하나를 import한 결과 (site 등 인터프리터 기본 로드는 제외)"""
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(
+        p for p in (str(ROOT), os.environ.get("PYTHONPATH")) if p)}
+    start = time.perf_counter()
+    proc = subprocess.run([python, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=str(ROOT), env=env, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"{module} import 실패:\n{proc.stderr[-2000:]}")
+
+    entries = parse_importtime(proc.stderr)
+    # 마지막 depth 0 항목이 요청한 모듈, 그 앞의 연속된 항목이 그 모듈이 끌고 온 것
+    last = max((i for i, e in enumerate(entries) if e["depth"] == 0 and e["module"] == module),
+               default=None)
+    if last is None:
+        return {"module": module, "cumulative_ms": 0.0, "process_ms": wall * 1e3,
+                "modules": 0, "entries": []}
+    first = last
+    while first > 0 and entries[first - 1]["depth"] > 0:
+        first -= 1
+    own = entries[first:last + 1]
+    return {"module": module,
+            "cumulative_ms": entries[last]["cumulative_us"] / 1e3,
+            "process_ms": wall * 1e3,
+            "modules": len(own),
+            "entries": own}
+
+
+def loaded(report: dict, packages) -> list:
+    """report의 import 목록 중 packages(또는 그 하위 모듈)에 해당하는 최상위 이름"""
+    names = {e["module"] for e in report["entries"]}
+    return sorted(p for p in packages if any(n == p or n.startswith(p + ".") for n in names))
+
+
+def top(report: dict, n: int = 15, key: str = "cumulative_us") -> list:
+    return sorted(report["entries"], key=lambda e: e[key], reverse=True)[:n]
+
+
+def pool_ready_seconds(workers: int = 2, mainModule: str = "sim_server.main") -> float:
+    """
+    spawn 컨텍스트 프로세스 풀의 모든 워커가 첫 작업에 응답하기까지 걸린 시간
+    spawn 워커는 부모의 __main__을 다시 import하므로 서버 main 모듈을 import하는 비용을 포함
+    """
+    import importlib
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=importlib.import_module, initargs=(mainModule,)) as pool:
+        pids = set(pool.map(_pid, range(workers * 4)))
+        elapsed = time.perf_counter() - start
+    if not pids:
+        raise RuntimeError("워커 응답 없음")
+    return elapsed
+
+
+def _pid(_):
+    time.sleep(0.01)  # 한 워커가 모든 작업을 가져가지 않도록
+    return os.getpid()
+
+
+def _summary(report: dict, n: int, forbid=()) -> dict:
+    return {
+        "module": report["module"],
+        "cumulative_ms": round(report["cumulative_ms"], 2),
+        "process_ms": round(report["process_ms"], 2),
+        "modules": report["modules"],
+        "heavy": loaded(report, HEAVY_PACKAGES),
+        "visualization": loaded(report, VISUALIZATION_PACKAGES),
+        "forbidden": loaded(report, forbid),
+        "top": [{"module": e["module"], "cumulative_ms": e["cumulative_us"] / 1e3,
+                 "self_ms": e["self_us"] / 1e3} for e in top(report, n)],
+    }
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="모듈 import 시간 보고서 (-X importtime)")
+    parser.add_argument("modules", nargs="*", default=["sim_server.main"])
+    parser.add_argument("--top", type=int, default=15, help="누적 시간 상위 몇 개를 보여줄지")
+    parser.add_argument("--budget-ms", type=float, help="모듈별 누적 import 시간 상한 (넘으면 종료 코드 1)")
+    parser.add_argument("--forbid", nargs="*", default=None,
+                        help="로드되면 실패로 볼 패키지 (기본: 시각화 패키지)")
+    parser.add_argument("--pool", type=int, default=0, help="spawn 워커 풀 준비 시간도 측정 (워커 수)")
+    parser.add_argument("--json", help="보고서 JSON 경로")
+    args = parser.parse_args(argv)
+
+    forbid = VISUALIZATION_PACKAGES if args.forbid is None else tuple(args.forbid)
+    failures = []
+    summaries = []
+    for module in args.modules:
+        summary = _summary(measure(module), args.top, forbid)
+        summaries.append(summary)
+        print(f"{module}: {summary['cumulative_ms']:.1f}ms import, {summary['modules']} modules, "
+              f"프로세스 {summary['process_ms']:.0f}ms")
+        for e in summary["top"]:
+            print(f"  {e['cumulative_ms']:9.2f}ms  {e['self_ms']:8.2f}ms  {e['module']}")
+        if summary["heavy"]:
+            print(f"  무거운 패키지 로드됨: {', '.join(summary['heavy'])}")
+        if summary["forbidden"]:
+            failures.append(f"{module}: 금지된 패키지 로드 {summary['forbidden']}")
+        if args.budget_ms is not None and summary["cumulative_ms"] > args.budget_ms:
+            failures.append(f"{module}: {summary['cumulative_ms']:.1f}ms > 예산 {args.budget_ms}ms")
+
+    report = {"imports": summaries}
+    if args.pool:
+        seconds = pool_ready_seconds(args.pool)
+        report["pool_ready_ms"] = seconds * 1e3
+        print(f"spawn 워커 {args.pool}개 준비: {seconds * 1e3:.0f}ms")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    for failure in failures:
+        print(f"실패: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
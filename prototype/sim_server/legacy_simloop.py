@@ -1,66 +1,337 @@
 import time
 import threading
-from typing import Dict, Any
+from pathlib import Path
+from typing import Dict, Any, Optional
 
-from prototype.sim_server.utils.owned_buffer import OwnedBuffer
+from sim_server.utils.owned_buffer import OwnedBuffer
+from sim_server.utils.input_mailbox import InputMailbox
+from sim_server.utils.interest import InterestRegistry, BodyCatalog
+from sim_server.utils.telemetry import TelemetryRegistry
+from sim_server.utils.checkpoint import CheckpointStore, model_key
+from sim_server.utils.metrics import METRICS
+from sim_server.utils.tracer import TRACER
+from sim_server.utils.latency import LatencyTracker
+from sim_server.utils.sim_pool import WarmSimPool
+from sim_server.utils.fast_forward import FastForwardControl, FastForwardJob
+from sim_server.utils.subscriber_gate import (
+    SubscriberGate, IDLE_PAUSE, IDLE_NO_FRAMES, IDLE_KEEPALIVE
+)
+
+
+_framesTotal = METRICS.counter("sim_frames_total", "출력 버퍼에 commit한 프레임 수")
+_tickSeconds = METRICS.histogram("sim_tick_seconds", "시뮬레이션 틱 하나(입력~commit)의 소요 시간 (초)")
+_overrunsTotal = METRICS.counter("sim_tick_overruns_total", "스텝 주기(dt)를 넘긴 틱 수")
+_checkpointSeconds = METRICS.histogram("sim_checkpoint_seconds",
+                                       "시뮬레이션 스레드에서 체크포인트 하나를 캡처하는 데 걸린 시간 (초)")
+_tickErrorsTotal = METRICS.counter("sim_tick_errors_total", "예외로 끝난 틱 수")
+# 빨리 감기 중 한 번에 연속으로 스텝하는 최대 실제 시간 (종료/취소/입력 확인 주기)
+FAST_FORWARD_SLICE = 0.05
+# 연속으로 이만큼 틱이 실패하면 루프를 끝냄 (스레드가 죽고 main이 마지막 체크포인트에서 재시작)
+MAX_TICK_ERRORS = 3
+
+_firstFrameSeconds = METRICS.histogram("sim_time_to_first_frame_seconds",
+                                       "시뮬레이션 루프 시작부터 첫 스텝 완료까지 걸린 시간 (초)")
+
+
+class SimBufferHandle:
+    """
+    step_sim()이 사용하는 버퍼 핸들 (read_inputs / write_outputs)
+    입력은 InputMailbox에서 꺼내고, 출력 프레임은 OwnedBuffer에 commit
+    """
+
+    def __init__(self, inputMailbox: Optional[InputMailbox], outputBuffer: OwnedBuffer,
+                 latencyTracker: Optional[LatencyTracker] = None):
+        self.inputMailbox = inputMailbox
+        self.outputBuffer = outputBuffer
+        self.latencyTracker = latencyTracker
+
+    def read_inputs(self):
+        if self.inputMailbox is None:
+            return None
+        inputs = self.inputMailbox.read_inputs()
+        if self.latencyTracker is not None:
+            # 설정값을 꺼낸 뒤에 cid를 꺼냄 (postMessage가 cid를 먼저 넣으므로 이번 틱에 반영된 명령의 cid가 빠지지 않음)
+            cids = self.inputMailbox.drainCorrelations()
+            if cids:
+                self.latencyTracker.applied(cids)
+        return inputs
+
+    def write_outputs(self, frame):
+        # 서버 벽시계 기준 프레임 생성 시각 (클라이언트 재생 스케줄링용)
+        frame["wall"] = time.time()
+        self.outputBuffer.commit(frame)
+        _framesTotal.inc()
+        if self.latencyTracker is not None:
+            self.latencyTracker.framed(self.outputBuffer.version)
 
 
 def runSimloop(modelDescription: Dict[str, Any],
                outputBuffer: OwnedBuffer,
-               stopEvent: threading.Event):
+               stopEvent: threading.Event,
+               inputMailbox: Optional[InputMailbox] = None,
+               dt: float = 1 / 60,
+               subscriberGate: Optional[SubscriberGate] = None,
+               interestRegistry: Optional[InterestRegistry] = None,
+               telemetryRegistry: Optional[TelemetryRegistry] = None,
+               recordDir: Optional[str] = None,
+               checkpointStore: Optional[CheckpointStore] = None,
+               checkpointInterval: float = 5.0,
+               latencyTracker: Optional[LatencyTracker] = None,
+               simPool: Optional[WarmSimPool] = None,
+               fastForward: Optional[FastForwardControl] = None):
     """
     시뮬레이션 루프 실행 함수
     모델 상태를 업데이트하며, 버퍼를 통해 서버에 상태를 전달
 
     Args:
-        modelDescription: 모델 설명 정보
+        modelDescription: 모델 설명 정보 (비어 있으면 테스트 데이터 생성, "backend"로 시뮬레이터 선택)
         outputBuffer: 시뮬레이션 출력 버퍼
         stopEvent: 종료 신호를 위한 이벤트
+        inputMailbox: 웹소켓 입력(모터 명령) 우편함
+        dt: 시뮬레이션 스텝 (초)
+        subscriberGate: 구독자 수 신호 (없으면 항상 전속력)
+                        구독자가 0명이면 idlePolicy에 따라 일시정지/프레임 생략/저속 유지
+        interestRegistry: 클라이언트 바디 구독 (합집합에 든 바디만 프레임으로 만듦)
+        telemetryRegistry: 텔레메트리 채널 구독 (구독된 채널만 계산)
+        recordDir: 프레임 기록 디렉토리 (있으면 그 아래 run_<시각>/에 매 스텝 기록)
+        checkpointStore: 상태 체크포인트 저장소 (재시작된 루프는 같은 모델의 마지막 체크포인트에서 이어감)
+        checkpointInterval: 체크포인트 주기 (실제 시간 초, 그동안 스텝이 없었으면 건너뜀)
+        latencyTracker: 입력 지연 추적 (cid가 붙은 입력의 반영/프레임 시각 기록)
+        simPool: 미리 만들어 둔 시뮬레이터 풀 (있으면 make_sim 대신 꺼내 쓰고 버퍼/체크포인트만 연결)
+        fastForward: 빨리 감기 요청 (있으면 목표 시간까지 페이싱 없이 스텝한 뒤 원래 주기로 복귀)
     """
     print("시뮬레이션 루프 시작")
+    loopStart = time.perf_counter()
+
+    simulator = None
+    if modelDescription:
+        # 백엔드 모듈(pychrono 등)은 실제 모델이 있을 때만 로드 (simInterface.py)
+        from sim_server.simInterface import make_sim
+        model = model_key(modelDescription)
+        checkpoint = checkpointStore.latestFor(model) if checkpointStore is not None else None
+        bufferHandle = SimBufferHandle(inputMailbox, outputBuffer, latencyTracker)
+
+        def build(checkpoint):
+            pooled = simPool.take(modelDescription) if simPool is not None else None
+            if pooled is None:
+                return make_sim(modelDescription, bufferHandle, checkpoint=checkpoint)
+            pooled.bindBuffer(bufferHandle)
+            if checkpoint is not None and pooled.supportsCheckpoint:
+                try:
+                    pooled.restoreCheckpoint(checkpoint)
+                except Exception:
+                    pooled.clear()
+                    raise
+            return pooled
 
-    while not stopEvent.is_set():
         try:
-            # TODO: 입력버퍼 읽어오기
-            # input_data = input_buffer.readBuff()
+            simulator = build(checkpoint)
+        except Exception as e:
+            if checkpoint is None:
+                raise
+            # 체크포인트 때문에 계속 죽지 않도록 버리고 처음부터 시작
+            print(f"체크포인트 복원 실패, 처음부터 시작: {e}")
+            checkpointStore.clear()
+            simulator = build(None)
+        if not simulator.supportsCheckpoint:
+            # 체크포인트를 지원하지 않는 백엔드는 저장하지 않음
+            checkpointStore = None
+        recorder = None
+        if recordDir:
+            from sim_server.utils.frame_recorder import FrameRecorder
+            runDir = Path(recordDir) / time.strftime("run_%Y%m%d_%H%M%S")
+            recorder = FrameRecorder(runDir, simulator.bodyNames)
+            print(f"프레임 기록: {runDir}")
+        simulator.attach(interestRegistry=interestRegistry, telemetryRegistry=telemetryRegistry,
+                         recorder=recorder)
+        if interestRegistry is not None:
+            interestRegistry.setCatalog(BodyCatalog(simulator.catalog))
+        if telemetryRegistry is not None:
+            telemetryRegistry.setAvailable(simulator.channels)
+    if fastForward is not None:
+        fastForward.available = simulator is not None
 
-            # TODO: 입력과 이전상태 -> 다음상태 계산
-            # 여기서 PyChrono 시뮬레이션 스텝 실행
-            # new_state = simulate_step(input_data)
+    checkpointStep = simulator.stepCount if simulator is not None else 0
+    nextCheckpoint = time.perf_counter() + checkpointInterval
 
-            # 임시: 테스트 데이터 생성
-            testState = {
-                "model_1": {
-                    "position": {"x": time.time() % 10, "y": 0.0, "z": 0.0},
-                    "rotation": {"x": 0.0, "y": 0.0, "z": 0.0, "w": 1.0}
-                }
-            }
+    def saveCheckpoint():
+        # 주기가 지났고 마지막 체크포인트 이후 스텝이 있었을 때만 캡처 (일시정지 중에는 같은 상태)
+        nonlocal checkpointStep, nextCheckpoint
+        start = time.perf_counter()
+        if start < nextCheckpoint or simulator.stepCount == checkpointStep:
+            return
+        checkpoint = simulator.captureCheckpoint(model)
+        if checkpoint is not None:
+            checkpointStore.submit(checkpoint)
+        checkpointStep = simulator.stepCount
+        end = time.perf_counter()
+        nextCheckpoint = end + checkpointInterval
+        _checkpointSeconds.observe(end - start)
 
-            # 결과를 출력버퍼에 쓰기
-            outputBuffer.commit(testState)
+    nextTick = time.perf_counter()
+    firstFrame = True
+    tickErrors = 0
+    try:
+        while not stopEvent.is_set():
+            try:
+                if fastForward is not None and simulator is not None:
+                    job = fastForward.poll(simulator.time)
+                    if job is not None:
+                        # 빨리 감기: 구독자 유무와 상관없이 페이싱 없이 스텝
+                        fastForwardSlice(simulator, job, dt, fastForward)
+                        if checkpointStore is not None:
+                            saveCheckpoint()
+                        tickErrors = 0
+                        nextTick = time.perf_counter()
+                        continue
 
-            # 시뮬레이션 주기 (예: 60 FPS = 16.67ms)
-            time.sleep(0.0167)
+                period = dt
+                publish = True
+                if subscriberGate is not None and subscriberGate.idle:
+                    policy = subscriberGate.idlePolicy
+                    if policy == IDLE_PAUSE:
+                        # 구독자가 생길 때까지 대기 (종료 신호 확인을 위해 짧게 끊어서)
+                        if not subscriberGate.wait(0.25):
+                            continue
+                        nextTick = time.perf_counter()
+                    elif policy == IDLE_NO_FRAMES:
+                        publish = False
+                    elif policy == IDLE_KEEPALIVE:
+                        period = 1.0 / subscriberGate.keepaliveHz
 
-        except Exception as e:
-            print(f"시뮬레이션 루프 오류: {e}")
-            import traceback
-            traceback.print_exc()
+                tickStart = time.perf_counter()
+                if simulator is not None:
+                    # 입력 반영 → 스텝 → 프레임 commit 까지 백엔드 step()에서 처리
+                    simulator.step(dt, publish=publish)
+                    if firstFrame:
+                        firstFrame = False
+                        _firstFrameSeconds.observe(time.perf_counter() - loopStart)
+                    if checkpointStore is not None:
+                        saveCheckpoint()
+                elif publish:
+                    # 임시: 테스트 데이터 생성
+                    testState = {
+                        "model_1": {
+                            "position": {"x": time.time() % 10, "y": 0.0, "z": 0.0},
+                            "rotation": {"x": 0.0, "y": 0.0, "z": 0.0, "w": 1.0}
+                        },
+                        "wall": time.time()
+                    }
+
+                    # 결과를 출력버퍼에 쓰기
+                    outputBuffer.commit(testState)
+                    _framesTotal.inc()
+
+                # 시뮬레이션 주기 (예: 60 FPS = 16.67ms), 스텝에 걸린 시간만큼 덜 기다림
+                now = time.perf_counter()
+                _tickSeconds.observe(now - tickStart)
+                if TRACER.enabled:
+                    TRACER.complete("tick", tickStart, now, cat="sim", args={"publish": publish})
+                    if now - tickStart > period:
+                        TRACER.onOverrun(tickStart, now, period)
+                tickErrors = 0
+                nextTick += period
+                delay = nextTick - now
+                if delay > 0:
+                    if period > dt:
+                        # 저속 유지 중에는 구독자가 생기면 바로 깨어나 전속력으로 복귀
+                        if subscriberGate.wait(delay):
+                            nextTick = time.perf_counter()
+                    else:
+                        stopEvent.wait(delay)
+                else:
+                    # 밀린 틱은 몰아서 따라잡지 않고 기준 시각을 다시 잡음
+                    _overrunsTotal.inc()
+                    nextTick = time.perf_counter()
+
+            except Exception as e:
+                _tickErrorsTotal.inc()
+                tickErrors += 1
+                if tickErrors >= MAX_TICK_ERRORS:
+                    # 계속 실패하면 상태가 깨진 것으로 보고 루프를 끝냄 (main이 체크포인트에서 다시 만듦)
+                    print(f"시뮬레이션 루프 오류 {tickErrors}회 연속, 루프 종료: {e}")
+                    raise
+                print(f"시뮬레이션 루프 오류 ({tickErrors}/{MAX_TICK_ERRORS}): {e}")
+                import traceback
+                traceback.print_exc()
+                # 같은 오류로 바쁘게 돌지 않도록 한 주기 쉬고 기준 시각을 다시 잡음
+                stopEvent.wait(dt)
+                nextTick = time.perf_counter()
+    finally:
+        if fastForward is not None:
+            fastForward.available = False
+        if simulator is not None:
+            if checkpointStore is not None and stopEvent.is_set():
+                # 계획된 정지(배포 등)는 마지막 스텝까지 이어가도록 한 번 더 저장
+                # (크래시로 끝난 경우는 상태가 깨졌을 수 있으므로 마지막 주기 체크포인트 유지)
+                try:
+                    checkpoint = simulator.captureCheckpoint(model)
+                    if checkpoint is not None:
+                        checkpointStore.submit(checkpoint)
+                except Exception as e:
+                    print(f"체크포인트 저장 실패: {e}")
+            simulator.clear()
 
     print("시뮬레이션 루프 종료")
 
 
+def fastForwardSlice(simulator, job: FastForwardJob, dt: float, control: FastForwardControl):
+    """
+    빨리 감기 한 구간: 목표 시간에 닿거나 FAST_FORWARD_SLICE만큼 지날 때까지 대기 없이 스텝
+    프레임은 job.publishHz 주기로만 commit하고, 목표에 닿는 마지막 스텝은 항상 commit
+    """
+    perf = time.perf_counter
+    start = perf()
+    end = start + FAST_FORWARD_SLICE
+    period = 1.0 / job.publishHz if job.publishHz > 0 else None
+    steps = 0
+    done = simulator.time + 0.5 * dt >= job.target
+    while not done and perf() < end:
+        done = simulator.time + 1.5 * dt >= job.target
+        publish = done or (period is not None and perf() >= job.nextPublish)
+        simulator.step(dt, publish=publish)
+        if publish and period is not None:
+            job.nextPublish = perf() + period
+        steps += 1
+    control.advance(job, simulator.time, steps)
+    if TRACER.enabled:
+        TRACER.complete("fast_forward", start, perf(), cat="sim",
+                        args={"steps": steps, "target": job.target})
+    if done:
+        control.finish(job)
+
+
 class SimLoopThread(threading.Thread):
     """
     시뮬레이션 루프를 별도 스레드에서 실행하는 스레드
     runSimloop() 함수를 스레드에서 실행하는 래퍼
     """
 
-    def __init__(self, modelDescription: Dict[str, Any], outputBuffer: OwnedBuffer):
-        super().__init__(daemon=True)
+    def __init__(self, modelDescription: Dict[str, Any], outputBuffer: OwnedBuffer,
+                 inputMailbox: Optional[InputMailbox] = None,
+                 subscriberGate: Optional[SubscriberGate] = None,
+                 interestRegistry: Optional[InterestRegistry] = None,
+                 telemetryRegistry: Optional[TelemetryRegistry] = None,
+                 recordDir: Optional[str] = None,
+                 checkpointStore: Optional[CheckpointStore] = None,
+                 checkpointInterval: float = 5.0,
+                 latencyTracker: Optional[LatencyTracker] = None,
+                 simPool: Optional[WarmSimPool] = None,
+                 fastForward: Optional[FastForwardControl] = None):
+        super().__init__(daemon=True, name="sim-loop")
 
         self.modelDescription = modelDescription
         self.outputBuffer = outputBuffer
+        self.inputMailbox = inputMailbox
+        self.subscriberGate = subscriberGate
+        self.interestRegistry = interestRegistry
+        self.telemetryRegistry = telemetryRegistry
+        self.recordDir = recordDir
+        self.checkpointStore = checkpointStore
+        self.checkpointInterval = checkpointInterval
+        self.latencyTracker = latencyTracker
+        self.simPool = simPool
+        self.fastForward = fastForward
 
         # 종료 이벤트
         self._stopEvent = threading.Event()
@@ -71,7 +342,17 @@ class SimLoopThread(threading.Thread):
             runSimloop(
                 modelDescription=self.modelDescription,
                 outputBuffer=self.outputBuffer,
-                stopEvent=self._stopEvent
+                stopEvent=self._stopEvent,
+                inputMailbox=self.inputMailbox,
+                subscriberGate=self.subscriberGate,
+                interestRegistry=self.interestRegistry,
+                telemetryRegistry=self.telemetryRegistry,
+                recordDir=self.recordDir,
+                checkpointStore=self.checkpointStore,
+                checkpointInterval=self.checkpointInterval,
+                latencyTracker=self.latencyTracker,
+                simPool=self.simPool,
+                fastForward=self.fastForward
             )
         except Exception as e:
             print(f"시뮬레이션 스레드 오류: {e}")
@@ -81,3 +362,5 @@ class SimLoopThread(threading.Thread):
     def stop(self):
         """스레드 정지"""
         self._stopEvent.set()
+        if self.subscriberGate is not None:
+            self.subscriberGate.wake()
@@ -0,0 +1,333 @@
+"""
+헤드리스 다중 클라이언트 웹소켓 부하 생성기
+
+/cadverse/interaction에 수백 개 연결을 열어 관찰자(viewer)와 입력 송신자(sender)를 섞어 돌리고,
+프레임을 실제로 디코딩하면서 처리량/누락·지연 프레임/지연 분포를 JSON으로 보고한다
+배포 전에 서버 한 대가 몇 명까지 버티는지 같은 리눅스 머신에서 재기 위한 도구
+
+사용법 (prototype 디렉토리에서, 서버 실행 중):
+    python -m sim_server.loadgen --viewers 200 --senders 20 --duration 30
+    python -m sim_server.loadgen --viewers 500 --processes 4 --out load_500.json
+
+클라이언트 동작:
+    viewer  프레임 수신/디코딩, ping에 pong 응답 (서버 적응형 전송 주기가 실제 클라이언트처럼 동작)
+    sender  viewer + --input-hz 주기로 cid를 붙인 모터 명령 전송
+            자기 cid가 표시된 프레임을 받으면 input_ack 응답 (서버 쪽 input_latency_seconds에도 기록)
+
+측정 항목 (--warmup 이후만):
+    frames / bytes          받은 프레임 수/크기 (전체 처리량 = 합 / 측정 시간)
+    frame_age               수신 시각 - 프레임 생성 시각(frame.wall), 같은 머신이라 시계 보정 없음
+    delivery                수신 시각 - 서버 전송 시각(sent)
+    interval                같은 클라이언트의 프레임 도착 간격
+    late_frames             frame_age가 --late-ms를 넘은 프레임
+    seq_gaps                클라이언트가 받지 못한 시뮬레이션 프레임 수 (seq 건너뜀, 적응형 주기로 인한 것 포함)
+    input_to_frame          sender가 명령을 보낸 뒤 그 cid가 표시된 프레임을 받기까지
+    rate_hz                 서버가 통보한 클라이언트별 마지막 전송 주기 ({"type": "rate"})
+    client_errors           연결 끊김(ConnectionClosed) 외의 예외로 끝난 클라이언트 수 (예외 종류별)
+                            한 클라이언트가 실패해도 나머지는 계속 측정하고 보고서에 실패 수만 남김
+
+한 프로세스의 이벤트 루프가 JSON 디코딩에 포화되면 측정이 부하 생성기 병목이 되므로
+--processes로 클라이언트를 여러 프로세스에 나누고 결과(히스토그램)를 합친다
+"""
+import asyncio
+import itertools
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# sim_server 디렉토리 안에서도 실행할 수 있도록 상위 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sim_server.utils.metrics import Histogram
+
+DEFAULT_URL = "ws://localhost:8000/cadverse/interaction"
+HISTOGRAMS = ("frame_age", "delivery", "interval", "input_to_frame")
+
+
+class LoadStats:
+    """한 프로세스의 클라이언트 결과 합계 (pickle로 부모 프로세스에 전달 후 merge)"""
+
+    def __init__(self):
+        self.connected = 0
+        self.failed = 0
+        self.disconnects = 0
+        self.frames = 0
+        self.bytes = 0
+        self.late_frames = 0
+        self.seq_gaps = 0
+        self.decode_errors = 0
+        self.inputs_sent = 0
+        self.inputs_seen = 0
+        self.server_errors = Counter()
+        self.client_errors = Counter()  # 예외 종류 -> 그 예외로 끝난 클라이언트 수
+        self.histograms = {name: Histogram() for name in HISTOGRAMS}
+        self.client_fps = []   # 클라이언트별 측정 구간 평균 수신 fps
+        self.rate_hz = []      # 클라이언트별 서버가 마지막으로 통보한 전송 주기
+
+    def merge(self, other: 'LoadStats'):
+        for name in ("connected", "failed", "disconnects", "frames", "bytes", "late_frames",
+                     "seq_gaps", "decode_errors", "inputs_sent", "inputs_seen"):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.server_errors.update(other.server_errors)
+        self.client_errors.update(other.client_errors)
+        for name, hist in other.histograms.items():
+            self.histograms[name].merge(hist)
+        self.client_fps += other.client_fps
+        self.rate_hz += other.rate_hz
+
+
+def _spread(values) -> dict:
+    if not values:
+        return {}
+    values = sorted(values)
+    return {"min": values[0], "p50": values[len(values) // 2], "mean": sum(values) / len(values),
+            "max": values[-1]}
+
+
+def _ms(hist: Histogram) -> dict:
+    if not hist.count:
+        return {"count": 0}
+    return {"count": hist.count, "mean": hist.sum / hist.count * 1e3,
+            "p50": hist.quantile(0.5) * 1e3, "p90": hist.quantile(0.9) * 1e3,
+            "p99": hist.quantile(0.99) * 1e3, "max": hist.max * 1e3}
+
+
+async def run_client(url, role, index, opts, stats: LoadStats, measure_from, stop_at):
+    """연결 하나 (measure_from/stop_at은 time.time() 기준)"""
+    import websockets
+
+    try:
+        ws = await websockets.connect(url, max_size=None, ping_interval=None,
+                                      open_timeout=opts["connect_timeout"])
+    except Exception:
+        stats.failed += 1
+        return
+    stats.connected += 1
+
+    hist = stats.histograms
+    late = opts["late_ms"] / 1000.0
+    pending = {}  # cid -> 보낸 시각 (perf_counter)
+    measured_frames = 0
+    last_seq = None
+    last_arrival = None
+    last_hz = None
+    sender = None
+
+    async def send_inputs():
+        period = 1.0 / opts["input_hz"]
+        speeds = itertools.cycle(opts["speeds"])
+        # 모든 sender가 같은 순간에 보내지 않도록 시작 위상을 어긋나게 함
+        await asyncio.sleep(period * (index % 16) / 16)
+        for n in itertools.count():
+            cid = f"{os.getpid()}-{index}-{n}"
+            pending[cid] = time.perf_counter()
+            if len(pending) > 256:
+                pending.pop(next(iter(pending)))
+            await ws.send(json.dumps({"type": "motors", "cid": cid,
+                                      "motors": [{"name": opts["motor"], "speed": next(speeds)}]}))
+            if time.time() >= measure_from:
+                stats.inputs_sent += 1
+            await asyncio.sleep(period)
+
+    try:
+        if role == "sender":
+            sender = asyncio.create_task(send_inputs())
+        while True:
+            remaining = stop_at - time.time()
+            if remaining <= 0:
+                break
+            try:
+                text = await asyncio.wait_for(ws.recv(), remaining)
+            except asyncio.TimeoutError:
+                break
+            now = time.time()
+            measuring = now >= measure_from
+            try:
+                message = json.loads(text)
+            except ValueError:
+                if measuring:
+                    stats.decode_errors += 1
+                continue
+            if not isinstance(message, dict):
+                continue
+            kind = message.get("type")
+
+            if kind == "frame":
+                seq = message.get("seq", 0)
+                cids = message.get("cids")
+                if cids:
+                    arrived = time.perf_counter()
+                    seen = []
+                    for cid in cids:
+                        sentAt = pending.pop(cid, None)
+                        if sentAt is not None:
+                            seen.append(cid)
+                            if measuring:
+                                hist["input_to_frame"].observe(arrived - sentAt)
+                                stats.inputs_seen += 1
+                    if seen:
+                        await ws.send(json.dumps({"type": "input_ack", "cids": seen, "render_in": 0.0}))
+                if measuring:
+                    measured_frames += 1
+                    stats.frames += 1
+                    stats.bytes += len(text)
+                    frame = message.get("frame") or {}
+                    wall = frame.get("wall")
+                    if wall is not None:
+                        age = now - wall
+                        hist["frame_age"].observe(age)
+                        if age > late:
+                            stats.late_frames += 1
+                    if message.get("sent") is not None:
+                        hist["delivery"].observe(now - message["sent"])
+                    if last_arrival is not None:
+                        hist["interval"].observe(now - last_arrival)
+                    if last_seq is not None and seq > last_seq + 1:
+                        stats.seq_gaps += seq - last_seq - 1
+                last_seq = seq
+                last_arrival = now
+            elif kind == "ping":
+                await ws.send(json.dumps({"type": "pong", "id": message.get("id")}))
+            elif kind == "rate":
+                last_hz = message.get("hz")
+            elif kind == "error":
+                stats.server_errors[message.get("reason", "unknown")] += 1
+    except websockets.ConnectionClosed:
+        stats.disconnects += 1
+    except Exception as e:
+        # 이 클라이언트만 끝내고 다른 클라이언트와 보고서는 유지
+        stats.client_errors[type(e).__name__] += 1
+    finally:
+        if sender is not None:
+            sender.cancel()
+        try:
+            await ws.close()
+        except Exception:
+            pass
+
+    window = stop_at - measure_from
+    if window > 0:
+        stats.client_fps.append(measured_frames / window)
+    if last_hz is not None:
+        stats.rate_hz.append(last_hz)
+
+
+async def run_group(url, roles, first_index, opts, start_at) -> LoadStats:
+    """
+    이 프로세스에 배정된 클라이언트 실행
+    start_at부터 ramp초 동안 고르게 연결을 열고, 모두 열린 뒤 warmup초 후부터 측정
+    """
+    stats = LoadStats()
+    ramp = opts["ramp"]
+    total = opts["total_clients"]
+    measure_from = start_at + ramp + opts["warmup"]
+    stop_at = measure_from + opts["duration"]
+
+    async def delayed(role, index):
+        await asyncio.sleep(max(start_at + ramp * index / max(total, 1) - time.time(), 0.0))
+        await run_client(url, role, index, opts, stats, measure_from, stop_at)
+
+    results = await asyncio.gather(*(delayed(role, first_index + i) for i, role in enumerate(roles)),
+                                   return_exceptions=True)
+    for result in results:
+        # run_client 밖에서 난 예외도 (연결 전 등) 그 클라이언트의 실패로만 셈
+        if isinstance(result, BaseException):
+            stats.client_errors[type(result).__name__] += 1
+    return stats
+
+
+def _worker(url, roles, first_index, opts, start_at) -> LoadStats:
+    return asyncio.run(run_group(url, roles, first_index, opts, start_at))
+
+
+def run_load(url=DEFAULT_URL, viewers=100, senders=10, duration=30.0, ramp=5.0, warmup=2.0,
+             input_hz=10.0, motor="shaft_motor", speeds=(2.0, 4.0), late_ms=100.0,
+             processes=1, connect_timeout=10.0) -> dict:
+    """부하 실행 후 보고서 dict 반환"""
+    # 역할을 섞어서 배정 (프로세스/연결 순서마다 sender가 고르게 퍼지도록)
+    total = viewers + senders
+    roles = ["viewer"] * total
+    if senders:
+        step = total / senders
+        for i in range(senders):
+            roles[int(i * step)] = "sender"
+
+    opts = {"duration": duration, "ramp": ramp, "warmup": warmup, "input_hz": input_hz,
+            "motor": motor, "speeds": list(speeds), "late_ms": late_ms,
+            "connect_timeout": connect_timeout, "total_clients": total}
+    processes = max(1, min(processes, total or 1))
+    # 모든 프로세스가 같은 시각 기준으로 연결/측정을 시작 (프로세스 기동 시간 여유)
+    start_at = time.time() + (0.5 if processes == 1 else 2.0)
+
+    if processes == 1:
+        stats = asyncio.run(run_group(url, roles, 0, opts, start_at))
+    else:
+        chunk = -(-total // processes)
+        stats = LoadStats()
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            futures = [pool.submit(_worker, url, roles[i:i + chunk], i, opts, start_at)
+                       for i in range(0, total, chunk)]
+            for future in futures:
+                stats.merge(future.result())
+
+    hist = stats.histograms
+    return {
+        "config": {"url": url, "viewers": viewers, "senders": senders, "duration": duration,
+                   "ramp": ramp, "warmup": warmup, "input_hz": input_hz, "motor": motor,
+                   "late_ms": late_ms, "processes": processes},
+        "connections": {"requested": total, "connected": stats.connected, "failed": stats.failed,
+                        "disconnected": stats.disconnects,
+                        "errors": sum(stats.client_errors.values())},
+        "throughput": {"frames": stats.frames, "bytes": stats.bytes,
+                       "frames_per_s": stats.frames / duration if duration else 0.0,
+                       "mbit_per_s": stats.bytes * 8 / 1e6 / duration if duration else 0.0},
+        "frames": {"late": stats.late_frames,
+                   "late_ratio": stats.late_frames / stats.frames if stats.frames else 0.0,
+                   "seq_gaps": stats.seq_gaps,
+                   "decode_errors": stats.decode_errors},
+        "latency_ms": {name: _ms(hist[name]) for name in HISTOGRAMS},
+        "inputs": {"sent": stats.inputs_sent, "seen": stats.inputs_seen},
+        "client_fps": _spread(stats.client_fps),
+        "rate_hz": _spread(stats.rate_hz),
+        "server_errors": dict(stats.server_errors),
+        "client_errors": dict(stats.client_errors),
+    }
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="웹소켓 다중 클라이언트 부하 생성기")
+    parser.add_argument("--url", default=DEFAULT_URL)
+    parser.add_argument("--viewers", type=int, default=100, help="프레임만 받는 클라이언트 수")
+    parser.add_argument("--senders", type=int, default=10, help="모터 명령도 보내는 클라이언트 수")
+    parser.add_argument("--duration", type=float, default=30.0, help="측정 시간 (초)")
+    parser.add_argument("--ramp", type=float, default=5.0, help="연결을 모두 여는 데 걸리는 시간 (초)")
+    parser.add_argument("--warmup", type=float, default=2.0, help="모두 연결된 뒤 측정 전 대기 (초)")
+    parser.add_argument("--input-hz", type=float, default=10.0, help="sender별 명령 주기")
+    parser.add_argument("--motor", default="shaft_motor", help="sender가 조작할 모터 이름")
+    parser.add_argument("--late-ms", type=float, default=100.0, help="지연 프레임 기준 (frame_age, ms)")
+    parser.add_argument("--processes", type=int, default=1, help="클라이언트를 나눠 돌릴 프로세스 수")
+    parser.add_argument("--out", help="보고서 JSON 경로 (없으면 stdout)")
+    args = parser.parse_args(argv)
+
+    total = args.viewers + args.senders
+    print(f"[loadgen] {total}개 연결 ({args.viewers} viewer, {args.senders} sender), "
+          f"{args.processes} 프로세스, 측정 {args.duration}s", file=sys.stderr)
+    report = run_load(url=args.url, viewers=args.viewers, senders=args.senders,
+                      duration=args.duration, ramp=args.ramp, warmup=args.warmup,
+                      input_hz=args.input_hz, motor=args.motor, late_ms=args.late_ms,
+                      processes=args.processes)
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        Path(args.out).write_text(text, encoding="utf-8")
+        print(f"[loadgen] 보고서 기록: {args.out}", file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
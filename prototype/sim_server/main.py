@@ -6,9 +6,18 @@ from pathlib import Path
 # sim_server 디렉토리 안에서도 실행할 수 있도록 상위 디렉토리를 path에 추가
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from prototype.sim_server.utils.owned_buffer import OwnedBuffer
+from sim_server.utils.owned_buffer import OwnedBuffer
+from sim_server.utils.input_mailbox import InputMailbox
+from sim_server.utils.subscriber_gate import SubscriberGate
+from sim_server.utils.interest import InterestRegistry
+from sim_server.utils.telemetry import TelemetryRegistry
+from sim_server.utils.checkpoint import CheckpointStore
+from sim_server.utils.sim_pool import WarmSimPool
+from sim_server.utils.fast_forward import FastForwardControl
+from sim_server.utils.tracer import TRACER
+from sim_server.utils.latency import LatencyTracker
 from sim_server.server import ServerThread, ServerConfig
-from sim_server.simloop import SimLoopThread
+from sim_server.legacy_simloop import SimLoopThread
 
 
 def loadServerConfig(configPath: str = None) -> ServerConfig:
@@ -52,26 +61,45 @@ def loadServerConfig(configPath: str = None) -> ServerConfig:
         return ServerConfig()
 
 
-def onWebsocketMessage(websocket, message, **kwargs):
+async def onWebsocketMessage(websocket, message, **kwargs):
     """
     WebSocket 메시지 수신 시 호출되는 콜백 함수
+    파싱 + 우편함 등록만 하므로 이벤트 루프에서 바로 처리
+    (스레드 풀로 보내면 연속된 모터 명령의 반영 순서가 워커 스케줄에 따라 바뀔 수 있음)
 
     Args:
         websocket: WebSocket 연결 객체
         message: 수신한 메시지
-        **kwargs: 추가 매개변수 (outputBuffer 등)
+        **kwargs: 추가 매개변수 (outputBuffer, inputMailbox 등)
     """
-    # 현재는 로그만 출력 (서버에서 이미 출력함)
-    # 향후 여기서 메시지 처리 로직 구현
-    # 예:
-    # outputBuffer = kwargs.get('outputBuffer')
-    # if outputBuffer:
-    #     data = outputBuffer.readBuff()
-    #     await websocket.send_text(json.dumps(data))
-    pass
+    # 모터 명령: {"motors": [{"name": "shaft_motor", "speed": 3.0, "ramp": 2.0}, ...]}
+    # 타입 없는 예전 형식도 {"type": "motors"}와 같이 처리
+    try:
+        data = json.loads(message)
+    except ValueError:
+        return  # JSON이 아닌 메시지는 무시
+
+    if isinstance(data, dict) and "motors" in data:
+        await onMotorsMessage(websocket, data, **kwargs)
+
+
+async def onMotorsMessage(websocket, message, **kwargs):
+    """
+    {"type": "motors", "motors": [...], "cid": "a1"} 메시지 핸들러
+    우편함 등록만 하므로 이벤트 루프에서 바로 처리 (스레드 풀을 거치지 않음)
+    cid가 있으면 입력 → 화면 지연 추적 시작 (utils/latency.py)
+    """
+    inputMailbox = kwargs.get('inputMailbox')
+    if inputMailbox is None:
+        return
+    latencyTracker = kwargs.get('latencyTracker')
+    cid = message.get("cid")
+    if cid is not None and latencyTracker is not None:
+        latencyTracker.received(cid, websocket, kwargs.get('receivedAt'))
+    inputMailbox.postMessage(message, websocket)
 
 
-def cleanup(serverThread, simThread):
+def cleanup(serverThread, simThread, checkpointStore=None, simPool=None):
     """
     프로그램 종료 시 리소스 정리
     - 스레드 안전하게 종료
@@ -89,6 +117,14 @@ def cleanup(serverThread, simThread):
         if simThread.is_alive():
             print("경고: 시뮬레이션 스레드가 5초 내에 종료되지 않음")
 
+    # 마지막 체크포인트 기록 (다음 실행이 이어서 시작)
+    if checkpointStore is not None:
+        checkpointStore.close()
+
+    # 미리 만들어 둔 시뮬레이터 정리
+    if simPool is not None:
+        simPool.close()
+
     # 서버 스레드 중지
     if serverThread and serverThread.is_alive():
         print("서버 스레드 중지 중...")
@@ -102,7 +138,7 @@ def cleanup(serverThread, simThread):
     print("정리 완료.")
 
 
-def main():
+def main(replayDir: str = None):
     """
     메인 스레드: ServerThread와 SimLoopThread를 관리
     - 버퍼를 생성하고 소유
@@ -110,6 +146,9 @@ def main():
     - 각 스레드에 버퍼와 콜백 전달
     - 스레드가 죽으면 재시작
     - 예외 처리 및 우아한 종료
+
+    Args:
+        replayDir: 기록된 실행 디렉토리 (있으면 시뮬레이션 없이 재생 모드로 서버만 실행)
     """
 
     # 서버 설정 로드
@@ -118,9 +157,58 @@ def main():
 
     # 입출력 버퍼 생성 (메인이 소유)
     outputBuffer = OwnedBuffer({})
+    inputMailbox = InputMailbox()
+    # 접속 클라이언트 수 (서버 → 시뮬 스케줄러), 재시작된 스레드도 같은 게이트를 공유
+    subscriberGate = SubscriberGate(idlePolicy=serverConfig.idle_policy,
+                                    keepaliveHz=serverConfig.idle_keepalive_hz)
+    # 클라이언트별 바디 구독 (시뮬레이션은 합집합만 프레임으로 만듦)
+    interestRegistry = InterestRegistry()
+    # 클라이언트별 텔레메트리 채널 구독 (반력/모터 토크 등은 구독될 때만 계산)
+    telemetryRegistry = TelemetryRegistry()
+    # 입력 → 화면 지연 추적 (cid가 붙은 입력만, 세션별 히스토그램)
+    latencyTracker = LatencyTracker()
+    # 빨리 감기 요청 (서버가 받고 시뮬레이션 루프가 실행, 재시작된 루프는 진행 중인 요청을 이어감)
+    fastForward = FastForwardControl(maxSeconds=serverConfig.fast_forward_max_seconds,
+                                     publishHz=serverConfig.fast_forward_publish_hz)
+    # 프레임 기록 디렉토리 (설정이 비어 있으면 기록 안 함)
+    recordDir = (str(Path(serverConfig.resources_dir) / serverConfig.record_dir)
+                 if serverConfig.record_dir else None)
+    # 상태 체크포인트 (기본 꺼짐, 켜면 시뮬레이션 스레드가 재시작될 때 마지막 상태에서 이어감)
+    # 디렉토리가 있으면 디스크에도 기록해서 프로세스 재시작 후에도 이어감
+    checkpointStore = None
+    if serverConfig.checkpoint_enabled:
+        checkpointStore = CheckpointStore(
+            str(Path(serverConfig.resources_dir) / serverConfig.checkpoint_dir)
+            if serverConfig.checkpoint_dir else None,
+            writeInterval=serverConfig.checkpoint_write_interval)
+
+    # 트레이스 (기본 꺼짐, /debug/trace로 켜고 끌 수 있음)
+    TRACER.configure(enabled=serverConfig.trace_enabled, capacity=serverConfig.trace_capacity,
+                     dumpDir=(str(Path(serverConfig.resources_dir) / serverConfig.trace_dump_dir)
+                              if serverConfig.trace_dump_dir else ""))
 
     # TODO: 실제 모델 description 데이터 로드
     modelDescription = {}
+    if serverConfig.synthetic_bodies > 0:
+        # 합성 백엔드: PyChrono 없이 네트워크/버퍼/팬아웃 계층 부하 측정 (synthetic_sim.py)
+        modelDescription = {"backend": "synthetic", "synthetic": {
+            "bodies": serverConfig.synthetic_bodies,
+            "motors": serverConfig.synthetic_motors,
+            "step_cost_ms": serverConfig.synthetic_step_cost_ms,
+        }}
+
+    # 시뮬레이터 풀: 시뮬레이션 스레드가 (재)시작될 때 make_sim을 기다리지 않도록 미리 만들어 둠
+    simPool = None
+    if serverConfig.sim_pool_size > 0 and modelDescription and not replayDir:
+        simPool = WarmSimPool(size=serverConfig.sim_pool_size, maxModels=serverConfig.sim_pool_models)
+        simPool.prewarm(modelDescription)
+
+    # 재생 모드: 기록을 memmap으로 열기만 함 (시뮬레이션 스레드 없음)
+    replayRun = None
+    if replayDir:
+        from sim_server.utils.frame_recorder import RecordedRun
+        replayRun = RecordedRun(replayDir)
+        print(f"재생 모드: {replayDir} ({len(replayRun)} frames, {len(replayRun.body_names)} bodies)")
 
     # 스레드 참조
     serverThread = None
@@ -143,19 +231,37 @@ def main():
                     serverThread = ServerThread(
                         config=serverConfig,
                         onWebsocketMessage=onWebsocketMessage,
-                        outputBuffer=outputBuffer  # kwargs로 전달
+                        messageHandlers={"motors": onMotorsMessage},
+                        subscriberGate=subscriberGate,
+                        interestRegistry=interestRegistry,
+                        telemetryRegistry=telemetryRegistry,
+                        replayRun=replayRun,
+                        outputBuffer=outputBuffer,  # kwargs로 전달
+                        inputMailbox=inputMailbox,
+                        latencyTracker=latencyTracker,
+                        fastForward=fastForward
                     )
                     serverThread.start()
                     print(f"서버 스레드 시작됨 (http://{serverConfig.host}:{serverConfig.port})")
 
-                # SimLoopThread 상태 체크 및 재시작
-                if simThread is None or not simThread.is_alive():
+                # SimLoopThread 상태 체크 및 재시작 (재생 모드에서는 실행하지 않음)
+                if replayRun is None and (simThread is None or not simThread.is_alive()):
                     if simThread is not None:
                         print("시뮬레이션 스레드가 종료됨. 재시작 중...")
 
                     simThread = SimLoopThread(
                         modelDescription=modelDescription,
-                        outputBuffer=outputBuffer
+                        outputBuffer=outputBuffer,
+                        inputMailbox=inputMailbox,
+                        subscriberGate=subscriberGate,
+                        interestRegistry=interestRegistry,
+                        telemetryRegistry=telemetryRegistry,
+                        recordDir=recordDir,
+                        checkpointStore=checkpointStore,
+                        checkpointInterval=serverConfig.checkpoint_interval,
+                        latencyTracker=latencyTracker,
+                        simPool=simPool,
+                        fastForward=fastForward
                     )
                     simThread.start()
                     print("시뮬레이션 스레드 시작됨")
@@ -185,8 +291,13 @@ def main():
 
     finally:
         # 어떤 경우든 정리 작업 수행
-        cleanup(serverThread, simThread)
+        cleanup(serverThread, simThread, checkpointStore, simPool)
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    parser = argparse.ArgumentParser(description="CADverse 시뮬레이션 서버")
+    parser.add_argument("--replay", metavar="RUN_DIR",
+                        help="기록된 실행 디렉토리를 재생 (시뮬레이션 없이 서버만 실행)")
+    args = parser.parse_args()
+    main(replayDir=args.replay)
@@ -1,10 +1,22 @@
+import contextlib
+import functools
 import json
+import shutil
 import threading
+import time
+import uuid
 from pathlib import Path
 from dataclasses import dataclass, asdict
-from typing import List, TYPE_CHECKING, Callable, Optional, Any
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
-from fastapi.responses import FileResponse
+from typing import Dict, List, TYPE_CHECKING, Callable, Optional, Any
+
+# FastAPI/uvicorn은 createApp/runServer에서 import
+# (ServerConfig만 쓰는 곳이나 spawn된 워커 프로세스가 웹 스택 로드 비용을 내지 않도록)
+if TYPE_CHECKING:
+    from fastapi import FastAPI
+    from sim_server.utils.subscriber_gate import SubscriberGate
+    from sim_server.utils.interest import InterestRegistry
+    from sim_server.utils.telemetry import TelemetryRegistry
+    from sim_server.utils.frame_recorder import RecordedRun
 
 
 
@@ -14,6 +26,36 @@ class ServerConfig:
     host: str = "0.0.0.0"
     port: int = 8000
     resources_dir: str = "./resources"
+    upload_dir: str = "uploads"              # resources_dir 기준 업로드 저장 경로
+    upload_chunk_size: int = 1024 * 1024     # 업로드 스트리밍 청크 크기 (bytes)
+    upload_max_bytes: int = 512 * 1024 * 1024
+    upload_workers: int = 2                  # 전처리 프로세스 풀 크기
+    debug_echo: bool = False                 # 수신 메시지 출력 + "I received ..." 응답 (디버그용)
+    handler_workers: int = 4                 # sync 메시지 핸들러 스레드 풀 크기
+    handler_max_pending: int = 256           # 풀에 걸려 있을 수 있는 최대 핸들러 작업 수
+    handler_overflow: str = "drop"           # 가득 찼을 때: "drop"(버림) / "reject"(busy 에러 응답)
+    idle_policy: str = "pause"               # 구독자 0명일 때 시뮬: run / pause / no_frames / keepalive
+    idle_keepalive_hz: float = 2.0           # idle_policy가 keepalive일 때 스텝 주기
+    publish_min_hz: float = 15.0             # 클라이언트별 프레임 전송 주기 하한 (링크가 나빠도 유지)
+    publish_max_hz: float = 60.0             # 클라이언트별 프레임 전송 주기 상한
+    publish_ping_interval: float = 1.0       # RTT 측정용 ping 주기 (초)
+    publish_report_interval: float = 5.0     # {"type": "rate"} 상태 통보 주기 (초)
+    record_dir: str = ""                     # 프레임 기록 디렉토리 (resources_dir 기준, 비우면 기록 안 함)
+    checkpoint_enabled: bool = False         # 상태 체크포인트 (켜면 재시작된 시뮬레이션 스레드가 마지막 상태에서 이어감)
+    checkpoint_dir: str = ""                 # 체크포인트 디렉토리 (resources_dir 기준, 비우면 메모리에만 유지)
+    checkpoint_interval: float = 5.0         # 체크포인트 주기 (실제 시간 초, 그동안 스텝이 없었으면 건너뜀)
+    checkpoint_write_interval: float = 1.0   # 디스크 기록 주기 (초, 그 사이 체크포인트는 최신 것만 기록)
+    trace_enabled: bool = False              # 트레이스 기록 (/debug/trace, Chrome trace-event JSON)
+    trace_capacity: int = 65536              # 트레이스 링 버퍼 크기 (이벤트 수)
+    trace_dump_dir: str = ""                 # 틱 주기 초과 시 트레이스 덤프 디렉토리 (resources_dir 기준)
+    synthetic_bodies: int = 0                # 0보다 크면 모델 대신 합성 시뮬레이터 (Chrono 없이 서버 부하 측정)
+    synthetic_motors: int = 4                # 합성 시뮬레이터 모터 수 (synthetic_motor_0 ...)
+    synthetic_step_cost_ms: float = 0.0      # 합성 시뮬레이터 물리 스텝 비용 흉내 (ms)
+    sim_pool_size: int = 0                   # 모델별로 미리 만들어 둘 시뮬레이터 수 (0이면 풀 사용 안 함)
+    sim_pool_models: int = 4                 # 풀을 유지할 모델 수 (요청 횟수 상위)
+    fast_forward_max_seconds: float = 600.0  # 빨리 감기 요청 하나의 최대 시뮬레이션 시간 (초)
+    fast_forward_publish_hz: float = 5.0     # 빨리 감는 동안 프레임 commit 주기 기본값 (0이면 끝날 때만)
+    fast_forward_report_interval: float = 0.25  # {"type": "fast_forward"} 진행 상황 방송 주기 (초)
 
     @classmethod
     def fromJson(cls, jsonPath: str) -> 'ServerConfig':
@@ -32,23 +74,245 @@ class ServerConfig:
         return asdict(self)
 
 
-def runServer(config: ServerConfig,
+def createApp(config: ServerConfig,
               onWebsocketMessage: Optional[Callable] = None,
-              **callbackKwargs):
+              messageHandlers: Optional[Dict[str, Callable]] = None,
+              subscriberGate: Optional["SubscriberGate"] = None,
+              interestRegistry: Optional["InterestRegistry"] = None,
+              telemetryRegistry: Optional["TelemetryRegistry"] = None,
+              replayRun: Optional["RecordedRun"] = None,
+              **callbackKwargs) -> "FastAPI":
     """
-    FastAPI 기반 서버 실행 함수
+    FastAPI 앱 생성 함수 (라우트 등록까지, 실행은 runServer에서)
     - WebSocket을 통한 실시간 인터랙션
     - HTTP를 통한 리소스 파일 제공 (메시 데이터 등)
+    - HTTP를 통한 OBJ 업로드 및 전처리
 
     Args:
         config: 서버 설정 (ServerConfig)
         onWebsocketMessage: WebSocket 메시지 수신 시 호출할 콜백 함수
+                           (type이 없거나 messageHandlers에 없는 메시지용)
                            시그니처: callback(websocket, message, **kwargs)
+        messageHandlers: 메시지 "type" -> 핸들러 (callback(websocket, dict, **kwargs))
+                         async 함수는 이벤트 루프에서, 일반 함수는 스레드 풀에서 실행
+                         (같은 연결의 일반 함수 호출은 받은 순서대로)
+        subscriberGate: 접속 클라이언트 수를 시뮬레이션 루프에 알리는 게이트
+        interestRegistry: 클라이언트별 바디 구독 (시뮬레이션은 합집합만 프레임으로 만듦)
+        telemetryRegistry: 클라이언트별 텔레메트리 채널 구독 (구독된 채널만 계산)
+        replayRun: 재생 모드에서 스트리밍할 기록 (있으면 outputBuffer 대신 클라이언트별 재생 커서)
         **callbackKwargs: 콜백 함수에 전달할 추가 매개변수
                          예: outputBuffer=buffer, inputBuffer=buffer 등
     """
+    from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Request
+    from fastapi.responses import FileResponse, PlainTextResponse, JSONResponse
+    from sim_server.utils.message_dispatcher import MessageDispatcher
+    from sim_server.utils.client_session import AdaptiveRate, ClientSession, FrameEncoder
+    from sim_server.utils.interest import Interest, InterestRegistry, BodyCatalog
+    from sim_server.utils.replay import ReplaySource
+    from sim_server.utils.fast_forward import ACTIVE_STATES
+    from sim_server.utils.metrics import METRICS
+    from sim_server.utils.tracer import TRACER
+
+    # 메시지 분배기 (느린 콜백이 이벤트 루프를 막지 않도록 sync 핸들러는 스레드 풀로)
+    dispatcher = MessageDispatcher(maxWorkers=config.handler_workers,
+                                   maxPending=config.handler_max_pending,
+                                   overflow=config.handler_overflow)
+    dispatcher.setFallback(onWebsocketMessage)
+
+    # 클라이언트별 전송 상태 (websocket -> ClientSession)
+    sessions: Dict[WebSocket, ClientSession] = {}
+    # 시뮬레이션 출력 프레임 (있으면 클라이언트별 주기로 전송)
+    outputBuffer = callbackKwargs.get("outputBuffer")
+    frameEncoder = FrameEncoder()
+    # 입력 지연 추적 (cid가 붙은 입력 → 프레임 → 클라이언트 응답)
+    latencyTracker = callbackKwargs.get("latencyTracker")
+    # 라이브 시뮬레이션 빨리 감기 (요청은 여기서, 실행은 시뮬레이션 루프에서)
+    fastForward = callbackKwargs.get("fastForward")
+    fastForwardReporter = None
+
+    # 재생 모드: 클라이언트별 재생 커서 (websocket -> ReplaySource)
+    replaySources: Dict[WebSocket, ReplaySource] = {}
+    if replayRun is not None and interestRegistry is None:
+        # 기록된 바디 이름으로 구독 목록 구성 (경계구 정보가 없어 위치는 첫 프레임 기준)
+        first = replayRun.frame(0)["bodies"] if len(replayRun) else []
+        interestRegistry = InterestRegistry()
+        interestRegistry.setCatalog(BodyCatalog([
+            {"name": b["name"], "assembly": None, "center": b["pos"], "radius": 0.0}
+            for b in first]))
+
+    async def onPong(websocket, message, **kwargs):
+        session = sessions.get(websocket)
+        if session is not None:
+            session.onPong(message)
+
+    async def onSubscribe(websocket, message, **kwargs):
+        """
+        바디 구독 변경: {"type": "subscribe", "bodies": [...], "assemblies": [...],
+                         "aabb": {"min": [...], "max": [...]}}
+        조건 없이 보내면 전체 구독
+        """
+        session = sessions.get(websocket)
+        if session is None or interestRegistry is None:
+            return
+        try:
+            interest = Interest.fromDict(message)
+        except (KeyError, TypeError, ValueError) as e:
+            await websocket.send_text(json.dumps(
+                {"type": "error", "reason": "bad_subscribe", "detail": str(e)}))
+            return
+        names = interestRegistry.update(websocket, interest)
+        if websocket in replaySources:
+            replaySources[websocket].names = names
+        await websocket.send_text(json.dumps({
+            "type": "subscribed",
+            "bodies": None if names is None else sorted(names),
+        }))
+
+    async def onCatalog(websocket, message, **kwargs):
+        """구독 가능한 바디/어셈블리 목록: {"type": "catalog"}"""
+        catalog = interestRegistry.catalog.toDict() if interestRegistry is not None else {}
+        await websocket.send_text(json.dumps({"type": "catalog", **catalog}))
+
+    async def onTelemetry(websocket, message, **kwargs):
+        """
+        텔레메트리 채널 구독 교체: {"type": "telemetry", "channels": {"motor:gearA_motor": 1}}
+        사용 가능한 채널 목록은 {"type": "telemetry", "list": true}
+        """
+        session = sessions.get(websocket)
+        if session is None or telemetryRegistry is None:
+            return
+        if message.get("list"):
+            await websocket.send_text(json.dumps(
+                {"type": "telemetry_channels", "channels": sorted(telemetryRegistry.available)}))
+            return
+        channels = message.get("channels") or {}
+        if not isinstance(channels, dict):
+            await websocket.send_text(json.dumps(
+                {"type": "error", "reason": "bad_telemetry", "detail": "channels는 {이름: decimation}"}))
+            return
+        accepted, unknown = telemetryRegistry.update(websocket, channels)
+        session.channels = accepted
+        await websocket.send_text(json.dumps(
+            {"type": "telemetry_ack", "channels": accepted, "unknown": unknown}))
+
+    async def onClockSync(websocket, message, **kwargs):
+        """
+        NTP 방식 시계 동기화: 클라이언트 {"type": "clock_sync", "id", "t0"}
+        → 서버 수신 시각 t1, 송신 시각 t2 (서버 벽시계, 초)를 붙여 그대로 응답
+        클라이언트는 수신 시각 t3로 offset = ((t1 - t0) + (t2 - t3)) / 2 계산
+        """
+        t1 = time.time()
+        reply = {"type": "clock_sync", "id": message.get("id"), "t0": message.get("t0"), "t1": t1}
+        reply["t2"] = time.time()
+        await websocket.send_text(json.dumps(reply))
+
+    async def onReplay(websocket, message, **kwargs):
+        """재생 제어: {"type": "replay", "action": "play" | "pause" | "seek" | "speed" | "state"}"""
+        source = replaySources.get(websocket)
+        if source is None:
+            await websocket.send_text(json.dumps({"type": "error", "reason": "not_replay"}))
+            return
+        try:
+            state = source.control(message)
+        except (KeyError, TypeError, ValueError) as e:
+            await websocket.send_text(json.dumps(
+                {"type": "error", "reason": "bad_replay", "detail": str(e)}))
+            return
+        await websocket.send_text(json.dumps(state))
+
+    async def onInputAck(websocket, message, **kwargs):
+        """
+        클라이언트가 자기 cid가 담긴 프레임을 받았다는 응답
+        {"type": "input_ack", "cids": ["a1"], "render_in": 0.08}  (render_in: 화면에 보이기까지 남은 초)
+        """
+        session = sessions.get(websocket)
+        if session is None or latencyTracker is None:
+            return
+        renderIn = message.get("render_in")
+        latencyTracker.acked(websocket, message.get("cids") or (),
+                             renderIn=float(renderIn) if renderIn is not None else None,
+                             rtt=session.rate.srtt)
+
+    async def onLatency(websocket, message, **kwargs):
+        """이 클라이언트의 입력 지연 통계: {"type": "latency"} → 단계별 p50/p99/max (초)"""
+        stats = latencyTracker.sessionStats(websocket) if latencyTracker is not None else {}
+        await websocket.send_text(json.dumps({"type": "latency", "stages": stats}))
+
+    async def notifySuperseded():
+        """새 요청으로 대체된 빨리 감기 요청을 그 요청을 보낸 클라이언트에게 알림"""
+        for job in fastForward.takeSuperseded():
+            ws = job.requester
+            if ws is None or ws not in activeConnections:
+                continue
+            try:
+                await ws.send_text(json.dumps(job.toDict()))
+            except Exception as e:
+                print(f"빨리 감기 대체 통보 실패: {e}")
+
+    async def reportFastForward():
+        """빨리 감기가 끝날 때까지 진행 상황을 모든 클라이언트에 방송 (끝난 상태도 한 번)"""
+        import asyncio
+        while True:
+            state = fastForward.state()
+            await notifySuperseded()
+            await broadcast(state)
+            if state["state"] not in ACTIVE_STATES and not fastForward.busy:
+                return
+            await asyncio.sleep(config.fast_forward_report_interval)
+
+    async def onFastForward(websocket, message, **kwargs):
+        """
+        빨리 감기: {"type": "fast_forward", "to": 30.0} / {"by": 10.0, "publish_hz": 2}
+        {"action": "cancel"} 중단, {"action": "state"} 조회 (utils/fast_forward.py)
+        """
+        import asyncio
+        nonlocal fastForwardReporter
+        if fastForward is None or not fastForward.available:
+            await websocket.send_text(json.dumps({"type": "error", "reason": "fast_forward_unavailable"}))
+            return
+        action = message.get("action", "start")
+        try:
+            if action == "start":
+                state = fastForward.request(to=message.get("to"), by=message.get("by"),
+                                            publishHz=message.get("publish_hz"), requester=websocket)
+            elif action == "cancel":
+                state = fastForward.cancel()
+            elif action == "state":
+                state = fastForward.state()
+            else:
+                raise ValueError(f"알 수 없는 action: {action}")
+        except ValueError as e:
+            await websocket.send_text(json.dumps(
+                {"type": "error", "reason": "bad_fast_forward", "detail": str(e)}))
+            return
+        await websocket.send_text(json.dumps(state))
+        await notifySuperseded()
+        if action == "start" and (fastForwardReporter is None or fastForwardReporter.done()):
+            fastForwardReporter = asyncio.create_task(reportFastForward())
+            backgroundTasks.add(fastForwardReporter)
+            fastForwardReporter.add_done_callback(backgroundTasks.discard)
+
+    dispatcher.register("pong", onPong)
+    dispatcher.register("input_ack", onInputAck)
+    dispatcher.register("latency", onLatency)
+    dispatcher.register("replay", onReplay)
+    dispatcher.register("clock_sync", onClockSync)
+    dispatcher.register("telemetry", onTelemetry)
+    dispatcher.register("subscribe", onSubscribe)
+    dispatcher.register("catalog", onCatalog)
+    dispatcher.register("fast_forward", onFastForward)
+    for msgType, handler in (messageHandlers or {}).items():
+        dispatcher.register(msgType, handler)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app: FastAPI):
+        yield
+        # 서버 종료 시 핸들러 스레드 풀 정리
+        dispatcher.shutdown()
+
     # FastAPI 앱 생성
-    app = FastAPI()
+    app = FastAPI(lifespan=lifespan)
+    app.state.dispatcher = dispatcher
 
     # 리소스 파일 디렉토리
     resourcesPath = Path(config.resources_dir)
@@ -56,6 +320,241 @@ def runServer(config: ServerConfig,
     # 현재 연결된 클라이언트 목록
     activeConnections: List[WebSocket] = []
 
+    # 메트릭 (/metrics): 연결 수, 핸들러/입력 대기열 드롭
+    connectionsTotal = METRICS.counter("ws_connections_total", "누적 웹소켓 연결 수")
+    METRICS.gauge("ws_connections", "현재 웹소켓 연결 수", fn=lambda: len(activeConnections))
+    METRICS.gauge("handler_pending", "스레드 풀에 걸려 있는 sync 핸들러 작업 수",
+                  fn=lambda: dispatcher.pending)
+    for reason in ("dropped", "rejected", "failed"):
+        METRICS.gauge("handler_messages", "대기열 초과/오류로 처리하지 못한 메시지 수",
+                      fn=functools.partial(getattr, dispatcher, reason), reason=reason)
+    inputMailbox = callbackKwargs.get("inputMailbox")
+    if inputMailbox is not None:
+        METRICS.gauge("input_mailbox_dropped", "대기 모터 수 제한으로 버린 입력 수",
+                      fn=lambda: inputMailbox.dropped)
+
+    # 업로드 파일 저장 디렉토리 (리소스 디렉토리 하위 → /cadverse/resources로 바로 제공 가능)
+    uploadsPath = resourcesPath / config.upload_dir
+    uploadsPath.mkdir(parents=True, exist_ok=True)
+
+    # 업로드 작업 상태 (upload_id -> 상태 dict)
+    uploadJobs: Dict[str, dict] = {}
+    # 업로드 진행 상황을 받을 웹소켓 (클라이언트가 정한 토큰 -> 웹소켓 목록, upload_id -> 토큰)
+    uploadWatchers: Dict[str, List[WebSocket]] = {}
+    uploadTokens: Dict[str, str] = {}
+    # 실행 중인 백그라운드 태스크 (GC 방지용 참조 보관)
+    backgroundTasks = set()
+    # 전처리용 프로세스 풀 (첫 업로드 시 생성)
+    preprocessPool = None
+
+    async def broadcast(message: dict):
+        """연결된 모든 클라이언트에게 JSON 메시지 전송"""
+        text = json.dumps(message, ensure_ascii=False)
+        for ws in list(activeConnections):
+            try:
+                await ws.send_text(text)
+            except Exception as e:
+                print(f"브로드캐스트 실패: {e}")
+
+    async def reportUpload(uploadId: str, **fields):
+        """
+        업로드 작업 상태 갱신 후 올린 클라이언트에게만 진행 상황 전달
+        (업로드 요청의 token으로 upload_watch를 보낸 웹소켓, 없으면 GET 조회로만)
+        """
+        job = uploadJobs[uploadId]
+        job.update(fields)
+        watchers = uploadWatchers.get(uploadTokens.get(uploadId), ())
+        if not watchers:
+            return
+        text = json.dumps({"type": "upload_progress", **job}, ensure_ascii=False)
+        for ws in list(watchers):
+            try:
+                await ws.send_text(text)
+            except Exception as e:
+                print(f"업로드 진행 상황 전송 실패: {e}")
+
+    def getPreprocessPool():
+        """
+        전처리 프로세스 풀 반환
+        서버/시뮬 스레드가 떠 있는 프로세스에서 fork하지 않도록 spawn 컨텍스트 사용
+        """
+        nonlocal preprocessPool
+        if preprocessPool is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            preprocessPool = ProcessPoolExecutor(
+                max_workers=config.upload_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return preprocessPool
+
+    async def runPreprocess(uploadId: str, rawPath: Path, outDir: Path,
+                            fileName: str, scale: float):
+        """업로드 완료된 파일을 프로세스 풀에서 전처리"""
+        import asyncio
+        from sim_server.utils.mesh_pipeline import preprocess_obj
+
+        loop = asyncio.get_running_loop()
+        await reportUpload(uploadId, status="processing")
+        try:
+            meta = await loop.run_in_executor(
+                getPreprocessPool(), functools.partial(
+                    preprocess_obj, str(rawPath), str(outDir), scale=scale, name=fileName)
+            )
+        except Exception as e:
+            print(f"업로드 전처리 실패 ({uploadId}): {e}")
+            shutil.rmtree(outDir, ignore_errors=True)
+            await reportUpload(uploadId, status="failed", error=str(e))
+            return
+        finally:
+            rawPath.unlink(missing_ok=True)
+
+        # 결과 파일은 리소스 경로 기준 상대 경로로 알려줌
+        prefix = f"{config.upload_dir}/{uploadId}"
+        await reportUpload(uploadId, status="done", progress=1.0, result={
+            **meta,
+            "obj": f"{prefix}/{meta['obj']}",
+            "binary": f"{prefix}/{meta['binary']}",
+            "lods": [{**lod, "file": f"{prefix}/{lod['file']}"} for lod in meta["lods"]],
+        })
+
+    async def onUploadWatch(websocket, message, **kwargs):
+        """
+        업로드 진행 상황 받기: {"type": "upload_watch", "token": "<클라이언트가 정한 문자열>"}
+        같은 token으로 POST /cadverse/upload?token=... 한 업로드의 upload_progress만 이 연결로 옴
+        """
+        token = message.get("token")
+        if not isinstance(token, str) or not token:
+            await websocket.send_text(json.dumps(
+                {"type": "error", "reason": "bad_upload_watch", "detail": "token은 비어 있지 않은 문자열"}))
+            return
+        watchers = uploadWatchers.setdefault(token, [])
+        if websocket not in watchers:
+            watchers.append(websocket)
+
+    dispatcher.register("upload_watch", onUploadWatch)
+
+    # HTTP POST: OBJ 업로드 (스트리밍 저장 → 프로세스 풀 전처리)
+    @app.post("/cadverse/upload", status_code=202)
+    async def uploadMesh(request: Request, scale: float = 0.001, token: Optional[str] = None):
+        """
+        OBJ 파일 업로드 (multipart/form-data의 file 필드)
+        - Content-Length가 제한을 넘으면 본문을 받기 전에 413
+        - 받는 대로 multipart를 파싱해서 파일 데이터만 디스크에 기록 (임시 파일 없이 한 번만 씀,
+          파일 쓰기는 스레드로 넘겨 이벤트 루프를 막지 않음)
+        - 저장이 끝나면 전처리 작업을 큐에 넣고 바로 응답
+        - 진행 상황은 token으로 {"type": "upload_watch", "token": ...}를 보낸 웹소켓에
+          {"type": "upload_progress", ...} 메시지로 전달 (progress 0~0.5: 네트워크 수신)
+        - 실패하면 (끊김, 디스크 오류 포함) 작업은 failed, 업로드 디렉토리는 삭제
+        """
+        import asyncio
+        from sim_server.utils.upload_stream import MultipartUpload
+
+        total = request.headers.get("content-length")
+        try:
+            total = int(total) if total is not None else None
+        except ValueError:
+            raise HTTPException(status_code=400, detail="잘못된 Content-Length")
+        if total is not None and total > config.upload_max_bytes:
+            raise HTTPException(status_code=413, detail="업로드 크기 제한 초과")
+        try:
+            upload = MultipartUpload(request.headers.get("content-type", ""))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        uploadId = uuid.uuid4().hex[:12]
+        outDir = uploadsPath / uploadId
+        rawPath = None
+        out = None
+        received = 0
+        lastReported = 0
+        try:
+            try:
+                async for chunk in request.stream():
+                    received += len(chunk)
+                    if received > config.upload_max_bytes:
+                        raise HTTPException(status_code=413, detail="업로드 크기 제한 초과")
+                    data = upload.feed(chunk)
+
+                    if out is None and upload.fileName is not None:
+                        # 파일 필드 헤더를 받은 시점에 작업 등록
+                        fileName = Path(upload.fileName).name
+                        if not fileName.lower().endswith(".obj"):
+                            raise HTTPException(status_code=400, detail="OBJ 파일만 업로드할 수 있습니다")
+                        outDir.mkdir(parents=True, exist_ok=True)
+                        rawPath = outDir / f"raw_{fileName}"
+                        out = open(rawPath, "wb")
+                        uploadJobs[uploadId] = {"upload_id": uploadId, "file": fileName,
+                                                "status": "uploading", "bytes": 0, "progress": 0.0}
+                        if token:
+                            uploadTokens[uploadId] = token
+                    if data:
+                        await asyncio.to_thread(out.writelines, data)
+
+                    # 진행 상황은 8청크 분량마다 한 번만 알림
+                    if out is not None and received - lastReported >= 8 * config.upload_chunk_size:
+                        lastReported = received
+                        await reportUpload(uploadId, bytes=received,
+                                           progress=(received / total * 0.5) if total else 0.0)
+                upload.finish()
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            finally:
+                if out is not None:
+                    out.close()
+        except BaseException as e:
+            # 클라이언트 끊김, 디스크 오류, 취소 등 어떤 실패든 작업 상태와 디렉토리 정리
+            shutil.rmtree(outDir, ignore_errors=True)
+            if uploadId in uploadJobs:
+                error = e.detail if isinstance(e, HTTPException) else (str(e) or type(e).__name__)
+                await reportUpload(uploadId, status="failed", error=error)
+            raise
+
+        await reportUpload(uploadId, status="queued", bytes=received, progress=0.5)
+        task = asyncio.create_task(runPreprocess(uploadId, rawPath, outDir, fileName, scale))
+        backgroundTasks.add(task)
+        task.add_done_callback(backgroundTasks.discard)
+        return uploadJobs[uploadId]
+
+    # HTTP GET: 업로드 작업 상태 조회
+    @app.get("/cadverse/upload/{upload_id}")
+    async def getUploadStatus(upload_id: str):
+        """웹소켓을 쓰지 않는 클라이언트용 업로드 상태 조회"""
+        job = uploadJobs.get(upload_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="업로드 작업을 찾을 수 없습니다")
+        return job
+
+    # HTTP GET: 파라메트릭 기어 메시 (클라이언트가 직접 생성하지 않는 경우)
+    @app.get("/cadverse/gears/mesh")
+    async def getGearMesh(module: float, teeth: int, face_width: float = 10.0,
+                          bore: float = 0.0, pressure_angle: float = 20.0,
+                          format: str = "obj"):
+        """
+        기어 파라미터로 메시 제공 (파라미터 튜플 기준 캐시)
+        예: GET /cadverse/gears/mesh?module=2&teeth=20&face_width=10&bore=5&format=cvm
+        """
+        from fastapi import Response
+        from sim_server.utils.gear_mesh import GearParams, gear_obj_text, gear_cvm_bytes
+
+        try:
+            params = GearParams(module, teeth, face_width, bore, pressure_angle)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        # 처음 생성할 때만 비용이 드므로 스레드로 넘겨 이벤트 루프를 막지 않음
+        import asyncio
+        if format == "cvm":
+            body = await asyncio.to_thread(gear_cvm_bytes, params)
+            mediaType = "application/octet-stream"
+        elif format == "obj":
+            body = await asyncio.to_thread(gear_obj_text, params)
+            mediaType = "text/plain"
+        else:
+            raise HTTPException(status_code=400, detail="format은 obj 또는 cvm입니다")
+        return Response(content=body, media_type=mediaType,
+                        headers={"Cache-Control": "public, max-age=31536000, immutable"})
+
     # HTTP GET: 리소스 파일 제공
     @app.get("/cadverse/resources/{file_path:path}")
     async def getResource(file_path: str):
@@ -77,6 +576,26 @@ def runServer(config: ServerConfig,
 
         return FileResponse(fullPath)
 
+    @app.get("/metrics")
+    async def getMetrics():
+        """Prometheus text 형식 메트릭 (단계별 소요 시간 p50/p99/max, 프레임/바이트/드롭/연결 수)"""
+        return PlainTextResponse(METRICS.render(), media_type="text/plain; version=0.0.4")
+
+    @app.get("/debug/trace")
+    async def getTrace():
+        """현재 트레이스 버퍼 (chrome://tracing / ui.perfetto.dev 에서 열기)"""
+        return JSONResponse(TRACER.toChrome(),
+                            headers={"Content-Disposition": 'attachment; filename="trace.json"'})
+
+    @app.post("/debug/trace")
+    async def setTrace(enabled: Optional[bool] = None, clear: bool = False):
+        """트레이스 켜기/끄기/비우기: POST /debug/trace?enabled=true&clear=true"""
+        if clear:
+            TRACER.clear()
+        if enabled is not None:
+            TRACER.configure(enabled=enabled)
+        return TRACER.status()
+
     # WebSocket: 실시간 인터랙션
     @app.websocket("/cadverse/interaction")
     async def websocketEndpoint(websocket: WebSocket):
@@ -88,9 +607,21 @@ def runServer(config: ServerConfig,
         # 클라이언트 접속
         await websocket.accept()
         activeConnections.append(websocket)
-        print("클라이언트 연결됨")
+        connectionsTotal.inc()
+        if subscriberGate is not None:
+            subscriberGate.add()
+        print(f"클라이언트 연결됨 (현재 {len(activeConnections)}명)")
+
+        session = ClientSession(websocket, AdaptiveRate(minHz=config.publish_min_hz,
+                                                        maxHz=config.publish_max_hz))
+        sessions[websocket] = session
+        session.latency = latencyTracker
+        if interestRegistry is not None:
+            # 구독 메시지를 보내기 전까지는 전체 바디
+            interestRegistry.update(websocket, Interest())
+            session.interest = interestRegistry
 
-        # 주기적 메시지 전송 태스크
+        # 주기적 메시지 전송 태스크 (출력 버퍼가 없을 때의 데모 메시지)
         async def sendPeriodicMessages():
             """1~3초마다 서버에서 메시지 전송"""
             try:
@@ -106,45 +637,104 @@ def runServer(config: ServerConfig,
             except Exception as e:
                 print(f"주기적 메시지 전송 종료: {e}")
 
-        # 백그라운드 태스크 시작
-        sendTask = asyncio.create_task(sendPeriodicMessages())
+        # 백그라운드 태스크 시작: 출력 버퍼가 있으면 클라이언트별 적응형 주기로 프레임 전송
+        if replayRun is not None:
+            # 재생 모드: 클라이언트마다 자기 커서 위치의 프레임 (버전 = 프레임 번호라 인코더도 따로)
+            source = ReplaySource(replayRun)
+            replaySources[websocket] = source
+            await websocket.send_text(json.dumps(source.state()))
+            sendTask = asyncio.create_task(session.publishLoop(
+                source, FrameEncoder(),
+                pingInterval=config.publish_ping_interval,
+                reportInterval=config.publish_report_interval))
+        elif outputBuffer is not None:
+            sendTask = asyncio.create_task(session.publishLoop(
+                outputBuffer, frameEncoder,
+                pingInterval=config.publish_ping_interval,
+                reportInterval=config.publish_report_interval))
+        else:
+            sendTask = asyncio.create_task(sendPeriodicMessages())
 
         try:
             # 연결이 끊길 때까지 메시지 수신
             while True:
                 data = await websocket.receive_text()
-                print(f"<- 클라이언트로부터 수신: {data}")
-
-                # 응답 전송 추가
-                response = f"I received \"{data}\""
-                await websocket.send_text(response)
-                print(f"-> 서버가 응답: {response}")
-
-                # 콜백 함수가 등록되어 있으면 호출
-                if onWebsocketMessage:
-                    try:
-                        # 콜백 함수 호출 (websocket, message, **kwargs)
-                        result = onWebsocketMessage(websocket, data, **callbackKwargs)
-                        # 비동기 함수인 경우 await
-                        if hasattr(result, '__await__'):
-                            await result
-                    except Exception as e:
-                        print(f"콜백 함수 오류: {e}")
-                        import traceback
-                        traceback.print_exc()
+                receivedAt = time.perf_counter()
+                if TRACER.enabled:
+                    TRACER.instant("input_received", cat="net",
+                                   args={"client": session.id, "bytes": len(data)})
+
+                if config.debug_echo:
+                    print(f"<- 클라이언트로부터 수신: {data}")
+                    response = f"I received \"{data}\""
+                    await websocket.send_text(response)
+                    print(f"-> 서버가 응답: {response}")
+
+                # 핸들러 분배 (sync 핸들러는 기다리지 않고 바로 다음 메시지 수신)
+                status = await dispatcher.dispatch(websocket, data, receivedAt=receivedAt,
+                                                   **callbackKwargs)
+                if status == "rejected":
+                    await websocket.send_text(json.dumps(
+                        {"type": "error", "reason": "busy", "pending": dispatcher.pending}))
 
         except WebSocketDisconnect:
-            # 연결 종료 시 목록에서 제거
-            if websocket in activeConnections:
-                activeConnections.remove(websocket)
             print("클라이언트 연결 종료")
         finally:
+            # 연결 종료 시 목록에서 제거 (구독자 수 감소 → 0명이면 시뮬레이션 idle)
+            sessions.pop(websocket, None)
+            replaySources.pop(websocket, None)
+            for token, watchers in list(uploadWatchers.items()):
+                if websocket in watchers:
+                    watchers.remove(websocket)
+                    if not watchers:
+                        del uploadWatchers[token]
+            if interestRegistry is not None:
+                interestRegistry.remove(websocket)
+            if telemetryRegistry is not None:
+                telemetryRegistry.remove(websocket)
+            if latencyTracker is not None:
+                latencyTracker.remove(websocket)
+            if websocket in activeConnections:
+                activeConnections.remove(websocket)
+                if subscriberGate is not None:
+                    subscriberGate.remove()
             # 주기적 전송 태스크 취소
             sendTask.cancel()
             try:
                 await sendTask
             except asyncio.CancelledError:
                 pass
+            except Exception as e:
+                # 연결이 먼저 끊겨 전송 태스크가 send 오류로 끝난 경우
+                print(f"프레임 전송 종료: {e}")
+
+    return app
+
+
+def runServer(config: ServerConfig,
+              onWebsocketMessage: Optional[Callable] = None,
+              messageHandlers: Optional[Dict[str, Callable]] = None,
+              subscriberGate: Optional["SubscriberGate"] = None,
+              interestRegistry: Optional["InterestRegistry"] = None,
+              telemetryRegistry: Optional["TelemetryRegistry"] = None,
+              replayRun: Optional["RecordedRun"] = None,
+              **callbackKwargs):
+    """
+    FastAPI 기반 서버 실행 함수
+    createApp()으로 앱을 만들고 uvicorn으로 실행 (블로킹)
+
+    Args:
+        config: 서버 설정 (ServerConfig)
+        onWebsocketMessage: WebSocket 메시지 수신 시 호출할 콜백 함수
+        messageHandlers: 메시지 "type" -> 핸들러
+        subscriberGate: 접속 클라이언트 수를 시뮬레이션 루프에 알리는 게이트
+        interestRegistry: 클라이언트별 바디 구독
+        telemetryRegistry: 클라이언트별 텔레메트리 채널 구독
+        replayRun: 재생 모드에서 스트리밍할 기록
+        **callbackKwargs: 콜백 함수에 전달할 추가 매개변수
+    """
+    app = createApp(config, onWebsocketMessage, messageHandlers, subscriberGate,
+                    interestRegistry, telemetryRegistry, replayRun, **callbackKwargs)
 
     # 서버 실행
     print(f"서버 시작: {config.host}:{config.port}")
@@ -162,17 +752,32 @@ class ServerThread(threading.Thread):
     def __init__(self,
                  config: ServerConfig,
                  onWebsocketMessage: Optional[Callable] = None,
+                 messageHandlers: Optional[Dict[str, Callable]] = None,
+                 subscriberGate: Optional["SubscriberGate"] = None,
+                 interestRegistry: Optional["InterestRegistry"] = None,
+                 telemetryRegistry: Optional["TelemetryRegistry"] = None,
+                 replayRun: Optional["RecordedRun"] = None,
                  **callbackKwargs):
         """
         Args:
             config: 서버 설정
             onWebsocketMessage: WebSocket 메시지 콜백
+            messageHandlers: 메시지 "type" -> 핸들러
+            subscriberGate: 접속 클라이언트 수 게이트
+            interestRegistry: 클라이언트별 바디 구독
+            telemetryRegistry: 클라이언트별 텔레메트리 채널 구독
+            replayRun: 재생 모드에서 스트리밍할 기록
             **callbackKwargs: 콜백에 전달할 매개변수 (예: outputBuffer=buffer)
         """
-        super().__init__(daemon=True)
+        super().__init__(daemon=True, name="server")
 
         self.config = config
         self.onWebsocketMessage = onWebsocketMessage
+        self.messageHandlers = messageHandlers
+        self.subscriberGate = subscriberGate
+        self.interestRegistry = interestRegistry
+        self.telemetryRegistry = telemetryRegistry
+        self.replayRun = replayRun
         self.callbackKwargs = callbackKwargs
 
     def run(self):
@@ -181,6 +786,11 @@ class ServerThread(threading.Thread):
             runServer(
                 config=self.config,
                 onWebsocketMessage=self.onWebsocketMessage,
+                messageHandlers=self.messageHandlers,
+                subscriberGate=self.subscriberGate,
+                interestRegistry=self.interestRegistry,
+                telemetryRegistry=self.telemetryRegistry,
+                replayRun=self.replayRun,
                 **self.callbackKwargs
             )
         except Exception as e:
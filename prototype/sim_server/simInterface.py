@@ -1,19 +1,207 @@
-from sim_server import simulate
+"""
+시뮬레이터 백엔드 인터페이스
 
-class Simulator:
-    def step(self): ...
-    def clear(self): ...
-        # 시뮬레이션 종료 시 호출해야 하는 함수가 있으면 여기서 호출
+runSimloop은 이 인터페이스만 사용하고, 실제 물리 엔진은 백엔드로 고른다
+    chrono     PyChrono (simulate.py), 기본값
+    synthetic  NumPy 해석적 궤적 (synthetic_sim.py), Chrono 없이 서버/네트워크 계층 부하 측정용
 
+모델 설명의 "backend"로 선택:
+    {"assemblies": [...]}                                        → chrono
+    {"backend": "synthetic", "synthetic": {"bodies": 10000}}     → synthetic
+
+백엔드 모듈은 선택될 때 import (synthetic만 쓰면 pychrono가 없어도 됨)
+"""
+import importlib
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Dict, List, Union
+
+
+@dataclass
 class SimState:
-    ...
+    """시뮬레이터 진행 상태 요약"""
+    backend: str
+    time: float
+    step: int
+    bodies: int
 
+
+@dataclass
 class SimDescription:
-    simMetaJson = "..."
+    simMetaJson: dict = field(default_factory=dict)
+    backend: str = "chrono"
+
+    @classmethod
+    def fromDict(cls, data: dict) -> 'SimDescription':
+        """모델 설명 dict ("backend"가 없으면 chrono)"""
+        return cls(simMetaJson=data, backend=data.get("backend", "chrono"))
+
+    @classmethod
+    def fromSDF(cls, path, **sdfOptions):
+        """SDF 파일 하나로 이루어진 모델 설명 (make_sim의 "sdf" assembly)"""
+        return cls(simMetaJson={"assemblies": [{"type": "sdf", "path": str(path), **sdfOptions}]})
+
+
+class Simulator(ABC):
+    """
+    시뮬레이터 백엔드 공통 인터페이스 (시뮬레이션 스레드 하나에서만 사용)
+
+    생성자: (모델 설명 dict, 버퍼 핸들(read_inputs/write_outputs), 체크포인트 또는 None)
+    생성 후 runSimloop이 구독/기록 객체를 attach()로 연결
+
+    체크포인트를 지원하는 백엔드는 supportsCheckpoint = True로 두고
+    captureCheckpoint(model) -> Checkpoint / restoreCheckpoint(checkpoint)를 구현
+    (runSimloop과 make_sim은 supportsCheckpoint를 보고 호출하거나 체크포인트를 넘김)
+    """
+    name = ""
+    supportsCheckpoint = False
+
+    def __init__(self):
+        self.interest = None   # InterestRegistry (없으면 항상 전체 바디)
+        self.telemetry = None  # TelemetryRegistry (없으면 텔레메트리 계산 안 함)
+        self.recorder = None   # FrameRecorder (있으면 매 스텝 전체 바디 포즈 기록)
+
+    @property
+    @abstractmethod
+    def bodyNames(self) -> List[str]:
+        """바디 이름 (FrameRecorder 열 순서)"""
+
+    @property
+    @abstractmethod
+    def catalog(self) -> List[dict]:
+        """interest 구독용 바디 목록 [{"name", "assembly", "center", "radius"}]"""
+
+    @property
+    @abstractmethod
+    def channels(self) -> List[str]:
+        """구독 가능한 텔레메트리 채널 이름"""
+
+    @property
+    @abstractmethod
+    def stepCount(self) -> int:
+        ...
+
+    @property
+    @abstractmethod
+    def time(self) -> float:
+        ...
+
+    def attach(self, interestRegistry=None, telemetryRegistry=None, recorder=None):
+        self.interest = interestRegistry
+        self.telemetry = telemetryRegistry
+        self.recorder = recorder
+
+    @abstractmethod
+    def step(self, dt: float, publish: bool = True):
+        """입력 반영 → dt만큼 진행 → (publish면) 프레임을 버퍼에 commit"""
+
+    @abstractmethod
+    def bindBuffer(self, bufferHandle):
+        """입출력 버퍼 연결 (미리 만들어 둔 시뮬레이터를 세션에 붙일 때)"""
+
+    @abstractmethod
+    def clear(self):
+        """시뮬레이션 종료 시 정리 (기록기 닫기, 엔진 리소스 해제)"""
+
+    def state(self) -> SimState:
+        return SimState(backend=self.name, time=self.time, step=self.stepCount,
+                        bodies=len(self.bodyNames))
+
+
+class ChronoSimulator(Simulator):
+    """PyChrono 백엔드 (simulate.py의 SimHandle 래퍼)"""
+    name = "chrono"
+    supportsCheckpoint = True
+
+    def __init__(self, modelMeta: dict, bufferHandle, checkpoint=None):
+        super().__init__()
+        # pychrono는 이 백엔드를 쓸 때만 로드
+        from sim_server import simulate
+        self._simulate = simulate
+        self.handle = simulate.make_sim(modelMeta, bufferHandle, checkpoint=checkpoint)
+
+    @property
+    def bodyNames(self) -> List[str]:
+        return self.handle.body_names
+
+    @property
+    def catalog(self) -> List[dict]:
+        return self.handle.catalog
+
+    @property
+    def channels(self) -> List[str]:
+        return self.handle.channels
+
+    @property
+    def stepCount(self) -> int:
+        return self.handle.step_count
+
+    @property
+    def time(self) -> float:
+        return self.handle.sys.GetChTime()
+
+    def attach(self, interestRegistry=None, telemetryRegistry=None, recorder=None):
+        super().attach(interestRegistry, telemetryRegistry, recorder)
+        self.handle.interest = interestRegistry
+        self.handle.telemetry = telemetryRegistry
+        self.handle.recorder = recorder
+
+    def bindBuffer(self, bufferHandle):
+        self.handle.buffer = bufferHandle
+
+    def step(self, dt: float, publish: bool = True):
+        self._simulate.step_sim(self.handle, dt, publish=publish)
+
+    def captureCheckpoint(self, model: str):
+        """현재 상태 Checkpoint"""
+        return self._simulate.capture_checkpoint(self.handle, model)
+
+    def restoreCheckpoint(self, checkpoint):
+        """아직 스텝하지 않은 시뮬레이터를 체크포인트 상태로"""
+        self._simulate.restore_checkpoint(self.handle, checkpoint)
+
+    def clear(self):
+        self._simulate.kill_sim(self.handle)
+
+
+# 백엔드 이름 -> 클래스 또는 "모듈:클래스" (문자열이면 처음 쓸 때 import)
+BACKENDS: Dict[str, Union[type, str]] = {
+    "chrono": ChronoSimulator,
+    "synthetic": "sim_server.synthetic_sim:SyntheticSimulator",
+}
+
+
+# 백엔드 생성 직렬화 (simulate.py의 모듈 수준 캐시를 시뮬 스레드와 WarmSimPool 보충 스레드가 같이 씀)
+_buildLock = threading.Lock()
+
 
-def make_sim(simDescription: SimDescription)->(Simulator,SimState):
-    simulate.make_sim()
+def registerBackend(name: str, backend: Union[type, str]):
+    """백엔드 추가/교체 (Simulator 하위 클래스 또는 "모듈:클래스")"""
+    BACKENDS[name] = backend
 
 
+def backendClass(name: str) -> type:
+    backend = BACKENDS.get(name)
+    if backend is None:
+        raise ValueError(f"알 수 없는 시뮬레이터 백엔드: {name} (사용 가능: {sorted(BACKENDS)})")
+    if isinstance(backend, str):
+        moduleName, _, className = backend.partition(":")
+        backend = getattr(importlib.import_module(moduleName), className)
+        BACKENDS[name] = backend
+    return backend
 
 
+def make_sim(simDescription: Union[SimDescription, dict], bufferHandle=None,
+             checkpoint=None) -> Simulator:
+    """
+    모델 설명의 백엔드로 시뮬레이터 생성
+    checkpoint가 있으면 그 상태에서 시작 (체크포인트를 지원하지 않는 백엔드는 처음부터)
+    """
+    if isinstance(simDescription, dict):
+        simDescription = SimDescription.fromDict(simDescription)
+    cls = backendClass(simDescription.backend)
+    if not cls.supportsCheckpoint:
+        checkpoint = None
+    with _buildLock:
+        return cls(simDescription.simMetaJson, bufferHandle, checkpoint=checkpoint)
@@ -1,13 +1,20 @@
 # simulate.py  (시뮬레이터 엔진)
 
 import pychrono as chrono
-import pychrono.irrlicht as chronoirr
 
-import os
 import json
-import re
+import os
 import time
 import math as m
+from functools import lru_cache
+
+from sim_server.utils.gear_mesh import GearParams, gear_obj_path, gear_pitch_radius
+from sim_server.utils.sdf_parser import load_sdf
+from sim_server.flat_model import plan_flat_model, is_world
+from sim_server.utils.telemetry import LatestSamples, channel_names, parse_channel
+from sim_server.utils.metrics import SIM_STAGES  # 단계별 소요 시간 (/metrics, 16.7ms 예산이 어디에 쓰이는지)
+from sim_server.utils.motor_ramp import apply_motor_inputs, advance_ramps
+from sim_server.utils.tracer import TRACER
 
 #===================================================================================================
 # 1. SimHandle 구조 정의
@@ -20,6 +27,66 @@ class SimHandle:
         self.motors = motors      # 생성된 모든 모터
         self.buffer = buffer      # input/output buffer 핸들
         self.last_dump_time = 0   # (AR JSON용) 마지막 프레임 저장 시각
+        self.motor_index = {}     # 모터 이름 -> MotorSetpoint (make_sim에서 한 번 생성)
+        self.ramping = set()      # 램프 진행 중인 모터 이름
+        self.body_names = []      # bodies와 같은 순서의 이름 (매 스텝 GetName() 호출 방지)
+        self.catalog = []         # 바디 이름/어셈블리/경계구 목록 (interest 구독 해석용)
+        self.interest = None      # InterestRegistry (없으면 항상 전체 바디 덤프)
+        self.visible_bodies = bodies  # 현재 구독 합집합에 해당하는 바디
+        self.visible_key = None       # visible_bodies를 계산할 때의 합집합 객체
+        self.step_count = 0       # 진행한 스텝 수 (텔레메트리 decimation 기준)
+        self.joint_index = {}     # 조인트 이름 -> 링크 (텔레메트리 reaction 채널)
+        self.gear_links = {}      # 기어 링크 이름 -> (기어A, 기어B, 공칭 속도비)
+        self.channels = []        # 구독 가능한 텔레메트리 채널 이름
+        self.telemetry = None     # TelemetryRegistry (없으면 텔레메트리 계산 안 함)
+        self.telemetry_samples = LatestSamples()  # 채널별 마지막 샘플 (샘플하지 않은 스텝의 프레임에도 실음)
+        self.recorder = None      # FrameRecorder (있으면 매 스텝 전체 바디 포즈를 디스크에 기록)
+        self.dynamic_bodies = []  # 고정되지 않은 (바디, 이름) 목록 (체크포인트 대상)
+
+class BuildContext:
+    """
+    make_sim 한 번의 조립 동안만 쓰는 부가 정보 (조립 헬퍼에 ctx로 넘기고 끝나면 SimHandle로 옮김)
+    모듈 전역에 두면 동시에 여러 시뮬레이터를 만들 때(예: 풀 워밍업) 서로 섞이므로 빌드마다 따로 둠
+    키는 id(객체) — 조립 중에는 bodies/joints 목록이 객체를 들고 있으므로 재사용되지 않음
+    """
+
+    def __init__(self):
+        self.mesh_paths = {}  # 바디 id -> (메시 경로, GearParams 또는 None) (경계구/카탈로그용)
+        self.gear_links = {}  # 기어 링크 id -> (기어A, 기어B, 공칭 속도비) (텔레메트리 gear 채널용)
+
+class MotorSetpoint:
+    """
+    모터 하나의 속도 설정 상태
+    ChFunctionConst를 모터마다 하나만 만들어 두고 값만 바꿔서 재사용
+    """
+    __slots__ = ("motor", "func", "value", "target", "rate")
+
+    def __init__(self, motor, speed):
+        self.motor = motor
+        self.func = chrono.ChFunctionConst(speed)
+        self.value = speed      # 현재 적용 중인 속도
+        self.target = speed     # 램프 목표 속도
+        self.rate = None        # 램프 기울기 (rad/s^2), None이면 즉시 적용
+        motor.SetSpeedFunction(self.func)
+
+    def set(self, speed):
+        if speed != self.value:
+            self.func.SetConstant(speed)
+            self.value = speed
+
+def index_motors(motors):
+    """
+    모터 이름 -> MotorSetpoint 인덱스 생성
+    step_sim에서 명령마다 모든 모터를 훑으며 GetName()을 부르지 않도록 make_sim에서 한 번만 만든다
+    """
+    index = {}
+    for motor in motors:
+        name = motor.GetName()
+        if name in index:
+            print("[sim] 경고: 모터 이름 중복, 나중 것은 입력으로 제어 불가:", name)
+            continue
+        index[name] = MotorSetpoint(motor, motor.GetSpeedFunction().GetVal(0))
+    return index
 
 # Class SimHandle(시뮬레이션의 두뇌역할)
 # 여러 값들을 하나로 묶어서 관리
@@ -38,9 +105,10 @@ class SimHandle:
 # 2. make_sim() : 시뮬레이션 한 세트 초기화
 # Pychrono 시스템을 만들고 필요한 바디/조인트/모터를 준비해서 SimHandle이라는 리모컨 객체로 묶어 반환하는 함수
 
-def make_sim(model_meta, buffer_handle):
+def make_sim(model_meta, buffer_handle, checkpoint=None):
     # model_meta : json 형태의 메타 정보
     # buffer_handle : input/output 버퍼
+    # checkpoint : utils.checkpoint.Checkpoint (있으면 조립 후 그 상태로 복원)
     """
     model_meta 예시 구조 (조립 헬퍼 기반):
 
@@ -79,6 +147,11 @@ def make_sim(model_meta, buffer_handle):
             "fixed": False
         },
         "motor_speed": 2.0
+        },
+        {
+        "type": "sdf",
+        "path": "resources/model.sdf",
+        "motors": [{"joint": "rot1", "name": "shaft_motor", "speed": 5.0}]
         }
     ]
     }
@@ -105,9 +178,14 @@ def make_sim(model_meta, buffer_handle):
     assemblies = model_meta.get("assemblies", [])
     print(f"[sim] assemblies 개수 = {len(assemblies)}")
 
-    for asm in assemblies:
+    # 바디 → 어셈블리 id (interest 구독용, 지정이 없으면 "<type>_<순번>")
+    assembly_of = {}
+    ctx = BuildContext()
+
+    for asm_no, asm in enumerate(assemblies):
         asm_type = asm.get("type")
         print(f"[sim] assembly 처리: type = {asm_type}")
+        first_body = len(bodies)
 
         if asm_type == "shaft_base":
             shaft_meta = asm["shaft"]
@@ -122,6 +200,17 @@ def make_sim(model_meta, buffer_handle):
                 bodies=bodies,
                 joints=joints,
                 motors=motors,
+                ctx=ctx,
+            )
+
+        elif asm_type == "sdf":
+            create_sdf_model(
+                sys=sys,
+                sdf_meta=asm,
+                bodies=bodies,
+                joints=joints,
+                motors=motors,
+                ctx=ctx,
             )
 
         elif asm_type == "gear_pair":
@@ -137,23 +226,26 @@ def make_sim(model_meta, buffer_handle):
                 bodies=bodies,
                 joints=joints,
                 motors=motors,
+                ctx=ctx,
             )
 
         else:
             print("[sim] 알 수 없는 assembly type:", asm_type)
 
-    # 3) 모델 메타 기반 바디/조인트/모터 생성 (나중을 위한 부분)
-    for b in model_meta.get("bodies", []):
-        print("[sim] (flat) bodies 항목 발견 — 현재는 사용 안 함:", b)
-        # 나중에 create_body(b) 함수 넣을 자리
-
-    for j in model_meta.get("joints", []):
-        print("[sim] (flat) joints 항목 발견 — 현재는 사용 안 함:", j)
-        # 나중에 create_joint(j) 함수 넣을 자리
-
-    for m in model_meta.get("motors", []):
-        print("[sim] (flat) motors 항목 발견 — 현재는 사용 안 함:", m)
-        # 나중에 create_motor(m) 함수 넣을 자리
+        asm_id = asm.get("id", f"{asm_type}_{asm_no}")
+        for b in bodies[first_body:]:
+            assembly_of[id(b)] = asm_id
+
+    # 3) 모델 메타 기반 바디/조인트/모터 생성 (flat 목록, 형식은 flat_model.py 참고)
+    if any(model_meta.get(k) for k in ("bodies", "joints", "motors")):
+        create_flat_model(
+            sys=sys,
+            flat_meta=model_meta,
+            bodies=bodies,
+            joints=joints,
+            motors=motors,
+            ctx=ctx,
+        )
 
     # 4) SimHandle 만들어서 반환
     handle = SimHandle(
@@ -163,6 +255,19 @@ def make_sim(model_meta, buffer_handle):
         motors=motors,
         buffer=buffer_handle,
     )
+    handle.motor_index = index_motors(motors)
+    handle.body_names = [b.GetName() for b in bodies]
+    handle.joint_index = {j.GetName(): j for j in joints if j.GetName()}
+    handle.gear_links = {j.GetName(): ctx.gear_links[id(j)]
+                         for j in joints if id(j) in ctx.gear_links}
+    handle.channels = channel_names(list(handle.joint_index), list(handle.motor_index),
+                                    list(handle.gear_links))
+    handle.catalog = build_body_catalog(bodies, assembly_of, ctx.mesh_paths)
+    handle.dynamic_bodies = [(b, n) for b, n in zip(bodies, handle.body_names) if not b.IsFixed()]
+
+    # 5) 체크포인트가 있으면 마지막 상태에서 이어가기 (재시작)
+    if checkpoint is not None:
+        restore_checkpoint(handle, checkpoint)
 
     print(f"[sim] make_sim() 완료 → bodies={len(bodies)}, joints={len(joints)}, motors={len(motors)}")
     return handle
@@ -191,6 +296,53 @@ def body_to_state_dict(body):
     }
     return state
 
+## interest 구독용 바디 목록 (이름, 어셈블리, 초기 위치 기준 경계구)
+def build_body_catalog(bodies, assembly_of, mesh_paths):
+    """
+    반환 예시:
+    [{"name": "gear_A", "assembly": "gear_pair_1", "center": [x,y,z], "radius": 0.04,
+      "gear": {"type": "involute_gear", "module": 2.0, "teeth": 20, ...}}, ...]
+    ("gear"는 파라미터로 기술된 기어 바디에만, 클라이언트가 메시를 직접 생성/요청할 수 있게)
+
+    메시 bounding box의 가장 먼 꼭짓점까지 거리를 반지름으로 써서
+    바디가 제자리에서 회전해도 경계구 안에 들어오도록 함
+    mesh_paths: BuildContext.mesh_paths (바디 id -> (메시 경로, GearParams 또는 None))
+    """
+    catalog = []
+    for b in bodies:
+        pos = b.GetPos()
+        radius = 0.0
+        path, gear = mesh_paths.get(id(b), (None, None))
+        if path is not None:
+            x0, x1, y0, y1, z0, z1 = read_obj_bounds(path)
+            radius = m.sqrt(max(abs(x0), abs(x1)) ** 2 + max(abs(y0), abs(y1)) ** 2
+                            + max(abs(z0), abs(z1)) ** 2)
+        entry = {
+            "name": b.GetName(),
+            "assembly": assembly_of.get(id(b), "flat"),
+            "center": [pos.x, pos.y, pos.z],
+            "radius": radius,
+        }
+        if gear is not None:
+            entry["gear"] = gear.toDict()
+        catalog.append(entry)
+    return catalog
+
+def select_visible_bodies(handle):
+    """
+    구독 합집합에 해당하는 바디 목록 (합집합 객체가 바뀔 때만 다시 계산)
+    합집합이 None이면 전체 바디
+    """
+    union = handle.interest.union if handle.interest is not None else None
+    if union is not handle.visible_key:
+        handle.visible_key = union
+        if union is None:
+            handle.visible_bodies = handle.bodies
+        else:
+            handle.visible_bodies = [b for b, n in zip(handle.bodies, handle.body_names)
+                                     if n in union]
+    return handle.visible_bodies
+
 ## 한 프레임 전체 덤프 구조 만들기
 def dump_frame(t, bodies):
     """
@@ -216,18 +368,20 @@ def dump_frame(t, bodies):
 #==================================================================================================
 # 3. step_sim() : 시뮬레이션 한 스텝 진행
 
-def step_sim(handle, dt):
+def step_sim(handle, dt, publish=True):
     """
     한 프레임(dt 초)만큼 시뮬레이션을 진행하는 함수.
 
     1) 입력 버퍼 읽기 (있으면)
     2) 입력을 모터/바디에 반영
     3) PyChrono 시스템 한 스텝 진행
-    4) 현재 상태를 출력 버퍼에 기록
+    4) 현재 상태를 출력 버퍼에 기록 (publish=False면 생략, 보는 사람이 없을 때)
     """
 
     sys = handle.sys
     buffer = handle.buffer
+    perf = time.perf_counter
+    t0 = perf()
 
     # 1) 입력 읽기 (버퍼가 있고 read_inputs가 있으면 호출)
     inputs = None  #입력 없음 상태로 시작
@@ -239,45 +393,59 @@ def step_sim(handle, dt):
             print("[sim] read_inputs() 호출 중 에러:", e)
 
     # 2) 입력 -> 모터에 반영
-    #    inputs 예시:
-    #    {
-    #      "motors": [
-    #      {"name": "shaft_motor", "speed": 3.0},
-    #      {"name": "gearA_motor", "speed": 1.5}
-    #      ]
-    #    }
+    #    inputs 예시 (InputMailbox.read_inputs, 모터별 최신 값만 남아 있음):
+    #    {"shaft_motor": (3.0, None), "gearA_motor": (1.5, 2.0)}   # (속도, 램프 기울기)
+    #    또는 예전 형식:
+    #    {"motors": [{"name": "shaft_motor", "speed": 3.0}, ...]}
     #    - 아직 입력이 없으면 그냥 모터는 make_sim에서 설정한 기본 속도로 돈다
     if inputs is not None:
-        # 예시 형식: inputs = {"motors": [{"name": "shaft_motor", "speed": 3.0}, ...]}
-        # 입력이 있을 대만 모터 제어 실행
-        motor_cmds = inputs.get("motors", [])
-        for cmd in motor_cmds:
-            target_name = cmd.get("name")
-            target_speed = cmd.get("speed")
-
-            if target_name is None or target_speed is None:
-                continue
-
-            for m in handle.motors:
-                # 모터에 이름이 붙어 있다고 가정 (m.SetName(...)을 make_sim에서 해두면 좋음)
-                m_name = ""
-                if hasattr(m, "GetName"):
-                    m_name = m.GetName()
-
-                if m_name == target_name:
-                    # 간단하게: 새로운 Const 함수로 속도 갱신
-                    func = chrono.ChFunctionConst(target_speed)
-                    m.SetSpeedFunction(func)
-                    # print("[sim] 모터 속도 갱신:", m_name, "=", target_speed)
+        apply_motor_inputs(handle.motor_index, handle.ramping, inputs)
+
+    # 램프 중인 모터는 목표 속도 쪽으로 한 스텝만큼 이동
+    if handle.ramping:
+        advance_ramps(handle.motor_index, handle.ramping, dt)
+
+    t1 = perf()
+    SIM_STAGES.input.observe(t1 - t0)
+    tracing = TRACER.enabled
+    if tracing and inputs:
+        TRACER.complete("input_applied", t0, t1, cat="sim", args={"motors": len(inputs)})
 
     # 3) PyChrono 시스템 한 스텝 진행
     sys.DoStepDynamics(dt)
+    handle.step_count += 1
+    t2 = perf()
+    SIM_STAGES.physics.observe(t2 - t1)
+    if tracing:
+        TRACER.complete("physics", t1, t2, cat="sim")
+
+    # 기록은 보는 사람/구독과 상관없이 매 스텝 전체 바디
+    if handle.recorder is not None:
+        record_frame(handle)
+        t3 = perf()
+        SIM_STAGES.record.observe(t3 - t2)
+        if tracing:
+            TRACER.complete("record", t2, t3, cat="sim")
+        t2 = t3
     # ㄴ 현재 힘/토크/조인터 조건/모터 조건 등을 바탕으로 dt초 동안의 운동을 계산
     #   각 바디의 위치/속도/회전 상태 업데이트
 
+    if not publish:
+        return
+
     # 4) 현재 상태를 프레임(JSON용 dict)으로 만들기
     t = sys.GetChTime()  # 현재 시뮬레이션 시간
-    frame = dump_frame(t, handle.bodies)
+    frame = dump_frame(t, select_visible_bodies(handle))
+
+    # 구독 중인 텔레메트리 채널만 해당 스텝에 계산하고, 프레임에는 채널별 마지막 샘플을 담음
+    if handle.telemetry is not None:
+        active = handle.telemetry.active
+        if active:
+            samples = sample_telemetry(handle, active)
+            latest = handle.telemetry_samples.update(handle.step_count, samples, active)
+            if latest:
+                frame["step"] = handle.step_count
+                frame["telemetry"] = latest
     # frame 예시:
     # {
     #   "time": 0.05,
@@ -288,12 +456,128 @@ def step_sim(handle, dt):
     #   ]
     # }
 
+    t3 = perf()
+    SIM_STAGES.dump.observe(t3 - t2)
+    if tracing:
+        TRACER.complete("serialize", t2, t3, cat="sim", args={"bodies": len(frame["bodies"])})
+
     # 출력 버퍼가 있고 write_outputs가 구현되어 있다면 호출
     if buffer is not None and hasattr(buffer, "write_outputs"):
         try:
             buffer.write_outputs(frame)
         except Exception as e:
             print("[sim] write_outputs() 호출 중 에러:", e)
+        t4 = perf()
+        SIM_STAGES.commit.observe(t4 - t3)
+        if tracing:
+            TRACER.complete("commit", t3, t4, cat="sim")
+
+def record_frame(handle):
+    """현재 전체 바디 포즈를 기록기에 추가 (바디 순서 = handle.body_names)"""
+    values = []
+    for b in handle.bodies:
+        p = b.GetPos()
+        q = b.GetRot()
+        values += (p.x, p.y, p.z, q.e0, q.e1, q.e2, q.e3)
+    handle.recorder.append(handle.sys.GetChTime(), values)
+
+def capture_checkpoint(handle, model):
+    """
+    현재 상태를 Checkpoint로 복사 (시뮬레이션 스레드, 숫자 복사만 하고 직렬화는 CheckpointStore 기록 스레드)
+    고정 바디는 움직이지 않으므로 제외
+    """
+    from sim_server.utils.checkpoint import Checkpoint
+    state = []
+    for b, _ in handle.dynamic_bodies:
+        p = b.GetPos()
+        q = b.GetRot()
+        v = b.GetPosDt()
+        w = b.GetAngVelParent()
+        state += (p.x, p.y, p.z, q.e0, q.e1, q.e2, q.e3, v.x, v.y, v.z, w.x, w.y, w.z)
+    motors = {name: [sp.value, sp.target, sp.rate, sp.motor.GetMotorAngle()]
+              for name, sp in handle.motor_index.items()}
+    return Checkpoint(model=model, time=handle.sys.GetChTime(), step=handle.step_count,
+                      bodies=[n for _, n in handle.dynamic_bodies], state=state,
+                      motors=motors, wall=time.time())
+
+def restore_checkpoint(handle, checkpoint):
+    """
+    make_sim 직후 체크포인트 상태로 복원 (바디 포즈/속도, 모터 설정값, 시뮬레이션 시간)
+    이름이 없는 바디/모터는 건너뜀 (모델이 조금 바뀌어도 나머지는 이어감)
+    """
+    from sim_server.utils.checkpoint import BODY_STATE
+    by_name = {n: b for b, n in handle.dynamic_bodies}
+    restored = 0
+    for i, name in enumerate(checkpoint.bodies):
+        b = by_name.get(name)
+        if b is None:
+            continue
+        s = checkpoint.state[i * BODY_STATE:(i + 1) * BODY_STATE]
+        b.SetPos(chrono.ChVector3d(s[0], s[1], s[2]))
+        b.SetRot(chrono.ChQuaterniond(s[3], s[4], s[5], s[6]))
+        b.SetPosDt(chrono.ChVector3d(s[7], s[8], s[9]))
+        b.SetAngVelParent(chrono.ChVector3d(s[10], s[11], s[12]))
+        restored += 1
+
+    for name, (value, target, rate, angle) in checkpoint.motors.items():
+        sp = handle.motor_index.get(name)
+        if sp is None:
+            continue
+        sp.set(value)
+        sp.target = target
+        sp.rate = rate
+        if rate is not None and target != value:
+            handle.ramping.add(name)
+        # 속도 모터의 각도 드리프트 보정이 새 바디 각도를 처음 각도로 되돌리지 않도록 기준 각도 이동
+        try:
+            sp.motor.SetAngleOffset(angle)
+        except Exception as e:
+            print("[sim] 모터 기준 각도 복원 실패:", name, e)
+
+    handle.sys.SetChTime(checkpoint.time)
+    handle.step_count = checkpoint.step
+    print(f"[sim] 체크포인트 복원: t={checkpoint.time:.3f}, step={checkpoint.step}, "
+          f"bodies={restored}/{len(checkpoint.bodies)}")
+
+def sample_telemetry(handle, active):
+    """
+    이번 스텝에 샘플할 채널 값 계산 (active: {채널: decimation})
+    반환 예시: {"motor:gearA_motor": {"torque": 1.2, "speed": 2.0, "angle": 0.5}}
+    """
+    step = handle.step_count
+    samples = {}
+    for channel, decimation in active.items():
+        if step % decimation:
+            continue
+        kind, target = parse_channel(channel)
+        try:
+            if kind == "reaction":
+                link = handle.joint_index.get(target)
+                if link is None:
+                    continue
+                wrench = link.GetReaction2()
+                f, tq = wrench.force, wrench.torque
+                samples[channel] = {"force": [f.x, f.y, f.z], "torque": [tq.x, tq.y, tq.z]}
+            elif kind == "motor":
+                sp = handle.motor_index.get(target)
+                if sp is None:
+                    continue
+                motor = sp.motor
+                samples[channel] = {"torque": motor.GetMotorTorque(),
+                                    "speed": motor.GetMotorAngleDt(),
+                                    "angle": motor.GetMotorAngle()}
+            elif kind == "gear":
+                pair = handle.gear_links.get(target)
+                if pair is None:
+                    continue
+                gearA, gearB, nominal = pair
+                wA = gearA.GetAngVelParent().Length()
+                wB = gearB.GetAngVelParent().Length()
+                samples[channel] = {"ratio": (wB / wA) if wA > 1e-9 else None,
+                                    "nominal": nominal}
+        except Exception as e:
+            print("[sim] 텔레메트리 계산 에러:", channel, e)
+    return samples
 
 #==================================================================================================
 
@@ -323,6 +607,14 @@ def kill_sim(handle):
             except Exception as e:
                 print("[sim] JSON 저장 중 오류:", e)
 
+    # 스트리밍 기록기는 남은 청크만 마저 기록
+    if handle.recorder is not None:
+        try:
+            handle.recorder.close()
+            print(f"[sim] 프레임 기록 완료: {handle.recorder.run_dir} ({handle.recorder.frames} frames)")
+        except Exception as e:
+            print("[sim] 프레임 기록 종료 중 오류:", e)
+
     # 2) PyChrono 시스템 자체는 C++ 기반이라,
     #    Python 쪽에서는 크게 정리할 게 없음.
     #    필요한 경우 여기서 custom cleanup 가능.
@@ -344,9 +636,23 @@ def kill_sim(handle):
 
 ## 1) OBJ bounding box → 중심/회전축 자동 검출
 
+def file_key(path):
+    """
+    메시 캐시 키 (경로, 수정 시각, 크기)
+    같은 경로에 파일이 다시 만들어지면(MeshResolver의 <stem>_s<scale>.obj 변환본 등) 새로 읽도록
+    """
+    st = os.stat(path)
+    return str(path), st.st_mtime_ns, st.st_size
+
 def read_obj_bounds(path):
+    """OBJ 꼭짓점의 (xmin, xmax, ymin, ymax, zmin, zmax)"""
+    return _read_obj_bounds(file_key(path))
+
+# 같은 메시를 여러 바디가 쓰면 파일을 한 번만 읽음 (최근 것만 유지)
+@lru_cache(maxsize=256)
+def _read_obj_bounds(key):
     xs, ys, zs = [], [], []
-    with open(path, "r") as f:
+    with open(key[0], "r") as f:
         for line in f:
             if line.startswith("v "):
                 _, x, y, z = line.split()
@@ -384,37 +690,31 @@ def detect_axis_and_center(path):
 
 
 
-## 2) 기어 파일명에서 module(m)/teeth(z) 파싱 + 피치반지름 계산
-
-import re
+## 2) 기어 바디 meta → 메시 경로 (피치반지름 계산은 utils/gear_mesh.py)
 
-def parse_module_teeth_from_name(fn):
+def mesh_path_of(meta):
     """
-    파일명에서 m(모듈, mm)과 z(치수)를 파싱한다.
-    예: gear_A_m2_z20.obj
+    바디 meta에서 로드할 OBJ 경로를 결정
+    "gear" 파라미터가 있으면 생성된 기어 메시 경로, 아니면 "mesh" 경로
     """
-    name = fn.lower()
-    m_m = re.search(r"m(\d+(\.\d+)?)", name)
-    m_z = re.search(r"z(\d+)", name)
+    if "gear" in meta:
+        return gear_obj_path(GearParams.fromDict(meta["gear"]))
+    return meta["mesh"]
 
-    if not (m_m and m_z):
-        return None, None
+## 3) OBJ 로드하여 ChBodyEasyMesh 생성
 
-    return float(m_m.group(1)), int(m_z.group(1))
+# 메시 캐시: file_key(OBJ 경로) -> ChTriangleMeshConnected (최근 것만 유지)
+# 같은 메시를 쓰는 바디는 파싱된 메시 객체를 공유 (ChBodyEasyMesh를 compute_mass=False로
+# 만들 때는 메시를 변형하지 않으므로 공유해도 안전, 캐시에서 빠져도 바디가 참조를 들고 있음)
+def load_mesh(path):
+    """OBJ 파일을 한 번만 파싱해서 캐시된 ChTriangleMeshConnected 반환 (파일이 바뀌면 다시 파싱)"""
+    return _load_mesh(file_key(path))
 
-def pitch_radius_from_name(fn, fallback=None):
-    """
-    피치반지름 r[m] = (module[m] * z) / 2
-    파일명에서 정보가 없으면 fallback 사용
-    """
-    module_mm, z = parse_module_teeth_from_name(fn)
-    if module_mm and z:
-        module_m = module_mm / 1000.0
-        return 0.5 * module_m * z
-    return fallback
+@lru_cache(maxsize=64)
+def _load_mesh(key):
+    return chrono.ChTriangleMeshConnected.CreateFromWavefrontFile(key[0], True, True)
 
-## 3) OBJ 로드하여 ChBodyEasyMesh 생성
-def load_body_from_obj(meta):
+def load_body_from_obj(meta, ctx=None):
     """
     meta = {
         "name": "shaft",
@@ -423,14 +723,24 @@ def load_body_from_obj(meta):
         "mass": 1000,
         "fixed": False
     }
+
+    기어는 mesh 대신 파라미터로 기술할 수 있음 (메시는 캐시에서 생성/재사용):
+    meta = {
+        "name": "gear_A",
+        "gear": {"module": 2, "teeth": 20, "face_width": 10, "bore": 5},
+        "mass": 1000
+    }
     """
 
-    path = meta["mesh"]
+    path = mesh_path_of(meta)
     mass = meta.get("mass", 1000)
     fixed = meta.get("fixed", False)
 
-    body = chrono.ChBodyEasyMesh(path, mass, False, True)
+    body = chrono.ChBodyEasyMesh(load_mesh(path), mass, False, True, False)
     body.SetName(meta.get("name", "unnamed"))
+    if ctx is not None:
+        gear = GearParams.fromDict(meta["gear"]) if "gear" in meta else None
+        ctx.mesh_paths[id(body)] = (path, gear)  # make_sim에서 경계구/카탈로그 계산용
     body.SetFixed(fixed)
 
     return body
@@ -464,7 +774,12 @@ def quat_from_axis(axis: chrono.ChVector3d):
     if axis.x == 0 and axis.y == 1 and axis.z == 0:
         return chrono.QuatFromAngleX(+m.pi / 2)
 
-    # 혹시 모르는 이상한 경우에는 그냥 QUNIT
+    # 그 밖의 임의 축(SDF 조인트 등)은 z축 -> axis 최소 회전
+    length = axis.Length()
+    if length > 0:
+        return chrono.QuatFromVec2Vec(chrono.ChVector3d(0, 0, 1), axis * (1.0 / length))
+
+    # 길이가 0인 이상한 경우에는 그냥 QUNIT
     return chrono.QUNIT
 
 
@@ -508,10 +823,11 @@ def make_rotation_motor(sys, body, base, center, axis, speed):
 
 
 ## 4) make_gear_link : 기어 링크 생성 헬퍼
-def make_gear_link(sys, gearA, gearB, rA, rB):
+def make_gear_link(sys, gearA, gearB, rA, rB, ctx=None):
     """
     gearA, gearB : ChBody
     rA, rB       : pitch radius (meter)
+    ctx          : BuildContext (있으면 텔레메트리 gear 채널용으로 기록)
     """
 
     ratio = (rA / rB) if rB != 0 else 1.0
@@ -521,6 +837,30 @@ def make_gear_link(sys, gearA, gearB, rA, rB):
     link.SetTransmissionRatio(ratio)
     link.SetEnforcePhase(False)  # 위상 강제 X (프리한 회전)
 
+    sys.AddLink(link)
+    if ctx is not None:
+        # 텔레메트리 gear 채널용 (make_sim에서 handle.gear_links로 옮김)
+        ctx.gear_links[id(link)] = (gearA, gearB, ratio)
+    return link
+
+## 5) make_fixed_link : 고정 조인트 생성 헬퍼
+def make_fixed_link(sys, body, base, center):
+    """body를 base에 center 위치에서 완전히 고정"""
+
+    link = chrono.ChLinkLockLock()
+    link.Initialize(body, base, chrono.ChFramed(center, chrono.QUNIT))
+    sys.AddLink(link)
+    return link
+
+
+## 6) make_prismatic : 직선 조인트 생성 헬퍼
+def make_prismatic(sys, body, base, center, axis):
+    """axis 방향(로컬 z축)으로만 미끄러지는 조인트"""
+
+    frame = chrono.ChFramed(center, quat_from_axis(axis))
+
+    link = chrono.ChLinkLockPrismatic()
+    link.Initialize(body, base, frame)
     sys.AddLink(link)
     return link
 
@@ -528,7 +868,8 @@ def make_gear_link(sys, gearA, gearB, rA, rB):
 # 3.조립헬퍼
 ## 1) 샤프트 + 베이스 + 회전조인트 + 모터
 
-def create_shaft_with_base(sys, shaft_meta, base_meta, motor_speed, bodies, joints, motors):
+def create_shaft_with_base(sys, shaft_meta, base_meta, motor_speed, bodies, joints, motors,
+                           ctx=None):
     """
     샤프트-베이스 한 세트를 조립하는 헬퍼.
 
@@ -550,22 +891,23 @@ def create_shaft_with_base(sys, shaft_meta, base_meta, motor_speed, bodies, join
     motor_speed = 5.0  # rad/s
 
     bodies, joints, motors : SimHandle에 들어갈 리스트들 (참조로 전달)
+    ctx : BuildContext (make_sim에서 넘김, 없으면 부가 정보를 모으지 않음)
     """
 
     # 베이스 바디 생성
-    base = load_body_from_obj(base_meta)
+    base = load_body_from_obj(base_meta, ctx)
     base.SetFixed(True)  # 베이스는 무조건 고정
     sys.Add(base)
     bodies.append(base)
 
     # 샤프트 바디 생성
-    shaft = load_body_from_obj(shaft_meta)
+    shaft = load_body_from_obj(shaft_meta, ctx)
     shaft.SetFixed(False)  # 샤프트는 회전할 수 있어야 함
     sys.Add(shaft)
     bodies.append(shaft)
 
     # 샤프트 OBJ에서 중심/회전축 자동 검출
-    shaft_mesh_path = shaft_meta["mesh"]
+    shaft_mesh_path = mesh_path_of(shaft_meta)
     shaft_center, shaft_axis = detect_axis_and_center(shaft_mesh_path)
 
     print("[asm] shaft center =", shaft_center)
@@ -579,6 +921,7 @@ def create_shaft_with_base(sys, shaft_meta, base_meta, motor_speed, bodies, join
         center=shaft_center,
         axis=shaft_axis
     )
+    rev.SetName(f"{shaft_meta.get('name', 'shaft')}_revolute")
     joints.append(rev)
 
     # 회전 모터 생성 (샤프트 - 베이스)
@@ -606,7 +949,8 @@ def create_shaft_with_base(sys, shaft_meta, base_meta, motor_speed, bodies, join
 
 ## 2) 기어 A/B + 조인트 + 모터 + 기어링크
 
-def create_gear_pair(sys, gearA_meta, gearB_meta, motor_speed, bodies, joints, motors, ground=None):
+def create_gear_pair(sys, gearA_meta, gearB_meta, motor_speed, bodies, joints, motors, ground=None,
+                     ctx=None):
     """
     기어 두 개(gearA, gearB)를 한 세트로 조립하는 헬퍼.
 
@@ -617,11 +961,18 @@ def create_gear_pair(sys, gearA_meta, gearB_meta, motor_speed, bodies, joints, m
         "mass": 1000,
         "fixed": False   # 여기서는 회전 가능 바디로 사용
     }
+    또는 메시 없이 파라미터로:
+    {
+        "name": "gear_A",
+        "gear": {"module": 2, "teeth": 20, "face_width": 10, "bore": 5},
+        "mass": 1000
+    }
 
     motor_speed : rad/s (기어 A에 거는 모터 기본 속도)
 
     bodies, joints, motors : SimHandle에 들어갈 리스트들 (참조로 전달)
     ground : 고정 기준 바디 (없으면 여기서 새로 생성)
+    ctx : BuildContext (make_sim에서 넘김)
     """
 
     # ground(고정 기준 바디) 준비
@@ -632,22 +983,19 @@ def create_gear_pair(sys, gearA_meta, gearB_meta, motor_speed, bodies, joints, m
         bodies.append(ground)
 
     # 기어 바디 생성
-    gearA = load_body_from_obj(gearA_meta)
+    gearA = load_body_from_obj(gearA_meta, ctx)
     gearA.SetFixed(False)
     sys.Add(gearA)
     bodies.append(gearA)
 
-    gearB = load_body_from_obj(gearB_meta)
+    gearB = load_body_from_obj(gearB_meta, ctx)
     gearB.SetFixed(False)
     sys.Add(gearB)
     bodies.append(gearB)
 
-    # 파일명에서 피치반지름 rA, rB 계산
-    fnA = os.path.basename(gearA_meta["mesh"])
-    fnB = os.path.basename(gearB_meta["mesh"])
-
-    rA = pitch_radius_from_name(fnA, fallback=gearA_meta.get("pitch_radius", 0.02))
-    rB = pitch_radius_from_name(fnB, fallback=gearB_meta.get("pitch_radius", 0.04))
+    # 기어 파라미터 또는 파일명에서 피치반지름 rA, rB 계산
+    rA = gear_pitch_radius(gearA_meta, fallback=gearA_meta.get("pitch_radius", 0.02))
+    rB = gear_pitch_radius(gearB_meta, fallback=gearB_meta.get("pitch_radius", 0.04))
 
     print(f"[gear] A pitch radius = {rA:.6f} m")
     print(f"[gear] B pitch radius = {rB:.6f} m")
@@ -679,6 +1027,8 @@ def create_gear_pair(sys, gearA_meta, gearB_meta, motor_speed, bodies, joints, m
         center=centerB,
         axis=axis,
     )
+    revA.SetName(f"{gearA_meta.get('name', 'gear_A')}_revolute")
+    revB.SetName(f"{gearB_meta.get('name', 'gear_B')}_revolute")
     joints.extend([revA, revB])
 
     # 5) 모터 (gearA - ground)
@@ -695,7 +1045,8 @@ def create_gear_pair(sys, gearA_meta, gearB_meta, motor_speed, bodies, joints, m
     motors.append(motor)
 
     # 6) 기어링크 (gearA - gearB)
-    gear_link = make_gear_link(sys, gearA, gearB, rA, rB)
+    gear_link = make_gear_link(sys, gearA, gearB, rA, rB, ctx)
+    gear_link.SetName(f"{gearA_meta.get('name', 'gear_A')}_{gearB_meta.get('name', 'gear_B')}_gear")
     joints.append(gear_link)
 
     print(f"[gear] gear pair 조립 완료 (motor speed = {motor_speed} rad/s)")
@@ -709,3 +1060,146 @@ def create_gear_pair(sys, gearA_meta, gearB_meta, motor_speed, bodies, joints, m
         "gear_link": gear_link,
     }
 
+## 3) SDF 모델 (utils/sdf_parser.py 변환 결과를 위 헬퍼들로 조립)
+
+def create_sdf_model(sys, sdf_meta, bodies, joints, motors, ground=None, ctx=None):
+    """
+    SDF 파일 하나를 조립하는 헬퍼.
+
+    sdf_meta 예시:
+    {
+        "type": "sdf",
+        "path": "resources/model.sdf",
+        "search_dirs": ["resources"],      # 메시 URI 탐색 경로 (선택)
+        "fix_roots": True,                  # 조인트 child가 아닌 링크 고정 (선택)
+        "motors": [                         # SDF에는 모터가 없으므로 조인트에 붙여서 지정 (선택)
+            {"joint": "rot1", "name": "shaft_motor", "speed": 5.0}
+        ]
+    }
+
+    변환 결과는 파일 해시로 캐시되므로 같은 파일은 두 번째부터 파싱하지 않음
+    """
+
+    compiled = load_sdf(
+        sdf_meta["path"],
+        search_dirs=sdf_meta.get("search_dirs", []),
+        fix_roots=sdf_meta.get("fix_roots", True),
+    )
+    print(f"[sdf] {compiled['source']}: links={len(compiled['bodies'])}, "
+          f"joints={len(compiled['joints'])}, meshes={len(compiled['meshes'])}")
+
+    # 변환 결과는 flat 형식과 같으므로 모터만 조인트 참조로 붙여서 flat 빌더로 조립
+    flat_meta = {
+        "bodies": compiled["bodies"],
+        "joints": compiled["joints"],
+        "motors": [
+            {"name": mm.get("name", f"{mm['joint']}_motor"), "joint": mm["joint"],
+             "speed": mm.get("speed", 0.0)}
+            for mm in sdf_meta.get("motors", [])
+        ],
+    }
+    by_name = create_flat_model(sys, flat_meta, bodies, joints, motors, ground=ground, ctx=ctx)
+
+    print("[sdf] SDF 모델 조립 완료")
+    return by_name
+
+
+## 4) flat bodies/joints/motors (범용 데이터 기반 조립)
+
+def create_flat_model(sys, flat_meta, bodies, joints, motors, ground=None, ctx=None):
+    """
+    flat "bodies" / "joints" / "motors" 목록을 조립하는 범용 헬퍼.
+    형식과 검증 규칙은 flat_model.py 참고
+
+    - plan_flat_model()로 전체를 한 번 검증 (틀린 항목이 있으면 아무것도 만들지 않고 ValueError)
+    - 이름 참조는 dict 인덱스로 해석 → 부품 수에 거의 선형
+    - 바디를 모두 만든 뒤 한 번에 추가하고, 그다음 조인트/모터를 순서대로 추가
+
+    반환 : 이름 -> ChBody dict
+    """
+
+    plan = plan_flat_model(flat_meta)
+
+    # 1) 바디 생성 (의존 순서, 월드 포즈 적용)
+    new_bodies = []
+    by_name = {}
+    for b in plan.bodies:
+        if b.get("mesh") or "gear" in b:
+            body = load_body_from_obj(b, ctx)
+        else:
+            # 메시 없는 바디 (더미 링크 등)
+            body = chrono.ChBody()
+            body.SetName(b["name"])
+            body.SetFixed(b.get("fixed", False))
+
+        body.SetPos(chrono.ChVector3d(*b["pos"]))
+        body.SetRot(chrono.ChQuaterniond(*b["rot"]))
+        if "mass" in b:
+            body.SetMass(b["mass"])
+        inertia = b.get("inertia")
+        if inertia:
+            body.SetInertiaXX(chrono.ChVector3d(inertia["ixx"], inertia["iyy"], inertia["izz"]))
+            body.SetInertiaXY(chrono.ChVector3d(inertia["ixy"], inertia["ixz"], inertia["iyz"]))
+
+        new_bodies.append(body)
+        by_name[b["name"]] = body
+
+    if plan.needs_ground and ground is None:
+        ground = chrono.ChBody()
+        ground.SetName("ground")
+        ground.SetFixed(True)
+        new_bodies.append(ground)
+
+    # 바디는 한 번에 추가
+    for body in new_bodies:
+        sys.Add(body)
+    bodies.extend(new_bodies)
+
+    def resolve(ref):
+        return ground if is_world(ref) else by_name[ref]
+
+    def vec(v, default=(0.0, 0.0, 0.0)):
+        return chrono.ChVector3d(*(v if v is not None else default))
+
+    # 2) 조인트
+    for j in plan.joints:
+        jtype = j.get("type", "revolute")
+        body = by_name[j["body"]]
+        base = resolve(j.get("base"))
+
+        if jtype == "revolute":
+            link = make_revolute(sys, body, base, vec(j["center"]), vec(j.get("axis"), (0, 0, 1)))
+        elif jtype == "prismatic":
+            link = make_prismatic(sys, body, base, vec(j["center"]), vec(j.get("axis"), (0, 0, 1)))
+        elif jtype == "fixed":
+            link = make_fixed_link(sys, body, base, vec(j["center"]))
+        else:  # gear: 피치반지름(또는 ratio)은 plan_flat_model에서 미리 계산됨
+            link = make_gear_link(sys, body, base, j["pitch_radius_a"], j["pitch_radius_b"], ctx)
+
+        link.SetName(j["name"])
+        joints.append(link)
+
+    # 3) 모터 (조인트 참조 시 그 조인트의 위치/축 사용)
+    for mm in plan.motors:
+        if "joint" in mm:
+            j = plan.joint_index[mm["joint"]]
+            body, base = by_name[j["body"]], resolve(j.get("base"))
+            center, axis = j["center"], j.get("axis")
+        else:
+            body, base = by_name[mm["body"]], resolve(mm.get("base"))
+            center, axis = mm["center"], mm.get("axis")
+
+        motor = make_rotation_motor(
+            sys=sys,
+            body=body,
+            base=base,
+            center=vec(center),
+            axis=vec(axis, (0, 0, 1)),
+            speed=mm.get("speed", 0.0),
+        )
+        motor.SetName(mm["name"])
+        motors.append(motor)
+
+    print(f"[flat] 조립 완료 → bodies={len(new_bodies)}, "
+          f"joints={len(plan.joints)}, motors={len(plan.motors)}")
+    return by_name
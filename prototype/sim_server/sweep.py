@@ -0,0 +1,403 @@
+"""
+헤드리스 배치 실행 / 파라미터 스윕 (실시간 페이싱 없이 프로세스 풀에서)
+
+모델 설명 하나에 스윕(모터 속도, 질량, 기어 크기 ...)을 적용해 변형(variant)을 만들고,
+각 변형을 워커 프로세스에서 대기 없이 끝까지 스텝한 뒤 기록(frame_recorder 형식)과 요약 지표를 남긴다
+실시간 서버처럼 하나씩 지켜보는 대신 멀티코어 머신 한 대에서 수백 개를 밤새 비교하는 용도
+
+사용법 (prototype 디렉토리에서):
+    python -m sim_server.sweep model.json --set assemblies.1.motor_speed=1,2,4 \\
+        --set assemblies.1.gearB.gear.teeth=30,40,60 --duration 20 --workers 8 --out sweeps/gears
+    python -m sim_server.sweep model.json --sweep sweep.json --record-every 10 --resume --out sweeps/mass
+
+파라미터 경로: 모델 설명 안의 점(.)으로 구분된 키, 숫자는 리스트 인덱스
+    assemblies.0.motor_speed         assemblies.1.gearA.mass         assemblies.1.gearA.gear.teeth
+값은 JSON으로 해석 (1.5, true, "text", [1,2]), 안 되면 문자열
+--set의 값 목록은 괄호/따옴표 밖의 쉼표로 나눔 (--set pos=[0,0,1],[0,1,0] → 값 2개)
+
+스윕 파일 (--sweep):
+    {"parameters": {"assemblies.0.motor_speed": [1, 2, 5], "assemblies.0.shaft.mass": [100, 500]},
+     "mode": "grid"}                              # grid: 모든 조합 (기본), zip: 같은 위치끼리
+    {"variants": [{"assemblies.0.motor_speed": 1}, {"assemblies.0.shaft.mass": 50}]}   # 직접 나열
+
+출력 디렉토리:
+    <out>/variant_0000/   meta.json, poses_*.f32, times_*.f64 (RecordedRun으로 열기)
+                          variant.json (적용한 파라미터 + 모델 설명), summary.json, log.txt (워커 출력)
+    <out>/summary.json    전체 보고서 (변형별 요약 + 실행 설정)
+    <out>/summary.csv     변형별 한 줄 (파라미터 + 주요 지표, 스프레드시트 비교용)
+
+요약 지표 (analytics.py):
+    realtime_factor   시뮬레이션 시간 / 실제 걸린 시간
+    diverged          기록된 포즈에 NaN/inf가 있으면 true
+    bodies            바디별 RPM 평균/변동계수, 축 흔들림 최대, 위치 변화 최대
+    gears             gear_pair 어셈블리의 실효 변속비 (기어 파라미터가 있으면 공칭 변속비 대비 오차)
+"""
+import copy
+import csv
+import io
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# sim_server 디렉토리 안에서도 실행할 수 있도록 상위 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+DEFAULT_DT = 1 / 60
+
+
+# ---------------------------------------------------------------- 스윕 정의
+
+def parse_value(text: str):
+    """ "1.5" → 1.5, "true" → True, "[1,2]" → [1, 2], 그 외는 문자열 그대로 """
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def split_values(text: str) -> List[str]:
+    """ '1,[2,3],"a,b"' → ['1', '[2,3]', '"a,b"'] (괄호/따옴표 안의 쉼표는 나누지 않음) """
+    parts, start, depth, quote, escaped = [], 0, 0, False, False
+    for i, ch in enumerate(text):
+        if quote:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                quote = False
+        elif ch == '"':
+            quote = True
+        elif ch in "[{":
+            depth += 1
+        elif ch in "]}":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    if quote or depth != 0:
+        raise ValueError(f"괄호/따옴표가 닫히지 않음: {text}")
+    parts.append(text[start:])
+    return parts
+
+
+def parse_set(spec: str):
+    """
+    "assemblies.0.motor_speed=1,2,5" → ("assemblies.0.motor_speed", [1, 2, 5])
+    "assemblies.0.shaft.pos=[0,0,1],[0,1,0]" → ("assemblies.0.shaft.pos", [[0, 0, 1], [0, 1, 0]])
+    """
+    path, sep, values = spec.partition("=")
+    if not sep or not path or not values:
+        raise ValueError(f"--set 형식은 경로=값1,값2,... ({spec})")
+    return path.strip(), [parse_value(v.strip()) for v in split_values(values)]
+
+
+def expand_sweep(parameters: Dict[str, list], mode: str = "grid") -> List[dict]:
+    """파라미터별 값 목록 → 변형별 {경로: 값} 목록"""
+    if not parameters:
+        return [{}]
+    paths = list(parameters)
+    if mode == "grid":
+        combos = itertools.product(*(parameters[p] for p in paths))
+    elif mode == "zip":
+        lengths = {len(parameters[p]) for p in paths}
+        if len(lengths) != 1:
+            raise ValueError(f"zip 모드는 파라미터별 값 개수가 같아야 함 ({sorted(lengths)})")
+        combos = zip(*(parameters[p] for p in paths))
+    else:
+        raise ValueError(f"알 수 없는 스윕 모드: {mode} (grid 또는 zip)")
+    return [dict(zip(paths, combo)) for combo in combos]
+
+
+def load_sweep(path) -> List[dict]:
+    spec = json.loads(Path(path).read_text(encoding="utf-8"))
+    if "variants" in spec:
+        return list(spec["variants"])
+    return expand_sweep(spec.get("parameters", {}), spec.get("mode", "grid"))
+
+
+def apply_params(description: dict, params: dict) -> dict:
+    """
+    모델 설명 사본에 {경로: 값} 적용
+    마지막 키만 새로 만들 수 있음 (기본값을 쓰던 mass 등), 중간 경로가 없으면 오타로 보고 KeyError
+    """
+    out = copy.deepcopy(description)
+    for path, value in params.items():
+        keys = path.split(".")
+        node = out
+        for i, key in enumerate(keys):
+            last = i == len(keys) - 1
+            if isinstance(node, list):
+                try:
+                    index = int(key)
+                    if last:
+                        node[index] = value
+                    else:
+                        node = node[index]
+                except (ValueError, IndexError):
+                    raise KeyError(f"{path}: 리스트 인덱스 {key}가 없음") from None
+            elif isinstance(node, dict):
+                if last:
+                    node[key] = value
+                elif key in node:
+                    node = node[key]
+                else:
+                    raise KeyError(f"{path}: 키 {key}가 없음")
+            else:
+                raise KeyError(f"{path}: {'.'.join(keys[:i])}가 dict/리스트가 아님")
+    return out
+
+
+def gear_pairs(description: dict) -> list:
+    """gear_pair 어셈블리 → analytics 기어 쌍 (driver, driven, 공칭 변속비 또는 None)"""
+    pairs = []
+    for asm in description.get("assemblies", []):
+        if asm.get("type") != "gear_pair":
+            continue
+        a, b = asm.get("gearA", {}), asm.get("gearB", {})
+        nominal = None
+        ta, tb = a.get("gear", {}).get("teeth"), b.get("gear", {}).get("teeth")
+        if ta and tb:
+            nominal = ta / tb
+        pairs.append((a.get("name", "gear_A"), b.get("name", "gear_B"), nominal))
+    return pairs
+
+
+# ---------------------------------------------------------------- 변형 하나 실행 (워커)
+
+def run_settings(description: dict, duration: float, dt: float, record_every: int) -> dict:
+    """결과를 재사용해도 되는지 판단하는 실행 설정 (variant summary.json의 "run")"""
+    from sim_server.utils.checkpoint import model_key
+    return {"model": model_key(description), "duration": duration, "dt": dt,
+            "record_every": max(int(record_every), 1)}
+
+
+def run_variant(index: int, description: dict, params: dict, out_dir: str,
+                duration: float, dt: float = DEFAULT_DT, record_every: int = 1,
+                gears: Optional[list] = None) -> dict:
+    """
+    변형 하나를 대기 없이 끝까지 실행하고 요약 dict 반환 (워커 프로세스, 예외도 요약에 담아 반환)
+    시뮬레이터/기록기 출력은 <variant>/log.txt로
+    """
+    run_dir = Path(out_dir) / f"variant_{index:04d}"
+    run_dir.mkdir(parents=True, exist_ok=True)
+    summary = {"variant": index, "params": params, "run_dir": str(run_dir),
+               "run": run_settings(description, duration, dt, record_every)}
+    (run_dir / "variant.json").write_text(
+        json.dumps({"params": params, "description": description}, indent=2, ensure_ascii=False),
+        encoding="utf-8")
+
+    with open(run_dir / "log.txt", "w", encoding="utf-8") as log, \
+            redirect_stdout(log), redirect_stderr(log):
+        try:
+            summary.update(_simulate(description, run_dir, duration, dt, record_every))
+            if gears is None:
+                gears = gear_pairs(description)
+            summary.update(_analyze(run_dir, gears))
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            summary["error"] = f"{type(e).__name__}: {e}"
+
+    (run_dir / "summary.json").write_text(json.dumps(summary, indent=2, ensure_ascii=False),
+                                          encoding="utf-8")
+    return summary
+
+
+def _simulate(description: dict, run_dir: Path, duration: float, dt: float,
+              record_every: int) -> dict:
+    from sim_server.simInterface import make_sim
+    from sim_server.utils.frame_recorder import FrameRecorder
+
+    start = time.perf_counter()
+    simulator = make_sim(description, None)
+    build_s = time.perf_counter() - start
+    recorder = FrameRecorder(run_dir, simulator.bodyNames)
+    steps = int(round(duration / dt))
+    record_every = max(int(record_every), 1)
+
+    start = time.perf_counter()
+    try:
+        for i in range(1, steps + 1):
+            # 기록은 record_every 스텝마다만 (기록기를 그 스텝에만 연결)
+            simulator.attach(recorder=recorder if i % record_every == 0 else None)
+            simulator.step(dt, publish=False)
+        wall_s = time.perf_counter() - start
+        sim_time = simulator.time
+    finally:
+        simulator.attach(recorder=recorder)
+        simulator.clear()  # 기록기의 남은 청크도 여기서 기록
+        recorder.close()
+    return {
+        "backend": simulator.name,
+        "steps": steps,
+        "dt": dt,
+        "sim_time": sim_time,
+        "frames": recorder.frames,
+        "build_s": build_s,
+        "wall_s": wall_s,
+        "realtime_factor": sim_time / wall_s if wall_s > 0 else None,
+    }
+
+
+def _analyze(run_dir: Path, gears: list) -> dict:
+    import numpy as np
+    from sim_server import analytics
+    from sim_server.utils.frame_recorder import RecordedRun
+
+    run = RecordedRun(run_dir)
+    if len(run) < 2:
+        return {"diverged": False, "bodies": {}, "gears": []}
+    diverged = not all(bool(np.isfinite(block).all())
+                       for body in run.body_names
+                       for _, block in analytics.iter_blocks(run, body))
+    bodies = {}
+    for body in run.body_names:
+        report = analytics.analyze_body(run, body)
+        bodies[body] = {"rpm_mean": report["rpm"].get("mean"), "rpm_cv": report["rpm"].get("cv"),
+                        "wobble_deg_max": report["wobble_deg"].get("max"),
+                        "drift_m_max": report["position_drift_m"].get("max")}
+    names = set(run.body_names)
+    gear_reports = [analytics.analyze_gear_pair(run, a, b, nominal)
+                    for a, b, nominal in gears if a in names and b in names]
+    return {"diverged": diverged, "bodies": bodies, "gears": gear_reports}
+
+
+# ---------------------------------------------------------------- 스윕 전체
+
+def run_sweep(description: dict, variants: List[dict], out_dir, duration: float,
+              dt: float = DEFAULT_DT, record_every: int = 1, workers: Optional[int] = None,
+              gears: Optional[list] = None, resume: bool = False) -> dict:
+    """
+    변형들을 프로세스 풀에서 실행하고 보고서 dict 반환 (<out>/summary.json, summary.csv도 기록)
+
+    Args:
+        variants: 변형별 {경로: 값} (expand_sweep / load_sweep)
+        workers: 워커 프로세스 수 (기본 CPU 수)
+        gears: 분석할 기어 쌍 [(driver, driven, nominal)] (없으면 gear_pair 어셈블리에서)
+        resume: summary.json이 있는 (에러 없는) 변형은 다시 실행하지 않음
+                (파라미터, 모델 설명, duration/dt/record_every가 모두 같을 때만)
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(variants) or 1))
+    descriptions = [apply_params(description, params) for params in variants]  # 경로 오류는 실행 전에
+
+    results: Dict[int, dict] = {}
+    pending = []
+    for i, params in enumerate(variants):
+        previous = out_dir / f"variant_{i:04d}" / "summary.json"
+        if resume and previous.exists():
+            summary = json.loads(previous.read_text(encoding="utf-8"))
+            if ("error" not in summary and summary.get("params") == params
+                    and summary.get("run") == run_settings(descriptions[i], duration, dt,
+                                                           record_every)):
+                results[i] = summary
+                continue
+        pending.append(i)
+    if results:
+        print(f"[sweep] 이전 결과 재사용: {len(results)}개", file=sys.stderr)
+
+    start = time.perf_counter()
+    done = 0
+    args = dict(out_dir=str(out_dir), duration=duration, dt=dt, record_every=record_every,
+                gears=gears)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_variant, i, descriptions[i], variants[i], **args): i
+                   for i in pending}
+        for future in as_completed(futures):
+            summary = future.result()
+            results[futures[future]] = summary
+            done += 1
+            status = (f"에러 {summary['error']}" if "error" in summary else
+                      f"실시간 대비 {summary['realtime_factor']:.1f}배, {summary['wall_s']:.1f}s")
+            print(f"[sweep] {done}/{len(pending)} variant_{futures[future]:04d}: {status}",
+                  file=sys.stderr)
+    elapsed = time.perf_counter() - start
+
+    summaries = [results[i] for i in range(len(variants))]
+    report = {
+        "config": {"duration": duration, "dt": dt, "record_every": record_every,
+                   "workers": workers, "variants": len(variants)},
+        "description": description,
+        "elapsed_s": elapsed,
+        "failed": sum("error" in s for s in summaries),
+        "diverged": sum(bool(s.get("diverged")) for s in summaries),
+        "variants": summaries,
+    }
+    (out_dir / "summary.json").write_text(json.dumps(report, indent=2, ensure_ascii=False),
+                                          encoding="utf-8")
+    (out_dir / "summary.csv").write_text(summary_csv(summaries), encoding="utf-8")
+    return report
+
+
+def summary_csv(summaries: List[dict]) -> str:
+    """변형별 한 줄: 파라미터 + 실행 지표 + 바디별 RPM 평균/변동계수 + 기어 변속비"""
+    rows = []
+    for s in summaries:
+        row = {"variant": s["variant"]}
+        row.update(s["params"])
+        for key in ("realtime_factor", "wall_s", "sim_time", "frames", "diverged", "error"):
+            row[key] = s.get(key)
+        for body, stats in s.get("bodies", {}).items():
+            row[f"{body}.rpm_mean"] = stats["rpm_mean"]
+            row[f"{body}.rpm_cv"] = stats["rpm_cv"]
+        for gear in s.get("gears", []):
+            row[f"{gear['driver']}:{gear['driven']}.ratio"] = gear["ratio"].get("mean")
+            if "error" in gear:
+                row[f"{gear['driver']}:{gear['driven']}.ratio_error"] = gear["error"]
+        rows.append(row)
+    columns = list(dict.fromkeys(k for row in rows for k in row))
+    text = io.StringIO()
+    writer = csv.DictWriter(text, fieldnames=columns)
+    writer.writeheader()
+    writer.writerows(rows)
+    return text.getvalue()
+
+
+def main(argv=None):
+    import argparse
+    from sim_server.analytics import _parse_gear
+
+    parser = argparse.ArgumentParser(description="헤드리스 배치 실행 / 파라미터 스윕")
+    parser.add_argument("model", help="모델 설명 JSON 경로")
+    parser.add_argument("--set", action="append", default=[], metavar="PATH=V1,V2,...",
+                        help="스윕할 파라미터 (여러 번 지정 가능)")
+    parser.add_argument("--mode", choices=("grid", "zip"), default="grid",
+                        help="--set 조합 방식 (grid: 모든 조합, zip: 같은 위치끼리)")
+    parser.add_argument("--sweep", help="스윕 정의 JSON (--set 대신)")
+    parser.add_argument("--duration", type=float, default=10.0, help="변형별 시뮬레이션 시간 (초)")
+    parser.add_argument("--dt", type=float, default=DEFAULT_DT, help="시뮬레이션 스텝 (초)")
+    parser.add_argument("--record-every", type=int, default=1, help="몇 스텝마다 포즈를 기록할지")
+    parser.add_argument("--workers", type=int, default=None, help="워커 프로세스 수 (기본 CPU 수)")
+    parser.add_argument("--gear", action="append", default=None,
+                        help="분석할 기어 쌍 driver:driven[:nominal_ratio] (없으면 gear_pair 어셈블리)")
+    parser.add_argument("--resume", action="store_true", help="이미 끝난 변형은 건너뜀")
+    parser.add_argument("--out", default="sweeps/latest", help="출력 디렉토리")
+    args = parser.parse_args(argv)
+
+    description = json.loads(Path(args.model).read_text(encoding="utf-8"))
+    if args.sweep:
+        variants = load_sweep(args.sweep)
+    else:
+        variants = expand_sweep(dict(parse_set(s) for s in args.set), args.mode)
+    gears = None if args.gear is None else [_parse_gear(g) for g in args.gear]
+
+    print(f"[sweep] 변형 {len(variants)}개, 변형별 {args.duration}s (dt={args.dt}), "
+          f"워커 {args.workers or os.cpu_count()}개 → {args.out}", file=sys.stderr)
+    report = run_sweep(description, variants, args.out, duration=args.duration, dt=args.dt,
+                       record_every=args.record_every, workers=args.workers, gears=gears,
+                       resume=args.resume)
+    print(f"[sweep] 완료 {report['elapsed_s']:.1f}s, 실패 {report['failed']}개, "
+          f"발산 {report['diverged']}개 → {Path(args.out) / 'summary.csv'}", file=sys.stderr)
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,279 @@
+"""
+NumPy 합성 시뮬레이터 백엔드 (PyChrono 없이 서버 계층 부하 측정용)
+
+바디 N개가 해석적 궤적을 따라 움직인다:
+    바디 i는 모터 k = i % motors에 묶여 있고, 모터 각도 θ_k에 대해
+        각도   a_i = ratio_i * θ_k + phase_i
+        위치   center_i + orbit_i * (cos a_i, 0, sin a_i)
+        회전   y축 기준 a_i (쿼터니언 (cos a/2, 0, sin a/2, 0))
+    ratio_i는 1, -0.5, 2 ... 처럼 기어열을 흉내 냄
+
+Chrono 백엔드와 같은 것:
+    - 모터 명령 형식과 램프 (InputMailbox {"이름": (속도, 램프)} / 예전 {"motors": [...]})
+    - 프레임 형식 {"time", "bodies": [{"name", "pos", "rot"}]}, interest 구독 합집합만 덤프
+    - motor:<이름> 텔레메트리, FrameRecorder 기록, 체크포인트 (모터 상태 + 시간)
+    - sim_stage_seconds 단계별 메트릭과 트레이스 구간
+
+모델 설명:
+    {"backend": "synthetic",
+     "synthetic": {"bodies": 10000, "motors": 4, "motor_speed": 2.0,
+                   "step_cost_ms": 2.0, "step_cost_gil": true, "spacing": 0.3, "seed": 0}}
+
+step_cost_ms는 물리 스텝 비용 흉내 (Chrono 스텝처럼 GIL을 잡고 바쁜 대기,
+step_cost_gil이 false면 sleep으로 GIL을 놓음)
+"""
+import math
+import time
+from typing import List
+
+import numpy as np
+
+from sim_server.simInterface import Simulator
+from sim_server.utils.metrics import SIM_STAGES
+from sim_server.utils.motor_ramp import apply_motor_inputs, advance_ramps
+from sim_server.utils.telemetry import LatestSamples, channel_names, parse_channel
+from sim_server.utils.tracer import TRACER
+
+DEFAULTS = {
+    "bodies": 1000,
+    "motors": 4,
+    "motor_speed": 2.0,     # rad/s
+    "step_cost_ms": 0.0,
+    "step_cost_gil": True,
+    "spacing": 0.3,         # 바디 궤도 중심 격자 간격 (m)
+    "seed": 0,
+}
+_RATIOS = np.array([1.0, -0.5, 2.0, -1.0])
+
+
+class _Motor:
+    """모터 설정값 (simulate.MotorSetpoint와 같은 필드, utils.motor_ramp로 갱신, 각도는 직접 적분)"""
+    __slots__ = ("value", "target", "rate", "angle")
+
+    def __init__(self, speed):
+        self.value = speed
+        self.target = speed
+        self.rate = None
+        self.angle = 0.0
+
+    def set(self, speed):
+        self.value = speed
+
+
+class SyntheticSimulator(Simulator):
+    name = "synthetic"
+    supportsCheckpoint = True
+
+    def __init__(self, modelMeta: dict, bufferHandle, checkpoint=None):
+        super().__init__()
+        opts = {**DEFAULTS, **(modelMeta.get("synthetic") or {})}
+        n = int(opts["bodies"])
+        m = max(int(opts["motors"]), 1)
+        self.buffer = bufferHandle
+        self.stepCost = float(opts["step_cost_ms"]) / 1000.0
+        self.stepCostGil = bool(opts["step_cost_gil"])
+        self._time = 0.0
+        self._stepCount = 0
+
+        rng = np.random.default_rng(opts["seed"])
+        side = max(int(math.ceil(math.sqrt(n))), 1)
+        idx = np.arange(n)
+        spacing = float(opts["spacing"])
+        self.centers = np.stack([(idx % side) * spacing, np.zeros(n), (idx // side) * spacing], axis=1)
+        self.orbits = rng.uniform(0.02, 0.4 * spacing, n)
+        self.phases = rng.uniform(0.0, 2 * math.pi, n)
+        self.motorOf = idx % m
+        self.ratios = _RATIOS[(idx // m) % len(_RATIOS)]
+
+        self.motorNames = [f"synthetic_motor_{k}" for k in range(m)]
+        self.motors = {name: _Motor(float(opts["motor_speed"])) for name in self.motorNames}
+        self.ramping = set()
+        self._names = [f"body_{i}" for i in range(n)]
+        self._catalog = [{"name": self._names[i], "assembly": f"synthetic_{self.motorOf[i]}",
+                          "center": self.centers[i].tolist(), "radius": float(self.orbits[i]) + 0.01}
+                         for i in range(n)]
+        self._channels = channel_names([], self.motorNames, [])
+        self.telemetrySamples = LatestSamples()
+        self._visibleKey = None
+        self._visible = None  # 구독 합집합에 든 바디 인덱스 (None이면 전체)
+
+        print(f"[synthetic] 바디 {n}개, 모터 {m}개, 스텝 비용 {self.stepCost * 1000:.2f}ms")
+        if checkpoint is not None:
+            self.restoreCheckpoint(checkpoint)
+
+    # ---------------------------------------------------------------- Simulator
+
+    @property
+    def bodyNames(self) -> List[str]:
+        return self._names
+
+    @property
+    def catalog(self) -> List[dict]:
+        return self._catalog
+
+    @property
+    def channels(self) -> List[str]:
+        return self._channels
+
+    @property
+    def stepCount(self) -> int:
+        return self._stepCount
+
+    @property
+    def time(self) -> float:
+        return self._time
+
+    def step(self, dt: float, publish: bool = True):
+        perf = time.perf_counter
+        buffer = self.buffer
+        t0 = perf()
+
+        inputs = None
+        if buffer is not None and hasattr(buffer, "read_inputs"):
+            try:
+                inputs = buffer.read_inputs()
+            except Exception as e:
+                print("[synthetic] read_inputs() 호출 중 에러:", e)
+        if inputs is not None:
+            apply_motor_inputs(self.motors, self.ramping, inputs)
+        if self.ramping:
+            advance_ramps(self.motors, self.ramping, dt)
+
+        t1 = perf()
+        SIM_STAGES.input.observe(t1 - t0)
+        tracing = TRACER.enabled
+        if tracing and inputs:
+            TRACER.complete("input_applied", t0, t1, cat="sim", args={"motors": len(inputs)})
+
+        # "물리" 스텝: 모터 각도 적분 + 설정된 비용만큼 대기
+        for motor in self.motors.values():
+            motor.angle += motor.value * dt
+        self._time += dt
+        self._stepCount += 1
+        if self.stepCost > 0:
+            end = t1 + self.stepCost
+            if self.stepCostGil:
+                while perf() < end:
+                    pass
+            else:
+                time.sleep(max(end - perf(), 0.0))
+        t2 = perf()
+        SIM_STAGES.physics.observe(t2 - t1)
+        if tracing:
+            TRACER.complete("physics", t1, t2, cat="sim")
+
+        if self.recorder is not None:
+            pos, rot = self.poses(None)
+            self.recorder.append(self._time, np.hstack([pos, rot]).ravel())
+            t3 = perf()
+            SIM_STAGES.record.observe(t3 - t2)
+            if tracing:
+                TRACER.complete("record", t2, t3, cat="sim")
+            t2 = t3
+
+        if not publish:
+            return
+
+        frame = self.dumpFrame()
+        if self.telemetry is not None:
+            active = self.telemetry.active
+            if active:
+                samples = self.sampleTelemetry(active)
+                latest = self.telemetrySamples.update(self._stepCount, samples, active)
+                if latest:
+                    frame["step"] = self._stepCount
+                    frame["telemetry"] = latest
+        t3 = perf()
+        SIM_STAGES.dump.observe(t3 - t2)
+        if tracing:
+            TRACER.complete("serialize", t2, t3, cat="sim", args={"bodies": len(frame["bodies"])})
+
+        if buffer is not None and hasattr(buffer, "write_outputs"):
+            try:
+                buffer.write_outputs(frame)
+            except Exception as e:
+                print("[synthetic] write_outputs() 호출 중 에러:", e)
+            t4 = perf()
+            SIM_STAGES.commit.observe(t4 - t3)
+            if tracing:
+                TRACER.complete("commit", t3, t4, cat="sim")
+
+    def bindBuffer(self, bufferHandle):
+        self.buffer = bufferHandle
+
+    def captureCheckpoint(self, model: str):
+        from sim_server.utils.checkpoint import Checkpoint
+        # 바디 포즈는 모터 각도로부터 계산되므로 모터 상태만 저장
+        motors = {name: [mt.value, mt.target, mt.rate, mt.angle] for name, mt in self.motors.items()}
+        return Checkpoint(model=model, time=self._time, step=self._stepCount, bodies=[], state=[],
+                          motors=motors, wall=time.time())
+
+    def restoreCheckpoint(self, checkpoint):
+        for name, (value, target, rate, angle) in checkpoint.motors.items():
+            motor = self.motors.get(name)
+            if motor is None:
+                continue
+            motor.value, motor.target, motor.rate, motor.angle = value, target, rate, angle
+            if rate is not None and target != value:
+                self.ramping.add(name)
+        self._time = checkpoint.time
+        self._stepCount = checkpoint.step
+        print(f"[synthetic] 체크포인트 복원: t={checkpoint.time:.3f}, step={checkpoint.step}")
+
+    def clear(self):
+        if self.recorder is not None:
+            try:
+                self.recorder.close()
+            except Exception as e:
+                print("[synthetic] 프레임 기록 종료 중 오류:", e)
+
+    # ---------------------------------------------------------------- 출력
+
+    def visibleIndices(self):
+        """구독 합집합에 든 바디 인덱스 (합집합 객체가 바뀔 때만 다시 계산, None이면 전체)"""
+        union = self.interest.union if self.interest is not None else None
+        if union is not self._visibleKey:
+            self._visibleKey = union
+            self._visible = None if union is None else np.array(
+                [i for i, n in enumerate(self._names) if n in union], dtype=np.intp)
+        return self._visible
+
+    def poses(self, indices):
+        """(위치 (k,3), 쿼터니언 (k,4)) (indices가 None이면 전체)"""
+        angles = np.array([self.motors[n].angle for n in self.motorNames])
+        motorOf, ratios, phases = self.motorOf, self.ratios, self.phases
+        centers, orbits = self.centers, self.orbits
+        if indices is not None:
+            motorOf, ratios, phases = motorOf[indices], ratios[indices], phases[indices]
+            centers, orbits = centers[indices], orbits[indices]
+        a = ratios * angles[motorOf] + phases
+        cos, sin = np.cos(a), np.sin(a)
+        pos = centers.copy()
+        pos[:, 0] += orbits * cos
+        pos[:, 2] += orbits * sin
+        half = 0.5 * a
+        rot = np.zeros((len(a), 4))
+        rot[:, 0] = np.cos(half)
+        rot[:, 2] = np.sin(half)
+        return pos, rot
+
+    def dumpFrame(self) -> dict:
+        indices = self.visibleIndices()
+        pos, rot = self.poses(indices)
+        names = self._names if indices is None else [self._names[i] for i in indices]
+        return {
+            "time": self._time,
+            "bodies": [{"name": n, "pos": p, "rot": q}
+                       for n, p, q in zip(names, pos.tolist(), rot.tolist())],
+        }
+
+    def sampleTelemetry(self, active):
+        samples = {}
+        for channel, decimation in active.items():
+            if self._stepCount % decimation:
+                continue
+            kind, target = parse_channel(channel)
+            motor = self.motors.get(target) if kind == "motor" else None
+            if motor is not None:
+                samples[channel] = {"torque": 0.0, "speed": motor.value, "angle": motor.angle}
+        return samples
@@ -0,0 +1,91 @@
+# AdaptiveRate 클라이언트별 전송 주기/정밀도 조절 (AIMD) 테스트
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sim_server.utils.client_session import AdaptiveRate, FrameEncoder, round_floats
+
+
+def make_rate(**kwargs):
+    rate = AdaptiveRate(minHz=15.0, maxHz=60.0, increaseHz=2.0, decreaseFactor=0.5, window=1.0,
+                        **kwargs)
+    rate._lastUpdate = 0.0
+    return rate
+
+
+def test_no_change_inside_window():
+    rate = make_rate(startHz=30.0)
+    rate.onSkip()
+    assert not rate.update(0.5)
+    assert rate.hz == 30.0
+    # 창이 지나면 그동안 쌓인 혼잡 신호로 줄어듦
+    assert rate.update(1.0)
+    assert rate.hz == 15.0
+
+
+def test_additive_increase_up_to_max():
+    rate = make_rate(startHz=55.0)
+    assert rate.update(1.0) and rate.hz == 57.0
+    assert rate.update(2.0) and rate.hz == 59.0
+    assert rate.update(3.0) and rate.hz == 60.0
+    assert not rate.update(4.0)
+
+
+def test_multiplicative_decrease_down_to_min():
+    rate = make_rate()
+    for now, hz in ((1.0, 30.0), (2.0, 15.0), (3.0, 15.0)):
+        rate.onSkip()
+        rate.update(now)
+        assert rate.hz == hz
+    assert rate.skipped == 3
+    # 혼잡 신호는 창마다 초기화: 조용해지면 다시 올라감
+    assert rate.update(4.0) and rate.hz == 17.0
+
+
+def test_slow_send_is_congestion():
+    rate = make_rate()
+    rate.onSend(0.2 * rate.period)
+    rate.update(1.0)
+    assert rate.hz == 60.0
+    rate.onSend(0.6 * rate.period)
+    rate.update(2.0)
+    assert rate.hz == 30.0
+
+
+def test_rtt_growth_over_min_rtt_is_congestion():
+    rate = make_rate()
+    rate.onRtt(0.010)
+    rate.onRtt(0.035)          # 2 * 10ms + 20ms 이하
+    rate.update(1.0)
+    assert rate.hz == 60.0 and rate.minRtt == 0.010
+    rate.onRtt(0.050)          # 큐잉 지연
+    rate.update(2.0)
+    assert rate.hz == 30.0
+    # 지수 평균 (1/8): 10ms → 13.1ms → 17.7ms
+    assert rate.srtt == pytest.approx(0.017734, abs=1e-6)
+
+
+def test_decimals_follow_rate():
+    rate = make_rate(minDecimals=2, maxDecimals=5)
+    assert rate.decimals == 5
+    rate.hz = 15.0
+    assert rate.decimals == 2
+    rate.hz = 37.5
+    assert rate.decimals == 4  # 2 + round(0.5 * 3)
+    assert AdaptiveRate(minHz=30.0, maxHz=30.0, minDecimals=2, maxDecimals=4).decimals == 4
+
+
+def test_encoder_shares_text_per_precision():
+    encoder = FrameEncoder()
+    frame = {"time": 0.123456, "bodies": [{"name": "a", "p": [1.234567]}, {"name": "b", "p": [0.5]}]}
+    coarse = encoder.encode(frame, 1, 2)
+    assert encoder.encode(frame, 1, 2) is coarse
+    assert '"time":0.12' in coarse and '"p":[1.23]' in coarse
+    fine = encoder.encode(frame, 1, 4)
+    assert '"time":0.1235' in fine
+    only_b = encoder.encode(frame, 1, 2, frozenset({"b"}))
+    assert '"name":"a"' not in only_b
+    assert round_floats((1.26, {"x": [2.04]}, "s"), 1) == [1.3, {"x": [2.0]}, "s"]
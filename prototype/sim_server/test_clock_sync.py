@@ -0,0 +1,136 @@
+# 시계 동기화 (서버 clock_sync 응답, 클라이언트 ClockSync) 및 참조 클라이언트 지터 버퍼 테스트
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.testclient import TestClient
+
+from ar_client import websocket_client
+from ar_client.websocket_client import ClockSync, JitterBuffer
+from sim_server.server import ServerConfig, createApp
+
+
+class FakeClock:
+    """websocket_client의 time 모듈 대용 (로컬 시계)"""
+
+    def __init__(self, now):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock(100.0)
+    monkeypatch.setattr(websocket_client, "time", fake)
+    return fake
+
+
+def exchange(sync, clock, serverOffset, up, down, serverHold=0.001):
+    """서버 시계가 serverOffset만큼 앞서 있고 편도 지연이 up/down일 때 한 번 주고받음"""
+    message = json.loads(sync.request())
+    t1 = message["t0"] + serverOffset + up
+    clock.now += up + serverHold + down
+    sync.onReply({"id": message["id"], "t1": t1, "t2": t1 + serverHold})
+
+
+# ---------------------------------------------------------------- 시계 동기화
+
+def test_offset_and_delay_from_one_exchange(clock):
+    sync = ClockSync()
+    assert not sync.ready and sync.offset == 0.0
+    exchange(sync, clock, serverOffset=5.0, up=0.01, down=0.01)
+    assert sync.ready
+    assert sync.offset == pytest.approx(5.0)
+    assert sync.delay == pytest.approx(0.02)
+    assert sync.serverNow() == pytest.approx(clock.now + 5.0)
+
+
+def test_lowest_delay_sample_wins(clock):
+    sync = ClockSync(window=3)
+    # 비대칭 큐잉 지연이 낀 샘플은 offset이 틀어짐
+    exchange(sync, clock, serverOffset=5.0, up=0.10, down=0.01)
+    exchange(sync, clock, serverOffset=5.0, up=0.005, down=0.005)
+    exchange(sync, clock, serverOffset=5.0, up=0.01, down=0.08)
+    assert sync.offset == pytest.approx(5.0)
+    assert sync.delay == pytest.approx(0.01)
+    # 창에서 밀려나면 남은 샘플 중 최소 지연을 사용
+    exchange(sync, clock, serverOffset=5.0, up=0.02, down=0.02)
+    exchange(sync, clock, serverOffset=5.0, up=0.03, down=0.03)
+    assert len(sync.samples) == 3
+    assert sync.delay == pytest.approx(0.04) and sync.offset == pytest.approx(5.0)
+
+
+def test_unknown_reply_is_ignored(clock):
+    sync = ClockSync()
+    sync.onReply({"id": 42, "t1": 1.0, "t2": 1.0})
+    assert not sync.ready
+
+
+def test_server_answers_clock_sync(tmp_path):
+    app = createApp(ServerConfig(resources_dir=str(tmp_path)))
+    with TestClient(app) as client:
+        with client.websocket_connect("/cadverse/interaction") as ws:
+            ws.send_json({"type": "clock_sync", "id": 7, "t0": 123.5})
+            while (reply := ws.receive_json())["type"] != "clock_sync":
+                pass
+    assert reply["id"] == 7 and reply["t0"] == 123.5
+    assert reply["t1"] <= reply["t2"]
+
+
+# ---------------------------------------------------------------- 지터 버퍼
+
+def frame(wall, x, rot=(0.0, 0.0, 0.0, 1.0)):
+    return {"wall": wall, "bodies": [{"name": "a", "pos": [x, 0.0, 0.0], "rot": list(rot)}]}
+
+
+def test_out_of_order_frames_are_interpolated():
+    buffer = JitterBuffer(playoutDelay=0.1)
+    for wall, x in ((1.00, 0.0), (1.04, 4.0), (1.02, 2.0)):
+        buffer.push(frame(wall, x), serverNow=wall)
+    assert [w for w, _ in buffer.frames] == [1.00, 1.02, 1.04]
+
+    pos, rot = buffer.sample(serverNow=1.13)["a"]   # 재생 시점 1.03
+    assert pos == pytest.approx([3.0, 0.0, 0.0])
+    assert rot == pytest.approx([0.0, 0.0, 0.0, 1.0])
+    # 재생 시점 이전 프레임은 하나만 남음
+    assert [w for w, _ in buffer.frames] == [1.02, 1.04]
+
+
+def test_rotation_takes_the_short_path():
+    buffer = JitterBuffer(playoutDelay=0.0)
+    buffer.push(frame(0.0, 0.0, (0.0, 0.0, 0.0, 1.0)), 0.0)
+    buffer.push(frame(1.0, 0.0, (0.0, 0.0, 0.0, -1.0)), 0.0)   # 같은 회전의 반대 부호
+    _, rot = buffer.sample(serverNow=0.5)["a"]
+    assert rot == pytest.approx([0.0, 0.0, 0.0, 1.0])
+
+
+def test_late_frames_are_dropped():
+    buffer = JitterBuffer(playoutDelay=0.1)
+    buffer.push(frame(1.00, 0.0), 1.00)
+    buffer.push(frame(1.02, 2.0), 1.02)
+    buffer.sample(serverNow=1.15)
+    buffer.push(frame(1.01, 1.0), serverNow=1.15)
+    assert buffer.late == 1
+    buffer.push({"bodies": []}, serverNow=1.15)   # wall 없는 프레임은 무시
+    assert len(buffer.frames) == 1
+
+
+def test_extrapolates_within_limit_then_holds():
+    buffer = JitterBuffer(playoutDelay=0.1, maxExtrapolation=0.05)
+    buffer.push(frame(1.00, 0.0), 1.00)
+    buffer.push(frame(1.02, 2.0), 1.02)
+    pos, _ = buffer.sample(serverNow=1.15)["a"]   # 최신 프레임보다 0.03초 뒤
+    assert pos == pytest.approx([5.0, 0.0, 0.0])
+    assert buffer.extrapolated == 1
+
+    pos, _ = buffer.sample(serverNow=1.20)["a"]   # 한도 초과: 마지막 포즈 유지
+    assert pos == pytest.approx([2.0, 0.0, 0.0])
+    assert buffer.underruns == 1
+    assert buffer.stats()["buffered"] == 1
+    assert JitterBuffer().sample(0.0) is None
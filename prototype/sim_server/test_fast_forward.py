@@ -0,0 +1,70 @@
+# FastForwardControl 요청 검증 테스트 (시뮬 스레드 없이 poll을 직접 호출)
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sim_server.utils.fast_forward import FastForwardControl
+from sim_server.utils.metrics import METRICS
+
+
+@pytest.fixture
+def control():
+    control = FastForwardControl(maxSeconds=60.0)
+    control.poll(10.0)  # 시뮬 스레드가 한 번 돌아서 현재 시간을 알림
+    return control
+
+
+@pytest.mark.parametrize("to", [5.0, 10.0, 70.5])
+def test_request_rejects_past_or_too_far_target(control, to):
+    with pytest.raises(ValueError, match="to"):
+        control.request(to=to)
+    assert not control.busy
+
+
+def test_request_runs_to_exact_target(control):
+    control.request(to=70.0)
+    job = control.poll(10.0)
+    assert job.state == "running" and job.target == 70.0
+
+
+def test_poll_rejects_target_passed_since_request(control):
+    control.request(to=12.0)
+    assert control.poll(15.0) is None  # 요청 후 시뮬레이션이 12초를 지남
+    state = control.state()
+    assert state["state"] == "rejected" and "error" in state
+    assert not control.busy
+
+
+def test_poll_rejects_target_too_far_after_reset(control):
+    """모델이 바뀌어 시간이 0으로 돌아가면 잘라서 실행하지 않고 거절"""
+    control.request(to=65.0)
+    assert control.poll(0.0) is None
+    assert control.state()["state"] == "rejected"
+
+
+def test_new_request_supersedes_running_job(control):
+    control.request(by=5.0)
+    first = control.poll(10.0)
+    control.request(by=20.0)
+    second = control.poll(11.0)
+    assert first.state == "superseded" and first.supersededBy == second.id
+    assert second.target == pytest.approx(31.0)
+    assert control.takeSuperseded() == [first]
+
+
+def test_new_request_supersedes_pending_job(control):
+    superseded = METRICS.counter("sim_fast_forward_total", state="superseded")
+    before = superseded.value
+    first = control.request(by=5.0, requester="client_a")
+    second = control.request(by=8.0, requester="client_b")
+    assert superseded.value == before + 1
+
+    jobs = control.takeSuperseded()
+    assert [job.requester for job in jobs] == ["client_a"]
+    assert jobs[0].toDict() == {"type": "fast_forward", "id": first["id"], "state": "superseded",
+                                "superseded_by": second["id"], "to": None, "by": 5.0}
+    assert control.takeSuperseded() == []
+    assert control.poll(10.0).id == second["id"]
@@ -0,0 +1,81 @@
+# flat_model.plan_flat_model 검증/정렬 테스트 (pychrono 없이 실행 가능)
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sim_server.flat_model import plan_flat_model
+
+
+def gear_model(**joint):
+    return {
+        "bodies": [
+            {"name": "gear_A", "gear": {"module": 2, "teeth": 20}},
+            {"name": "gear_B", "mesh": "gear_B_m2_z40.obj"},
+        ],
+        "joints": [
+            {"name": "revA", "type": "revolute", "body": "gear_A", "base": "world",
+             "center": [0, 0, 0]},
+            {"name": "mesh_AB", "type": "gear", "body": "gear_A", "base": "gear_B", **joint},
+        ],
+        "motors": [{"name": "m", "joint": "revA", "speed": 2.0}],
+    }
+
+
+def test_plan_orders_children_after_parents_in_world_pose():
+    plan = plan_flat_model({"bodies": [
+        {"name": "pin", "parent": "arm", "pos": [0.1, 0, 0]},
+        {"name": "arm", "pos": [1, 2, 3]},
+    ]})
+    assert [b["name"] for b in plan.bodies] == ["arm", "pin"]
+    assert plan.body_index["pin"]["pos"] == pytest.approx([1.1, 2, 3])
+    assert not plan.needs_ground
+
+
+def test_plan_collects_all_errors():
+    with pytest.raises(ValueError) as e:
+        plan_flat_model({
+            "bodies": [{"name": "a", "parent": "missing"}, {"name": "a"}],
+            "joints": [{"name": "j", "type": "slider", "body": "x", "base": "a"}],
+            "motors": [{"name": "m", "joint": "nope"}],
+        })
+    message = str(e.value)
+    for part in ("이름 중복 'a'", "알 수 없는 type 'slider'", "알 수 없는 body 'x'",
+                 "알 수 없는 joint 'nope'"):
+        assert part in message
+
+
+def test_plan_resolves_gear_pitch_radii():
+    plan = plan_flat_model(gear_model())
+    gear = plan.joint_index["mesh_AB"]
+    # gear_A: 파라미터 (2mm * 20 / 2), gear_B: 파일명 m2_z40
+    assert gear["pitch_radius_a"] == pytest.approx(0.02)
+    assert gear["pitch_radius_b"] == pytest.approx(0.04)
+    assert plan.joints[1] is gear
+    assert plan.needs_ground
+
+
+def test_plan_gear_explicit_radius_and_ratio():
+    plan = plan_flat_model(gear_model(pitch_radius_a=0.5))
+    assert plan.joint_index["mesh_AB"]["pitch_radius_a"] == 0.5
+    plan = plan_flat_model(gear_model(ratio=3))
+    gear = plan.joint_index["mesh_AB"]
+    assert (gear["pitch_radius_a"], gear["pitch_radius_b"]) == (3.0, 1.0)
+
+
+def test_plan_rejects_unknown_gear_radius_up_front():
+    model = gear_model()
+    model["bodies"][1]["mesh"] = "plate.obj"  # 파일명에 m/z가 없음
+    with pytest.raises(ValueError, match="기어 피치반지름을 알 수 없음"):
+        plan_flat_model(model)
+    model["bodies"][1]["pitch_radius"] = 0.03
+    assert plan_flat_model(model).joint_index["mesh_AB"]["pitch_radius_b"] == 0.03
+
+
+def test_plan_rejects_invalid_gear_params():
+    model = gear_model()
+    model["bodies"][0]["gear"] = {"module": 2, "teeth": 20, "pressure_angle": 50}
+    with pytest.raises(ValueError, match="gear_A"):
+        plan_flat_model(model)
@@ -0,0 +1,82 @@
+# FrameRecorder → RecordedRun 기록/읽기 왕복 테스트
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sim_server.utils.frame_recorder import COMPONENTS, FrameRecorder, RecordedRun
+
+NAMES = ["gear_A", "gear_B"]
+
+
+def pose_values(i):
+    """프레임 i의 바디별 px,py,pz,e0,e1,e2,e3 (float32로 정확히 표현되는 값)"""
+    return [b * 100 + i + c / 8 for b in range(len(NAMES)) for c in range(len(COMPONENTS))]
+
+
+def record(run_dir, frames, chunk_frames=4):
+    recorder = FrameRecorder(run_dir, NAMES, chunk_frames=chunk_frames)
+    for i in range(frames):
+        recorder.append(i * 0.01, pose_values(i))
+    recorder.close()
+    recorder.close()
+    return recorder
+
+
+def test_round_trip_across_chunks(tmp_path):
+    recorder = record(tmp_path, frames=10)
+    assert recorder.chunks == 3
+
+    run = RecordedRun(tmp_path)
+    assert len(run) == 10 and run.chunks == 3
+    assert run.times == pytest.approx([i * 0.01 for i in range(10)])
+    for i in (0, 3, 4, 9):
+        assert run.poses(i).reshape(-1).tolist() == pose_values(i)
+    frame = run.frame(5, names={"gear_B"})
+    assert frame["time"] == pytest.approx(0.05)
+    assert frame["bodies"] == [{"name": "gear_B", "pos": pose_values(5)[7:10],
+                                "rot": pose_values(5)[10:]}]
+    with pytest.raises(IndexError):
+        run.poses(10)
+
+
+def test_columns_span_chunk_boundaries(tmp_path):
+    record(tmp_path, frames=10)
+    run = RecordedRun(tmp_path)
+    e3 = COMPONENTS.index("e3")
+    assert run.column("gear_A", "e3").tolist() == [i + e3 / 8 for i in range(10)]
+    assert run.column("gear_B", "px", 3, 6).tolist() == [100.0 + i for i in range(3, 6)]
+    assert run.column("gear_B", "px", 9, 100).tolist() == [109.0]
+    block = run.body_block("gear_A", 2, 5)
+    assert block.shape == (3, 7) and block[0].tolist() == pose_values(2)[:7]
+
+
+def test_index_at_clamps_to_recorded_range(tmp_path):
+    record(tmp_path, frames=10)
+    run = RecordedRun(tmp_path)
+    assert run.index_at(-1.0) == 0
+    assert run.index_at(0.035) == 3
+    assert run.index_at(0.04) == 4
+    assert run.index_at(99.0) == 9
+
+
+def test_partial_last_chunk_is_padded_but_not_read(tmp_path):
+    record(tmp_path, frames=6)
+    meta = json.loads((tmp_path / "meta.json").read_text(encoding="utf-8"))
+    assert meta["frames"] == 6 and meta["chunks"] == 2
+    # 마지막 청크 파일은 크기가 같고 남은 칸은 NaN
+    times = np.fromfile(tmp_path / "times_00001.f64", dtype=np.float64)
+    assert times.size == 4 and np.isnan(times[2:]).all()
+    run = RecordedRun(tmp_path)
+    assert len(run.times) == 6 and not np.isnan(run.times).any()
+
+
+def test_empty_run(tmp_path):
+    record(tmp_path, frames=0)
+    run = RecordedRun(tmp_path)
+    assert len(run) == 0 and run.column("gear_A", "px").size == 0
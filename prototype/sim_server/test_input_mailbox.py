@@ -0,0 +1,70 @@
+# InputMailbox 모터 명령 우편함 테스트
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sim_server.utils.input_mailbox import InputMailbox
+
+
+def test_commands_between_ticks_coalesce_to_latest():
+    mailbox = InputMailbox()
+    for speed in (1.0, 2.0, 3.0):
+        mailbox.postMessage({"motors": [{"name": "a", "speed": speed}]})
+    mailbox.postMessage(json.dumps({"motors": [{"name": "b", "speed": 5}]}))
+    assert mailbox.read_inputs() == {"a": (3.0, None), "b": (5.0, None)}
+    assert mailbox.read_inputs() is None
+
+
+def test_ramp_is_kept_with_setpoint():
+    mailbox = InputMailbox()
+    assert mailbox.post("a", 1, ramp=2)
+    mailbox.postMessage({"motors": [{"name": "b", "speed": 1.5, "ramp": 0.5}]})
+    assert mailbox.drain() == {"a": (1.0, 2.0), "b": (1.5, 0.5)}
+
+
+def test_max_pending_drops_new_names_but_updates_pending_ones():
+    mailbox = InputMailbox(maxPending=2)
+    assert mailbox.post("a", 1.0) and mailbox.post("b", 1.0)
+    assert not mailbox.post("c", 1.0)
+    assert mailbox.post("a", 2.0)
+    assert mailbox.dropped == 1
+    assert mailbox.drain() == {"a": (2.0, None), "b": (1.0, None)}
+    assert mailbox.post("c", 1.0)
+
+
+@pytest.mark.parametrize("speed, ramp", [(float("nan"), None), (float("inf"), None),
+                                          (1.0, float("nan")), ("fast", None), (None, None)])
+def test_post_rejects_non_finite_or_non_numeric(speed, ramp):
+    mailbox = InputMailbox()
+    with pytest.raises(ValueError):
+        mailbox.post("a", speed, ramp)
+    assert mailbox.drain() == {}
+
+
+def test_post_message_skips_bad_entries():
+    mailbox = InputMailbox()
+    count = mailbox.postMessage({"motors": [
+        "a", None, {"name": "a", "speed": "NaN"}, {"name": "b", "speed": 1e999},
+        {"speed": 1.0}, {"name": "c", "speed": 2.0},
+    ], "cid": "x"})
+    assert count == 1
+    assert mailbox.drain() == {"c": (2.0, None)}
+    assert mailbox.drainCorrelations() == [(None, "x")]
+    assert mailbox.postMessage({"motors": {"name": "a"}}) == 0
+    assert mailbox.postMessage(["motors"]) == 0
+
+
+def test_cid_only_queued_when_a_command_is_accepted():
+    mailbox = InputMailbox(maxPending=1)
+    mailbox.post("a", 1.0)
+    assert mailbox.postMessage({"motors": [{"name": "b", "speed": 1.0}], "cid": "full"}) == 0
+    assert mailbox.drainCorrelations() == []
+    # 이미 대기 중인 모터는 덮어쓰므로 등록됨
+    assert mailbox.postMessage({"motors": [{"name": "b", "speed": 1.0},
+                                           {"name": "a", "speed": 2.0}], "cid": "ok"}) == 1
+    assert mailbox.drainCorrelations() == [(None, "ok")]
+    assert mailbox.dropped == 2
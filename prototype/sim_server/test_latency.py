@@ -0,0 +1,74 @@
+# LatencyTracker / InputMailbox 상관관계 id 테스트
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sim_server.utils.input_mailbox import InputMailbox
+from sim_server.utils.latency import LatencyTracker
+
+
+def runTick(mailbox, tracker, seq):
+    """시뮬 스레드 한 틱 (legacy_simloop.SimBufferHandle과 같은 순서)"""
+    inputs = mailbox.read_inputs()
+    tracker.applied(mailbox.drainCorrelations())
+    tracker.framed(seq)
+    return inputs
+
+
+def test_same_cid_from_two_sessions_is_tracked_separately():
+    tracker = LatencyTracker()
+    mailbox = InputMailbox()
+    a, b = object(), object()
+    for session, speed in ((a, 1.0), (b, 2.0)):
+        tracker.received("c1", session)
+        mailbox.postMessage({"motors": [{"name": "m", "speed": speed}], "cid": "c1"}, session)
+    runTick(mailbox, tracker, seq=1)
+
+    assert tracker.takeSent(a, 1) == ["c1"]
+    assert tracker.takeSent(b, 1) == ["c1"]
+    assert tracker.acked(a, ["c1"]) == 1
+    assert tracker.acked(b, ["c1"]) == 1
+    assert tracker.sessionStats(a)["total"]["count"] == 1
+
+
+def test_cid_is_queued_before_setpoint():
+    """설정값을 꺼낸 틱에 그 명령의 cid가 항상 같이 꺼내짐"""
+    mailbox = InputMailbox()
+    session = object()
+
+    class Probe(dict):
+        # 설정값이 들어가는 순간 cid가 이미 있는지 확인
+        def __setitem__(self, key, value):
+            assert list(mailbox._cids) == [(session, "c9")]
+            super().__setitem__(key, value)
+
+    mailbox._latest = Probe()
+    assert mailbox.postMessage({"motors": [{"name": "m", "speed": 1.0}], "cid": "c9"}, session) == 1
+    assert mailbox.drainCorrelations() == [(session, "c9")]
+
+
+def test_no_cid_without_valid_commands():
+    mailbox = InputMailbox()
+    assert mailbox.postMessage({"motors": [{"name": "m"}], "cid": "c1"}) == 0
+    assert mailbox.drainCorrelations() == []
+
+
+def test_stages_add_up_to_total():
+    """received→queued(dispatch)도 보고되고, 단계 합이 total과 같음"""
+    tracker = LatencyTracker()
+    mailbox = InputMailbox()
+    session = object()
+    tracker.received("c1", session, receivedAt=time.perf_counter() - 0.05)
+    mailbox.postMessage({"motors": [{"name": "m", "speed": 1.0}], "cid": "c1"}, session)
+    runTick(mailbox, tracker, seq=1)
+    tracker.takeSent(session, 1)
+    assert tracker.acked(session, ["c1"]) == 1
+
+    stats = tracker.sessionStats(session)
+    assert stats["dispatch"]["count"] == 1 and stats["dispatch"]["max"] >= 0.05
+    parts = sum(stats[s]["sum"] for s in ("dispatch", "queue", "frame", "publish", "delivery"))
+    assert parts == pytest.approx(stats["total"]["sum"], rel=1e-3)
@@ -0,0 +1,57 @@
+# loadgen 클라이언트 실패 격리 테스트 (스텁 웹소켓 서버)
+import asyncio
+import itertools
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sim_server.loadgen import run_load
+
+
+@pytest.fixture
+def stub_server():
+    """첫 연결에는 깨진 프레임(seq가 문자열)을, 나머지에는 정상 프레임을 보내는 서버"""
+    websockets = pytest.importorskip("websockets")
+    connections = itertools.count()
+    ready = threading.Event()
+    state = {}
+
+    async def handler(ws, *args):
+        bad = next(connections) == 0
+        for seq in itertools.count(1):
+            frame = {"type": "frame", "seq": "x" if bad else seq, "frame": {"wall": time.time()}}
+            try:
+                await ws.send(json.dumps(frame))
+            except websockets.ConnectionClosed:
+                return
+            await asyncio.sleep(0.01)
+
+    async def serve():
+        state["stop"] = asyncio.Event()
+        async with websockets.serve(handler, "127.0.0.1", 0) as server:
+            state["port"] = server.sockets[0].getsockname()[1]
+            ready.set()
+            await state["stop"].wait()
+
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_until_complete, args=(serve(),), daemon=True)
+    thread.start()
+    assert ready.wait(5)
+    yield f"ws://127.0.0.1:{state['port']}"
+    loop.call_soon_threadsafe(state["stop"].set)
+    thread.join(timeout=5)
+
+
+def test_one_failing_client_does_not_lose_the_report(stub_server):
+    report = run_load(url=stub_server, viewers=3, senders=0, duration=0.3, ramp=0.0, warmup=0.0)
+    assert report["connections"]["connected"] == 3
+    assert report["connections"]["errors"] == 1
+    assert report["client_errors"] == {"TypeError": 1}
+    # 나머지 두 클라이언트의 측정은 그대로 남음
+    assert report["throughput"]["frames"] > 0 and report["client_fps"]["max"] > 0
@@ -0,0 +1,45 @@
+# utils.motor_ramp 모터 명령/램프 테스트 (pychrono 없이 실행 가능)
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sim_server.utils.motor_ramp import apply_motor_inputs, advance_ramps
+
+
+class Setpoint:
+    def __init__(self, speed=0.0):
+        self.value = self.target = speed
+        self.rate = None
+        self.sets = 0
+
+    def set(self, speed):
+        self.value = speed
+        self.sets += 1
+
+
+def test_immediate_command_sets_speed_and_cancels_ramp():
+    setpoints, ramping = {"m": Setpoint()}, {"m"}
+    apply_motor_inputs(setpoints, ramping, {"m": (2.0, None), "unknown": (1.0, None)})
+    assert setpoints["m"].value == 2.0 and setpoints["m"].rate is None
+    assert ramping == set()
+
+
+def test_ramp_moves_toward_target_and_finishes():
+    setpoints, ramping = {"m": Setpoint()}, set()
+    apply_motor_inputs(setpoints, ramping, {"m": (1.0, -4.0)})
+    assert ramping == {"m"} and setpoints["m"].value == 0.0
+    advance_ramps(setpoints, ramping, 0.1)
+    assert setpoints["m"].value == pytest.approx(0.4)
+    for _ in range(2):
+        advance_ramps(setpoints, ramping, 0.1)
+    assert setpoints["m"].value == 1.0 and ramping == set()
+
+
+def test_legacy_motor_list_skips_bad_entries():
+    setpoints, ramping = {"m": Setpoint()}, set()
+    apply_motor_inputs(setpoints, ramping, {"motors": ["m", {"name": "m"},
+                                                       {"name": "m", "speed": 3.0}]})
+    assert setpoints["m"].value == 3.0 and setpoints["m"].sets == 1
@@ -0,0 +1,118 @@
+# ReplaySource 재생 커서 (재생/정지/seek/배속) 테스트
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sim_server.utils import replay
+from sim_server.utils.frame_recorder import COMPONENTS, FrameRecorder, RecordedRun
+from sim_server.utils.replay import MAX_SPEED, MIN_SPEED, ReplaySource
+
+DT = 0.1
+FRAMES = 11  # 0.0 ~ 1.0초
+
+
+class FakeClock:
+    """replay의 time 모듈 대용 (벽시계를 직접 진행)"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def perf_counter(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(replay, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def run(tmp_path):
+    recorder = FrameRecorder(tmp_path, ["a", "b"], chunk_frames=4)
+    for i in range(FRAMES):
+        recorder.append(i * DT, [float(i)] * (2 * len(COMPONENTS)))
+    recorder.close()
+    return RecordedRun(tmp_path)
+
+
+def test_plays_at_speed_and_stops_at_end(clock, run):
+    source = ReplaySource(run)
+    frame, version = source.latest()
+    assert version == 0 and frame["time"] == 0.0
+
+    clock.now += 0.35
+    frame, version = source.latest()
+    assert version == 3 and frame["bodies"][0]["pos"] == [3.0, 3.0, 3.0]
+    # 같은 프레임이면 다시 만들지 않음
+    assert source.latest()[0] is frame
+
+    clock.now += 10.0
+    state = source.control({"action": "state"})
+    assert state["t"] == pytest.approx(1.0) and not state["playing"] and state["frame"] == 10
+    # 끝에서 다시 재생하면 처음부터
+    assert source.control({"action": "play"})["frame"] == 0
+
+
+def test_pause_and_seek(clock, run):
+    source = ReplaySource(run)
+    clock.now += 0.2
+    state = source.control({"action": "pause"})
+    assert state["t"] == pytest.approx(0.2) and not state["playing"]
+    clock.now += 5.0
+    assert source.latest()[1] == 2
+
+    assert source.control({"action": "seek", "t": 0.75})["frame"] == 7
+    assert source.control({"action": "seek", "t": -3})["t"] == 0.0
+    assert source.control({"action": "seek", "t": 42})["t"] == pytest.approx(1.0)
+
+
+def test_speed_change_keeps_position(clock, run):
+    source = ReplaySource(run)
+    clock.now += 0.2
+    state = source.control({"action": "speed", "value": 2.0})
+    assert state["t"] == pytest.approx(0.2) and state["speed"] == 2.0
+    clock.now += 0.2
+    assert source.state()["t"] == pytest.approx(0.6)
+
+    assert source.control({"action": "speed", "value": 1000})["speed"] == MAX_SPEED
+    assert source.control({"action": "speed", "value": 0})["speed"] == MIN_SPEED
+
+
+@pytest.mark.parametrize("message", [
+    {"action": "speed", "value": float("nan")},
+    {"action": "speed", "value": float("inf")},
+    {"action": "speed", "value": "fast"},
+    {"action": "seek", "t": float("nan")},
+    {"action": "rewind"},
+])
+def test_bad_control_is_rejected_without_changing_state(clock, run, message):
+    source = ReplaySource(run)
+    clock.now += 0.3
+    before = source.state()
+    with pytest.raises(ValueError):
+        source.control(message)
+    assert source.state() == before
+
+
+def test_missing_control_value_is_key_error(clock, run):
+    source = ReplaySource(run)
+    with pytest.raises(KeyError):
+        source.control({"action": "seek"})
+
+
+def test_subscribed_names_filter_frames(clock, run):
+    source = ReplaySource(run, playing=False)
+    source.names = frozenset({"b"})
+    frame, _ = source.latest()
+    assert [b["name"] for b in frame["bodies"]] == ["b"]
+    assert frame["wall"] == clock.now
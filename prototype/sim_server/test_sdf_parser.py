@@ -0,0 +1,102 @@
+# sdf_parser 변환 및 해시 캐시 테스트 (pychrono 없이 실행 가능)
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sim_server.utils import sdf_parser
+from sim_server.utils.sdf_parser import load_sdf, parse_sdf
+
+OBJ = "v 0 0 0\nv 1 0 0\nv 0 1 0\nf 1 2 3\n"
+
+SDF = """<?xml version="1.0"?>
+<sdf version="1.6">
+  <model name="arm">
+    <link name="base">
+      <visual name="v"><geometry><mesh><uri>model://arm/meshes/base.obj</uri></mesh></geometry></visual>
+    </link>
+    <link name="shaft">
+      <pose>0 0 0.1 0 0 0</pose>
+      <inertial><mass>2.0</mass></inertial>
+      <visual name="v"><geometry><mesh><uri>model://arm/meshes/shaft.obj</uri></mesh></geometry></visual>
+    </link>
+    <joint name="rot1" type="revolute">
+      <parent>base</parent>
+      <child>shaft</child>
+      <axis><xyz>0 0 1</xyz></axis>
+    </joint>
+  </model>
+</sdf>
+"""
+
+
+@pytest.fixture
+def model(tmp_path):
+    sdf = tmp_path / "model" / "arm.sdf"
+    sdf.parent.mkdir()
+    sdf.write_text(SDF, encoding="utf-8")
+    meshes = tmp_path / "meshes_a"
+    meshes.mkdir()
+    for name in ("base", "shaft"):
+        (meshes / f"{name}.obj").write_text(OBJ, encoding="utf-8")
+    return sdf, meshes
+
+
+@pytest.fixture
+def no_parse(monkeypatch):
+    """이후 load_sdf가 다시 파싱하면 실패"""
+    def fail(*args, **kwargs):
+        raise AssertionError("캐시를 쓰지 않고 다시 파싱함")
+    monkeypatch.setattr(sdf_parser, "parse_sdf", fail)
+
+
+def test_parse_sdf_bodies_and_joints(model, tmp_path):
+    sdf, meshes = model
+    compiled = parse_sdf(sdf, search_dirs=[meshes], cache_dir=tmp_path / "cache")
+    assert [b["name"] for b in compiled["bodies"]] == ["base", "shaft"]
+    base, shaft = compiled["bodies"]
+    assert base["fixed"] and not shaft["fixed"]  # fix_roots
+    assert shaft["mass"] == 2.0 and shaft["pos"] == pytest.approx([0, 0, 0.1])
+    assert shaft["mesh"] == str((meshes / "shaft.obj").resolve())
+    assert compiled["joints"][0]["body"] == "shaft" and compiled["joints"][0]["base"] == "base"
+    assert compiled["warnings"] == []
+
+
+def test_load_sdf_second_load_uses_cache(model, tmp_path, request):
+    sdf, meshes = model
+    first = load_sdf(sdf, search_dirs=[meshes], cache_dir=tmp_path / "cache")
+    request.getfixturevalue("no_parse")
+    second = load_sdf(sdf, search_dirs=[meshes], cache_dir=tmp_path / "cache")
+    assert second == first
+    assert second["hash"] == sdf_parser.file_hash(sdf)
+
+
+def test_load_sdf_cache_keyed_by_search_dirs(model, tmp_path):
+    sdf, meshes_a = model
+    meshes_b = tmp_path / "meshes_b"
+    meshes_b.mkdir()
+    for name in ("base", "shaft"):
+        (meshes_b / f"{name}.obj").write_text(OBJ, encoding="utf-8")
+
+    a = load_sdf(sdf, search_dirs=[meshes_a], cache_dir=tmp_path / "cache")
+    b = load_sdf(sdf, search_dirs=[meshes_b], cache_dir=tmp_path / "cache")
+    assert a["bodies"][1]["mesh"] == str((meshes_a / "shaft.obj").resolve())
+    assert b["bodies"][1]["mesh"] == str((meshes_b / "shaft.obj").resolve())
+
+
+def test_load_sdf_missing_mesh_is_not_cached(model, tmp_path, request):
+    sdf, meshes = model
+    (meshes / "shaft.obj").unlink()
+    first = load_sdf(sdf, search_dirs=[meshes], cache_dir=tmp_path / "cache")
+    assert first["bodies"][1]["mesh"] is None
+    assert any(w.startswith(sdf_parser.MISSING_MESH) for w in first["warnings"])
+    assert list((tmp_path / "cache").glob("*.json")) == []
+
+    # 메시를 추가하면 다음 로드에서 찾고, 그 결과는 캐시됨
+    (meshes / "shaft.obj").write_text(OBJ, encoding="utf-8")
+    second = load_sdf(sdf, search_dirs=[meshes], cache_dir=tmp_path / "cache")
+    assert second["bodies"][1]["mesh"] == str((meshes / "shaft.obj").resolve())
+    request.getfixturevalue("no_parse")
+    assert load_sdf(sdf, search_dirs=[meshes], cache_dir=tmp_path / "cache") == second
@@ -1 +1,248 @@
 # Server 및 ServerThread 테스트
+# createApp으로 만든 앱을 TestClient로 직접 호출 (uvicorn 없이)
+import json
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.testclient import TestClient
+
+from sim_server.server import ServerConfig, createApp
+
+OBJ = b"v 0 0 0\nv 1000 0 0\nv 0 1000 0\nv 0 0 1000\nf 1 2 3\nf 1 3 4\nf 1 2 4\nf 2 3 4\n"
+
+
+@pytest.fixture
+def config(tmp_path):
+    return ServerConfig(resources_dir=str(tmp_path), upload_chunk_size=64, upload_workers=1)
+
+
+def uploadDirs(config):
+    return [p for p in (Path(config.resources_dir) / config.upload_dir).iterdir()]
+
+
+class CountingBuffer:
+    """latest()를 부를 때마다 새 프레임 (출력 버퍼 대용)"""
+
+    def __init__(self, names=()):
+        self.version = 0
+        self.bodies = [{"name": n, "pos": [0, 0, 0]} for n in names]
+
+    def latest(self):
+        self.version += 1
+        return {"t": self.version * 0.01, "bodies": self.bodies}, self.version
+
+
+def syncRoundTrip(ws):
+    """async 핸들러 응답을 받을 때까지 대기 (그 전에 보낸 메시지는 모두 분배됨)"""
+    ws.send_json({"type": "upload_watch"})
+    while ws.receive_json().get("reason") != "bad_upload_watch":
+        pass
+
+
+# ---------------------------------------------------------------- 메시지 분배
+
+def test_slow_sync_handler_does_not_stall_frames(config):
+    release = threading.Event()
+
+    def slow(websocket, message, **kwargs):
+        release.wait(5)
+
+    app = createApp(config, messageHandlers={"slow": slow}, outputBuffer=CountingBuffer())
+    with TestClient(app) as client:
+        with client.websocket_connect("/cadverse/interaction") as ws:
+            try:
+                ws.send_json({"type": "slow"})
+                frames = 0
+                deadline = time.perf_counter() + 0.5
+                while time.perf_counter() < deadline:
+                    if ws.receive_json()["type"] == "frame":
+                        frames += 1
+                assert frames >= 3
+                assert app.state.dispatcher.pending == 1
+            finally:
+                release.set()
+
+
+@pytest.mark.parametrize("overflow", ["drop", "reject"])
+def test_overflow_counters(config, overflow):
+    config.handler_workers = 1
+    config.handler_max_pending = 1
+    config.handler_overflow = overflow
+    release = threading.Event()
+
+    def slow(websocket, message, **kwargs):
+        release.wait(5)
+
+    app = createApp(config, messageHandlers={"slow": slow})
+    with TestClient(app) as client:
+        with client.websocket_connect("/cadverse/interaction") as ws:
+            try:
+                for _ in range(3):
+                    ws.send_json({"type": "slow"})
+                if overflow == "reject":
+                    for _ in range(2):
+                        message = ws.receive_json()
+                        assert message["type"] == "error" and message["reason"] == "busy"
+                syncRoundTrip(ws)
+                stats = app.state.dispatcher.stats()
+            finally:
+                release.set()
+    assert stats["pending"] == 1
+    assert stats["dropped" if overflow == "drop" else "rejected"] == 2
+    assert stats["rejected" if overflow == "drop" else "dropped"] == 0
+
+
+def test_sync_handlers_keep_per_connection_order(config):
+    """type 없는 (레거시) 메시지가 워커 여러 개에서도 받은 순서대로 처리됨"""
+    seen = []
+    finished = threading.Event()
+
+    def legacy(websocket, message, **kwargs):
+        time.sleep(random.uniform(0, 0.005))
+        seen.append(json.loads(message)["n"])
+        if len(seen) == 20:
+            finished.set()
+
+    app = createApp(config, onWebsocketMessage=legacy)
+    with TestClient(app) as client:
+        with client.websocket_connect("/cadverse/interaction") as ws:
+            for n in range(20):
+                ws.send_json({"motors": [], "n": n})
+            assert finished.wait(5)
+    assert seen == list(range(20))
+
+
+def test_sync_callable_returning_coroutine_is_awaited(config):
+    class Handler:
+        def __call__(self, websocket, message, **kwargs):
+            return websocket.send_text(json.dumps({"type": "echo", "n": message["n"]}))
+
+    app = createApp(config, messageHandlers={"echo": Handler()})
+    with TestClient(app) as client:
+        with client.websocket_connect("/cadverse/interaction") as ws:
+            ws.send_json({"type": "echo", "n": 7})
+            assert ws.receive_json() == {"type": "echo", "n": 7}
+    assert app.state.dispatcher.stats()["failed"] == 0
+
+
+# ---------------------------------------------------------------- 구독
+
+def nextFrameBodies(ws):
+    while True:
+        message = ws.receive_json()
+        if message["type"] == "frame":
+            return sorted(b["name"] for b in message["frame"]["bodies"])
+
+
+def test_frames_follow_resubscription_after_catalog_change(config):
+    """모델이 바뀌어 레지스트리가 구독을 다시 해석하면 다음 프레임부터 반영"""
+    from sim_server.utils.interest import BodyCatalog, InterestRegistry
+
+    def catalog(bPos):
+        return BodyCatalog([{"name": "a", "assembly": None, "center": [0, 0, 0], "radius": 0.1},
+                            {"name": "b", "assembly": None, "center": bPos, "radius": 0.1}])
+
+    registry = InterestRegistry()
+    registry.setCatalog(catalog([5, 0, 0]))
+    app = createApp(config, interestRegistry=registry, outputBuffer=CountingBuffer(["a", "b"]))
+    with TestClient(app) as client:
+        with client.websocket_connect("/cadverse/interaction") as ws:
+            ws.send_json({"type": "subscribe", "aabb": {"min": [-1, -1, -1], "max": [1, 1, 1]}})
+            while ws.receive_json()["type"] != "subscribed":
+                pass
+            assert nextFrameBodies(ws) == ["a"]
+
+            registry.setCatalog(catalog([0.5, 0, 0]))  # b가 구독 영역 안으로
+            # 이미 보낸 프레임이 하나 남아 있을 수 있음
+            seen = [nextFrameBodies(ws) for _ in range(3)]
+            assert seen[-1] == ["a", "b"]
+
+
+# ---------------------------------------------------------------- 업로드
+
+def test_upload_rejects_large_content_length_before_body(config):
+    config.upload_max_bytes = 100
+    with TestClient(createApp(config)) as client:
+        res = client.post("/cadverse/upload", files={"file": ("big.obj", b"v 0 0 0\n" * 100)})
+    assert res.status_code == 413
+    assert uploadDirs(config) == []
+
+
+def test_upload_rejects_non_obj_and_cleans_up(config):
+    with TestClient(createApp(config)) as client:
+        res = client.post("/cadverse/upload", files={"file": ("model.stl", b"solid x\n")})
+    assert res.status_code == 400
+    assert uploadDirs(config) == []
+
+
+def test_upload_truncated_body_marks_job_failed(config):
+    """파일 데이터 도중 본문이 끝나면 400, 작업은 failed, 디렉토리 삭제"""
+    body = (b"--xx\r\nContent-Disposition: form-data; name=\"file\"; filename=\"a.obj\"\r\n\r\n"
+            + OBJ)
+    with TestClient(createApp(config)) as client:
+        res = client.post("/cadverse/upload", content=body,
+                          headers={"content-type": "multipart/form-data; boundary=xx"})
+    assert res.status_code == 400
+    assert uploadDirs(config) == []
+
+
+def test_upload_streams_and_reports_to_watcher_only(config):
+    with TestClient(createApp(config)) as client:
+        with client.websocket_connect("/cadverse/interaction") as watcher, \
+                client.websocket_connect("/cadverse/interaction") as other:
+            watcher.send_json({"type": "upload_watch", "token": "t1"})
+            time.sleep(0.1)
+            res = client.post("/cadverse/upload?token=t1", files={"file": ("part.obj", OBJ)})
+            assert res.status_code == 202
+            job = res.json()
+            assert job["status"] == "queued" and job["bytes"] > len(OBJ)
+
+            statuses = []
+            while not statuses or statuses[-1] not in ("done", "failed"):
+                message = watcher.receive_json()
+                if message.get("type") == "upload_progress":
+                    statuses.append(message["status"])
+            assert statuses[-1] == "done"
+            assert "uploading" in statuses or "queued" in statuses
+
+            # 다른 연결에는 upload_progress가 가지 않음 (다음 메시지가 바로 응답)
+            other.send_json({"type": "upload_watch"})
+            assert other.receive_json()["reason"] == "bad_upload_watch"
+
+        status = client.get(f"/cadverse/upload/{job['upload_id']}").json()
+    assert status["status"] == "done"
+    outDir = Path(config.resources_dir) / config.upload_dir / job["upload_id"]
+    assert not any(p.name.startswith("raw_") for p in outDir.iterdir())
+
+
+# ---------------------------------------------------------------- 기어 메시
+
+@pytest.mark.parametrize("query", ["module=2&teeth=3", "module=0&teeth=20",
+                                   "module=2&teeth=20&pressure_angle=0",
+                                   "module=2&teeth=20&pressure_angle=60"])
+def test_gear_mesh_rejects_bad_params(config, query):
+    with TestClient(createApp(config)) as client:
+        res = client.get(f"/cadverse/gears/mesh?{query}")
+    assert res.status_code == 400
+
+
+def test_gear_mesh_cvm_is_little_endian(config):
+    import struct
+    from sim_server.utils.gear_mesh import GearParams, gear_mesh
+
+    with TestClient(createApp(config)) as client:
+        res = client.get("/cadverse/gears/mesh?module=2&teeth=20&format=cvm")
+    assert res.status_code == 200
+    body = res.content
+    vertices, triangles = gear_mesh(GearParams(2, 20))
+    assert body[:4] == b"CVM1"
+    assert struct.unpack_from('<II', body, 4) == (len(vertices), len(triangles))
+    assert struct.unpack_from('<3f', body, 12) == pytest.approx(vertices[0], abs=1e-6)
+    assert len(body) == 12 + 12 * len(vertices) + 12 * len(triangles)
@@ -0,0 +1,74 @@
+# WarmSimPool 테스트 (가짜 builder, pychrono 없이 실행 가능)
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sim_server.utils.checkpoint import model_key
+from sim_server.utils.sim_pool import WarmSimPool
+
+MODEL = {"backend": "synthetic", "synthetic": {"bodies": 4}}
+
+
+class FakeSimulator:
+    def __init__(self):
+        self.cleared = False
+
+    def clear(self):
+        self.cleared = True
+
+
+class FlakyBuilder:
+    """처음 failures번은 실패하고 이후에는 FakeSimulator 반환"""
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.calls = 0
+        self.failed = threading.Event()
+
+    def __call__(self, description, bufferHandle):
+        self.calls += 1
+        if self.calls <= self.failures:
+            self.failed.set()
+            raise RuntimeError("build failed")
+        return FakeSimulator()
+
+
+def waitFor(condition, timeout=5.0):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_failed_model_is_retried_when_requested_again():
+    builder = FlakyBuilder(failures=1)
+    pool = WarmSimPool(size=1, builder=builder)
+    try:
+        pool.prewarm(MODEL)
+        assert builder.failed.wait(5)
+        key = model_key(MODEL)
+        assert waitFor(lambda: key in pool.failures)
+        time.sleep(0.05)
+        assert builder.calls == 1  # 실패한 모델은 다시 요청될 때까지 건너뜀
+
+        assert pool.take(MODEL) is None  # 아직 없음, 실패 기록을 지우고 다시 생성
+        assert waitFor(lambda: pool.status()[key]["ready"] == 1)
+        assert key not in pool.failures
+        assert isinstance(pool.take(MODEL), FakeSimulator)
+    finally:
+        pool.close()
+
+
+def test_close_disposes_ready_simulators():
+    pool = WarmSimPool(size=2, builder=FlakyBuilder(failures=0))
+    pool.prewarm(MODEL)
+    key = model_key(MODEL)
+    assert waitFor(lambda: pool.status()[key]["ready"] == 2)
+    ready = list(pool._ready[key])
+    pool.close()
+    assert all(s.cleared for s in ready)
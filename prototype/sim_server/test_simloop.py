@@ -1 +1,135 @@
 # SimLoopThread 테스트
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sim_server import simInterface
+from sim_server.legacy_simloop import MAX_TICK_ERRORS, runSimloop
+from sim_server.synthetic_sim import SyntheticSimulator
+from sim_server.utils.checkpoint import CheckpointStore, model_key
+from sim_server.utils.owned_buffer import OwnedBuffer
+
+MODEL = {"backend": "flaky", "synthetic": {"bodies": 4, "motors": 1}}
+DT = 0.01
+
+
+class FlakySimulator(SyntheticSimulator):
+    """failAt 스텝부터 step()이 계속 실패 (None이면 정상)"""
+    failAt = None
+    calls = 0
+    restoredFrom = []
+
+    def __init__(self, modelMeta, bufferHandle, checkpoint=None):
+        super().__init__(modelMeta, bufferHandle, checkpoint=checkpoint)
+        FlakySimulator.restoredFrom.append(None if checkpoint is None else checkpoint.step)
+
+    def step(self, dt, publish=True):
+        if self.failAt is not None and self.stepCount >= self.failAt:
+            FlakySimulator.calls += 1
+            raise RuntimeError("step failed")
+        super().step(dt, publish=publish)
+
+
+@pytest.fixture
+def flaky(monkeypatch):
+    monkeypatch.setitem(simInterface.BACKENDS, "flaky", FlakySimulator)
+    monkeypatch.setattr(FlakySimulator, "restoredFrom", [])
+    monkeypatch.setattr(FlakySimulator, "calls", 0)
+    return FlakySimulator
+
+
+def test_failing_step_escalates_and_restart_resumes_from_checkpoint(flaky):
+    store = CheckpointStore()
+    flaky.failAt = 5
+    try:
+        with pytest.raises(RuntimeError, match="step failed"):
+            runSimloop(MODEL, OwnedBuffer({}), threading.Event(), dt=DT,
+                       checkpointStore=store, checkpointInterval=0.0)
+    finally:
+        flaky.failAt = None
+    assert flaky.calls == MAX_TICK_ERRORS
+    checkpoint = store.latestFor(model_key(MODEL))
+    assert checkpoint is not None and checkpoint.step == 5
+
+    # main이 하듯 루프를 다시 시작하면 마지막 체크포인트에서 이어감
+    output = OwnedBuffer({})
+    stop = threading.Event()
+    thread = threading.Thread(target=runSimloop, args=(MODEL, output, stop),
+                              kwargs={"dt": DT, "checkpointStore": store})
+    thread.start()
+    try:
+        for _ in range(500):
+            if output.version:
+                break
+            stop.wait(0.01)
+    finally:
+        stop.set()
+        thread.join(timeout=5)
+    assert flaky.restoredFrom == [None, 5]
+    frame, _ = output.latest()
+    assert frame["time"] > 5 * DT
+
+
+def test_checkpoint_skipped_without_new_steps(flaky):
+    store = CheckpointStore()
+    flaky.failAt = 0
+    try:
+        with pytest.raises(RuntimeError):
+            runSimloop(MODEL, OwnedBuffer({}), threading.Event(), dt=DT,
+                       checkpointStore=store, checkpointInterval=0.0)
+    finally:
+        flaky.failAt = None
+    assert store.latest is None
+
+
+class NoCheckpointSimulator(SyntheticSimulator):
+    supportsCheckpoint = False
+
+    def restoreCheckpoint(self, checkpoint):
+        raise AssertionError("체크포인트를 지원하지 않는 백엔드에 복원을 시도함")
+
+
+class OnePool:
+    """take()가 미리 만든 시뮬레이터 하나를 돌려주는 풀"""
+
+    def __init__(self, simulator):
+        self.simulator = simulator
+
+    def take(self, description):
+        simulator, self.simulator = self.simulator, None
+        return simulator
+
+
+@pytest.mark.parametrize("pooled", [False, True])
+def test_backend_without_checkpoint_support_starts_fresh(monkeypatch, pooled):
+    monkeypatch.setitem(simInterface.BACKENDS, "plain", NoCheckpointSimulator)
+    model = {"backend": "plain", "synthetic": {"bodies": 2, "motors": 1}}
+    store = CheckpointStore()
+    stale = SyntheticSimulator(model, None)
+    for _ in range(3):
+        stale.step(DT, publish=False)
+    store.submit(stale.captureCheckpoint(model_key(model)))
+
+    pool = OnePool(NoCheckpointSimulator(model, None)) if pooled else None
+    output = OwnedBuffer({})
+    stop = threading.Event()
+    thread = threading.Thread(target=runSimloop, args=(model, output, stop),
+                              kwargs={"dt": DT, "checkpointStore": store, "simPool": pool,
+                                      "checkpointInterval": 0.0})
+    thread.start()
+    try:
+        for _ in range(500):
+            if output.version >= 2:
+                break
+            stop.wait(0.01)
+    finally:
+        stop.set()
+        thread.join(timeout=5)
+    frame, version = output.latest()
+    assert version and frame["time"] == pytest.approx(version * DT)
+    # 저장된 체크포인트는 그대로 (지원하지 않는 백엔드는 저장하지 않음)
+    assert store.latest.step == 3
@@ -0,0 +1,128 @@
+# SubscriberGate 구독자 신호 / 구독자 없을 때 시뮬 루프 정책 테스트 (합성 백엔드)
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sim_server import simInterface
+from sim_server.legacy_simloop import runSimloop
+from sim_server.synthetic_sim import SyntheticSimulator
+from sim_server.utils.owned_buffer import OwnedBuffer
+from sim_server.utils.subscriber_gate import (
+    SubscriberGate, IDLE_RUN, IDLE_PAUSE, IDLE_NO_FRAMES, IDLE_KEEPALIVE
+)
+
+MODEL = {"backend": "counting", "synthetic": {"bodies": 2, "motors": 1}}
+DT = 0.002
+
+
+class CountingSimulator(SyntheticSimulator):
+    """step() 호출마다 publish 여부를 기록"""
+    steps = []
+
+    def step(self, dt, publish=True):
+        CountingSimulator.steps.append(publish)
+        super().step(dt, publish=publish)
+
+
+@pytest.fixture
+def counting(monkeypatch):
+    monkeypatch.setitem(simInterface.BACKENDS, "counting", CountingSimulator)
+    monkeypatch.setattr(CountingSimulator, "steps", [])
+    return CountingSimulator
+
+
+class RunningLoop:
+    """runSimloop를 스레드로 돌리고 with 블록이 끝나면 멈춤"""
+
+    def __init__(self, gate):
+        self.output = OwnedBuffer({})
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=runSimloop, args=(MODEL, self.output, self.stop),
+                                       kwargs={"dt": DT, "subscriberGate": gate})
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop.set()
+        self.thread.join(timeout=5)
+        assert not self.thread.is_alive()
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        SubscriberGate(idlePolicy="sleep")
+
+
+def test_count_never_goes_negative():
+    gate = SubscriberGate()
+    assert gate.idle
+    assert gate.add() == 1 and not gate.idle
+    assert gate.remove() == 0 and gate.remove() == 0
+    assert gate.idle
+
+
+def test_wait_returns_when_a_subscriber_arrives():
+    gate = SubscriberGate()
+    start = time.perf_counter()
+    assert not gate.wait(0.02)
+    threading.Timer(0.05, gate.add).start()
+    assert gate.wait(5.0)
+    assert time.perf_counter() - start < 2.0
+    # 구독자가 있으면 기다리지 않음
+    assert gate.wait(5.0)
+
+
+def test_idle_run_keeps_full_speed(counting):
+    with RunningLoop(SubscriberGate(idlePolicy=IDLE_RUN)):
+        time.sleep(0.2)
+    assert len(counting.steps) > 20 and all(counting.steps)
+
+
+def test_idle_pause_stops_stepping_until_subscribed(counting):
+    gate = SubscriberGate(idlePolicy=IDLE_PAUSE)
+    with RunningLoop(gate) as loop:
+        time.sleep(0.2)
+        assert counting.steps == [] and loop.output.version == 0
+        gate.add()
+        for _ in range(500):
+            if loop.output.version >= 3:
+                break
+            time.sleep(0.01)
+    assert loop.output.version >= 3 and all(counting.steps)
+
+
+def test_idle_no_frames_steps_without_committing(counting):
+    gate = SubscriberGate(idlePolicy=IDLE_NO_FRAMES)
+    with RunningLoop(gate) as loop:
+        time.sleep(0.2)
+        assert len(counting.steps) > 20 and not any(counting.steps)
+        assert loop.output.version == 0
+        gate.add()
+        for _ in range(500):
+            if loop.output.version:
+                break
+            time.sleep(0.01)
+    assert loop.output.version
+    # 스텝은 계속됐으므로 첫 프레임 시각은 그동안 진행된 시간
+    frame, version = loop.output.latest()
+    assert frame["time"] > version * DT
+
+
+def test_idle_keepalive_steps_slowly_and_wakes_on_subscribe(counting):
+    gate = SubscriberGate(idlePolicy=IDLE_KEEPALIVE, keepaliveHz=10.0)
+    with RunningLoop(gate) as loop:
+        time.sleep(0.35)
+        slow = len(counting.steps)
+        # 10Hz로 0.35초면 4스텝 안팎 (전속력이면 100스텝 이상)
+        assert 1 <= slow <= 8 and all(counting.steps)
+        assert loop.output.version == slow
+        gate.add()
+        time.sleep(0.1)
+    assert len(counting.steps) - slow > 10
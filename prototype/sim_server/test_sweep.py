@@ -0,0 +1,65 @@
+# sweep 파라미터 해석/변형 전개/재개 테스트 (합성 백엔드, pychrono 없이 실행 가능)
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sim_server.sweep import apply_params, expand_sweep, parse_set, run_sweep
+
+MODEL = {"backend": "synthetic", "synthetic": {"bodies": 2, "motors": 1, "motor_speed": 1.0}}
+
+
+def test_parse_set_splits_outside_brackets_and_quotes():
+    assert parse_set("a.b=1,2.5,true") == ("a.b", [1, 2.5, True])
+    assert parse_set("pos=[0,0,1],[0,1,0]") == ("pos", [[0, 0, 1], [0, 1, 0]])
+    assert parse_set('name="a,b",plain, {"k": [1, 2]}') == ("name", ["a,b", "plain", {"k": [1, 2]}])
+    for bad in ("a.b", "=1", "a=[1,2"):
+        with pytest.raises(ValueError):
+            parse_set(bad)
+
+
+def test_expand_sweep_grid_and_zip():
+    params = {"x": [1, 2], "y": ["a", "b"]}
+    assert expand_sweep(params) == [{"x": 1, "y": "a"}, {"x": 1, "y": "b"},
+                                    {"x": 2, "y": "a"}, {"x": 2, "y": "b"}]
+    assert expand_sweep(params, "zip") == [{"x": 1, "y": "a"}, {"x": 2, "y": "b"}]
+    assert expand_sweep({}) == [{}]
+    with pytest.raises(ValueError):
+        expand_sweep({"x": [1, 2], "y": [1]}, "zip")
+
+
+def test_apply_params_rejects_missing_intermediate_keys():
+    out = apply_params(MODEL, {"synthetic.motor_speed": 3.0, "synthetic.seed": 7})
+    assert out["synthetic"]["motor_speed"] == 3.0 and out["synthetic"]["seed"] == 7
+    assert MODEL["synthetic"]["motor_speed"] == 1.0
+    with pytest.raises(KeyError):
+        apply_params(MODEL, {"synthetc.motor_speed": 1.0})
+
+
+def summary_mtime(out, index):
+    return (out / f"variant_{index:04d}" / "summary.json").stat().st_mtime_ns
+
+
+def test_resume_reruns_only_when_settings_change(tmp_path):
+    variants = expand_sweep({"synthetic.motor_speed": [1.0, 2.0]})
+    kwargs = dict(duration=0.05, dt=0.01, workers=1)
+    first = run_sweep(MODEL, variants, tmp_path, **kwargs)
+    assert first["failed"] == 0 and [s["steps"] for s in first["variants"]] == [5, 5]
+    before = [summary_mtime(tmp_path, i) for i in range(2)]
+
+    again = run_sweep(MODEL, variants, tmp_path, resume=True, **kwargs)
+    assert [summary_mtime(tmp_path, i) for i in range(2)] == before
+    assert again["variants"] == first["variants"]
+
+    longer = run_sweep(MODEL, variants, tmp_path, resume=True, **{**kwargs, "duration": 0.1})
+    assert [s["steps"] for s in longer["variants"]] == [10, 10]
+
+    sparse = run_sweep(MODEL, variants, tmp_path, resume=True, record_every=2,
+                       **{**kwargs, "duration": 0.1})
+    assert [s["frames"] for s in sparse["variants"]] == [5, 5]
+
+    report = json.loads((tmp_path / "summary.json").read_text(encoding="utf-8"))
+    assert report["config"]["record_every"] == 2
@@ -0,0 +1,64 @@
+# 텔레메트리 샘플 전달 테스트 (합성 백엔드, pychrono 없이 실행 가능)
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sim_server.synthetic_sim import SyntheticSimulator
+from sim_server.utils.telemetry import TelemetryRegistry, select_samples
+
+CHANNEL = "motor:synthetic_motor_0"
+
+
+class FrameList:
+    """write_outputs로 commit된 프레임을 모두 보관"""
+
+    def __init__(self):
+        self.frames = []
+
+    def write_outputs(self, frame):
+        self.frames.append(frame)
+
+
+def run(channels, steps=60):
+    buffer = FrameList()
+    sim = SyntheticSimulator({"synthetic": {"bodies": 2, "motors": 1}}, buffer)
+    registry = TelemetryRegistry()
+    registry.setAvailable(sim.channels)
+    for client, subs in channels.items():
+        registry.update(client, subs)
+    sim.attach(telemetryRegistry=registry)
+    for _ in range(steps):
+        sim.step(0.01)
+    return buffer.frames
+
+
+def receive(frames, every, channels):
+    """every 프레임마다 최신 프레임 하나만 읽는 클라이언트가 받은 샘플의 스텝"""
+    lastSent, steps = {}, []
+    for frame in frames[every - 1::every]:
+        samples = select_samples(frame.get("telemetry"), channels, lastSent)
+        if CHANNEL in samples:
+            steps.append(samples[CHANNEL]["step"])
+    return steps
+
+
+def test_slow_reader_gets_every_sample_once():
+    frames = run({"a": {CHANNEL: 10}})
+    # 샘플한 스텝(10, 20, ...)의 프레임을 읽지 못해도 다음 프레임에서 받음
+    assert receive(frames, 4, {CHANNEL: 10}) == [10, 20, 30, 40, 50, 60]
+    # 매 프레임 읽어도 같은 샘플은 한 번만
+    assert receive(frames, 1, {CHANNEL: 10}) == [10, 20, 30, 40, 50, 60]
+
+
+def test_coarser_subscriber_is_spaced_by_its_decimation():
+    frames = run({"a": {CHANNEL: 10}, "b": {CHANNEL: 20}})
+    assert receive(frames, 7, {CHANNEL: 20}) == [10, 30, 50]
+
+
+def test_sample_carries_its_own_step():
+    frames = run({"a": {CHANNEL: 10}}, steps=15)
+    frame = frames[-1]
+    assert frame["step"] == 15
+    step, sample = frame["telemetry"][CHANNEL]
+    assert step == 10 and set(sample) == {"torque", "speed", "angle"}
@@ -0,0 +1,86 @@
+# Tracer trace-event 기록/내보내기 테스트
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sim_server.utils.tracer import Tracer
+
+
+def events(trace, ph):
+    return [e for e in trace["traceEvents"] if e["ph"] == ph]
+
+
+def test_disabled_span_records_nothing():
+    tracer = Tracer()
+    with tracer.span("encode", cat="net"):
+        pass
+    assert tracer.toChrome()["traceEvents"] == []
+    tracer.onOverrun(0.0, 1.0, 0.5)
+    assert tracer.status()["events"] == 0
+
+
+def test_chrome_events_use_microseconds_and_thread_names():
+    tracer = Tracer(enabled=True)
+    tracer.complete("tick", 1.0, 1.0025, cat="sim", args={"publish": True})
+    with tracer.span("encode", cat="net", client=3):
+        pass
+    tracer.instant("input_received", cat="net")
+
+    def worker():
+        tracer.complete("physics", 2.0, 2.001, cat="sim")
+    thread = threading.Thread(target=worker, name="sim-loop")
+    thread.start()
+    thread.join()
+
+    trace = json.loads(json.dumps(tracer.toChrome()))
+    assert trace["displayTimeUnit"] == "ms"
+    tick, encode, physics = events(trace, "X")
+    assert tick == {"name": "tick", "cat": "sim", "ph": "X", "ts": 1e6, "dur": tick["dur"],
+                    "pid": 1, "tid": threading.get_ident(), "args": {"publish": True}}
+    assert abs(tick["dur"] - 2500.0) < 1e-6
+    assert encode["args"] == {"client": 3} and encode["dur"] >= 0
+    (instant,) = events(trace, "i")
+    assert instant["s"] == "t" and "dur" not in instant and "args" not in instant
+    names = {e["tid"]: e["args"]["name"] for e in events(trace, "M")}
+    assert names[physics["tid"]] == "sim-loop"
+    assert names[tick["tid"]] == threading.current_thread().name
+
+
+def test_ring_buffer_keeps_newest():
+    tracer = Tracer(capacity=3, enabled=True)
+    for i in range(5):
+        tracer.complete(f"e{i}", i, i + 1)
+    assert [e["name"] for e in events(tracer.toChrome(), "X")] == ["e2", "e3", "e4"]
+    tracer.configure(capacity=2)
+    assert [e["name"] for e in events(tracer.toChrome(), "X")] == ["e3", "e4"]
+    tracer.clear()
+    assert tracer.status()["events"] == 0
+
+
+def test_overrun_dumps_at_most_once_per_interval(tmp_path):
+    tracer = Tracer(enabled=True)
+    tracer.configure(dumpDir=str(tmp_path), dumpInterval=10.0)
+    tracer.complete("tick", 100.0, 100.03)
+    tracer.onOverrun(100.0, 100.03, 1 / 60)
+    tracer.onOverrun(101.0, 101.03, 1 / 60)   # 간격 안: 이벤트만 기록
+    assert tracer.dumps == 1
+
+    for _ in range(200):
+        files = list(tmp_path.glob("overrun_*.json"))
+        if files:
+            break
+        time.sleep(0.01)
+    (path,) = files
+    trace = json.loads(path.read_text(encoding="utf-8"))
+    # 덤프에는 그 시점까지의 이벤트 (두 번째 overrun은 없음)
+    assert [e["name"] for e in events(trace, "X")] == ["tick", "overrun"]
+    overrun = events(trace, "X")[1]
+    assert abs(overrun["args"]["budget_ms"] - 1000 / 60) < 1e-9
+    assert [e["name"] for e in events(tracer.toChrome(), "X")] == ["tick", "overrun", "overrun"]
+
+    tracer.onOverrun(111.0, 111.03, 1 / 60)
+    assert tracer.dumps == 2
@@ -0,0 +1,142 @@
+"""
+시뮬레이션 상태 체크포인트 (재시작 시 마지막 상태에서 이어가기)
+
+시뮬레이션 스레드는 capture_checkpoint()로 숫자 목록만 복사해서 submit()하고,
+JSON 변환/디스크 기록은 기록 스레드가 한다 (대기 중인 체크포인트는 최신 것 하나만 기록)
+
+- 메모리의 latest는 매 submit마다 교체 → 같은 프로세스 안의 스레드 재시작(크래시)은 디스크 없이 복원
+- 디렉토리가 있으면 writeInterval마다 최신 것만 원자적으로 기록 → 배포 등 프로세스 재시작 후 복원
+  close() 시 마지막 체크포인트까지 기록
+
+파일: <directory>/checkpoint.json
+    {"version", "model", "time", "step", "wall",
+     "bodies": [...], "state": [바디마다 px,py,pz, e0,e1,e2,e3, vx,vy,vz, wx,wy,wz],
+     "motors": {모터 이름: [현재 속도, 목표 속도, 램프 기울기 또는 null, 모터 각도]}}
+"""
+import hashlib
+import json
+import threading
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+FORMAT_VERSION = 1
+BODY_STATE = 13  # pos(3) + rot(4) + 선속도(3) + 월드 기준 각속도(3)
+
+
+def model_key(modelDescription: dict) -> str:
+    """모델 설명 해시 (다른 모델의 체크포인트를 복원하지 않도록)"""
+    data = json.dumps(modelDescription, sort_keys=True, default=str)
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class Checkpoint:
+    """시뮬레이션 한 시점의 상태 (고정 바디는 제외)"""
+    model: str
+    time: float
+    step: int
+    bodies: List[str]
+    state: List[float]
+    motors: Dict[str, list] = field(default_factory=dict)
+    wall: float = 0.0
+
+    @classmethod
+    def fromDict(cls, data: dict) -> 'Checkpoint':
+        if data.get("version") != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 체크포인트 버전: {data.get('version')}")
+        if len(data["state"]) != len(data["bodies"]) * BODY_STATE:
+            raise ValueError("체크포인트 state 길이가 바디 수와 맞지 않음")
+        return cls(model=data["model"], time=data["time"], step=data["step"],
+                   bodies=data["bodies"], state=data["state"],
+                   motors=data.get("motors", {}), wall=data.get("wall", 0.0))
+
+    def toDict(self) -> dict:
+        return {"version": FORMAT_VERSION, **asdict(self)}
+
+
+class CheckpointStore:
+    """
+    최신 체크포인트 보관 + (디렉토리가 있으면) 백그라운드 기록
+
+    main이 한 번 만들어서 재시작되는 SimLoopThread들이 공유
+    """
+
+    FILENAME = "checkpoint.json"
+
+    def __init__(self, directory: Optional[str] = None, writeInterval: float = 1.0):
+        self.directory = Path(directory) if directory else None
+        self.writeInterval = writeInterval
+        self.latest: Optional[Checkpoint] = None
+        self.written = 0
+        self._written: Optional[Checkpoint] = None
+        self._wake = threading.Event()
+        self._closed = False
+        self._writer = None
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self.latest = self._load()
+            self._writer = threading.Thread(target=self._writeLoop, daemon=True,
+                                            name="checkpoint-writer")
+            self._writer.start()
+
+    @property
+    def path(self) -> Optional[Path]:
+        return None if self.directory is None else self.directory / self.FILENAME
+
+    def submit(self, checkpoint: Checkpoint):
+        """시뮬레이션 스레드에서 호출 (대입만 하고 바로 반환)"""
+        self.latest = checkpoint
+
+    def latestFor(self, model: str) -> Optional[Checkpoint]:
+        """같은 모델의 최신 체크포인트 (없으면 None)"""
+        cp = self.latest
+        return cp if cp is not None and cp.model == model else None
+
+    def clear(self):
+        """체크포인트 폐기 (새 모델로 처음부터 시작할 때)"""
+        self.latest = None
+        if self.path is not None:
+            self.path.unlink(missing_ok=True)
+
+    def flush(self):
+        """아직 기록하지 않은 최신 체크포인트를 지금 기록 (호출한 스레드에서)"""
+        cp = self.latest
+        if cp is None or cp is self._written or self.path is None:
+            return
+        tmp = self.path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(cp.toDict()), encoding="utf-8")
+        tmp.replace(self.path)
+        self._written = cp
+        self.written += 1
+
+    def _writeLoop(self):
+        while not self._closed:
+            self._wake.wait(self.writeInterval)
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"[checkpoint] 기록 실패: {e}")
+
+    def _load(self) -> Optional[Checkpoint]:
+        path = self.path
+        if not path.exists():
+            return None
+        try:
+            cp = Checkpoint.fromDict(json.loads(path.read_text(encoding="utf-8")))
+            print(f"[checkpoint] 불러옴: {path} (t={cp.time:.3f}, step={cp.step})")
+            return cp
+        except Exception as e:
+            print(f"[checkpoint] 읽기 실패, 무시: {path} ({e})")
+            return None
+
+    def close(self):
+        """기록 스레드 종료 후 마지막 체크포인트 기록 (여러 번 불러도 됨)"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._writer is not None:
+            self._wake.set()
+            self._writer.join()
+        self.flush()
+
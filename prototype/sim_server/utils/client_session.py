@@ -0,0 +1,268 @@
+import asyncio
+import itertools
+import json
+import time
+from typing import Dict, FrozenSet, Optional
+
+from sim_server.utils.telemetry import select_samples
+from sim_server.utils.metrics import METRICS
+from sim_server.utils.tracer import TRACER
+
+_STAGE_HELP = "프레임 전송 단계별 소요 시간 (초)"
+_stageRead = METRICS.histogram("publish_stage_seconds", _STAGE_HELP, stage="buffer_read")
+_stageEncode = METRICS.histogram("publish_stage_seconds", _STAGE_HELP, stage="encode")
+_stageSend = METRICS.histogram("publish_stage_seconds", _STAGE_HELP, stage="send")
+_framesSent = METRICS.counter("ws_frames_sent_total", "클라이언트에 보낸 프레임 수")
+_bytesSent = METRICS.counter("ws_bytes_sent_total", "클라이언트에 보낸 프레임 크기 합 (bytes)")
+_framesSkipped = METRICS.counter("ws_publish_skipped_total", "전송이 밀려 건너뛴 전송 틱 수")
+_sessionIds = itertools.count(1)
+
+
+def round_floats(obj, decimals: int):
+    """프레임 안의 float를 소수 decimals자리로 반올림 (전송 크기/인코딩 정밀도 조절)"""
+    if isinstance(obj, float):
+        return round(obj, decimals)
+    if isinstance(obj, dict):
+        return {k: round_floats(v, decimals) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [round_floats(v, decimals) for v in obj]
+    return obj
+
+
+class AdaptiveRate:
+    """
+    클라이언트별 전송 주기/정밀도 조절기 (AIMD)
+
+    혼잡 신호:
+      - send 완료까지 걸린 시간이 전송 주기의 절반 이상 (소켓 버퍼가 차서 drain 대기)
+      - 이전 send가 끝나기 전에 다음 틱이 와서 프레임을 건너뜀
+      - RTT가 최소 RTT 대비 크게 늘어남 (어딘가에 큐가 쌓이는 중)
+    window초마다 혼잡이면 주기를 decreaseFactor배로 줄이고, 아니면 increaseHz씩 올림
+    주기가 낮을수록 소수점 자릿수도 줄여서 프레임 크기를 같이 줄인다
+    """
+
+    def __init__(self, minHz: float = 15.0, maxHz: float = 60.0, startHz: Optional[float] = None,
+                 minDecimals: int = 3, maxDecimals: int = 5,
+                 increaseHz: float = 2.0, decreaseFactor: float = 0.7, window: float = 1.0):
+        self.minHz = minHz
+        self.maxHz = maxHz
+        self.hz = startHz if startHz is not None else maxHz
+        self.minDecimals = minDecimals
+        self.maxDecimals = maxDecimals
+        self.increaseHz = increaseHz
+        self.decreaseFactor = decreaseFactor
+        self.window = window
+
+        self.srtt: Optional[float] = None    # RTT 지수 평균 (초)
+        self.minRtt: Optional[float] = None
+        self.sendTime = 0.0                  # send 소요 시간 지수 평균 (초)
+        self.skipped = 0
+
+        self._congested = False
+        self._lastUpdate = time.perf_counter()
+
+    @property
+    def period(self) -> float:
+        return 1.0 / self.hz
+
+    @property
+    def decimals(self) -> int:
+        span = self.maxHz - self.minHz
+        ratio = (self.hz - self.minHz) / span if span > 0 else 1.0
+        return self.minDecimals + round(ratio * (self.maxDecimals - self.minDecimals))
+
+    def onSend(self, seconds: float):
+        self.sendTime += (seconds - self.sendTime) * 0.125
+        if seconds > 0.5 * self.period:
+            self._congested = True
+
+    def onSkip(self):
+        self.skipped += 1
+        self._congested = True
+
+    def onRtt(self, rtt: float):
+        self.srtt = rtt if self.srtt is None else self.srtt + (rtt - self.srtt) * 0.125
+        self.minRtt = rtt if self.minRtt is None else min(self.minRtt, rtt)
+        # 최소 RTT의 2배 + 20ms를 넘으면 큐잉 지연으로 판단
+        if rtt > 2 * self.minRtt + 0.02:
+            self._congested = True
+
+    def update(self, now: Optional[float] = None) -> bool:
+        """
+        window마다 주기 조정
+
+        Returns:
+            주기가 바뀌었으면 True
+        """
+        now = time.perf_counter() if now is None else now
+        if now - self._lastUpdate < self.window:
+            return False
+        self._lastUpdate = now
+
+        before = self.hz
+        if self._congested:
+            self.hz = max(self.minHz, self.hz * self.decreaseFactor)
+        else:
+            self.hz = min(self.maxHz, self.hz + self.increaseHz)
+        self._congested = False
+        return self.hz != before
+
+    def toDict(self) -> dict:
+        """클라이언트에 알리는 현재 상태"""
+        return {
+            "hz": round(self.hz, 2),
+            "decimals": self.decimals,
+            "rtt_ms": None if self.srtt is None else round(self.srtt * 1000, 1),
+            "send_ms": round(self.sendTime * 1000, 2),
+            "skipped": self.skipped,
+        }
+
+
+class FrameEncoder:
+    """
+    (프레임 버전, 정밀도, 구독 바디 집합)별 JSON 인코딩 캐시
+    같은 조건의 클라이언트들은 같은 문자열을 공유 (클라이언트 수만큼 인코딩하지 않음)
+    """
+
+    def __init__(self):
+        self._version = None
+        self._cache: Dict[tuple, str] = {}
+
+    def encode(self, frame, version: int, decimals: int,
+               names: Optional[FrozenSet[str]] = None) -> str:
+        if version != self._version:
+            self._version = version
+            self._cache = {}
+        key = (decimals, names)
+        text = self._cache.get(key)
+        if text is None:
+            if "telemetry" in frame:
+                # 텔레메트리는 클라이언트마다 채널이 달라서 ClientSession에서 따로 붙임
+                frame = {k: v for k, v in frame.items() if k != "telemetry"}
+            if names is not None and "bodies" in frame:
+                # 클라이언트가 구독한 바디만 남김
+                frame = {**frame, "bodies": [b for b in frame["bodies"] if b["name"] in names]}
+            text = json.dumps({"type": "frame", "seq": version,
+                               "frame": round_floats(frame, decimals)},
+                              separators=(",", ":"))
+            self._cache[key] = text
+        return text
+
+
+class ClientSession:
+    """
+    웹소켓 클라이언트 하나의 전송 상태
+
+    - publishLoop(): 자기 주기마다 최신 프레임 하나만 전송 (밀린 프레임을 쌓지 않음)
+    - 주기적으로 {"type": "ping", "id", "t"}를 보내고 클라이언트의 pong으로 RTT 측정
+    - 주기/정밀도가 바뀌거나 reportInterval마다 {"type": "rate", ...}로 현재 상태 통보
+    """
+
+    def __init__(self, websocket, rate: AdaptiveRate):
+        self.id = next(_sessionIds)  # 로그/트레이스용 클라이언트 번호
+        self.websocket = websocket
+        self.rate = rate
+        self.lastSeq = -1
+        self.interest = None                         # InterestRegistry (있으면 매 프레임 이 클라이언트의 구독 바디를 읽음)
+        self.channels: Dict[str, int] = {}           # 구독 중인 텔레메트리 채널 -> decimation
+        self._lastSample: Dict[str, int] = {}        # 채널별 마지막으로 보낸 스텝
+        self.latency = None                          # LatencyTracker (있으면 이 클라이언트 입력의 cid를 프레임에 붙임)
+        self._pingIds = itertools.count(1)
+        self._pendingPings: Dict[int, float] = {}
+
+    @property
+    def names(self) -> Optional[FrozenSet[str]]:
+        """
+        구독 중인 바디 이름 (None이면 전체)
+        모델이 바뀌면 레지스트리가 구독을 다시 해석하므로 구독 시점 값을 들고 있지 않고 매번 읽음
+        """
+        return self.interest.namesFor(self.websocket) if self.interest is not None else None
+
+    def onPong(self, message: dict):
+        """클라이언트 pong 처리: {"type": "pong", "id": <ping id>}"""
+        sentAt = self._pendingPings.pop(message.get("id"), None)
+        if sentAt is not None:
+            self.rate.onRtt(time.perf_counter() - sentAt)
+
+    async def _send(self, text: str):
+        start = time.perf_counter()
+        await self.websocket.send_text(text)
+        end = time.perf_counter()
+        elapsed = end - start
+        self.rate.onSend(elapsed)
+        _stageSend.observe(elapsed)
+        if TRACER.enabled:
+            TRACER.complete("send", start, end, cat="net",
+                            args={"client": self.id, "seq": self.lastSeq, "bytes": len(text)})
+        _framesSent.inc()
+        _bytesSent.inc(len(text))
+
+    async def _ping(self):
+        pingId = next(self._pingIds)
+        now = time.perf_counter()
+        # 응답 없는 ping이 쌓이지 않도록 오래된 것은 정리
+        if len(self._pendingPings) > 8:
+            self._pendingPings.pop(next(iter(self._pendingPings)))
+        self._pendingPings[pingId] = now
+        await self.websocket.send_text(json.dumps({"type": "ping", "id": pingId, "t": now}))
+
+    async def _report(self):
+        await self.websocket.send_text(json.dumps({"type": "rate", **self.rate.toDict()}))
+
+    async def publishLoop(self, outputBuffer, encoder: FrameEncoder,
+                          pingInterval: float = 1.0, reportInterval: float = 5.0):
+        """연결이 끊기거나 태스크가 취소될 때까지 프레임 전송"""
+        rate = self.rate
+        nextTick = time.perf_counter()
+        nextPing = nextTick
+        nextReport = nextTick + reportInterval
+        await self._report()
+
+        while True:
+            now = time.perf_counter()
+            if now >= nextPing:
+                nextPing = now + pingInterval
+                await self._ping()
+
+            start = time.perf_counter()
+            frame, version = outputBuffer.latest()
+            encodeStart = time.perf_counter()
+            _stageRead.observe(encodeStart - start)
+            if version != self.lastSeq and frame:
+                self.lastSeq = version
+                text = encoder.encode(frame, version, rate.decimals, self.names)
+                if self.channels:
+                    samples = select_samples(frame.get("telemetry"), self.channels, self._lastSample)
+                    if samples:
+                        # 공유 인코딩 끝의 '}' 앞에 이 클라이언트의 텔레메트리를 덧붙임
+                        text = text[:-1] + ',"telemetry":' + json.dumps(
+                            round_floats(samples, rate.maxDecimals), separators=(",", ":")) + "}"
+                if self.latency is not None:
+                    # 이 클라이언트 입력이 반영된 첫 프레임(또는 건너뛰었으면 그 이후 프레임)에 cid 표시
+                    cids = self.latency.takeSent(self.websocket, version)
+                    if cids:
+                        text = text[:-1] + ',"cids":' + json.dumps(cids) + "}"
+                # 클라이언트별 전송 시각 (서버 벽시계, 클라이언트 지연 측정용)
+                text = text[:-1] + ',"sent":%.6f}' % time.time()
+                encodeEnd = time.perf_counter()
+                _stageEncode.observe(encodeEnd - encodeStart)
+                if TRACER.enabled:
+                    TRACER.complete("encode", encodeStart, encodeEnd, cat="net",
+                                    args={"client": self.id, "seq": version})
+                await self._send(text)
+
+            now = time.perf_counter()
+            if rate.update(now) or now >= nextReport:
+                nextReport = now + reportInterval
+                await self._report()
+
+            # 다음 틱: 전송이 주기보다 오래 걸렸으면 밀린 틱은 건너뜀 (백로그 대신 혼잡 신호)
+            nextTick += rate.period
+            delay = nextTick - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                rate.onSkip()
+                _framesSkipped.inc()
+                nextTick = time.perf_counter()
+                await asyncio.sleep(0)
@@ -0,0 +1,248 @@
+"""
+라이브 시뮬레이션 빨리 감기 (목표 시뮬레이션 시간까지 페이싱 없이 스텝)
+
+정상 상태(steady state)를 보려고 과도 구간을 실시간으로 기다리지 않도록,
+클라이언트 요청이 오면 시뮬레이션 루프가 목표 시간까지 대기 없이 스텝하고 끝나면 원래 페이싱으로 돌아간다
+간단한 어셈블리는 실시간의 수십 배로 돌 수 있으므로 남는 CPU로 워밍업 구간을 건너뛰는 용도
+
+웹소켓 메시지:
+    {"type": "fast_forward", "to": 30.0}                  # 시뮬레이션 시간 30초까지
+    {"type": "fast_forward", "by": 10.0, "publish_hz": 2}  # 지금부터 10초 (빨리 감는 동안 초당 2프레임만)
+    {"type": "fast_forward", "action": "cancel"}           # 중단 (그 시점부터 정상 페이싱)
+    {"type": "fast_forward", "action": "state"}            # 진행 상황만 조회
+
+진행 상황은 모든 클라이언트에 방송 (시뮬레이션을 같이 보고 있으므로):
+    {"type": "fast_forward", "id": 3, "state": "running", "sim_time": 12.4, "start": 2.0,
+     "target": 30.0, "progress": 0.37, "speed": 41.5, "elapsed": 0.25}
+state: pending → running → done | cancelled | superseded (새 요청으로 대체)
+       pending → superseded (시작 전에 새 요청이 옴)
+       pending → rejected (시작 시점에 목표가 이미 지났거나 maxSeconds보다 멂, "error"에 이유)
+대체된 요청은 요청한 클라이언트에게 따로 알림 ("superseded_by"에 대체한 요청 id)
+
+목표(to)는 요청 시 마지막으로 알려진 시뮬레이션 시간 기준으로 검증해서 바로 ValueError로 거절하고,
+그 사이 시간이 지나거나 모델이 바뀌어 시작 시점에 맞지 않게 되면 잘라 쓰지 않고 rejected로 끝낸다
+
+- 서버(이벤트 루프): request() / cancel() / state(), takeSuperseded()로 대체된 요청을 꺼내 요청자에게 통보
+- 시뮬 스레드: available 설정, 틱마다 poll()로 진행할 작업을 받고 advance()/finish()
+- 빨리 감는 동안 프레임은 publish_hz 주기로만 (0이면 끝날 때 한 번), 입력은 계속 반영
+"""
+import itertools
+import math
+import threading
+import time
+from typing import List, Optional
+
+from sim_server.utils.metrics import METRICS
+
+_FINISHED_HELP = "끝난 빨리 감기 요청 수"
+_finished = {state: METRICS.counter("sim_fast_forward_total", _FINISHED_HELP, state=state)
+             for state in ("done", "cancelled", "superseded", "rejected")}
+_speedup = METRICS.histogram("sim_fast_forward_speedup",
+                             "빨리 감기 속도 (시뮬레이션 초 / 실제 초)")
+
+ACTIVE_STATES = ("pending", "running")
+
+
+class FastForwardJob:
+    """빨리 감기 요청 하나 (시작 시각/목표는 시뮬 스레드가 poll()에서 정함)"""
+
+    def __init__(self, jobId: int, to: Optional[float], by: Optional[float], publishHz: float,
+                 requester=None):
+        self.id = jobId
+        self.to = to
+        self.by = by
+        self.publishHz = publishHz
+        self.requester = requester  # 요청한 클라이언트 (서버의 웹소켓, 대체 통보용)
+        self.state = "pending"
+        self.start = None
+        self.target = None
+        self.simTime = None
+        self.steps = 0
+        self.startWall = None
+        self.endWall = None
+        self.nextPublish = 0.0
+        self.cancelled = False
+        self.error: Optional[str] = None  # rejected일 때 이유
+        self.supersededBy: Optional[int] = None  # superseded일 때 대체한 요청 id
+
+    def toDict(self) -> dict:
+        out = {"type": "fast_forward", "id": self.id, "state": self.state}
+        if self.error is not None:
+            out["error"] = self.error
+        if self.supersededBy is not None:
+            out["superseded_by"] = self.supersededBy
+        if self.target is None:
+            out.update({"to": self.to, "by": self.by})
+            return out
+        span = self.target - self.start
+        wall = (self.endWall or time.perf_counter()) - self.startWall
+        done = self.simTime - self.start
+        out.update({
+            "sim_time": self.simTime,
+            "start": self.start,
+            "target": self.target,
+            "progress": min(done / span, 1.0) if span > 0 else 1.0,
+            "speed": done / wall if wall > 0 else None,
+            "elapsed": wall,
+            "steps": self.steps,
+        })
+        return out
+
+
+class FastForwardControl:
+    """
+    main이 만들어 서버(요청/방송)와 시뮬레이션 루프(실행)에 같이 넘긴다
+    한 번에 하나만 진행 (새 요청은 진행 중인 것을 대체)
+    """
+
+    def __init__(self, maxSeconds: float = 600.0, publishHz: float = 5.0):
+        """
+        Args:
+            maxSeconds: 요청 하나로 빨리 감을 수 있는 최대 시뮬레이션 시간 (초)
+            publishHz: 빨리 감는 동안 프레임 commit 주기 기본값 (0이면 끝날 때만)
+        """
+        self.maxSeconds = maxSeconds
+        self.publishHz = publishHz
+        self.available = False  # 시뮬레이터가 있는 루프가 돌고 있을 때만 (시뮬 스레드가 설정)
+        self.simTime: Optional[float] = None  # 마지막 poll()의 시뮬레이션 시간 (요청 검증용)
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._pending: Optional[FastForwardJob] = None
+        self._job: Optional[FastForwardJob] = None
+        self._last: Optional[FastForwardJob] = None
+        self._superseded: List[FastForwardJob] = []  # 요청자에게 아직 알리지 않은 대체된 요청
+
+    # ---------------------------------------------------------------- 서버 쪽
+
+    def request(self, to=None, by=None, publishHz=None, requester=None) -> dict:
+        """
+        빨리 감기 요청 등록 (to: 목표 시뮬레이션 시간, by: 지금부터 몇 초, 둘 중 하나)
+        아직 시작하지 않은 이전 요청은 superseded로 끝냄 (takeSuperseded()로 꺼내 요청자에게 통보)
+
+        Raises:
+            ValueError: 값이 없거나 잘못됨 (to가 현재 시뮬레이션 시간 이하이거나 maxSeconds보다 멂)
+        """
+        if (to is None) == (by is None):
+            raise ValueError("to 또는 by 중 하나만 지정")
+        to = None if to is None else _finite(to, "to")
+        by = None if by is None else _finite(by, "by")
+        if by is not None and not 0 < by <= self.maxSeconds:
+            raise ValueError(f"by는 0보다 크고 {self.maxSeconds}초 이하")
+        if to is not None and self.simTime is not None:
+            _checkTarget(to, self.simTime, self.maxSeconds)
+        publishHz = self.publishHz if publishHz is None else _finite(publishHz, "publish_hz")
+        if publishHz < 0:
+            raise ValueError("publish_hz는 0 이상")
+        job = FastForwardJob(next(self._ids), to, by, publishHz, requester)
+        with self._lock:
+            replaced, self._pending = self._pending, job
+            if replaced is not None:
+                self._supersede(replaced, job)
+        return job.toDict()
+
+    def takeSuperseded(self) -> List[FastForwardJob]:
+        """대체된 뒤 아직 요청자에게 알리지 않은 요청을 모두 꺼냄"""
+        with self._lock:
+            jobs, self._superseded = self._superseded, []
+        return jobs
+
+    def cancel(self) -> dict:
+        with self._lock:
+            if self._pending is not None:
+                self._pending.state = "cancelled"
+                self._last, self._pending = self._pending, None
+                _finished["cancelled"].inc()
+            if self._job is not None:
+                self._job.cancelled = True  # 시뮬 스레드가 다음 poll()에서 정리
+        return self.state()
+
+    def state(self) -> dict:
+        """진행 중(또는 대기 중)인 요청, 없으면 마지막으로 끝난 요청의 상태"""
+        with self._lock:
+            job = self._pending or self._job or self._last
+        if job is None:
+            return {"type": "fast_forward", "state": "idle"}
+        return job.toDict()
+
+    @property
+    def busy(self) -> bool:
+        return self._pending is not None or self._job is not None
+
+    # ---------------------------------------------------------------- 시뮬 스레드 쪽
+
+    def poll(self, simTime: float) -> Optional[FastForwardJob]:
+        """이번 틱에 진행할 작업 (새 요청이 있으면 시작, 취소됐거나 목표에 닿았으면 정리 후 None)"""
+        self.simTime = simTime
+        with self._lock:
+            pending, self._pending = self._pending, None
+            job = self._job
+        if pending is not None:
+            if job is not None:
+                job.supersededBy = pending.id
+                self.finish(job, "superseded")  # 새 요청이 거절돼도 이전 작업은 대체됨
+            try:
+                target = pending.to if pending.to is not None else simTime + pending.by
+                _checkTarget(target, simTime, self.maxSeconds)
+            except ValueError as e:
+                # 요청 후 시간이 지났거나 모델이 바뀜: 잘라서 실행하지 않고 이유와 함께 끝냄
+                pending.error = str(e)
+                pending.state = "rejected"
+                _finished["rejected"].inc()
+                with self._lock:
+                    self._last = pending
+                return None
+            pending.start = simTime
+            pending.target = target
+            pending.simTime = simTime
+            pending.startWall = time.perf_counter()
+            pending.state = "running"
+            with self._lock:
+                self._job = job = pending
+        if job is None:
+            return None
+        if job.cancelled:
+            self.finish(job, "cancelled")
+            return None
+        return job
+
+    def advance(self, job: FastForwardJob, simTime: float, steps: int):
+        job.simTime = simTime
+        job.steps += steps
+
+    def finish(self, job: FastForwardJob, state: str = "done"):
+        job.endWall = time.perf_counter()
+        job.state = state
+        wall = job.endWall - job.startWall
+        if state == "done" and wall > 0:
+            _speedup.observe((job.simTime - job.start) / wall)
+        _finished[state].inc()
+        with self._lock:
+            if self._job is job:
+                self._job = None
+            self._last = job
+            if state == "superseded":
+                self._superseded.append(job)
+
+    def _supersede(self, job: FastForwardJob, by: FastForwardJob):
+        """시작 전인 요청을 대체 (락을 잡은 상태에서 호출)"""
+        job.state = "superseded"
+        job.supersededBy = by.id
+        _finished["superseded"].inc()
+        self._superseded.append(job)
+
+
+def _checkTarget(target: float, simTime: float, maxSeconds: float):
+    if target <= simTime:
+        raise ValueError(f"to({target:g})는 현재 시뮬레이션 시간({simTime:g})보다 커야 함")
+    if target - simTime > maxSeconds:
+        raise ValueError(f"to({target:g})는 현재 시뮬레이션 시간({simTime:g})에서 {maxSeconds:g}초 이내")
+
+
+def _finite(value, name: str) -> float:
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name}는 숫자") from None
+    if not math.isfinite(value):
+        raise ValueError(f"{name}는 유한한 숫자")
+    return value
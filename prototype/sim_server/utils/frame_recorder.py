@@ -0,0 +1,223 @@
+"""
+프레임 기록기 (디스크에 컬럼 단위로 스트리밍 저장, numpy.memmap으로 다시 읽기)
+
+kill_sim에서 JSON 하나로 저장하는 방식은 실행 전체를 메모리에 들고 있어야 하므로
+긴 실행은 고정 크기 청크로 나눠 바로바로 디스크에 쓴다
+
+디렉토리 구조:
+    <run_dir>/
+        meta.json             {"bodies": [...], "components": [...], "chunk_frames": C,
+                               "frames": N, "chunks": K, ...}
+        poses_00000.f32       float32 [바디 수 * 7, C]  (행 = 바디별 성분, 열 = 프레임)
+        times_00000.f64       float64 [C]               (프레임별 시뮬레이션 시간)
+        ...
+
+- 성분 순서: px, py, pz, e0, e1, e2, e3 (body_to_state_dict의 pos/rot와 같음)
+- 한 성분의 시계열이 청크 안에서 연속이라 바디/성분별 분석이 빠름
+- 시간 → 프레임 번호는 times 컬럼 searchsorted (RecordedRun.index_at)
+"""
+import json
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+COMPONENTS = ("px", "py", "pz", "e0", "e1", "e2", "e3")
+FORMAT_VERSION = 1
+
+
+class FrameRecorder:
+    """
+    시뮬레이션 스레드에서 append(), 청크가 차면 백그라운드 스레드가 디스크에 기록
+    메모리 사용량은 (청크 크기 × 최대 대기 청크 수)로 고정
+    """
+
+    def __init__(self, run_dir, body_names: List[str], chunk_frames: int = 4096,
+                 max_pending_chunks: int = 2):
+        import numpy as np
+        self.np = np
+        self.run_dir = Path(run_dir)
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        self.body_names = list(body_names)
+        self.width = len(self.body_names) * len(COMPONENTS)
+        self.chunk_frames = chunk_frames
+
+        self.frames = 0
+        self.chunks = 0
+        self._row = 0
+        self._poses = np.zeros((self.width, chunk_frames), dtype=np.float32)
+        self._times = np.zeros(chunk_frames, dtype=np.float64)
+
+        # 다 쓴 청크 버퍼 재사용 (쓰기 스레드 → 기록 스레드)
+        self._free = queue.Queue()
+        self._pending = queue.Queue(maxsize=max_pending_chunks)
+        self._writer = threading.Thread(target=self._writeLoop, daemon=True,
+                                        name="frame-recorder")
+        self._writer.start()
+        self._closed = False
+        self._write_meta()
+
+    def append(self, t: float, values):
+        """
+        프레임 하나 추가
+
+        Args:
+            t: 시뮬레이션 시간
+            values: 길이 (바디 수 * 7)의 숫자 목록 (바디 순서대로 px,py,pz,e0,e1,e2,e3)
+        """
+        j = self._row
+        self._poses[:, j] = values
+        self._times[j] = t
+        self._row = j + 1
+        self.frames += 1
+        if self._row == self.chunk_frames:
+            self._flush_chunk()
+
+    def _flush_chunk(self):
+        # 기록 스레드가 밀리면 여기서 대기 (메모리가 무한히 늘지 않도록)
+        self._pending.put((self.chunks, self._row, self._poses, self._times))
+        self.chunks += 1
+        self._row = 0
+        try:
+            self._poses, self._times = self._free.get_nowait()
+        except queue.Empty:
+            self._poses = self.np.zeros((self.width, self.chunk_frames), dtype=self.np.float32)
+            self._times = self.np.zeros(self.chunk_frames, dtype=self.np.float64)
+
+    def _writeLoop(self):
+        while True:
+            item = self._pending.get()
+            if item is None:
+                return
+            index, rows, poses, times = item
+            try:
+                if rows < self.chunk_frames:
+                    # 마지막 청크: 남은 칸은 NaN (파일 크기는 항상 같게)
+                    poses[:, rows:] = self.np.nan
+                    times[rows:] = self.np.nan
+                self._write_atomic(self.run_dir / f"poses_{index:05d}.f32", poses)
+                self._write_atomic(self.run_dir / f"times_{index:05d}.f64", times)
+                self._write_meta(chunks=index + 1)
+            except Exception as e:
+                print(f"[recorder] 청크 기록 실패 ({index}): {e}")
+            self._free.put((poses, times))
+
+    @staticmethod
+    def _write_atomic(path: Path, array):
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        array.tofile(tmp)
+        tmp.replace(path)
+
+    def _write_meta(self, chunks: Optional[int] = None):
+        # 기록이 끝난 청크까지만 frames에 반영 (읽는 쪽이 아직 없는 파일을 열지 않도록)
+        chunks = 0 if chunks is None else chunks
+        frames = min(self.frames, chunks * self.chunk_frames)
+        meta = {
+            "version": FORMAT_VERSION,
+            "bodies": self.body_names,
+            "components": list(COMPONENTS),
+            "chunk_frames": self.chunk_frames,
+            "frames": frames,
+            "chunks": chunks,
+            "updated": time.time(),
+        }
+        path = self.run_dir / "meta.json"
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(meta), encoding="utf-8")
+        tmp.replace(path)
+
+    def close(self):
+        """남은 프레임 기록 후 기록 스레드 종료 (여러 번 불러도 됨)"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._row:
+            self._flush_chunk()
+        self._pending.put(None)
+        self._writer.join()
+        self._write_meta(chunks=self.chunks)
+
+
+class RecordedRun:
+    """
+    기록된 실행 읽기 (청크 파일을 numpy.memmap으로 열어서 필요한 부분만 읽음)
+
+    run = RecordedRun("recordings/run_0001")
+    i = run.index_at(12.5)          # 시뮬레이션 시간 12.5초 직전/같은 프레임
+    run.frame(i)                    # {"time", "bodies": [{"name", "pos", "rot"}]}
+    run.column("gear_A", "e3")      # 한 성분의 전체 시계열
+    """
+
+    def __init__(self, run_dir):
+        import numpy as np
+        self.np = np
+        self.run_dir = Path(run_dir)
+        meta = json.loads((self.run_dir / "meta.json").read_text(encoding="utf-8"))
+        self.meta = meta
+        self.body_names: List[str] = meta["bodies"]
+        self.body_index = {n: i for i, n in enumerate(self.body_names)}
+        self.chunk_frames: int = meta["chunk_frames"]
+        self.frames: int = meta["frames"]
+        self.chunks: int = meta["chunks"]
+        self.width = len(self.body_names) * len(COMPONENTS)
+        self._maps = {}
+
+        # 시간 인덱스 (프레임당 8바이트라 전체를 메모리에 올림)
+        if self.chunks:
+            self.times = np.concatenate([
+                np.fromfile(self.run_dir / f"times_{k:05d}.f64", dtype=np.float64)
+                for k in range(self.chunks)])[:self.frames]
+        else:
+            self.times = np.zeros(0, dtype=np.float64)
+
+    def __len__(self):
+        return self.frames
+
+    def _chunk(self, k: int):
+        m = self._maps.get(k)
+        if m is None:
+            m = self.np.memmap(self.run_dir / f"poses_{k:05d}.f32", dtype=self.np.float32,
+                               mode="r", shape=(self.width, self.chunk_frames))
+            self._maps[k] = m
+        return m
+
+    def index_at(self, t: float) -> int:
+        """시간 t 이하인 마지막 프레임 번호 (t가 첫 프레임보다 앞이면 0)"""
+        i = int(self.np.searchsorted(self.times, t, side="right")) - 1
+        return min(max(i, 0), self.frames - 1)
+
+    def poses(self, i: int):
+        """프레임 i의 [바디 수, 7] 배열"""
+        if not 0 <= i < self.frames:
+            raise IndexError(i)
+        k, j = divmod(i, self.chunk_frames)
+        return self.np.asarray(self._chunk(k)[:, j]).reshape(len(self.body_names), len(COMPONENTS))
+
+    def frame(self, i: int, names=None) -> dict:
+        """프레임 i를 dump_frame과 같은 형식으로 (names가 있으면 그 바디만)"""
+        p = self.poses(i)
+        bodies = []
+        for b, name in enumerate(self.body_names):
+            if names is not None and name not in names:
+                continue
+            row = p[b].tolist()
+            bodies.append({"name": name, "pos": row[:3], "rot": row[3:]})
+        return {"time": float(self.times[i]), "bodies": bodies}
+
+    def column(self, body: str, component: str, start: int = 0, stop: Optional[int] = None):
+        """바디 한 성분의 시계열 [start, stop) (float32)"""
+        stop = self.frames if stop is None else min(stop, self.frames)
+        row = self.body_index[body] * len(COMPONENTS) + COMPONENTS.index(component)
+        parts = []
+        i = start
+        while i < stop:
+            k, j = divmod(i, self.chunk_frames)
+            n = min(self.chunk_frames - j, stop - i)
+            parts.append(self._chunk(k)[row, j:j + n])
+            i += n
+        return self.np.concatenate(parts) if parts else self.np.zeros(0, dtype=self.np.float32)
+
+    def body_block(self, body: str, start: int = 0, stop: Optional[int] = None):
+        """바디 하나의 [프레임 수, 7] 배열 [start, stop)"""
+        return self.np.stack([self.column(body, c, start, stop) for c in COMPONENTS], axis=1)
@@ -0,0 +1,256 @@
+"""
+파라메트릭 인벌류트 기어 메시 생성
+기어를 (module, teeth, face_width, bore) 파라미터로만 기술하고
+메시는 필요할 때 생성해서 파라미터 튜플 기준으로 캐시한다
+
+- Chrono용 : gear_obj_path() → 캐시 디렉토리의 OBJ 파일 경로 (ChBodyEasyMesh 로드용)
+- 클라이언트용 : GearParams.toDict() 몇 바이트만 보내거나,
+                gear_obj_text()/gear_cvm_bytes()를 HTTP로 제공
+
+단위: 파라미터는 mm (파일명 gear_A_m2_z20 과 같은 규칙), 생성되는 메시는 m
+기어 축은 z축, 두께 방향 중심이 원점
+"""
+import math
+import os
+import re
+import threading
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+from pathlib import Path
+
+# 기본 캐시 디렉토리: prototype/resources/generated/gears
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / "resources" / "generated" / "gears"
+
+# 치형 한쪽 면(플랭크)/이끝/이뿌리 원호를 나누는 점 개수
+FLANK_SAMPLES = 6
+TIP_SAMPLES = 3
+ROOT_SAMPLES = 3
+
+_file_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class GearParams:
+    module: float                 # 모듈 (mm)
+    teeth: int                    # 잇수 z
+    face_width: float = 10.0      # 이폭 (mm)
+    bore: float = 0.0             # 축 구멍 지름 (mm, 0이면 구멍 없음)
+    pressure_angle: float = 20.0  # 압력각 (deg)
+
+    def __post_init__(self):
+        """
+        Raises:
+            ValueError: 메시를 만들 수 없는 파라미터
+        """
+        if not (self.module > 0 and self.teeth >= 4 and self.face_width > 0 and self.bore >= 0):
+            raise ValueError(f"잘못된 기어 파라미터: {self}")
+        # 0°면 기초원 = 피치원, 45° 이상이면 치형이 이끝원 전에 뾰족해짐
+        if not 0 < self.pressure_angle < 45:
+            raise ValueError(f"압력각은 0°보다 크고 45°보다 작아야 함: {self.pressure_angle}")
+
+    @classmethod
+    def fromDict(cls, data: dict) -> 'GearParams':
+        """model_meta의 "gear" 항목에서 생성 (알 수 없는 키는 무시)"""
+        return cls(
+            module=float(data["module"]),
+            teeth=int(data["teeth"]),
+            face_width=float(data.get("face_width", 10.0)),
+            bore=float(data.get("bore", 0.0)),
+            pressure_angle=float(data.get("pressure_angle", 20.0)),
+        )
+
+    def toDict(self) -> dict:
+        """클라이언트 전송용 기어 기술자"""
+        return {"type": "involute_gear", **asdict(self)}
+
+    @property
+    def pitch_radius(self) -> float:
+        """피치반지름 r[m] = (module[m] * z) / 2 (pitch_radius_from_name과 같은 규칙)"""
+        return 0.5 * (self.module / 1000.0) * self.teeth
+
+    @property
+    def file_stem(self) -> str:
+        """캐시 파일 이름 (parse_module_teeth_from_name으로 다시 파싱 가능한 형태)"""
+        def fmt(v):
+            return f"{v:g}".replace('.', 'p')
+        return (f"gear_m{self.module:g}_z{self.teeth}_w{fmt(self.face_width)}"
+                f"_b{fmt(self.bore)}_pa{fmt(self.pressure_angle)}")
+
+
+
+## 기어 파일명에서 module(m)/teeth(z) 파싱 + 피치반지름 계산
+
+def parse_module_teeth_from_name(fn):
+    """
+    파일명에서 m(모듈, mm)과 z(치수)를 파싱한다.
+    예: gear_A_m2_z20.obj
+    """
+    name = fn.lower()
+    m_m = re.search(r"m(\d+(\.\d+)?)", name)
+    m_z = re.search(r"z(\d+)", name)
+
+    if not (m_m and m_z):
+        return None, None
+
+    return float(m_m.group(1)), int(m_z.group(1))
+
+
+def pitch_radius_from_name(fn, fallback=None):
+    """
+    피치반지름 r[m] = (module[m] * z) / 2
+    파일명에서 정보가 없으면 fallback 사용
+    """
+    module_mm, z = parse_module_teeth_from_name(fn)
+    if module_mm and z:
+        module_m = module_mm / 1000.0
+        return 0.5 * module_m * z
+    return fallback
+
+
+def gear_pitch_radius(meta, fallback):
+    """
+    기어 바디 meta의 피치반지름 [m]
+    1) "gear" 파라미터  2) 메시 파일명(m, z)  3) fallback 순으로 사용
+    """
+    if "gear" in meta:
+        return GearParams.fromDict(meta["gear"]).pitch_radius
+    return pitch_radius_from_name(os.path.basename(meta["mesh"]), fallback=fallback)
+
+def _involute(alpha):
+    return math.tan(alpha) - alpha
+
+
+def _profile(params: GearParams):
+    """
+    기어 외곽선 (반지름, 각도) 목록을 반시계 방향으로 생성
+    치형은 각도가 단조 증가하므로 같은 각도의 보어 점과 1:1로 면을 이을 수 있다
+    """
+    m = params.module / 1000.0
+    z = params.teeth
+    alpha = math.radians(params.pressure_angle)
+
+    rp = 0.5 * m * z
+    rb = rp * math.cos(alpha)
+    ra = rp + m
+    rf = max(rp - 1.25 * m, 0.5 * params.bore / 1000.0 + 0.25 * m)
+
+    pitch_half = math.pi / (2 * z) + _involute(alpha)
+
+    def half_angle(r):
+        # 기초원 안쪽은 반지름 방향 직선으로 이어짐
+        if r <= rb:
+            return pitch_half
+        return pitch_half - _involute(math.acos(rb / r))
+
+    # 이 사이 간격이 음수가 되지 않도록 제한 (잇수가 아주 적은 경우)
+    step = 2 * math.pi / z
+    root_half = min(half_angle(rf), 0.45 * step)
+    radii = [rf + (ra - rf) * i / FLANK_SAMPLES for i in range(FLANK_SAMPLES + 1)]
+
+    points = []
+    for k in range(z):
+        center = k * step
+        for r in radii:
+            points.append((r, center - min(half_angle(r), root_half)))
+        tip_half = half_angle(ra)
+        for i in range(1, TIP_SAMPLES):
+            points.append((ra, center - tip_half + 2 * tip_half * i / TIP_SAMPLES))
+        for r in reversed(radii):
+            points.append((r, center + min(half_angle(r), root_half)))
+        for i in range(1, ROOT_SAMPLES):
+            points.append((rf, center + root_half + (step - 2 * root_half) * i / ROOT_SAMPLES))
+    return points
+
+
+@lru_cache(maxsize=64)
+def gear_mesh(params: GearParams):
+    """
+    기어 메시 생성 (파라미터 튜플 기준 캐시)
+
+    Returns:
+        (vertices [(x,y,z), ...], triangles [(i,j,k), ...])  # 0-based 인덱스
+    """
+    profile = _profile(params)
+    n = len(profile)
+    half_width = 0.5 * params.face_width / 1000.0
+    bore_radius = 0.5 * params.bore / 1000.0
+
+    vertices = []
+    # 외곽선 앞/뒤: [0, n) 앞면(+z), [n, 2n) 뒷면(-z)
+    for z_side in (half_width, -half_width):
+        for r, theta in profile:
+            vertices.append((r * math.cos(theta), r * math.sin(theta), z_side))
+
+    triangles = []
+
+    def quad(a, b, c, d):
+        triangles.append((a, b, c))
+        triangles.append((a, c, d))
+
+    # 외곽 옆면
+    for i in range(n):
+        j = (i + 1) % n
+        quad(i, n + i, n + j, j)
+
+    if bore_radius > 0:
+        # 보어 앞/뒤: [2n, 3n) 앞면, [3n, 4n) 뒷면 (외곽선과 같은 각도)
+        for z_side in (half_width, -half_width):
+            for _, theta in profile:
+                vertices.append(
+                    (bore_radius * math.cos(theta), bore_radius * math.sin(theta), z_side))
+        for i in range(n):
+            j = (i + 1) % n
+            quad(2 * n + i, 2 * n + j, 3 * n + j, 3 * n + i)  # 보어 안쪽 면
+            quad(2 * n + i, i, j, 2 * n + j)                  # 앞면 (+z)
+            quad(3 * n + i, 3 * n + j, n + j, n + i)          # 뒷면 (-z)
+    else:
+        # 구멍이 없으면 중심점 기준 부채꼴
+        front = len(vertices)
+        vertices.append((0.0, 0.0, half_width))
+        back = len(vertices)
+        vertices.append((0.0, 0.0, -half_width))
+        for i in range(n):
+            j = (i + 1) % n
+            triangles.append((front, i, j))
+            triangles.append((back, n + j, n + i))
+
+    return vertices, triangles
+
+
+@lru_cache(maxsize=64)
+def gear_obj_text(params: GearParams) -> str:
+    """기어 메시를 OBJ 문자열로 변환"""
+    vertices, triangles = gear_mesh(params)
+    lines = [f"# involute gear {params.toDict()}\n"]
+    lines.extend(f"v {x:.6f} {y:.6f} {z:.6f}\n" for x, y, z in vertices)
+    lines.extend(f"f {a + 1} {b + 1} {c + 1}\n" for a, b, c in triangles)
+    return ''.join(lines)
+
+
+@lru_cache(maxsize=64)
+def gear_cvm_bytes(params: GearParams) -> bytes:
+    """기어 메시를 .cvm 바이너리로 변환 (utils/mesh_pipeline.cvm_bytes 사용)"""
+    from sim_server.utils.mesh_pipeline import cvm_bytes
+
+    vertices, triangles = gear_mesh(params)
+    return cvm_bytes(vertices, triangles)
+
+
+def gear_obj_path(params: GearParams, cache_dir=None) -> str:
+    """
+    기어 OBJ 파일 경로 반환 (없으면 생성)
+    같은 파라미터는 프로세스/재시작과 상관없이 같은 파일을 재사용
+    """
+    cache_path = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+    path = cache_path / f"{params.file_stem}.obj"
+    if path.exists():
+        return str(path)
+
+    with _file_lock:
+        if not path.exists():
+            cache_path.mkdir(parents=True, exist_ok=True)
+            # 임시 파일에 쓰고 교체 (다른 프로세스가 반쯤 쓴 파일을 읽지 않도록)
+            tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp.write_text(gear_obj_text(params), encoding='utf-8')
+            tmp.replace(path)
+    return str(path)
@@ -0,0 +1,135 @@
+import json
+import math
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+# 모터 이름 -> (목표 속도 rad/s, 램프 기울기 rad/s^2 또는 None)
+Setpoint = Tuple[float, Optional[float]]
+
+
+class InputMailbox:
+    """
+    웹소켓 입력 → 시뮬레이션 스레드 전달용 우편함
+
+    - 서버 스레드는 post()로 모터별 최신 설정값만 덮어씀 (락 없음, dict 대입은 GIL에서 원자적)
+    - 시뮬 스레드는 틱마다 drain()으로 바뀐 모터만 꺼냄 (dict.popitem도 원자적)
+    - 틱 사이에 같은 모터로 명령이 몇 번 오든 마지막 값 하나만 남으므로
+      클라이언트가 명령을 쏟아내도 틱당 처리 비용은 '바뀐 모터 수'에 비례
+    """
+
+    def __init__(self, maxPending: int = 4096):
+        self._latest: Dict[str, Setpoint] = {}
+        self.maxPending = maxPending  # 서로 다른 이름으로 무한히 쌓이는 것 방지
+        self.dropped = 0
+        # 지연 추적용 (보낸 세션, 메시지의 "cid"), 같은 틱의 drain 직후에 꺼내서 반영된 것으로 봄
+        self._cids = deque(maxlen=maxPending)
+
+    @staticmethod
+    def _parse(name, speed, ramp=None) -> Tuple[str, Setpoint]:
+        """
+        (모터 이름, 설정값) 검증/변환
+        이름이 없거나 속도/램프가 유한한 숫자가 아니면 ValueError (NaN/inf가 시뮬레이션에 들어가지 않도록)
+        """
+        if name is None:
+            raise ValueError("모터 이름 없음")
+        try:
+            speed = float(speed)
+            ramp = None if ramp is None else float(ramp)
+        except (TypeError, ValueError):
+            raise ValueError(f"잘못된 모터 명령 값: {name}") from None
+        if not math.isfinite(speed) or (ramp is not None and not math.isfinite(ramp)):
+            raise ValueError(f"유한하지 않은 모터 명령 값: {name}")
+        return name, (speed, ramp)
+
+    def post(self, name: str, speed: float, ramp: Optional[float] = None) -> bool:
+        """
+        모터 설정값 등록 (이전 미처리 값은 덮어씀)
+
+        Args:
+            name: 모터 이름
+            speed: 목표 속도 (rad/s)
+            ramp: 목표까지 변화 기울기 (rad/s^2), None이면 즉시 적용
+
+        Returns:
+            등록 여부 (대기 중인 모터 수 제한 초과 시 False)
+
+        Raises:
+            ValueError: 속도/램프가 유한한 숫자가 아님
+        """
+        return self._store(*self._parse(name, speed, ramp))
+
+    def _store(self, name: str, setpoint: Setpoint) -> bool:
+        if name not in self._latest and len(self._latest) >= self.maxPending:
+            self.dropped += 1
+            return False
+        self._latest[name] = setpoint
+        return True
+
+    def postMessage(self, message, session=None) -> int:
+        """
+        클라이언트 메시지(JSON 문자열 또는 dict)에서 모터 명령을 등록
+        형식: {"motors": [{"name": "shaft_motor", "speed": 3.0, "ramp": 2.0}, ...], "cid": "a1"}
+        dict가 아니거나 값이 잘못된 명령은 건너뜀
+
+        cid(선택)는 지연 추적용이며 명령이 하나라도 등록될 때만 (session, cid)로 함께 전달됨
+        등록 가능 여부를 먼저 확인하고 cid를 설정값보다 먼저 넣으므로, 시뮬 스레드가 drain()으로
+        꺼낸 명령의 cid는 바로 뒤의 drainCorrelations()에서 항상 같이 꺼내짐
+        (등록은 이벤트 루프 한 곳에서만 하고 drain은 대기 수를 줄이기만 하므로 확인 결과가 바뀌지 않음)
+
+        Returns:
+            등록한 명령 수
+        """
+        if isinstance(message, str):
+            message = json.loads(message)
+        motors = message.get("motors") if isinstance(message, dict) else None
+        if not isinstance(motors, list):
+            return 0
+        commands = []
+        for cmd in motors:
+            if not isinstance(cmd, dict):
+                continue
+            try:
+                commands.append(self._parse(cmd.get("name"), cmd.get("speed"), cmd.get("ramp")))
+            except ValueError:
+                continue
+        if not commands:
+            return 0
+
+        cid = message.get("cid")
+        if cid is not None:
+            # 이미 대기 중인 모터가 있거나 새 모터 자리가 남아 있으면 적어도 하나는 등록됨
+            latest = self._latest
+            if len(latest) < self.maxPending or any(name in latest for name, _ in commands):
+                self._cids.append((session, cid))
+        count = 0
+        for name, setpoint in commands:
+            count += self._store(name, setpoint)
+        return count
+
+    def drainCorrelations(self) -> List[Tuple[object, str]]:
+        """등록된 (session, cid)를 모두 꺼냄 (시뮬 스레드 전용, drain 직후에 호출)"""
+        out = []
+        cids = self._cids
+        while cids:
+            try:
+                out.append(cids.popleft())
+            except IndexError:
+                break
+        return out
+
+    def drain(self) -> Dict[str, Setpoint]:
+        """등록된 설정값을 모두 꺼냄 (시뮬 스레드 전용)"""
+        out = {}
+        latest = self._latest
+        while latest:
+            try:
+                name, setpoint = latest.popitem()
+            except KeyError:
+                break
+            out[name] = setpoint
+        return out
+
+    # step_sim()의 buffer.read_inputs() 인터페이스
+    def read_inputs(self) -> Optional[Dict[str, Setpoint]]:
+        drained = self.drain()
+        return drained or None
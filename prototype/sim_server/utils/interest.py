@@ -0,0 +1,142 @@
+"""
+클라이언트별 관심 영역(interest) 관리
+각 AR 클라이언트가 보고 싶은 바디만 구독하면
+시뮬레이션 스레드는 전체 구독의 합집합만 프레임으로 만들고,
+서버는 클라이언트마다 자기 구독분만 잘라서 보낸다
+
+구독 메시지 예시:
+    {"type": "subscribe", "bodies": ["gear_A"], "assemblies": ["press_1"],
+     "aabb": {"min": [-1, 0, -1], "max": [1, 2, 1]}}
+    {"type": "subscribe"}   # 필터 해제 (전체)
+
+- bodies / assemblies / aabb 조건은 합집합으로 해석
+- aabb는 make_sim 시점의 바디 경계구(초기 위치 + 메시 최대 반지름)와 겹치는지로 판단
+"""
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+Vec3 = Tuple[float, float, float]
+
+
+@dataclass
+class Interest:
+    """클라이언트 하나의 구독 조건"""
+    bodies: FrozenSet[str] = frozenset()
+    assemblies: FrozenSet[str] = frozenset()
+    aabb: Optional[Tuple[Vec3, Vec3]] = None
+
+    @classmethod
+    def fromDict(cls, data: dict) -> 'Interest':
+        aabb = data.get("aabb")
+        if aabb is not None:
+            lo, hi = aabb["min"], aabb["max"]
+            if len(lo) != 3 or len(hi) != 3:
+                raise ValueError("aabb의 min/max는 길이 3이어야 함")
+            aabb = (tuple(map(float, lo)), tuple(map(float, hi)))
+        return cls(bodies=frozenset(data.get("bodies") or ()),
+                   assemblies=frozenset(data.get("assemblies") or ()),
+                   aabb=aabb)
+
+    @property
+    def everything(self) -> bool:
+        """조건이 하나도 없으면 전체 구독"""
+        return not self.bodies and not self.assemblies and self.aabb is None
+
+
+@dataclass
+class BodyCatalog:
+    """
+    바디 이름/어셈블리/경계구 목록 (make_sim 이후 시뮬레이션 스레드에서 생성)
+    entries: [{"name", "assembly", "center": [x,y,z], "radius"}]
+    """
+    entries: List[dict] = field(default_factory=list)
+
+    def __post_init__(self):
+        self.names = [e["name"] for e in self.entries]
+        self.nameSet = frozenset(self.names)
+        self.byAssembly: Dict[str, List[str]] = {}
+        for e in self.entries:
+            self.byAssembly.setdefault(e.get("assembly"), []).append(e["name"])
+        self._centers = None
+        self._radii = None
+
+    def queryAabb(self, lo: Vec3, hi: Vec3) -> List[str]:
+        """경계구가 AABB와 겹치는 바디 이름 목록"""
+        if not self.entries:
+            return []
+        import numpy as np
+        if self._centers is None:
+            self._centers = np.array([e["center"] for e in self.entries], dtype=np.float64)
+            self._radii = np.array([e["radius"] for e in self.entries], dtype=np.float64)
+        # 구 중심에서 박스까지 최단거리 <= 반지름
+        nearest = np.clip(self._centers, np.asarray(lo), np.asarray(hi))
+        dist2 = ((self._centers - nearest) ** 2).sum(axis=1)
+        hits = np.nonzero(dist2 <= self._radii ** 2)[0]
+        return [self.names[i] for i in hits]
+
+    def resolve(self, interest: Interest) -> Optional[FrozenSet[str]]:
+        """구독 조건 → 바디 이름 집합 (None이면 전체)"""
+        if interest.everything:
+            return None
+        names = set(interest.bodies & self.nameSet)
+        for asm in interest.assemblies:
+            names.update(self.byAssembly.get(asm, ()))
+        if interest.aabb is not None:
+            names.update(self.queryAabb(*interest.aabb))
+        return frozenset(names)
+
+    def toDict(self) -> dict:
+        return {"bodies": self.entries, "assemblies": sorted(a for a in self.byAssembly if a)}
+
+
+class InterestRegistry:
+    """
+    클라이언트 구독 → 합집합 관리
+
+    - 서버(이벤트 루프)에서 update()/remove(), 시뮬레이션 스레드에서 setCatalog()
+      접속 시 Interest()(전체)로 등록해 두어야 구독하지 않은 클라이언트도 전체를 받음
+    - 시뮬레이션 스레드는 매 스텝 union 속성만 읽음 (객체 교체라 락 불필요)
+      union이 None이면 전체 바디, 아니면 그 이름들만 프레임에 포함
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.catalog = BodyCatalog()
+        self._interests: Dict[object, Interest] = {}
+        self._resolved: Dict[object, Optional[FrozenSet[str]]] = {}
+        self.union: Optional[FrozenSet[str]] = None
+
+    def setCatalog(self, catalog: BodyCatalog):
+        """모델이 (재)생성되면 바디 목록 교체 후 모든 구독을 다시 해석"""
+        with self._lock:
+            self.catalog = catalog
+            self._resolved = {k: catalog.resolve(i) for k, i in self._interests.items()}
+            self._rebuild()
+
+    def update(self, clientId, interest: Interest) -> Optional[FrozenSet[str]]:
+        with self._lock:
+            self._interests[clientId] = interest
+            self._resolved[clientId] = self.catalog.resolve(interest)
+            self._rebuild()
+            return self._resolved[clientId]
+
+    def remove(self, clientId):
+        with self._lock:
+            if self._interests.pop(clientId, None) is not None:
+                self._resolved.pop(clientId, None)
+                self._rebuild()
+
+    def namesFor(self, clientId) -> Optional[FrozenSet[str]]:
+        return self._resolved.get(clientId)
+
+    def _rebuild(self):
+        # 전체를 보는 클라이언트가 하나라도 있거나 등록된 클라이언트가 없으면 필터 없음
+        resolved = list(self._resolved.values())
+        if not resolved or any(r is None for r in resolved):
+            union = None
+        else:
+            union = frozenset().union(*resolved)
+        if union != self.union:
+            # 같은 내용이면 객체를 유지 (시뮬레이션 쪽은 객체가 바뀔 때만 바디 목록 재계산)
+            self.union = union
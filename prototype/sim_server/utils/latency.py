@@ -0,0 +1,169 @@
+"""
+입력 → 화면(input-to-photon) 지연 추적
+
+클라이언트가 입력 메시지에 상관관계 id("cid")를 붙이면 단계별 시각을 기록한다:
+
+    received  websocketEndpoint가 메시지를 받은 시각           (이벤트 루프)
+    queued    핸들러가 우편함(InputMailbox)에 넣은 시각          (핸들러)
+    applied   step_sim이 우편함에서 꺼내 모터에 반영한 시각      (시뮬 스레드)
+    framed    그 입력이 반영된 첫 프레임이 commit된 시각         (시뮬 스레드)
+    sent      그 프레임(또는 이후 프레임)이 클라이언트에 나간 시각 (이벤트 루프)
+    acked     클라이언트가 {"type": "input_ack"}로 받았다고 알린 시각
+
+클라이언트는 자기 cid가 담긴 프레임({"cids": [...]})을 받으면 바로 응답한다:
+    {"type": "input_ack", "cids": ["a1"], "render_in": 0.08}
+render_in은 그 프레임이 지터 버퍼에서 실제로 재생되기까지 남은 시간(초, 선택)이고,
+photon = (acked - RTT/2) + render_in - received 로 화면에 보이기까지의 지연을 추정한다
+
+단계(STAGES)는 이웃한 시각의 차이다:
+    dispatch=queued-received, queue=applied-queued, frame=framed-applied,
+    publish=sent-framed, delivery=acked-sent, total=acked-received
+
+- 시각은 모두 서버 time.perf_counter() (같은 프로세스라 스레드 사이에도 비교 가능)
+- 기록 키는 (session, cid) — cid는 클라이언트가 정하므로 다른 클라이언트와 겹쳐도 섞이지 않음
+- 세션별 히스토그램 + 전역 히스토그램(/metrics의 input_latency_seconds{stage=...})
+- 응답이 오지 않는 cid가 쌓이지 않도록 maxPending개를 넘으면 오래된 것부터 버림
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+from sim_server.utils.metrics import METRICS, Histogram
+
+STAGES = ("dispatch", "queue", "frame", "publish", "delivery", "total", "photon")
+_STAGE_HELP = "입력 지연 단계별 시간 (초): dispatch=수신→우편함 등록, queue=등록→반영, frame=반영→프레임, " \
+              "publish=프레임→전송, delivery=전송→클라이언트 응답, total=수신→응답, photon=수신→화면 추정"
+
+
+class _Record:
+    __slots__ = ("cid", "session", "received", "queued", "applied", "framed", "seq", "sent")
+
+    def __init__(self, cid, session, received):
+        self.cid = cid
+        self.session = session
+        self.received = received
+        self.queued = None
+        self.applied = None
+        self.framed = None
+        self.seq = None
+        self.sent = None
+
+
+class LatencyTracker:
+    """
+    main이 만들어 서버(수신/전송/응답)와 시뮬레이션(반영/프레임)에 같이 넘긴다
+    session은 웹소켓 객체 (서버의 세션 키와 같음)
+    """
+
+    def __init__(self, maxPending: int = 1024):
+        self.maxPending = maxPending
+        self._lock = threading.Lock()
+        self._records: "OrderedDict[tuple, _Record]" = OrderedDict()  # (session, cid) -> 기록
+        self._applied: List[_Record] = []              # 반영됐지만 아직 프레임이 없는 입력 (시뮬 스레드)
+        self._framed: Dict[object, List[_Record]] = {}  # 세션 -> 프레임은 나왔지만 아직 안 보낸 입력
+        self._sessions: Dict[object, Dict[str, Histogram]] = {}
+        self._global = {s: METRICS.histogram("input_latency_seconds", _STAGE_HELP, stage=s)
+                        for s in STAGES}
+        self.dropped = 0
+
+    # ---------------------------------------------------------------- 서버 (이벤트 루프)
+
+    def received(self, cid: str, session, receivedAt: Optional[float] = None):
+        """입력 메시지 수신 시 우편함 등록 직전에 호출 (시뮬 스레드가 cid를 먼저 꺼내도 기록이 있도록)"""
+        now = time.perf_counter()
+        record = _Record(str(cid), session, receivedAt if receivedAt is not None else now)
+        record.queued = now
+        key = (session, record.cid)
+        with self._lock:
+            self._records[key] = record
+            self._records.move_to_end(key)
+            while len(self._records) > self.maxPending:
+                self._records.popitem(last=False)
+                self.dropped += 1
+
+    def takeSent(self, session, seq: int) -> Optional[List[str]]:
+        """
+        seq 프레임을 session에 보내기 직전 호출
+        이 세션의 입력 중 seq 이하 프레임에 반영된 cid 목록 (없으면 None, 락 없이 빠르게 반환)
+        """
+        if not self._framed.get(session):
+            return None
+        now = time.perf_counter()
+        with self._lock:
+            pending = self._framed.get(session, [])
+            ready = [r for r in pending if r.seq <= seq]
+            if not ready:
+                return None
+            self._framed[session] = [r for r in pending if r.seq > seq]
+        for r in ready:
+            r.sent = now
+        return [r.cid for r in ready]
+
+    def acked(self, session, cids: Iterable[str], renderIn: Optional[float] = None,
+              rtt: Optional[float] = None) -> int:
+        """클라이언트 input_ack 처리 후 히스토그램 기록 (처리한 cid 수 반환)"""
+        now = time.perf_counter()
+        done = []
+        with self._lock:
+            for cid in cids:
+                r = self._records.get((session, str(cid)))
+                if r is not None and r.sent is not None:
+                    del self._records[(session, r.cid)]
+                    done.append(r)
+        hists = self._sessions.setdefault(session, {s: Histogram() for s in STAGES})
+        for r in done:
+            values = {
+                "dispatch": r.queued - r.received,
+                "queue": r.applied - r.queued,
+                "frame": r.framed - r.applied,
+                "publish": r.sent - r.framed,
+                "delivery": now - r.sent,
+                "total": now - r.received,
+            }
+            if renderIn is not None:
+                # 응답이 돌아오는 편도 시간만큼 빼고 재생까지 남은 시간을 더함
+                oneWay = rtt / 2 if rtt is not None else 0.0
+                values["photon"] = max(now - oneWay + renderIn - r.received, 0.0)
+            for stage, value in values.items():
+                hists[stage].observe(value)
+                self._global[stage].observe(value)
+        return len(done)
+
+    def remove(self, session):
+        with self._lock:
+            self._framed.pop(session, None)
+            self._sessions.pop(session, None)
+            for key in [k for k, r in self._records.items() if r.session is session]:
+                del self._records[key]
+
+    def sessionStats(self, session) -> dict:
+        hists = self._sessions.get(session)
+        if hists is None:
+            return {}
+        return {stage: h.toDict() for stage, h in hists.items() if h.count}
+
+    # ---------------------------------------------------------------- 시뮬레이션 스레드
+
+    def applied(self, keys: Iterable[tuple]):
+        """우편함에서 꺼낸 입력이 이번 스텝에 반영됨 (keys: InputMailbox.drainCorrelations()의 (session, cid))"""
+        now = time.perf_counter()
+        with self._lock:
+            for session, cid in keys:
+                r = self._records.get((session, str(cid)))
+                if r is not None and r.applied is None:
+                    r.applied = now
+                    self._applied.append(r)
+
+    def framed(self, seq: int):
+        """반영된 입력이 처음 담긴 프레임이 commit됨 (seq = 출력 버퍼 버전)"""
+        if not self._applied:
+            return
+        now = time.perf_counter()
+        with self._lock:
+            for r in self._applied:
+                r.framed = now
+                r.seq = seq
+                self._framed.setdefault(r.session, []).append(r)
+            self._applied = []
+
@@ -1,15 +1,22 @@
 import threading
+import time
 import traceback
 
-# TODO: 문서화, 타입힌트, 테스트작성, (메트릭로깅&프로파일링)
+from sim_server.utils.metrics import METRICS
+
+# TODO: 문서화, 타입힌트, 테스트작성
 
 class LoopThread(threading.Thread):
-    def __init__(self, target, args=(), kwargs=None, cleanup=None, daemon=False):
+    def __init__(self, target, args=(), kwargs=None, cleanup=None, daemon=False, metricName=None):
         super().__init__(daemon=daemon)
         self.target = target
         self.args = args
         self.kwargs = kwargs if kwargs is not None else {}
         self.cleanup = cleanup  # 종료 시 실행할 callback
+        # 반복 1회 소요 시간 히스토그램 (/metrics의 loop_iteration_seconds{loop=metricName})
+        self._iteration = (METRICS.histogram("loop_iteration_seconds", "LoopThread 반복 1회 소요 시간 (초)",
+                                             loop=metricName)
+                           if metricName else None)
         self._stopFlag = threading.Event()
         self._startFlag = threading.Event()
 
@@ -17,7 +24,12 @@ class LoopThread(threading.Thread):
         self._startFlag.set()
         try:
             while not self._stopFlag.is_set():
+                if self._iteration is None:
+                    self.target(*self.args, **self.kwargs)
+                    continue
+                start = time.perf_counter()
                 self.target(*self.args, **self.kwargs)
+                self._iteration.observe(time.perf_counter() - start)
         except Exception:
             traceback.print_exc()
         finally:
@@ -0,0 +1,191 @@
+"""
+업로드된 OBJ 메시 전처리 파이프라인
+ProcessPoolExecutor 워커에서 실행되는 것을 전제로 함 (이벤트 루프/시뮬 스레드와 분리)
+
+처리 순서:
+    1) mm→m 스케일 변환 (스트리밍)
+    2) 정점/면 배열 파싱
+    3) bounding box → 중심/회전축 검출
+    4) LOD 생성 (vertex clustering)
+    5) 바이너리 메시(.cvm) 변환
+
+.cvm 포맷 (little-endian):
+    magic   b"CVM1"
+    uint32  정점 개수 N
+    uint32  삼각형 개수 T
+    float32 정점 좌표 N*3
+    uint32  삼각형 인덱스 T*3
+"""
+import json
+import struct
+from array import array
+from pathlib import Path
+
+from sim_server.utils.obj_scaler import rescale_obj_file
+
+CVM_MAGIC = b"CVM1"
+
+# LOD별 bounding box 대각선 분할 수 (클수록 원본에 가까움)
+DEFAULT_LOD_GRID = (128, 32)
+
+
+def parse_obj_arrays(path):
+    """
+    OBJ 파일에서 정점과 삼각형 인덱스를 읽어 numpy 배열로 반환
+    다각형 면은 fan 방식으로 삼각형 분할, 음수(상대) 인덱스 지원
+
+    Returns:
+        (vertices (N,3) float32, triangles (T,3) uint32)
+    """
+    import numpy as np
+
+    verts = array('f')
+    tris = array('I')
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            if line.startswith('v '):
+                parts = line.split()
+                if len(parts) >= 4:
+                    verts.extend((float(parts[1]), float(parts[2]), float(parts[3])))
+            elif line.startswith('f '):
+                nverts = len(verts) // 3
+                idx = []
+                for token in line.split()[1:]:
+                    i = int(token.split('/', 1)[0])
+                    idx.append(i - 1 if i > 0 else nverts + i)
+                for k in range(1, len(idx) - 1):
+                    tris.extend((idx[0], idx[k], idx[k + 1]))
+
+    vertices = np.frombuffer(verts, dtype=np.float32).reshape(-1, 3)
+    triangles = np.frombuffer(tris, dtype=np.uint32).reshape(-1, 3)
+    return vertices, triangles
+
+
+def bounds_axis_center(vertices):
+    """
+    detect_axis_and_center()와 같은 규칙을 pychrono 없이 계산
+    가장 긴 bounding box 축을 회전축으로 사용
+
+    Returns:
+        (bounds [xmin,xmax,ymin,ymax,zmin,zmax], center [x,y,z], axis [x,y,z])
+    """
+    lo = vertices.min(axis=0)
+    hi = vertices.max(axis=0)
+    bounds = [float(lo[0]), float(hi[0]), float(lo[1]), float(hi[1]), float(lo[2]), float(hi[2])]
+    center = [float(c) for c in (lo + hi) / 2]
+
+    dx, dy, dz = (hi - lo).tolist()
+    if dx >= dy and dx >= dz:
+        axis = [1.0, 0.0, 0.0]
+    elif dy >= dx and dy >= dz:
+        axis = [0.0, 1.0, 0.0]
+    else:
+        axis = [0.0, 0.0, 1.0]
+    return bounds, center, axis
+
+
+def cluster_lod(vertices, triangles, grid):
+    """
+    vertex clustering 기반 LOD 생성
+    bounding box 대각선을 grid 칸으로 나눈 격자에 정점을 모으고,
+    같은 칸의 정점은 평균 위치로 합친 뒤 퇴화/중복 삼각형을 제거한다
+    """
+    import numpy as np
+
+    lo = vertices.min(axis=0)
+    extent = float(np.linalg.norm(vertices.max(axis=0) - lo))
+    cell = extent / grid if extent > 0 else 1.0
+
+    keys = np.floor((vertices - lo) / cell).astype(np.int64)
+    _, remap, counts = np.unique(keys, axis=0, return_inverse=True, return_counts=True)
+    remap = remap.reshape(-1)
+
+    sums = np.zeros((len(counts), 3), dtype=np.float64)
+    np.add.at(sums, remap, vertices)
+    new_verts = (sums / counts[:, None]).astype(np.float32)
+
+    new_tris = remap[triangles]
+    keep = (new_tris[:, 0] != new_tris[:, 1]) & (new_tris[:, 1] != new_tris[:, 2]) \
+        & (new_tris[:, 0] != new_tris[:, 2])
+    new_tris = new_tris[keep]
+    if len(new_tris):
+        # 방향(winding)을 유지하기 위해 정렬된 키로만 중복을 판별
+        _, first = np.unique(np.sort(new_tris, axis=1), axis=0, return_index=True)
+        new_tris = new_tris[np.sort(first)]
+    return new_verts, new_tris.astype(np.uint32)
+
+
+def cvm_bytes(vertices, triangles) -> bytes:
+    """
+    정점 (N,3) / 삼각형 (M,3) 배열(또는 튜플 목록)을 .cvm 바이너리로 변환
+    플랫폼과 상관없이 리틀엔디언 float32/uint32
+    """
+    import numpy as np
+
+    verts = np.asarray(vertices, dtype='<f4').reshape(-1, 3)
+    tris = np.asarray(triangles, dtype='<u4').reshape(-1, 3)
+    return (CVM_MAGIC + struct.pack('<II', len(verts), len(tris))
+            + verts.tobytes() + tris.tobytes())
+
+
+def write_cvm(path, vertices, triangles):
+    """정점/삼각형 배열을 .cvm 바이너리로 저장"""
+    with open(path, 'wb') as f:
+        f.write(cvm_bytes(vertices, triangles))
+
+
+def preprocess_obj(src_path, out_dir, scale=0.001, lod_grid=DEFAULT_LOD_GRID, name=None):
+    """
+    업로드된 OBJ 하나를 전처리해 out_dir에 결과물을 저장 (프로세스 풀 작업 단위)
+
+    결과물:
+        <stem>_scaled.obj   : 스케일 변환된 OBJ (ChBodyEasyMesh 로드용)
+        <stem>.cvm          : 원본 해상도 바이너리 메시
+        <stem>_lod{i}.cvm   : LOD 바이너리 메시
+        <stem>.meta.json    : bounds/중심/회전축/파일 목록
+
+    Args:
+        name: 결과 파일 이름 기준 (None이면 src_path 파일명 사용)
+
+    Returns:
+        meta.json과 같은 내용의 dict (out_dir 기준 상대 파일명)
+    """
+    src = Path(src_path)
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    stem = Path(name).stem if name else src.stem
+
+    scaled_name = f"{stem}_scaled.obj"
+    rescale_obj_file(src, out / scaled_name, scale=scale)
+
+    vertices, triangles = parse_obj_arrays(out / scaled_name)
+    if len(vertices) == 0:
+        raise ValueError(f"정점이 없는 OBJ 파일입니다: {src.name}")
+    bounds, center, axis = bounds_axis_center(vertices)
+
+    binary_name = f"{stem}.cvm"
+    write_cvm(out / binary_name, vertices, triangles)
+
+    lods = []
+    for i, grid in enumerate(lod_grid, start=1):
+        lod_verts, lod_tris = cluster_lod(vertices, triangles, grid)
+        lod_name = f"{stem}_lod{i}.cvm"
+        write_cvm(out / lod_name, lod_verts, lod_tris)
+        lods.append({"file": lod_name, "grid": grid,
+                     "vertices": len(lod_verts), "triangles": len(lod_tris)})
+
+    meta = {
+        "source": name or src.name,
+        "scale": scale,
+        "obj": scaled_name,
+        "binary": binary_name,
+        "vertices": len(vertices),
+        "triangles": len(triangles),
+        "bounds": bounds,
+        "center": center,
+        "axis": axis,
+        "lods": lods,
+    }
+    with open(out / f"{stem}.meta.json", 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    return meta
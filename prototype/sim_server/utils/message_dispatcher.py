@@ -0,0 +1,171 @@
+import asyncio
+import functools
+import inspect
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+# 대기열이 가득 찼을 때 정책
+OVERFLOW_DROP = "drop"      # 조용히 버리고 dropped만 증가
+OVERFLOW_REJECT = "reject"  # 버리고 클라이언트에게 busy 에러 응답
+
+
+class MessageDispatcher:
+    """
+    웹소켓 메시지 타입별 핸들러 분배기
+
+    - JSON 객체의 "type" 값으로 핸들러를 찾고, 없으면 fallback 핸들러 호출
+    - async 핸들러는 이벤트 루프에서 바로 await (짧게 끝나는 일 전용)
+    - 일반(sync) 핸들러는 제한된 스레드 풀로 넘기고 기다리지 않음
+      → 느린 핸들러가 있어도 수신 루프/다른 클라이언트 전송이 막히지 않음
+    - 같은 연결의 sync 작업은 받은 순서대로 하나씩 실행 (앞 작업이 끝나야 다음 작업을 풀에 넣음)
+      → 풀 워커가 여러 개여도 한 클라이언트의 명령 순서가 뒤바뀌지 않음
+    - sync 핸들러가 코루틴(awaitable)을 반환하면 이벤트 루프로 돌려서 await
+    - 풀에 걸려 있는 작업 수가 maxPending을 넘으면 overflow 정책대로 처리
+
+    핸들러 시그니처: handler(websocket, message, **kwargs)
+        typed 핸들러는 파싱된 dict, fallback 핸들러는 원본 문자열을 받음
+    """
+
+    def __init__(self, maxWorkers: int = 4, maxPending: int = 256,
+                 overflow: str = OVERFLOW_DROP):
+        if overflow not in (OVERFLOW_DROP, OVERFLOW_REJECT):
+            raise ValueError(f"알 수 없는 overflow 정책: {overflow}")
+        self.maxWorkers = maxWorkers
+        self.maxPending = maxPending
+        self.overflow = overflow
+
+        self._handlers: Dict[str, Callable] = {}
+        self._fallback: Optional[Callable] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._closed = False
+        # 연결 -> 마지막으로 받은 sync 작업의 완료 future (연결별 순서 유지)
+        self._tails: Dict[Any, asyncio.Future] = {}
+
+        # 이벤트 루프 스레드에서만 갱신 (done 콜백도 루프에서 실행됨)
+        self.pending = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.failed = 0
+
+    def register(self, msgType: str, handler: Callable):
+        """메시지 타입 핸들러 등록 (같은 타입은 덮어씀)"""
+        self._handlers[msgType] = handler
+
+    def on(self, msgType: str):
+        """데코레이터 형태 등록: @dispatcher.on("motors")"""
+        def decorator(handler):
+            self.register(msgType, handler)
+            return handler
+        return decorator
+
+    def setFallback(self, handler: Optional[Callable]):
+        """type이 없거나 등록되지 않은 메시지를 받을 핸들러 (기존 onWebsocketMessage 콜백)"""
+        self._fallback = handler
+
+    def _getExecutor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.maxWorkers,
+                                                thread_name_prefix="ws-handler")
+        return self._executor
+
+    def _resolve(self, text: str):
+        """(핸들러, 넘길 메시지) 반환"""
+        try:
+            data = json.loads(text)
+        except ValueError:
+            data = None
+        if isinstance(data, dict):
+            handler = self._handlers.get(data.get("type"))
+            if handler is not None:
+                return handler, data
+        return self._fallback, text
+
+    async def dispatch(self, websocket, text: str, **kwargs) -> str:
+        """
+        메시지 하나 분배
+
+        Returns:
+            "done"(async 처리 완료) / "queued"(풀에 넣음) / "dropped" / "rejected" / "unhandled"
+        """
+        handler, message = self._resolve(text)
+        if handler is None:
+            return "unhandled"
+
+        if _isAsync(handler):
+            try:
+                await handler(websocket, message, **kwargs)
+            except Exception as e:
+                self._onError(e)
+            return "done"
+
+        if self.pending >= self.maxPending:
+            if self.overflow == OVERFLOW_REJECT:
+                self.rejected += 1
+                return "rejected"
+            self.dropped += 1
+            return "dropped"
+
+        loop = asyncio.get_running_loop()
+        self.pending += 1
+        call = functools.partial(handler, websocket, message, **kwargs)
+        done = loop.create_future()
+        prev = self._tails.get(websocket)
+        self._tails[websocket] = done
+        if prev is None or prev.done():
+            self._submit(loop, websocket, call, done)
+        else:
+            prev.add_done_callback(lambda _: self._submit(loop, websocket, call, done))
+        return "queued"
+
+    def _submit(self, loop, websocket, call, done):
+        """풀에 작업 넣기 (루프 스레드에서만 호출)"""
+        if self._closed:
+            self._finish(websocket, done, None)
+            return
+        future = loop.run_in_executor(self._getExecutor(), call)
+        future.add_done_callback(functools.partial(self._onDone, websocket, done))
+
+    def _onDone(self, websocket, done, future):
+        if not future.cancelled() and future.exception() is None:
+            result = future.result()
+            if inspect.isawaitable(result):
+                # sync 콜러블이 코루틴을 반환한 경우 (async __call__ 객체 등): 루프에서 마저 실행
+                task = asyncio.ensure_future(result)
+                task.add_done_callback(functools.partial(self._finish, websocket, done))
+                return
+        self._finish(websocket, done, future)
+
+    def _finish(self, websocket, done, future):
+        self.pending -= 1
+        if self._tails.get(websocket) is done:
+            del self._tails[websocket]
+        done.set_result(None)
+        if future is None or future.cancelled():
+            return
+        e = future.exception()
+        if e is not None:
+            self._onError(e)
+
+    def _onError(self, e: BaseException):
+        self.failed += 1
+        print(f"메시지 핸들러 오류: {e}")
+        import traceback
+        traceback.print_exception(type(e), e, e.__traceback__)
+
+    def stats(self) -> dict:
+        return {"pending": self.pending, "dropped": self.dropped,
+                "rejected": self.rejected, "failed": self.failed}
+
+    def shutdown(self):
+        """스레드 풀 종료 (대기 중인 작업은 취소)"""
+        self._closed = True
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def _isAsync(handler) -> bool:
+    """async 함수 또는 async __call__을 가진 객체 (functools.partial도 풀어서 확인)"""
+    return (inspect.iscoroutinefunction(handler)
+            or inspect.iscoroutinefunction(getattr(handler, "__call__", None)))
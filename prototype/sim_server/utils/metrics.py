@@ -0,0 +1,219 @@
+"""
+저비용 메트릭 (히스토그램 / 카운터 / 게이지) + Prometheus 텍스트 출력
+
+핫패스에서 락을 잡지 않는다:
+  - 히스토그램은 로그 간격 고정 버킷에 정수 증가만 (측정값 하나당 log 한 번 + 리스트 인덱싱)
+  - 한 메트릭은 사실상 한 스레드만 기록 (시뮬레이션 단계 = 시뮬 스레드, 전송 = 이벤트 루프)
+    여러 스레드가 같은 메트릭에 동시에 기록하면 드물게 증가분이 빠질 수 있지만 모니터링 용도로는 무시
+  - /metrics 읽기 쪽은 찢어진 값(count와 sum이 한 샘플 어긋남)을 허용
+
+사용 예:
+    from sim_server.utils.metrics import METRICS
+    physics = METRICS.histogram("sim_stage_seconds", "시뮬레이션 스텝 단계별 소요 시간", stage="physics")
+    t0 = time.perf_counter(); sys.DoStepDynamics(dt); physics.observe(time.perf_counter() - t0)
+
+    METRICS.render()  # Prometheus text exposition format (0.0.4)
+"""
+import math
+from typing import Callable, Dict, List, Optional, Tuple
+
+Labels = Tuple[Tuple[str, str], ...]
+
+# 버킷: 1µs부터 2^(1/4)배씩 (상대 오차 약 9%), 약 100초까지
+_MIN = 1e-6
+_FACTOR = 2 ** 0.25
+_LOG_FACTOR = math.log(_FACTOR)
+_BUCKETS = 108
+
+
+def _formatLabels(labels: Labels, extra: str = "") -> str:
+    parts = [f'{k}="{v}"' for k, v in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Histogram:
+    """로그 버킷 히스토그램 (p50/p99는 버킷 기하 중앙값으로 근사, max는 정확)"""
+
+    def __init__(self, labels: Labels = ()):
+        self.labels = labels
+        self.counts = [0] * (_BUCKETS + 1)  # 마지막 칸은 최소값 미만(0 포함)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        if value > _MIN:
+            i = int(math.log(value / _MIN) / _LOG_FACTOR)
+            if i >= _BUCKETS:
+                i = _BUCKETS - 1
+        else:
+            i = _BUCKETS
+        self.counts[i] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        count = self.count
+        if not count:
+            return 0.0
+        rank = q * count
+        seen = self.counts[_BUCKETS]
+        if seen >= rank:
+            return 0.0
+        for i in range(_BUCKETS):
+            seen += self.counts[i]
+            if seen >= rank:
+                return min(_MIN * _FACTOR ** (i + 0.5), self.max)
+        return self.max
+
+    def merge(self, other: 'Histogram'):
+        """다른 히스토그램의 관측값을 더함 (프로세스별로 모은 히스토그램 합치기)"""
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+    def reset(self):
+        self.counts = [0] * (_BUCKETS + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def toDict(self) -> dict:
+        return {"count": self.count, "sum": self.sum, "p50": self.quantile(0.5),
+                "p99": self.quantile(0.99), "max": self.max}
+
+
+class Counter:
+    def __init__(self, labels: Labels = ()):
+        self.labels = labels
+        self.value = 0
+
+    def inc(self, n: int = 1):
+        self.value += n
+
+
+class Gauge:
+    """set()으로 값을 넣거나, fn을 주면 /metrics를 읽을 때 호출"""
+
+    def __init__(self, labels: Labels = (), fn: Optional[Callable[[], float]] = None):
+        self.labels = labels
+        self.fn = fn
+        self._value = 0.0
+
+    def set(self, value: float):
+        self._value = value
+
+    @property
+    def value(self) -> float:
+        if self.fn is not None:
+            try:
+                return float(self.fn())
+            except Exception:
+                return float("nan")
+        return self._value
+
+
+class MetricsRegistry:
+    """
+    이름 + 라벨별 메트릭 보관
+    같은 이름/라벨로 다시 요청하면 기존 객체를 반환 (모듈 로드 시 한 번 만들어 두고 재사용)
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Tuple[str, str, Dict[Labels, object]]] = {}
+
+    def _get(self, kind: str, cls, name: str, help: str, labels: dict, **kwargs):
+        key: Labels = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        entry = self._metrics.get(name)
+        if entry is None:
+            entry = (kind, help, {})
+            self._metrics[name] = entry
+        elif entry[0] != kind:
+            raise ValueError(f"메트릭 {name}은 이미 {entry[0]}로 등록됨")
+        elif help and not entry[1]:
+            entry = (kind, help, entry[2])
+            self._metrics[name] = entry
+        series = entry[2]
+        metric = series.get(key)
+        if metric is None:
+            metric = cls(key, **kwargs)
+            series[key] = metric
+        return metric
+
+    def histogram(self, name: str, help: str = "", **labels) -> Histogram:
+        return self._get("summary", Histogram, name, help, labels)
+
+    def counter(self, name: str, help: str = "", **labels) -> Counter:
+        return self._get("counter", Counter, name, help, labels)
+
+    def gauge(self, name: str, help: str = "", fn: Optional[Callable[[], float]] = None,
+              **labels) -> Gauge:
+        gauge = self._get("gauge", Gauge, name, help, labels)
+        if fn is not None:
+            # 앱이 다시 만들어지면 새 상태를 보도록 콜백 교체
+            gauge.fn = fn
+        return gauge
+
+    def snapshot(self) -> dict:
+        """디버그용 dict ({이름: [{"labels", 값...}]})"""
+        out = {}
+        for name, (kind, _, series) in self._metrics.items():
+            rows = []
+            for labels, metric in list(series.items()):
+                row = {"labels": dict(labels)}
+                if kind == "summary":
+                    row.update(metric.toDict())
+                else:
+                    row["value"] = metric.value
+                rows.append(row)
+            out[name] = rows
+        return out
+
+    def render(self) -> str:
+        """Prometheus text exposition format"""
+        lines: List[str] = []
+        for name, (kind, help, series) in sorted(self._metrics.items()):
+            if help:
+                lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == "summary":
+                for labels, h in list(series.items()):
+                    for q in (0.5, 0.99):
+                        quantile = 'quantile="%s"' % q
+                        lines.append(f"{name}{_formatLabels(labels, quantile)} {h.quantile(q):.9g}")
+                    lines.append(f"{name}_sum{_formatLabels(labels)} {h.sum:.9g}")
+                    lines.append(f"{name}_count{_formatLabels(labels)} {h.count}")
+                lines.append(f"# TYPE {name}_max gauge")
+                for labels, h in list(series.items()):
+                    lines.append(f"{name}_max{_formatLabels(labels)} {h.max:.9g}")
+            else:
+                for labels, metric in list(series.items()):
+                    lines.append(f"{name}{_formatLabels(labels)} {metric.value:.9g}")
+        return "\n".join(lines) + "\n"
+
+
+# 프로세스 전역 레지스트리 (시뮬레이션 스레드와 서버가 같은 객체에 기록)
+METRICS = MetricsRegistry()
+
+
+class SimStageMetrics:
+    """
+    시뮬레이션 틱 단계별 소요 시간 sim_stage_seconds{stage=...} (모든 백엔드가 같은 객체에 기록)
+    input → physics → record → dump_frame → commit
+    """
+    HELP = "시뮬레이션 틱 단계별 소요 시간 (초)"
+
+    def __init__(self, registry: MetricsRegistry):
+        self.input = registry.histogram("sim_stage_seconds", self.HELP, stage="input")
+        self.physics = registry.histogram("sim_stage_seconds", self.HELP, stage="physics")
+        self.record = registry.histogram("sim_stage_seconds", self.HELP, stage="record")
+        self.dump = registry.histogram("sim_stage_seconds", self.HELP, stage="dump_frame")
+        self.commit = registry.histogram("sim_stage_seconds", self.HELP, stage="commit")
+
+
+SIM_STAGES = SimStageMetrics(METRICS)
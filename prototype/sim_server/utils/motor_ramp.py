@@ -0,0 +1,56 @@
+"""
+모터 속도 명령 반영과 램프 진행 (백엔드 공통 규칙)
+
+설정값 객체는 value(현재 속도) / target(램프 목표) / rate(램프 기울기, None이면 즉시) 필드와
+set(speed)(현재 속도를 바꾸고 엔진에 반영)를 가진다 (simulate.MotorSetpoint, synthetic_sim._Motor)
+
+입력 형식 (InputMailbox.read_inputs, 모터별 최신 값만 남아 있음):
+    {"shaft_motor": (3.0, None), "gearA_motor": (1.5, 2.0)}   # (속도, 램프 기울기)
+또는 예전 형식:
+    {"motors": [{"name": "shaft_motor", "speed": 3.0, "ramp": 2.0}, ...]}
+"""
+from typing import Dict, Set
+
+
+def apply_motor_inputs(setpoints: Dict[str, object], ramping: Set[str], inputs: dict):
+    """
+    모터 명령을 이름으로 바로 찾아 반영 (바뀐 모터 수에 비례하는 비용)
+    램프가 있으면 목표만 바꾸고 ramping에 넣고, 없으면 바로 set()
+
+    Args:
+        setpoints: 모터 이름 -> 설정값 객체
+        ramping: 램프 진행 중인 모터 이름 (갱신됨)
+        inputs: 모터 명령 (위 형식)
+    """
+    if "motors" in inputs and isinstance(inputs["motors"], list):
+        inputs = {cmd.get("name"): (cmd.get("speed"), cmd.get("ramp"))
+                  for cmd in inputs["motors"] if isinstance(cmd, dict)}
+
+    for name, (speed, ramp) in inputs.items():
+        sp = setpoints.get(name)
+        if sp is None or speed is None:
+            continue
+        sp.target = speed
+        if ramp:
+            sp.rate = abs(ramp)
+            ramping.add(name)
+        else:
+            sp.rate = None
+            sp.set(speed)
+            ramping.discard(name)
+
+
+def advance_ramps(setpoints: Dict[str, object], ramping: Set[str], dt: float):
+    """램프 중인 모터를 목표 속도 쪽으로 dt만큼 이동 (목표에 도달한 모터는 ramping에서 뺌)"""
+    done = []
+    for name in ramping:
+        sp = setpoints[name]
+        step = sp.rate * dt
+        diff = sp.target - sp.value
+        if abs(diff) <= step:
+            sp.set(sp.target)
+            done.append(name)
+        else:
+            sp.set(sp.value + (step if diff > 0 else -step))
+    for name in done:
+        ramping.discard(name)
@@ -27,3 +27,32 @@ def rescale_obj_mm_to_m(obj_str:str)->str:
     OBJ 문자열을 받아 모든 'v ' 정점 좌표를 1/1000 배로 줄임(mm→m)
     """
     return rescale_obj(obj_str, scale=0.001)
+
+def rescale_obj_file(src_path, dst_path, scale=0.001, chunk_lines=65536)->int:
+    """
+    OBJ 파일을 줄 단위로 스트리밍하며 'v ' 정점 좌표를 scale 배로 변환해 dst_path에 저장
+    파일 전체를 메모리에 올리지 않으므로 큰 업로드 파일에도 사용 가능
+
+    Returns:
+        변환한 정점 개수
+    """
+    count = 0
+    pending = []
+    with open(src_path, 'r', encoding='utf-8', errors='replace') as src, \
+            open(dst_path, 'w', encoding='utf-8') as dst:
+        for line in src:
+            if line.startswith('v '):
+                parts = line.split()
+                if len(parts) >= 4:
+                    try:
+                        x, y, z = [float(p) * scale for p in parts[1:4]]
+                        line = f"v {x:.6f} {y:.6f} {z:.6f}\n"
+                        count += 1
+                    except ValueError:
+                        pass  # 숫자 파싱 실패 시 원본 유지
+            pending.append(line)
+            if len(pending) >= chunk_lines:
+                dst.writelines(pending)
+                pending.clear()
+        dst.writelines(pending)
+    return count
@@ -8,9 +8,12 @@ class OwnedBuffer:
         self._ownership = threading.Lock()
         self._commitLock = threading.Lock()
 
+        self.version = 0  # commit 횟수 (읽는 쪽에서 새 데이터인지 판단용)
+
         def commit(newBuff: Indexable):
             with self._commitLock:
                 self._buff = newBuff
+                self.version += 1
         self.commit = commit
 
     def __enter__(self):
@@ -28,6 +31,13 @@ class OwnedBuffer:
             cp =  copy.deepcopy(self._buff)
         return cp
 
+    # 최신 commit 객체와 버전을 복사 없이 반환
+    # commit된 객체는 이후 수정하지 않는다는 전제 (step_sim은 매 스텝 새 프레임을 만듦)
+    # 여러 클라이언트가 같은 프레임을 읽을 때 deepcopy 비용을 피하기 위해 사용
+    def latest(self):
+        with self._commitLock:
+            return self._buff, self.version
+
     # 하나씩 접근할 때 사용
     # 내부 함수임. 밖에서 사용 금지
     # 만약 오너가 쓰기 중이면 데이터가 깨질 위험 있음
@@ -0,0 +1,134 @@
+"""
+기록된 실행(RecordedRun) 재생
+시뮬레이션 없이 같은 /cadverse/interaction 프로토콜로 프레임을 보낸다
+
+클라이언트마다 재생 커서(위치/속도/재생 여부)가 따로 있고,
+ReplaySource.latest()가 OwnedBuffer.latest()와 같은 형태라 ClientSession.publishLoop를 그대로 쓴다
+(전송 주기 조절, 바디 구독 필터, 인코딩 모두 실시간 모드와 동일)
+
+제어 메시지:
+    {"type": "replay", "action": "play"}
+    {"type": "replay", "action": "pause"}
+    {"type": "replay", "action": "seek", "t": 12.5}      # 시뮬레이션 시간(초)
+    {"type": "replay", "action": "speed", "value": 4.0}  # 배속 (0.05 ~ 64)
+    {"type": "replay", "action": "state"}
+응답: {"type": "replay_state", "t", "playing", "speed", "start", "end", "frame"}
+"""
+import math
+import time
+from typing import Optional
+
+MIN_SPEED = 0.05
+MAX_SPEED = 64.0
+
+
+def _finite(value, name: str) -> float:
+    """숫자로 바꿔서 반환 (NaN/무한대는 min/max 범위 제한을 그대로 통과하므로 거부)"""
+    value = float(value)
+    if not math.isfinite(value):
+        raise ValueError(f"{name}은(는) 유한한 숫자여야 함: {value}")
+    return value
+
+
+class ReplayCursor:
+    """벽시계 기준으로 진행하는 재생 위치 (시뮬레이션 시간 단위)"""
+
+    def __init__(self, start: float, end: float, speed: float = 1.0, playing: bool = True):
+        self.start = start
+        self.end = end
+        self.speed = speed
+        self.playing = playing
+        self._anchorT = start
+        self._anchorWall = time.perf_counter()
+
+    def position(self) -> float:
+        if not self.playing:
+            return self._anchorT
+        t = self._anchorT + (time.perf_counter() - self._anchorWall) * self.speed
+        if t >= self.end:
+            # 끝에 도달하면 멈춤
+            self._setAnchor(self.end)
+            self.playing = False
+            return self.end
+        return t
+
+    def _setAnchor(self, t: float):
+        self._anchorT = min(max(t, self.start), self.end)
+        self._anchorWall = time.perf_counter()
+
+    def play(self):
+        t = self.position()
+        if t >= self.end:
+            t = self.start  # 끝에서 다시 재생하면 처음부터
+        self._setAnchor(t)
+        self.playing = True
+
+    def pause(self):
+        self._setAnchor(self.position())
+        self.playing = False
+
+    def seek(self, t: float):
+        self._setAnchor(_finite(t, "t"))
+
+    def setSpeed(self, speed: float):
+        speed = _finite(speed, "speed")
+        self._setAnchor(self.position())
+        self.speed = min(max(speed, MIN_SPEED), MAX_SPEED)
+
+
+class ReplaySource:
+    """
+    클라이언트 하나의 재생 프레임 공급자
+    latest()는 커서 위치의 프레임과 버전(프레임 번호)을 반환
+    같은 프레임이면 다시 만들지 않고, 청크는 memmap이라 필요한 열만 읽힌다
+    """
+
+    def __init__(self, run, speed: float = 1.0, playing: bool = True):
+        self.run = run
+        start = float(run.times[0]) if len(run) else 0.0
+        end = float(run.times[-1]) if len(run) else 0.0
+        self.cursor = ReplayCursor(start, end, speed, playing)
+        self.names = None  # 구독 바디 (None이면 전체), 미리 걸러서 프레임 생성 비용 절약
+        self._index: Optional[int] = None
+        self._names = None
+        self._frame = {}
+
+    def latest(self):
+        if not len(self.run):
+            return {}, 0
+        i = self.run.index_at(self.cursor.position())
+        if i != self._index or self.names is not self._names:
+            self._index = i
+            self._names = self.names
+            self._frame = self.run.frame(i, names=self.names)
+            # 재생 시점의 서버 벽시계 (클라이언트 지터 버퍼가 실시간과 같은 방식으로 재생)
+            self._frame["wall"] = time.time()
+        return self._frame, i
+
+    def control(self, message: dict) -> dict:
+        """제어 메시지 처리 후 현재 상태 반환 (잘못된 값이면 ValueError)"""
+        action = message.get("action", "state")
+        cursor = self.cursor
+        if action == "play":
+            cursor.play()
+        elif action == "pause":
+            cursor.pause()
+        elif action == "seek":
+            cursor.seek(message["t"])
+        elif action == "speed":
+            cursor.setSpeed(message["value"])
+        elif action != "state":
+            raise ValueError(f"알 수 없는 replay action: {action}")
+        return self.state()
+
+    def state(self) -> dict:
+        t = self.cursor.position()
+        return {
+            "type": "replay_state",
+            "t": t,
+            "playing": self.cursor.playing,
+            "speed": self.cursor.speed,
+            "start": self.cursor.start,
+            "end": self.cursor.end,
+            "frame": self.run.index_at(t) if len(self.run) else 0,
+        }
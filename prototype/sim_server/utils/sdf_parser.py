@@ -0,0 +1,377 @@
+"""
+SDF(Simulation Description Format) 모델 로더
+- iterparse로 link/joint 단위씩 읽고 바로 버려서 큰 world 파일도 메모리 사용량이 일정함
+- 링크/조인트를 make_sim이 쓰는 바디/조인트 meta 형태로 변환 (pychrono 없이 순수 파이썬)
+- 메시 URI는 파일당 한 번만 해석하고, OBJ가 아니거나 scale이 있으면 변환본을 캐시에 저장
+- 변환 결과는 SDF 파일 해시를 키로 JSON 캐시 → 같은 파일은 파싱 없이 바로 다시 열림
+
+변환 결과 예시:
+{
+    "source": "model.sdf",
+    "bodies": [
+        {"name": "base", "mesh": ".../base_s0.001.obj", "mass": 0.55, "fixed": True,
+         "pos": [x, y, z], "rot": [e0, e1, e2, e3],
+         "inertia": {"ixx": ..., "iyy": ..., "izz": ..., "ixy": ..., "ixz": ..., "iyz": ...}}
+    ],
+    "joints": [
+        {"name": "rot1", "type": "revolute", "body": "shaft", "base": "base",
+         "center": [x, y, z], "axis": [1, 0, 0]}
+    ],
+    "meshes": {"model:///meshes/CAD/base.stl": ".../base_s0.001.obj"},
+    "warnings": [...]
+}
+"""
+import hashlib
+import json
+import math
+import os
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from sim_server.utils.obj_scaler import rescale_obj_file
+
+# 변환 규칙이 바뀌면 올려서 기존 캐시를 무효화
+COMPILER_VERSION = 1
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / "resources" / "generated" / "sdf"
+
+SUPPORTED_JOINTS = ("revolute", "continuous", "prismatic", "fixed")
+
+# 이 경고가 있는 결과는 캐시하지 않음 (메시를 나중에 추가하면 다음 로드에서 다시 찾도록)
+MISSING_MESH = "메시를 찾을 수 없음"
+
+
+#==================================================================================================
+# 포즈 계산 (x y z roll pitch yaw → 위치 + 쿼터니언 e0..e3)
+
+def _quat_from_rpy(roll, pitch, yaw):
+    cr, sr = math.cos(roll / 2), math.sin(roll / 2)
+    cp, sp = math.cos(pitch / 2), math.sin(pitch / 2)
+    cy, sy = math.cos(yaw / 2), math.sin(yaw / 2)
+    return (
+        cr * cp * cy + sr * sp * sy,
+        sr * cp * cy - cr * sp * sy,
+        cr * sp * cy + sr * cp * sy,
+        cr * cp * sy - sr * sp * cy,
+    )
+
+def _quat_mul(a, b):
+    a0, a1, a2, a3 = a
+    b0, b1, b2, b3 = b
+    return (
+        a0 * b0 - a1 * b1 - a2 * b2 - a3 * b3,
+        a0 * b1 + a1 * b0 + a2 * b3 - a3 * b2,
+        a0 * b2 - a1 * b3 + a2 * b0 + a3 * b1,
+        a0 * b3 + a1 * b2 - a2 * b1 + a3 * b0,
+    )
+
+def _rotate(q, v):
+    # v' = q * v * q^-1
+    p = _quat_mul(_quat_mul(q, (0.0, v[0], v[1], v[2])), (q[0], -q[1], -q[2], -q[3]))
+    return (p[1], p[2], p[3])
+
+IDENTITY_POSE = ((0.0, 0.0, 0.0), (1.0, 0.0, 0.0, 0.0))
+
+def parse_pose(text):
+    """'x y z roll pitch yaw' 문자열을 (pos, quat) 로 변환"""
+    if not text or not text.strip():
+        return IDENTITY_POSE
+    vals = [float(v) for v in text.split()]
+    vals += [0.0] * (6 - len(vals))
+    return (tuple(vals[0:3]), _quat_from_rpy(*vals[3:6]))
+
+def compose(parent, child):
+    """parent 프레임 기준 child 포즈를 parent의 부모 기준으로 변환"""
+    ppos, prot = parent
+    cpos, crot = child
+    rp = _rotate(prot, cpos)
+    return ((ppos[0] + rp[0], ppos[1] + rp[1], ppos[2] + rp[2]), _quat_mul(prot, crot))
+
+def snap_axis(axis, tol=1e-6):
+    """
+    정규화 후 주축과 거의 같은 축은 주축으로 맞춤
+    (CAD 익스포터가 내보내는 0.9999999999999981 같은 값 → quat_from_axis가 바로 처리)
+    """
+    n = math.sqrt(sum(c * c for c in axis)) or 1.0
+    unit = [c / n for c in axis]
+    snapped = [0.0 if abs(c) < tol else (math.copysign(1.0, c) if abs(abs(c) - 1) < tol else c)
+               for c in unit]
+    return snapped
+
+
+#==================================================================================================
+# 메시 URI 해석
+
+class MeshResolver:
+    """
+    SDF 메시 URI → 로드 가능한 OBJ 경로
+    같은 (uri, scale)은 한 번만 해석하고, 변환본(.obj, scale 적용)은 캐시 디렉토리에 재사용
+    """
+
+    def __init__(self, search_dirs, cache_dir):
+        self.search_dirs = [Path(d) for d in search_dirs]
+        self.cache_dir = Path(cache_dir)
+        self.resolved = {}    # uri -> 경로 (결과 JSON의 "meshes")
+        self._memo = {}       # (uri, scale) -> 경로
+        self.warnings = []
+
+    def _find(self, uri):
+        rel = uri.split("://", 1)[-1].lstrip("/")
+        rel_path = Path(rel)
+        candidates = []
+        for d in self.search_dirs:
+            candidates += [d / rel_path, d / rel_path.with_suffix(".obj"),
+                           d / rel_path.name, d / rel_path.with_suffix(".obj").name]
+        # OBJ를 우선 사용 (ChBodyEasyMesh는 Wavefront만 로드)
+        candidates.sort(key=lambda p: p.suffix.lower() != ".obj")
+        for c in candidates:
+            if c.is_file():
+                return c
+        return None
+
+    def resolve(self, uri, scale):
+        key = (uri, tuple(scale))
+        if key in self._memo:
+            return self._memo[key]
+
+        found = self._find(uri)
+        path = None
+        if found is None:
+            self.warnings.append(f"{MISSING_MESH}: {uri}")
+        elif found.suffix.lower() != ".obj":
+            self.warnings.append(f"OBJ가 아닌 메시는 지원하지 않음: {found}")
+        elif tuple(scale) == (1.0, 1.0, 1.0):
+            path = str(found.resolve())
+        else:
+            if not (scale[0] == scale[1] == scale[2]):
+                self.warnings.append(f"비균일 scale은 x축 값으로 적용: {uri} {scale}")
+            out = self.cache_dir / "meshes" / f"{found.stem}_s{scale[0]:g}.obj"
+            # 원본보다 새 변환본이 있으면 그대로 재사용
+            if not out.exists() or out.stat().st_mtime < found.stat().st_mtime:
+                out.parent.mkdir(parents=True, exist_ok=True)
+                tmp = out.with_suffix(f".{os.getpid()}.tmp")
+                rescale_obj_file(found, tmp, scale=scale[0])
+                tmp.replace(out)
+            path = str(out.resolve())
+
+        self._memo[key] = path
+        if path is not None:
+            self.resolved[uri] = path
+        return path
+
+
+#==================================================================================================
+# 스트리밍 파싱
+
+def _text(elem, tag, default=None):
+    child = elem.find(tag)
+    return child.text.strip() if child is not None and child.text else default
+
+def _link_to_body(elem, name, model_pose, resolver):
+    pose = compose(model_pose, parse_pose(_text(elem, "pose")))
+    body = {
+        "name": name,
+        "mesh": None,
+        "mass": 1.0,
+        "fixed": False,
+        "pos": list(pose[0]),
+        "rot": list(pose[1]),
+    }
+
+    inertial = elem.find("inertial")
+    if inertial is not None:
+        body["mass"] = float(_text(inertial, "mass", 1.0))
+        inertia = inertial.find("inertia")
+        if inertia is not None:
+            body["inertia"] = {k: float(_text(inertia, k, 0.0))
+                               for k in ("ixx", "iyy", "izz", "ixy", "ixz", "iyz")}
+
+    # visual 메시를 우선, 없으면 collision 메시 사용
+    for tag in ("visual", "collision"):
+        mesh = elem.find(f"{tag}/geometry/mesh")
+        if mesh is None:
+            continue
+        uri = _text(mesh, "uri")
+        scale = [float(v) for v in _text(mesh, "scale", "1 1 1").split()]
+        if uri:
+            body["mesh"] = resolver.resolve(uri, scale)
+            break
+    return body, pose
+
+def _joint_to_meta(elem, name, scope, model_pose, link_poses, warnings):
+    jtype = elem.get("type", "")
+    parent = _text(elem, "parent", "world")
+    child = _text(elem, "child", "")
+
+    def scoped(ref):
+        if ref == "world":
+            return ref
+        return f"{scope}::{ref}" if scope else ref
+
+    parent, child = scoped(parent), scoped(child)
+    if jtype not in SUPPORTED_JOINTS:
+        warnings.append(f"지원하지 않는 조인트 타입 ({jtype}): {name}")
+        return None
+    if child not in link_poses:
+        warnings.append(f"조인트 {name}의 child 링크를 찾을 수 없음: {child}")
+        return None
+
+    # SDF 1.6까지 조인트 pose는 child 링크 프레임 기준
+    frame = compose(link_poses[child], parse_pose(_text(elem, "pose")))
+    joint = {
+        "name": name,
+        "type": "revolute" if jtype == "continuous" else jtype,
+        "body": child,
+        "base": parent,
+        "center": list(frame[0]),
+    }
+
+    axis_elem = elem.find("axis")
+    if axis_elem is not None and jtype != "fixed":
+        axis = [float(v) for v in _text(axis_elem, "xyz", "0 0 1").split()]
+        use_model_frame = _text(axis_elem, "use_parent_model_frame", "0") in ("1", "true")
+        axis = _rotate(model_pose[1] if use_model_frame else frame[1], axis)
+        joint["axis"] = snap_axis(axis)
+    elif jtype != "fixed":
+        joint["axis"] = snap_axis(_rotate(frame[1], (0.0, 0.0, 1.0)))
+    return joint
+
+def parse_sdf(path, search_dirs=(), cache_dir=None, fix_roots=True):
+    """
+    SDF 파일을 스트리밍으로 읽어 바디/조인트 meta로 변환 (캐시 없이 항상 파싱)
+
+    Args:
+        path: SDF 파일 경로
+        search_dirs: 메시 URI 탐색 경로 (SDF 파일 위치는 항상 포함)
+        cache_dir: 변환 메시 저장 경로
+        fix_roots: 어떤 조인트의 child도 아닌 링크를 고정 바디로 둘지 여부
+                   (CAD 익스포트 모델은 보통 베이스가 월드에 붙어 있지 않음)
+    """
+    path = Path(path)
+    cache_root = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+    resolver = MeshResolver([path.parent, *search_dirs], cache_root)
+
+    bodies, joints = [], []
+    link_poses = {}
+    warnings = resolver.warnings
+    in_world = False
+
+    # 현재 열려 있는 요소 스택과 model 스택 [이름, 누적 포즈]
+    stack = []
+    models = []
+
+    def scope_name():
+        # 단일 모델 파일은 최상위 모델 이름을 생략, world 안의 모델은 모델 이름으로 구분
+        names = [n for n, _ in (models if in_world else models[1:]) if n]
+        return "::".join(names)
+
+    for event, elem in ET.iterparse(str(path), events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            if tag == "world":
+                in_world = True
+            elif tag == "model":
+                parent_pose = models[-1][1] if models else IDENTITY_POSE
+                models.append([elem.get("name", ""), parent_pose])
+            stack.append(elem)
+            continue
+
+        stack.pop()
+        parent = stack[-1] if stack else None
+
+        if tag == "pose" and parent is not None and parent.tag == "model":
+            # model 직속 pose: 상위 model 포즈에 합성 (link보다 먼저 나온다고 가정)
+            outer_pose = models[-2][1] if len(models) > 1 else IDENTITY_POSE
+            models[-1][1] = compose(outer_pose, parse_pose(elem.text))
+        elif tag == "link" and models:
+            scope = scope_name()
+            name = f"{scope}::{elem.get('name')}" if scope else elem.get("name")
+            body, pose = _link_to_body(elem, name, models[-1][1], resolver)
+            link_poses[name] = pose
+            bodies.append(body)
+            elem.clear()
+        elif tag == "joint" and models:
+            scope = scope_name()
+            name = f"{scope}::{elem.get('name')}" if scope else elem.get("name")
+            joint = _joint_to_meta(elem, name, scope, models[-1][1], link_poses, warnings)
+            if joint is not None:
+                joints.append(joint)
+            elem.clear()
+        elif tag == "include":
+            warnings.append(f"<include>는 지원하지 않음: {_text(elem, 'uri')}")
+            elem.clear()
+        elif tag == "model":
+            models.pop()
+            elem.clear()
+
+    if fix_roots:
+        children = {j["body"] for j in joints}
+        for b in bodies:
+            if b["name"] not in children:
+                b["fixed"] = True
+    for j in joints:
+        if j["base"] == "world":
+            j["base"] = None  # make_sim에서 고정 ground 바디로 연결
+
+    return {
+        "source": path.name,
+        "bodies": bodies,
+        "joints": joints,
+        "meshes": resolver.resolved,
+        "warnings": warnings,
+    }
+
+#==================================================================================================
+# 해시 기반 캐시
+
+def file_hash(path, chunk_size=1 << 20):
+    """파일을 청크 단위로 읽어 sha256 계산"""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            h.update(chunk)
+    return h.hexdigest()
+
+def load_sdf(path, search_dirs=(), cache_dir=None, fix_roots=True):
+    """
+    SDF 파일을 변환하고 결과를 (파일 해시, 메시 탐색 경로) 기준으로 캐시
+    같은 내용의 파일을 같은 탐색 경로로 열면 파싱 없이 캐시 JSON만 읽어서 반환
+    찾지 못한 메시가 있으면 캐시하지 않음
+
+    Returns:
+        parse_sdf()와 같은 dict ("hash" 키 추가)
+    """
+    cache_root = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+    digest = file_hash(path)
+    # 메시 URI는 탐색 경로 순서대로 해석되므로 (SDF 위치 포함) 해석된 경로 목록도 키에 넣음
+    dirs = [str(Path(d).resolve()) for d in (Path(path).parent, *search_dirs)]
+    dirs_digest = hashlib.sha256("\0".join(dirs).encode("utf-8")).hexdigest()
+    cache_file = cache_root / (f"{digest[:32]}_{dirs_digest[:16]}"
+                               f"_v{COMPILER_VERSION}_{int(fix_roots)}.json")
+
+    if cache_file.exists():
+        try:
+            with open(cache_file, "r", encoding="utf-8") as f:
+                compiled = json.load(f)
+            # 변환 메시가 지워졌으면 다시 변환
+            if all(os.path.exists(p) for p in compiled["meshes"].values()):
+                return compiled
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[sdf] 캐시 읽기 실패, 다시 변환: {e}")
+
+    compiled = parse_sdf(path, search_dirs=search_dirs, cache_dir=cache_root, fix_roots=fix_roots)
+    compiled["hash"] = digest
+    for w in compiled["warnings"]:
+        print("[sdf] 경고:", w)
+    if any(w.startswith(MISSING_MESH) for w in compiled["warnings"]):
+        return compiled
+
+    cache_root.mkdir(parents=True, exist_ok=True)
+    tmp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(compiled, f, ensure_ascii=False)
+    tmp.replace(cache_file)
+    return compiled
@@ -0,0 +1,153 @@
+"""
+미리 만들어 둔 시뮬레이터 풀 (세션 시작 시 make_sim 대기 제거)
+
+make_sim(메시 로드, 조립, 조인트/모터/기어 링크 생성)은 모델에 따라 수 초가 걸린다
+자주 요청되는 모델 설명마다 아직 스텝하지 않은 시뮬레이터를 size개씩 만들어 두고,
+runSimloop이 하나 꺼내 가면 백그라운드 스레드가 다시 채운다
+
+- 키: checkpoint.model_key(모델 설명) (설명 JSON의 해시, 체크포인트와 같은 키)
+- 요청 횟수가 많은 모델 maxModels개만 유지 (순위에서 밀린 모델의 준비분은 정리)
+- 풀에서 꺼낸 시뮬레이터는 버퍼를 bindBuffer()로 연결하고, 체크포인트가 있으면 그 상태로 복원해서 사용
+- 생성은 simInterface.make_sim으로만 (백엔드 생성 락을 시뮬 스레드와 공유)
+
+사용 예:
+    pool = WarmSimPool(size=2)
+    pool.prewarm(modelDescription)             # 시작 시 인기 모델을 미리 등록
+    simulator = pool.take(modelDescription)    # 없으면 None (요청 횟수는 기록되어 다음부터 채워짐)
+"""
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+
+from sim_server.utils.checkpoint import model_key
+from sim_server.utils.metrics import METRICS
+
+_hits = METRICS.counter("sim_pool_hits_total", "미리 만들어 둔 시뮬레이터로 시작한 횟수")
+_misses = METRICS.counter("sim_pool_misses_total", "풀이 비어 있어 make_sim을 기다린 횟수")
+_buildSeconds = METRICS.histogram("sim_pool_build_seconds", "풀 보충용 시뮬레이터 생성 시간 (초)")
+
+
+class WarmSimPool:
+    def __init__(self, size: int = 1, maxModels: int = 4,
+                 builder: Optional[Callable] = None):
+        """
+        Args:
+            size: 모델별로 준비해 둘 시뮬레이터 수
+            maxModels: 풀을 유지할 모델 수 (요청 횟수 상위)
+            builder: 모델 설명 → Simulator (기본 simInterface.make_sim, 버퍼 없이 생성)
+        """
+        if builder is None:
+            from sim_server.simInterface import make_sim
+            builder = make_sim
+        self.size = size
+        self.maxModels = maxModels
+        self.builder = builder
+        self._lock = threading.Lock()
+        self._ready: Dict[str, List] = {}       # 모델 키 -> 준비된 시뮬레이터
+        self._descriptions: Dict[str, dict] = {}
+        self._requests: Counter = Counter()     # 모델 키 -> 요청 횟수 (prewarm 포함)
+        self._wake = threading.Event()
+        self._closed = False
+        self.failures: Dict[str, str] = {}      # 모델 키 -> 마지막 생성 실패 이유 (다시 요청되면 지움)
+        METRICS.gauge("sim_pool_ready", "풀에 준비된 시뮬레이터 수",
+                      fn=lambda: sum(len(v) for v in self._ready.values()))
+        self._thread = threading.Thread(target=self._refillLoop, daemon=True, name="sim-pool")
+        self._thread.start()
+
+    # ---------------------------------------------------------------- 사용하는 쪽
+
+    def prewarm(self, description: dict, weight: int = 1):
+        """모델을 인기 모델로 등록하고 보충 시작 (weight만큼 요청 횟수 가산)"""
+        if not description:
+            return
+        key = model_key(description)
+        with self._lock:
+            self._descriptions[key] = description
+            self._requests[key] += weight
+            self.failures.pop(key, None)  # 다시 요청됐으므로 재시도
+        self._wake.set()
+
+    def take(self, description: dict):
+        """준비된 시뮬레이터 하나 (없으면 None, 호출한 쪽에서 직접 make_sim)"""
+        key = model_key(description)
+        with self._lock:
+            self._descriptions.setdefault(key, description)
+            self._requests[key] += 1
+            self.failures.pop(key, None)  # 다시 요청됐으므로 재시도
+            ready = self._ready.get(key)
+            simulator = ready.pop() if ready else None
+        self._wake.set()
+        if simulator is None:
+            _misses.inc()
+        else:
+            _hits.inc()
+        return simulator
+
+    def status(self) -> dict:
+        with self._lock:
+            return {key: {"ready": len(self._ready.get(key, ())), "requests": count,
+                          **({"error": self.failures[key]} if key in self.failures else {})}
+                    for key, count in self._requests.most_common()}
+
+    def close(self):
+        """보충 중단 후 준비된 시뮬레이터 정리"""
+        self._closed = True
+        self._wake.set()
+        self._thread.join(timeout=5)
+        with self._lock:
+            ready = [s for sims in self._ready.values() for s in sims]
+            self._ready.clear()
+        for simulator in ready:
+            self._dispose(simulator)
+
+    # ---------------------------------------------------------------- 보충 스레드
+
+    def _popular(self) -> List[str]:
+        return [key for key, _ in self._requests.most_common(self.maxModels)]
+
+    def _nextToBuild(self) -> Optional[str]:
+        """준비 수가 가장 모자란 인기 모델 (실패한 모델은 다시 요청될 때까지 건너뜀)"""
+        with self._lock:
+            popular = self._popular()
+            # 순위에서 밀린 모델의 준비분 정리
+            evicted = [k for k in self._ready if k not in popular]
+            stale = [s for k in evicted for s in self._ready.pop(k)]
+            candidates = [(len(self._ready.get(k, ())), k) for k in popular
+                          if len(self._ready.get(k, ())) < self.size and k not in self.failures]
+        for simulator in stale:
+            self._dispose(simulator)
+        return min(candidates)[1] if candidates else None
+
+    def _refillLoop(self):
+        while not self._closed:
+            key = self._nextToBuild()
+            if key is None:
+                self._wake.wait()
+                self._wake.clear()
+                continue
+            description = self._descriptions[key]
+            start = time.perf_counter()
+            try:
+                simulator = self.builder(description, None)
+            except Exception as e:
+                print(f"[sim-pool] 시뮬레이터 생성 실패 ({key[:8]}): {e}")
+                with self._lock:
+                    self.failures[key] = str(e)
+                continue
+            _buildSeconds.observe(time.perf_counter() - start)
+            with self._lock:
+                if self._closed or key not in self._popular():
+                    keep = False
+                else:
+                    self._ready.setdefault(key, []).append(simulator)
+                    keep = True
+            if not keep:
+                self._dispose(simulator)
+
+    @staticmethod
+    def _dispose(simulator):
+        try:
+            simulator.clear()
+        except Exception as e:
+            print(f"[sim-pool] 시뮬레이터 정리 실패: {e}")
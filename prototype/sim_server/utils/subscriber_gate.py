@@ -0,0 +1,65 @@
+import threading
+
+# 구독자가 없을 때 시뮬레이션 루프 동작
+IDLE_RUN = "run"              # 그대로 전속력 (기존 동작)
+IDLE_PAUSE = "pause"          # 스텝 중단, 구독자가 생기면 재개
+IDLE_NO_FRAMES = "no_frames"  # 스텝은 계속하되 프레임 생성/commit 생략
+IDLE_KEEPALIVE = "keepalive"  # 낮은 주기로 스텝 + 프레임
+IDLE_POLICIES = (IDLE_RUN, IDLE_PAUSE, IDLE_NO_FRAMES, IDLE_KEEPALIVE)
+
+
+class SubscriberGate:
+    """
+    서버(구독자 수) → 시뮬레이션 루프(스케줄링) 신호 전달
+
+    - 서버 스레드: 웹소켓 접속/종료 시 add() / remove()
+    - 시뮬 스레드: idle 여부를 보고 idlePolicy대로 쉬거나 속도를 낮춤,
+                  wait()로 자다가 구독자가 생기면 바로 깨어나 전속력으로 복귀
+    """
+
+    def __init__(self, idlePolicy: str = IDLE_PAUSE, keepaliveHz: float = 2.0):
+        if idlePolicy not in IDLE_POLICIES:
+            raise ValueError(f"알 수 없는 idle 정책: {idlePolicy}")
+        self.idlePolicy = idlePolicy
+        self.keepaliveHz = keepaliveHz
+
+        self._count = 0
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def idle(self) -> bool:
+        return self._count == 0
+
+    def add(self) -> int:
+        with self._changed:
+            self._count += 1
+            self._changed.notify_all()
+            return self._count
+
+    def remove(self) -> int:
+        with self._changed:
+            self._count = max(0, self._count - 1)
+            self._changed.notify_all()
+            return self._count
+
+    def wait(self, timeout: float) -> bool:
+        """
+        구독자가 생기거나 wake()가 불릴 때까지 최대 timeout초 대기
+
+        Returns:
+            구독자가 있으면 True
+        """
+        with self._changed:
+            if self._count == 0:
+                self._changed.wait(timeout)
+            return self._count > 0
+
+    def wake(self):
+        """대기 중인 시뮬 루프를 깨움 (종료 시 사용)"""
+        with self._changed:
+            self._changed.notify_all()
@@ -0,0 +1,154 @@
+"""
+온디맨드 텔레메트리 채널 관리
+포즈 외의 값(조인트 반력, 모터 토크/속도, 실측 기어비)은 계산 비용이 있으므로
+구독하는 클라이언트가 있는 채널만, 가장 촘촘한 구독 간격(decimation)으로 계산한다
+
+채널 이름: "<종류>:<대상 이름>"
+    reaction:<joint>   조인트 반력/반토크 (GetReaction2)     {"force": [x,y,z], "torque": [x,y,z]}
+    motor:<motor>      모터 토크/속도/각도                     {"torque", "speed", "angle"}
+    gear:<gear link>   실측 기어비 (각속도비)와 공칭 기어비    {"ratio", "nominal"}
+
+구독 메시지 예시 (decimation = 몇 스텝마다 한 번 샘플할지):
+    {"type": "telemetry", "channels": {"motor:gearA_motor": 1, "reaction:gear_A_revolute": 10}}
+    {"type": "telemetry", "channels": {}}   # 구독 해제
+
+프레임에는 채널마다 마지막 샘플이 frame["telemetry"][채널] = (샘플한 스텝, 값)으로 매번 실리고
+(클라이언트는 자기 주기로 최신 프레임만 읽으므로 샘플한 스텝의 프레임을 건너뛸 수 있음)
+클라이언트에는 아직 보내지 않은 샘플만 {"step": 샘플한 스텝, ...값}으로 보낸다
+"""
+import threading
+from typing import Dict, Iterable, List, Optional
+
+CHANNEL_KINDS = ("reaction", "motor", "gear")
+
+
+def parse_channel(channel: str):
+    """ "motor:gearA_motor" → ("motor", "gearA_motor") (형식이 틀리면 ValueError) """
+    kind, sep, target = channel.partition(":")
+    if not sep or kind not in CHANNEL_KINDS or not target:
+        raise ValueError(f"잘못된 채널 이름: {channel}")
+    return kind, target
+
+
+class TelemetryRegistry:
+    """
+    클라이언트 채널 구독 → 시뮬레이션에서 계산할 채널 목록
+
+    - 서버(이벤트 루프): update()/remove()
+    - 시뮬레이션 스레드: setAvailable()로 모델의 채널 목록 등록, 매 스텝 active만 읽음
+      active는 {채널: 최소 decimation} dict이고 구독이 바뀔 때 통째로 교체 (락 불필요)
+    """
+
+    def __init__(self, maxDecimation: int = 10000):
+        self._lock = threading.Lock()
+        self.maxDecimation = maxDecimation
+        self.available: frozenset = frozenset()
+        self._subs: Dict[object, Dict[str, int]] = {}
+        self.active: Dict[str, int] = {}
+
+    def setAvailable(self, channels: Iterable[str]):
+        with self._lock:
+            self.available = frozenset(channels)
+            self._rebuild()
+
+    def update(self, clientId, channels: Dict[str, int]):
+        """
+        클라이언트 구독을 통째로 교체
+
+        Returns:
+            (구독된 채널 {이름: decimation}, 모델에 없는 채널 목록)
+        """
+        accepted, unknown = {}, []
+        for channel, decimation in channels.items():
+            try:
+                parse_channel(channel)
+                decimation = int(decimation)
+            except (TypeError, ValueError):
+                unknown.append(channel)
+                continue
+            if channel not in self.available:
+                unknown.append(channel)
+                continue
+            accepted[channel] = min(max(decimation, 1), self.maxDecimation)
+
+        with self._lock:
+            if accepted:
+                self._subs[clientId] = accepted
+            else:
+                self._subs.pop(clientId, None)
+            self._rebuild()
+        return accepted, unknown
+
+    def remove(self, clientId):
+        with self._lock:
+            if self._subs.pop(clientId, None) is not None:
+                self._rebuild()
+
+    def _rebuild(self):
+        active = {}
+        for subs in self._subs.values():
+            for channel, decimation in subs.items():
+                if channel in self.available:
+                    active[channel] = min(decimation, active.get(channel, decimation))
+        self.active = active
+
+
+class LatestSamples:
+    """
+    채널별 마지막 샘플과 그 스텝 (시뮬레이션 스레드에서만 사용)
+
+    샘플은 decimation 스텝마다 계산하지만 매 프레임에 실어서,
+    샘플한 스텝의 프레임을 읽지 못한 클라이언트도 다음에 읽는 프레임에서 받게 한다
+    """
+
+    def __init__(self):
+        self._latest: Dict[str, tuple] = {}
+
+    def update(self, step: int, samples: dict, active: Dict[str, int]) -> Dict[str, tuple]:
+        """
+        이번 스텝 샘플을 반영한 {채널: (스텝, 샘플)} (구독이 끝난 채널은 뺌)
+        매번 새 dict를 만들므로 commit된 프레임에 그대로 넣어도 됨
+        """
+        latest = {channel: entry for channel, entry in self._latest.items() if channel in active}
+        for channel, sample in samples.items():
+            latest[channel] = (step, sample)
+        self._latest = latest
+        return latest
+
+
+def select_samples(telemetry: Optional[dict], channels: Dict[str, int],
+                   lastSent: Dict[str, int]) -> dict:
+    """
+    클라이언트 하나에 보낼 텔레메트리 샘플 선택
+    채널마다 마지막으로 보낸 스텝에서 decimation 이상 지난 샘플만 포함 (같은 샘플은 한 번만)
+
+    Args:
+        telemetry: frame["telemetry"] ({채널: (샘플한 스텝, 샘플)})
+        channels: 이 클라이언트의 {채널: decimation}
+        lastSent: 이 클라이언트의 {채널: 마지막으로 보낸 스텝} (갱신됨)
+
+    Returns:
+        {채널: {"step": 샘플한 스텝, ...샘플}}
+    """
+    if not telemetry or not channels:
+        return {}
+    out = {}
+    for channel, decimation in channels.items():
+        entry = telemetry.get(channel)
+        if entry is None:
+            continue
+        step, sample = entry
+        last = lastSent.get(channel)
+        if last is not None and step - last < decimation:
+            continue
+        lastSent[channel] = step
+        out[channel] = {"step": step, **sample}
+    return out
+
+
+def channel_names(joint_names: List[str], motor_names: List[str],
+                  gear_names: List[str]) -> List[str]:
+    """모델에서 구독 가능한 채널 이름 목록"""
+    return ([f"reaction:{n}" for n in joint_names]
+            + [f"motor:{n}" for n in motor_names]
+            + [f"gear:{n}" for n in gear_names])
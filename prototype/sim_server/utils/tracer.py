@@ -0,0 +1,147 @@
+"""
+Chrome / Perfetto trace-event 기록기 (선택 사항, 기본 꺼짐)
+
+메트릭(/metrics)은 분포만 보여주므로, 특정 프레임이 왜 늦었는지는 타임라인으로 본다
+시뮬 틱, 물리 스텝, 직렬화, 클라이언트별 전송, 입력 수신/반영 구간을 스레드 id와 함께
+고정 크기 링 버퍼에 넣어 두고, 요청하거나 틱이 주기를 넘겼을 때 JSON으로 내보낸다
+(chrome://tracing 또는 https://ui.perfetto.dev 에서 열기)
+
+- 꺼져 있을 때 비용은 TRACER.enabled 확인 한 번
+- 기록은 deque.append 한 번 (GIL 안에서 원자적, 락 없음), 가득 차면 오래된 이벤트부터 버림
+- 시각은 time.perf_counter() 기준 (호출하는 쪽이 이미 잰 값을 그대로 넘길 수 있음)
+
+사용 예:
+    from sim_server.utils.tracer import TRACER
+    if TRACER.enabled:
+        TRACER.complete("physics", t1, t2, cat="sim")
+    with TRACER.span("encode", cat="net", client=3):
+        ...
+"""
+import contextlib
+import json
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Optional
+
+_NULL_SPAN = contextlib.nullcontext()
+
+
+class Tracer:
+    def __init__(self, capacity: int = 65536, enabled: bool = False):
+        self.enabled = enabled
+        self.capacity = capacity
+        self._events = deque(maxlen=capacity)
+        self._threadNames = {}
+        self.dumpDir: Optional[Path] = None
+        self.dumpInterval = 10.0   # 주기 초과 덤프 최소 간격 (초), 연속 초과 시 파일이 쏟아지지 않도록
+        self.dumps = 0
+        self._lastDump = float("-inf")
+
+    def configure(self, enabled: Optional[bool] = None, capacity: Optional[int] = None,
+                  dumpDir: Optional[str] = None, dumpInterval: Optional[float] = None):
+        if capacity is not None and capacity != self.capacity:
+            self.capacity = capacity
+            self._events = deque(self._events, maxlen=capacity)
+        if dumpDir is not None:
+            self.dumpDir = Path(dumpDir) if dumpDir else None
+        if dumpInterval is not None:
+            self.dumpInterval = dumpInterval
+        if enabled is not None:
+            self.enabled = enabled
+
+    def _tid(self) -> int:
+        tid = threading.get_ident()
+        if tid not in self._threadNames:
+            self._threadNames[tid] = threading.current_thread().name
+        return tid
+
+    # ---------------------------------------------------------------- 기록
+
+    def complete(self, name: str, start: float, end: float, cat: str = "", args: Optional[dict] = None):
+        """이미 잰 구간 [start, end] (perf_counter 초) 기록"""
+        self._events.append((name, cat, "X", start, end - start, self._tid(), args))
+
+    def instant(self, name: str, cat: str = "", args: Optional[dict] = None):
+        self._events.append((name, cat, "i", time.perf_counter(), 0.0, self._tid(), args))
+
+    def span(self, name: str, cat: str = "", **args):
+        """with 블록 구간 기록 (꺼져 있으면 아무것도 하지 않는 컨텍스트)"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._span(name, cat, args or None)
+
+    @contextlib.contextmanager
+    def _span(self, name, cat, args):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.complete(name, start, time.perf_counter(), cat, args)
+
+    def clear(self):
+        self._events.clear()
+
+    # ---------------------------------------------------------------- 내보내기
+
+    def toChrome(self) -> dict:
+        """현재 버퍼를 trace-event JSON 객체로 (ts/dur 단위 µs)"""
+        return self._toChrome(list(self._events), dict(self._threadNames))
+
+    @staticmethod
+    def _toChrome(events, threadNames) -> dict:
+        out = [{"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": name}}
+               for tid, name in threadNames.items()]
+        for name, cat, ph, ts, dur, tid, args in events:
+            e = {"name": name, "cat": cat, "ph": ph, "ts": ts * 1e6, "pid": 1, "tid": tid}
+            if ph == "X":
+                e["dur"] = dur * 1e6
+            else:
+                e["s"] = "t"
+            if args:
+                e["args"] = args
+            out.append(e)
+        return {"traceEvents": out, "displayTimeUnit": "ms"}
+
+    def dump(self, path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.toChrome()), encoding="utf-8")
+        return path
+
+    def onOverrun(self, start: float, end: float, budget: float):
+        """
+        틱이 주기를 넘겼을 때 (시뮬 스레드에서 호출)
+        dumpDir이 있으면 dumpInterval에 한 번만, 버퍼 스냅샷을 별도 스레드에서 파일로 기록
+        """
+        if not self.enabled:
+            return
+        self.complete("overrun", start, end, cat="sim", args={"budget_ms": budget * 1000})
+        if self.dumpDir is None or end - self._lastDump < self.dumpInterval:
+            return
+        self._lastDump = end
+        # 시뮬 스레드에서는 버퍼 복사만, JSON 변환/기록은 별도 스레드
+        events = list(self._events)
+        threadNames = dict(self._threadNames)
+        path = self.dumpDir / time.strftime("overrun_%Y%m%d_%H%M%S.json")
+        self.dumps += 1
+
+        def write():
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                trace = self._toChrome(events, threadNames)
+                path.write_text(json.dumps(trace), encoding="utf-8")
+                print(f"[trace] 주기 초과 트레이스 기록: {path}")
+            except Exception as e:
+                print(f"[trace] 기록 실패: {e}")
+        threading.Thread(target=write, daemon=True, name="trace-dump").start()
+
+    def status(self) -> dict:
+        return {"enabled": self.enabled, "capacity": self.capacity, "events": len(self._events),
+                "dump_dir": None if self.dumpDir is None else str(self.dumpDir),
+                "overrun_dumps": self.dumps}
+
+
+# 프로세스 전역 트레이서 (main에서 설정으로 켬)
+TRACER = Tracer()
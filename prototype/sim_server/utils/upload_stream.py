@@ -0,0 +1,108 @@
+"""
+multipart/form-data 업로드 스트리밍 수신 (python-multipart 스트리밍 파서)
+
+FastAPI의 UploadFile 인자는 핸들러가 불리기 전에 본문 전체를 임시 파일로 받아 두므로
+크기 제한/진행률이 네트워크 수신 시점과 맞지 않고 디스크에 두 번 쓰게 된다
+request.stream()의 청크를 그대로 파서에 넣어 파일 필드의 데이터만 꺼내 쓴다
+
+사용 예:
+    upload = MultipartUpload(request.headers.get("content-type", ""))
+    async for chunk in request.stream():
+        for data in upload.feed(chunk):   # 파일 필드 데이터 (upload.fileName은 헤더가 끝나면 설정)
+            out.write(data)
+    upload.finish()
+"""
+from typing import List, Optional
+
+
+class MultipartUpload:
+    """file 필드 하나만 꺼내는 multipart 수신기 (다른 필드와 두 번째 파일은 무시)"""
+
+    def __init__(self, contentType: str, field: str = "file"):
+        """
+        Raises:
+            ValueError: multipart/form-data가 아니거나 boundary가 없음
+        """
+        from python_multipart.multipart import MultipartParser, parse_options_header
+
+        mediaType, params = parse_options_header(contentType)
+        boundary = params.get(b"boundary")
+        if mediaType != b"multipart/form-data" or not boundary:
+            raise ValueError("multipart/form-data 요청이 아님")
+        self.field = field
+        self.fileName: Optional[str] = None  # 파일 필드 헤더가 끝나면 설정
+        self.complete = False                # 파일 필드 데이터를 끝까지 받음
+        self._parseOptions = parse_options_header
+        self._headerField = b""
+        self._headerValue = b""
+        self._headers = {}
+        self._inFile = False
+        self._data: List[bytes] = []
+        self._parser = MultipartParser(boundary, {
+            "on_part_begin": self._onPartBegin,
+            "on_header_field": self._onHeaderField,
+            "on_header_value": self._onHeaderValue,
+            "on_header_end": self._onHeaderEnd,
+            "on_headers_finished": self._onHeadersFinished,
+            "on_part_data": self._onPartData,
+            "on_part_end": self._onPartEnd,
+        })
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        """
+        본문 청크 하나를 파싱하고 그 안에 있던 파일 데이터 조각 반환
+
+        Raises:
+            ValueError: 형식이 잘못된 multipart 본문
+        """
+        try:
+            self._parser.write(chunk)
+        except Exception as e:
+            raise ValueError(f"잘못된 multipart 본문: {e}") from None
+        data, self._data = self._data, []
+        return data
+
+    def finish(self):
+        """본문 끝 (파일 필드가 끝까지 오지 않았으면 ValueError)"""
+        try:
+            self._parser.finalize()
+        except Exception as e:
+            raise ValueError(f"잘못된 multipart 본문: {e}") from None
+        if self.fileName is None:
+            raise ValueError(f"{self.field} 필드가 없음")
+        if not self.complete:
+            raise ValueError("파일 데이터가 끝나기 전에 본문이 끝남")
+
+    # ---------------------------------------------------------------- 파서 콜백
+
+    def _onPartBegin(self):
+        self._headers = {}
+
+    def _onHeaderField(self, data, start, end):
+        self._headerField += data[start:end]
+
+    def _onHeaderValue(self, data, start, end):
+        self._headerValue += data[start:end]
+
+    def _onHeaderEnd(self):
+        self._headers[self._headerField.lower()] = self._headerValue
+        self._headerField = b""
+        self._headerValue = b""
+
+    def _onHeadersFinished(self):
+        disposition, params = self._parseOptions(self._headers.get(b"content-disposition", b""))
+        name = params.get(b"name", b"").decode("utf-8", "replace")
+        fileName = params.get(b"filename")
+        if (disposition == b"form-data" and name == self.field and fileName is not None
+                and self.fileName is None):
+            self.fileName = fileName.decode("utf-8", "replace")
+            self._inFile = True
+
+    def _onPartData(self, data, start, end):
+        if self._inFile:
+            self._data.append(bytes(data[start:end]))
+
+    def _onPartEnd(self):
+        if self._inFile:
+            self._inFile = False
+            self.complete = True